@@ -1,77 +1,73 @@
 import os
-from langchain_community.utilities import GoogleSerperAPIWrapper
+import json
+import time
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import SystemMessage, HumanMessage
 import re
+import asyncio
 from typing import List, Dict
+from agent.events import emit_event, emit_stage, astream_llm_text
+from agent.gazetteer import get_gazetteer
+from agent.history import estimate_tokens
+from agent.risk_planner import LOCATION_SCOPED_CATEGORIES, location_key, plan_risk_searches
+from agent.risk_scoring import RISK_SCORES_FENCE, RISK_SCORES_INSTRUCTIONS, extract_risk_scores, rank_venues
+from utils.risk_baselines import get_risk_baseline_store
+from utils.risk_report_cache import get_risk_report_cache
+from utils.search_cache import get_cached_search
+from utils.time_expressions import parse_time_expression
+
+# Maximum number of risk searches in flight at once for a single assessment
+RISK_SEARCH_CONCURRENCY = int(os.getenv("RISK_SEARCH_CONCURRENCY", "8"))
+# Token budget for the venue search data in one batch report prompt; larger batches are split into chunks
+RISK_PROMPT_TOKEN_BUDGET = int(os.getenv("RISK_PROMPT_TOKEN_BUDGET", "6000"))
+# Maximum number of batch report chunks sent to the LLM at once
+RISK_REPORT_CONCURRENCY = int(os.getenv("RISK_REPORT_CONCURRENCY", "4"))
+# Characters of a precomputed city baseline included as location context in venue prompts
+RISK_BASELINE_CONTEXT_CHARS = int(os.getenv("RISK_BASELINE_CONTEXT_CHARS", "1500"))
 
 # --- Venue parsing function (DEPRECATED - Now using LLM-based extraction) ---
 # This function is kept for backward compatibility but is no longer used
 # The intelligent_venue_processor_node in venue_graph.py now handles venue extraction using LLM
 
-# --- Direct risk assessment function for individual venues ---
-def assess_venue_risks_directly(llm, venue_info: Dict, time_period=""):
-    """Assess risks for a specific venue with targeted, venue-specific searches."""
-    
-    venue_name = venue_info.get('name', 'Unknown Venue')
-    venue_location = venue_info.get('location', 'Unknown')
-    
-    # Create search wrapper
-    search = GoogleSerperAPIWrapper()
-    
-    try:
-        print(f"Starting venue-specific risk assessment for {venue_name}")
-        
-        # Make targeted searches for venue-specific risks
-        risk_reports = {}
-        
-        # 1. Weather risks - search for current weather alerts and forecasts for the specific venue area
-        weather_query = f"current weather alerts warnings {venue_name} {venue_location} {time_period} monsoon rain flood heat wave"
-        print(f"Searching for weather risks: {weather_query}")
-        weather_results = search.run(weather_query)
-        
-        # 2. Political/security risks - search for recent incidents, protests, or security issues near the venue
-        security_query = f"recent incidents protests security issues crime {venue_name} {venue_location} last week month"
-        print(f"Searching for security risks: {security_query}")
-        security_results = search.run(security_query)
-        
-        # 3. Health risks - search for health alerts, disease outbreaks, or health-related issues in the venue area
-        health_query = f"health alerts disease outbreak COVID dengue health issues {venue_name} {venue_location} current"
-        print(f"Searching for health risks: {health_query}")
-        health_results = search.run(health_query)
-        
-        # 4. Logistical risks - search for traffic, construction, road closures, or infrastructure issues affecting the venue
-        logistics_query = f"traffic construction road closure infrastructure issues parking {venue_name} {venue_location} current"
-        print(f"Searching for logistical risks: {logistics_query}")
-        logistics_results = search.run(logistics_query)
-        
-        # 5. Event conflicts - search for conflicting events, VIP movements, or major events near the venue
-        events_query = f"upcoming events VIP movement Prime Minister rally concert festival {venue_name} {venue_location} {time_period}"
-        print(f"Searching for event conflicts: {events_query}")
-        events_results = search.run(events_query)
-        
-        print(f"Completed targeted searches for {venue_name}")
-        
-        # Create comprehensive venue-specific risk analysis prompt
-        risk_analysis_prompt = f"""
+# --- Concurrent search fan-out ---
+def search_tasks(search, queries: List[str], categories: List[str]) -> List[asyncio.Future]:
+    """Start the searches as tasks sharing one semaphore; callers can await each result separately."""
+    semaphore = asyncio.Semaphore(max(1, RISK_SEARCH_CONCURRENCY))
+
+    async def run(query, category):
+        async with semaphore:
+            return await search.arun(query, category)
+
+    return [asyncio.ensure_future(run(query, category)) for query, category in zip(queries, categories)]
+
+async def arun_searches(search, queries: List[str], categories: List[str]) -> List[str]:
+    """Run search queries concurrently, bounded by a semaphore. Results are in query order.
+
+    categories[i] is the search-cache category (and so the expiry) of queries[i].
+    """
+    return list(await asyncio.gather(*search_tasks(search, queries, categories)))
+
+# --- Venue-specific risk prompts ---
+def _venue_risk_prompt(venue_name, venue_location, results: Dict[str, str]):
+    return f"""
         You are an Event Risk Assessment AI specializing in venue-specific risk analysis. Analyze the following targeted search results and create a detailed, venue-specific risk assessment for: {venue_name} in {venue_location}.
 
         **VENUE-SPECIFIC SEARCH RESULTS:**
 
         **Weather & Environmental Risks:**
-        {weather_results}
+        {results['weather']}
 
         **Security & Political Risks:**
-        {security_results}
+        {results['security']}
 
         **Health & Safety Risks:**
-        {health_results}
+        {results['health']}
 
         **Logistical & Infrastructure Risks:**
-        {logistics_results}
+        {results['logistics']}
 
         **Event Conflicts & VIP Movements:**
-        {events_results}
+        {results['events']}
 
         **INSTRUCTIONS:**
         - Your response MUST ONLY include venue-specific risk assessment and actionable recommendations. Do NOT include any generic city safety information, unrelated venues, or process/instructional/meta text (such as general advice, how to request a risk assessment, or what you are about to do).
@@ -118,17 +114,13 @@ def assess_venue_risks_directly(llm, venue_info: Dict, time_period=""):
 
         **Venue-Specific Recommendations:**
         [Actionable recommendations based on the actual risks found]
-        """
-        
-        # Get venue-specific risk analysis from LLM
-        risk_analysis = llm.invoke(risk_analysis_prompt)
-        risk_report = risk_analysis.content if hasattr(risk_analysis, 'content') else str(risk_analysis)
-        
-        return risk_report
-        
-    except Exception as e:
-        print(f"Error in venue-specific risk assessment for {venue_name}: {str(e)}")
-        return f"""## Risk Assessment: {venue_name}, {venue_location}
+
+        {RISK_SCORES_INSTRUCTIONS}
+    """
+
+def _venue_risk_error_report(venue_name, venue_location, e):
+    print(f"Error in venue-specific risk assessment for {venue_name}: {str(e)}")
+    return f"""## Risk Assessment: {venue_name}, {venue_location}
 
 **Error in Risk Assessment:**
 I encountered an error while conducting venue-specific risk assessment: {str(e)}
@@ -142,13 +134,83 @@ Please consult local authorities, venue management, or recent news sources for c
 - Monitor local weather services for venue-specific alerts
 - Review recent news coverage of the venue area"""
 
+# --- Risk report cache helpers ---
+async def _acached_venue_report(venue_name, venue_location, time_period):
+    cache = get_risk_report_cache()
+    if cache is None:
+        return None
+    try:
+        entry = await cache.aget("venue", venue_name, venue_location, time_period)
+    except Exception as e:
+        print(f"Risk report cache read failed: {e}")
+        return None
+    if entry is not None:
+        print(f"Serving cached risk assessment for {venue_name}")
+        return entry["markdown"]
+    return None
+
+async def _astore_venue_report(venue_name, venue_location, time_period, risk_report):
+    cache = get_risk_report_cache()
+    if cache is None:
+        return
+    try:
+        await cache.aset("venue", venue_name, venue_location, time_period, {"markdown": risk_report})
+    except Exception as e:
+        print(f"Risk report cache write failed: {e}")
+
+# --- Direct risk assessment function for individual venues ---
+async def aassess_venue_risks_directly(llm, venue_info: Dict, time_period=""):
+    """Assess risks for a specific venue with targeted, venue-specific searches."""
+    venue_name = venue_info.get('name', 'Unknown Venue')
+    venue_location = venue_info.get('location', 'Unknown')
+    cached = await _acached_venue_report(venue_name, venue_location, time_period)
+    if cached is not None:
+        return cached
+    search = get_cached_search()
+    
+    try:
+        print(f"Starting venue-specific risk assessment for {venue_name}")
+        plan = plan_risk_searches([venue_info], time_period, await asyncio.to_thread(_baseline_results, [venue_info]))
+        for category, query in zip(plan.categories, plan.queries):
+            print(f"Searching for {category} risks: {query}")
+        results = plan.venue_results(await arun_searches(search, plan.queries, plan.categories))[0]
+        print(f"Completed targeted searches for {venue_name}")
+        
+        risk_analysis = await llm.ainvoke(_venue_risk_prompt(venue_name, venue_location, results), config={"run_name": "venue_risk_report"})
+        risk_report = risk_analysis.content if hasattr(risk_analysis, 'content') else str(risk_analysis)
+        await _astore_venue_report(venue_name, venue_location, time_period, risk_report)
+        return risk_report
+        
+    except Exception as e:
+        return _venue_risk_error_report(venue_name, venue_location, e)
+
 # --- Calculate venue risk score ---
+def _default_venue_score():
+    return {
+        'average_score': 5.0,  # Default medium risk
+        'risk_level': "Medium",
+        'individual_scores': [5, 5, 5, 5, 5]
+    }
+
 def calculate_venue_score(risk_report: str) -> Dict:
-    """Extract risk scores from risk report and calculate overall venue score."""
+    """Extract risk scores from a single-venue risk report and calculate the overall venue score.
+
+    Uses the report's structured risk-scores block when present and falls back to "N/10" markers.
+    """
     try:
+        markdown, venue_scores = extract_risk_scores(risk_report)
+        if venue_scores and venue_scores[0]["scores"]:
+            best = rank_venues(venue_scores[:1])[0]
+            return {
+                'average_score': best['overall_score'],
+                'risk_level': best['risk_level'],
+                'individual_scores': list(best['scores'].values()),
+                'category_scores': best['scores']
+            }
+
         # Look for risk scores in the report
         score_pattern = r'(\d+)/10'
-        scores = re.findall(score_pattern, risk_report)
+        scores = re.findall(score_pattern, markdown)
         
         if scores:
             # Convert to integers and calculate average
@@ -169,36 +231,87 @@ def calculate_venue_score(risk_report: str) -> Dict:
                 'individual_scores': risk_scores
             }
         else:
-            return {
-                'average_score': 5.0,  # Default medium risk
-                'risk_level': "Medium",
-                'individual_scores': [5, 5, 5, 5, 5]
-            }
+            return _default_venue_score()
     except Exception as e:
         print(f"Error calculating venue score: {e}")
-        return {
-            'average_score': 5.0,
-            'risk_level': "Medium",
-            'individual_scores': [5, 5, 5, 5, 5]
-        }
+        return _default_venue_score()
 
-# --- Direct risk assessment function ---
-def assess_risks_directly(llm, location, time_period=""):
-    """Direct risk assessment without using agent framework to avoid Gemini API issues."""
-    
-    # Create search wrapper
-    search = GoogleSerperAPIWrapper()
-    
+# --- Precomputed city risk baselines ---
+def baseline_city(location: str) -> str:
+    """City whose baseline covers a location ("Bandra, Mumbai" -> "Mumbai")."""
+    place = get_gazetteer().find(location)
+    if place is None:
+        return location
+    return place.parent or place.name
+
+def get_risk_baseline(location: str):
+    """Fresh precomputed baseline for the location's city, or None."""
+    store = get_risk_baseline_store()
+    if store is None or location in ("", "Unknown"):
+        return None
     try:
-        # Make comprehensive search for risks
-        search_query = f"weather political health security logistical risks events {location} {time_period}"
-        print(f"Searching for risks with query: {search_query}")
-        
-        search_results = search.run(search_query)
-        print(f"Search completed, results length: {len(search_results)}")
-        
-        # Create prompt for risk analysis
-        risk_analysis_prompt = f"""
+        return store.get(baseline_city(location))
+    except Exception as e:
+        print(f"Risk baseline read failed: {e}")
+        return None
+
+def _baseline_age_hours(baseline) -> float:
+    return (time.time() - baseline["created_at"]) / 3600
+
+def _baseline_results(venues_info: List[Dict]) -> Dict[str, Dict[str, str]]:
+    """Location-scoped search results replaced by city baselines, keyed by location_key(location)."""
+    results = {}
+    for venue in venues_info:
+        venue_location = venue.get('location', 'Unknown')
+        key = location_key(venue_location)
+        if key in results:
+            continue
+        baseline = get_risk_baseline(venue_location)
+        if baseline is None:
+            continue
+        summary = " ".join(baseline["report"].split())[:RISK_BASELINE_CONTEXT_CHARS]
+        scores = ", ".join(f"{category} {score:g}/10" for category, score in baseline["scores"].items())
+        context = (f"Precomputed {baseline['location']} city risk baseline, {_baseline_age_hours(baseline):.0f}h old"
+                   f"{f' (scores: {scores})' if scores else ''}: {summary}")
+        covered = f"Covered by the {baseline['location']} city risk baseline given under Weather."
+        results[key] = {category: context if i == 0 else covered for i, category in enumerate(LOCATION_SCOPED_CATEGORIES)}
+        print(f"Using precomputed risk baseline for {baseline['location']}")
+    return results
+
+def _baseline_prompt(location, search_results):
+    return _direct_risk_prompt(location, search_results) + f"""
+        {RISK_SCORES_INSTRUCTIONS}
+        Use "{location}" as the venue name.
+        """
+
+def compute_risk_baseline(llm, location: str) -> Dict:
+    """Compute and store the baseline risk report and category scores for a city."""
+    search = get_cached_search()
+    search_results = search.run(_direct_risk_query(location), category="location")
+    result = llm.invoke(_baseline_prompt(location, search_results), config={"run_name": "risk_baseline"})
+    report, venue_scores = extract_risk_scores(result.content if hasattr(result, 'content') else str(result))
+    scores = venue_scores[0]["scores"] if venue_scores else {}
+    store = get_risk_baseline_store()
+    entry = {"location": location, "report": report, "scores": scores, "created_at": time.time()}
+    return store.set(location, report, scores) if store is not None else entry
+
+def _serve_baseline(location):
+    """Report for a generic city assessment from a fresh baseline, or None."""
+    # Only exact city requests; a locality gets a live, more specific assessment
+    if baseline_city(location) != location:
+        return None
+    baseline = get_risk_baseline(location)
+    if baseline is None:
+        return None
+    print(f"Serving precomputed risk baseline for {location}")
+    return f"{baseline['report']}\n\n_Baseline risk assessment for {baseline['location']}, updated {_baseline_age_hours(baseline):.0f}h ago._"
+
+# --- Direct risk assessment function ---
+def _direct_risk_query(location, time_period=""):
+    return f"weather political health security logistical risks events {location} {time_period}"
+
+def _direct_risk_prompt(location, search_results):
+    return f"""
         You are an Event Risk Assessment AI. Analyze the following web search results and create a comprehensive risk assessment for an event in {location}.
 
         Web Search Results:
@@ -219,19 +332,75 @@ def assess_risks_directly(llm, location, time_period=""):
         If no specific risks are found for a category, state that explicitly.
         Format your response in clear Markdown with proper headers and bullet points.
         """
+
+def _direct_risk_error_report(location, e):
+    print(f"Error in direct risk assessment: {str(e)}")
+    return f"## Event Risk Assessment for {location}\n\nI encountered an error while assessing risks: {str(e)}\n\nPlease consult local authorities for current risk information."
+
+async def aassess_risks_directly(llm, location, time_period=""):
+    """Direct risk assessment without using agent framework to avoid Gemini API issues.
+
+    Served from a fresh precomputed city baseline when there is one.
+    """
+    baseline_report = await asyncio.to_thread(_serve_baseline, location)
+    if baseline_report is not None:
+        return baseline_report
+    search = get_cached_search()
+    
+    try:
+        search_query = _direct_risk_query(location, time_period)
+        print(f"Searching for risks with query: {search_query}")
         
-        # Get risk analysis from LLM
-        risk_analysis = llm.invoke(risk_analysis_prompt)
-        risk_report = risk_analysis.content if hasattr(risk_analysis, 'content') else str(risk_analysis)
+        search_results = await search.arun(search_query, category="location")
+        print(f"Search completed, results length: {len(search_results)}")
         
-        return risk_report
+        risk_analysis = await llm.ainvoke(_direct_risk_prompt(location, search_results), config={"run_name": "location_risk_report"})
+        return risk_analysis.content if hasattr(risk_analysis, 'content') else str(risk_analysis)
         
     except Exception as e:
-        print(f"Error in direct risk assessment: {str(e)}")
-        return f"## Event Risk Assessment for {location}\n\nI encountered an error while assessing risks: {str(e)}\n\nPlease consult local authorities for current risk information."
+        return _direct_risk_error_report(location, e)
+
+# --- Location and time extraction ---
+def extract_location_and_time(input_text: str):
+    """Extract a place and a time period from free text. Location is "Unknown" if no place matches.
+
+    The time period is the absolute date range the text refers to, e.g. "24-25 October 2026"
+    for "next weekend", or "" if none is mentioned.
+    """
+    # Indian cities, towns, localities and regions from the gazetteer ("Bandra, Mumbai" for localities)
+    place = get_gazetteer().find(input_text)
+    location = place.label if place else "Unknown"
+    
+    period = parse_time_expression(input_text)
+    time_period = period.label if period else ""
+    
+    return location, time_period
+
+def _risk_node_result(state, input_text, chat_history, risk_report):
+    # Update chat history with the interaction
+    updated_chat_history = chat_history + [
+        HumanMessage(content=input_text),
+        HumanMessage(content=risk_report)
+    ]
+    return {
+        **state,
+        "risk_report": risk_report,
+        "chat_history": updated_chat_history
+    }
+
+def _risk_node_error(state, chat_history, e):
+    print(f"Error in event risk assessment node: {str(e)}")
+    error_report = f"## Event Risk Assessment\n\nI apologize, but I encountered an error while assessing event risk: {str(e)}"
+    return {
+        **state,
+        "risk_report": error_report,
+        "chat_history": chat_history
+    }
+
+_UNKNOWN_LOCATION_REPORT = "## Event Risk Assessment\n\nUnable to determine the location from your query. Please specify the city/location for a proper risk assessment."
 
 # --- LangGraph node function ---
-def event_risk_assessment_node(state: dict) -> dict:
+async def aevent_risk_assessment_node(state: dict) -> dict:
     """LangGraph node for event risk assessment using direct web search approach."""
     if "llm" not in state:
         raise ValueError("LLM not found in state! State keys: " + str(list(state.keys())))
@@ -243,98 +412,310 @@ def event_risk_assessment_node(state: dict) -> dict:
     print(f"Starting direct risk assessment for: {input_text}")
     
     try:
-        # Extract location and time from input
-        # Simple extraction - look for common patterns
-        import re
-        
-        # Common Indian cities
-        cities = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad", "Jaipur", "Lucknow"]
-        location = "Unknown"
-        
-        for city in cities:
-            if city.lower() in input_text.lower():
-                location = city
-                break
-        
-        # Extract time period if mentioned
-        time_period = ""
-        time_patterns = ["next week", "this week", "next month", "tomorrow", "today"]
-        for pattern in time_patterns:
-            if pattern in input_text.lower():
-                time_period = pattern
-                break
-        
+        location, time_period = extract_location_and_time(input_text)
         print(f"Extracted location: {location}, time period: {time_period}")
         
         if location == "Unknown":
-            risk_report = "## Event Risk Assessment\n\nUnable to determine the location from your query. Please specify the city/location for a proper risk assessment."
+            risk_report = _UNKNOWN_LOCATION_REPORT
         else:
-            # Perform direct risk assessment
-            risk_report = assess_risks_directly(llm, location, time_period)
+            risk_report = await aassess_risks_directly(llm, location, time_period)
         
-        # Update chat history with the interaction
-        updated_chat_history = chat_history + [
-            HumanMessage(content=input_text),
-            HumanMessage(content=risk_report)
-        ]
-        
-        return {
-            **state,
-            "risk_report": risk_report,
-            "chat_history": updated_chat_history
-        }
+        return _risk_node_result(state, input_text, chat_history, risk_report)
         
     except Exception as e:
-        print(f"Error in event risk assessment node: {str(e)}")
-        error_report = f"## Event Risk Assessment\n\nI apologize, but I encountered an error while assessing event risk: {str(e)}"
-        
-        return {
-            **state,
-            "risk_report": error_report,
-            "chat_history": chat_history
-        } 
+        return _risk_node_error(state, chat_history, e)
 
-def batch_assess_venue_risks(llm, venues_info: List[Dict], time_period=""):
-    """Batch risk assessment for multiple venues in a single LLM call."""
-    search = GoogleSerperAPIWrapper()
+# --- Batch risk assessment ---
+_BATCH_PROMPT_HEADER = "You are an Event Risk Assessment AI. For each venue below, analyze the search results and provide a risk assessment and risk score (1-10):\n\n"
+_BATCH_PROMPT_INSTRUCTIONS = (
+    "Start each venue's section with a heading in exactly this form: ### Venue <number>: <venue name>\n"
+    "For each venue, provide:\n"
+    "- A risk assessment by category\n"
+    "- An overall risk score (1-10)\n"
+    "- A summary and recommendations\n"
+    "- Your response MUST ONLY include venue-specific risk assessment and actionable recommendations. Do NOT include any generic city safety information, unrelated venues, or process/instructional/meta text (such as general advice, how to request a risk assessment, or what you are about to do).\n"
+    "- ONLY present the risk assessment and actionable recommendations for the venue requested.\n"
+    "- Do NOT mention other venues, or provide general safety advice for the city or region.\n"
+    "- Do NOT include any statements about your process or what you are about to do.\n"
+    + RISK_SCORES_INSTRUCTIONS
+)
+
+def _venue_block(number: int, v: Dict) -> str:
+    return "\n".join([
+        f"Venue {number}: {v['name']} ({v['location']})",
+        f"Weather: {v['weather']}",
+        f"Security: {v['security']}",
+        f"Health: {v['health']}",
+        f"Logistics: {v['logistics']}",
+        f"Events: {v['events']}",
+    ]) + "\n\n"
+
+def _batch_risk_prompt(venue_blocks: List[str]) -> str:
+    return "".join([_BATCH_PROMPT_HEADER, *venue_blocks, _BATCH_PROMPT_INSTRUCTIONS])
+
+def chunk_venue_blocks(venue_blocks: List[str], token_budget: int = None) -> List[List[str]]:
+    """Greedily group venue blocks, in order, into chunks whose estimated size fits token_budget.
+
+    A block larger than the budget gets a chunk of its own.
+    """
+    token_budget = RISK_PROMPT_TOKEN_BUDGET if token_budget is None else token_budget
+    chunks, current, used = [], [], 0
+    for block in venue_blocks:
+        tokens = estimate_tokens(block)
+        if current and used + tokens > token_budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(block)
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _batch_risk_chunks(all_venue_data: List[Dict], numbers: List[int]) -> List[tuple]:
+    """Chunk the venues under the prompt budget. Returns [(venue indices, prompt)] in order.
+
+    Venues keep their position in the full batch as their number, so chunk reports
+    (and cached sections) merge into one consistently numbered report.
+    """
+    blocks = [_venue_block(number, v) for number, v in zip(numbers, all_venue_data)]
+    chunks, start = [], 0
+    for chunk in chunk_venue_blocks(blocks):
+        chunks.append((list(range(start, start + len(chunk))), _batch_risk_prompt(chunk)))
+        start += len(chunk)
+    if len(chunks) > 1:
+        print(f"Splitting risk report for {len(blocks)} venues into {len(chunks)} chunks")
+    return chunks
+
+def _batch_venue_data(venues_info: List[Dict], plan, results: List[str]) -> List[Dict]:
     all_venue_data = []
-    for venue in venues_info:
-        venue_name = venue.get('name', 'Unknown Venue')
-        venue_location = venue.get('location', 'Unknown')
-        # Do web searches as before
-        weather_results = search.run(f"current weather alerts warnings {venue_name} {venue_location} {time_period} monsoon rain flood heat wave")
-        security_results = search.run(f"recent incidents protests security issues crime {venue_name} {venue_location} last week month")
-        health_results = search.run(f"health alerts disease outbreak COVID dengue health issues {venue_name} {venue_location} current")
-        logistics_results = search.run(f"traffic construction road closure infrastructure issues parking {venue_name} {venue_location} current")
-        events_results = search.run(f"upcoming events VIP movement Prime Minister rally concert festival {venue_name} {venue_location} {time_period}")
+    for venue, venue_results in zip(venues_info, plan.venue_results(results)):
         all_venue_data.append({
-            "name": venue_name,
-            "location": venue_location,
-            "weather": weather_results,
-            "security": security_results,
-            "health": health_results,
-            "logistics": logistics_results,
-            "events": events_results
+            "name": venue.get('name', 'Unknown Venue'),
+            "location": venue.get('location', 'Unknown'),
+            **venue_results
         })
-    # Build a single prompt
-    prompt = "You are an Event Risk Assessment AI. For each venue below, analyze the search results and provide a risk assessment and risk score (1-10):\n\n"
-    for i, v in enumerate(all_venue_data, 1):
-        prompt += f"Venue {i}: {v['name']} ({v['location']})\n"
-        prompt += f"Weather: {v['weather']}\n"
-        prompt += f"Security: {v['security']}\n"
-        prompt += f"Health: {v['health']}\n"
-        prompt += f"Logistics: {v['logistics']}\n"
-        prompt += f"Events: {v['events']}\n\n"
-    prompt += (
-        "For each venue, provide:\n"
-        "- A risk assessment by category\n"
-        "- An overall risk score (1-10)\n"
-        "- A summary and recommendations\n"
-        "- Your response MUST ONLY include venue-specific risk assessment and actionable recommendations. Do NOT include any generic city safety information, unrelated venues, or process/instructional/meta text (such as general advice, how to request a risk assessment, or what you are about to do).\n"
-        "- ONLY present the risk assessment and actionable recommendations for the venue requested.\n"
-        "- Do NOT mention other venues, or provide general safety advice for the city or region.\n"
-        "- Do NOT include any statements about your process or what you are about to do.\n"
-    )
-    # Single LLM call
-    result = llm.invoke(prompt)
-    return result.content if hasattr(result, 'content') else str(result) 
\ No newline at end of file
+    return all_venue_data
+
+# --- Per-venue sections of batch reports ---
+_VENUE_HEADING = re.compile(r'^#{1,6}[ \t]*Venue[ \t]+(\d+)\b.*$', re.MULTILINE)
+
+def split_venue_sections(markdown: str) -> Dict[int, str]:
+    """Split a batch report on its "### Venue N: ..." headings into {N: section body}."""
+    matches = list(_VENUE_HEADING.finditer(markdown))
+    sections = {}
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following else len(markdown)
+        sections[int(match.group(1))] = markdown[match.end():end].strip()
+    return sections
+
+def _chunk_sections(report: str, numbered_venues: List[tuple]):
+    """Per-venue {number: {"markdown", "scores"}} for a chunk report, or None if it can't be split."""
+    markdown, venue_scores = extract_risk_scores(report)
+    sections = split_venue_sections(markdown)
+    if not all(number in sections for number, _ in numbered_venues):
+        return None
+    scores_by_name = {entry["venue"].strip().lower(): entry["scores"] for entry in venue_scores}
+    return {
+        number: {
+            "markdown": sections[number],
+            "scores": scores_by_name.get(venue.get('name', 'Unknown Venue').strip().lower(), {})
+        }
+        for number, venue in numbered_venues
+    }
+
+def _section_markdown(number: int, venue: Dict, section: Dict) -> str:
+    venue_name = venue.get('name', 'Unknown Venue')
+    text = f"### Venue {number}: {venue_name} ({venue.get('location', 'Unknown')})\n\n{section['markdown']}"
+    if section.get("scores"):
+        text += f"\n\n```{RISK_SCORES_FENCE}\n{json.dumps([{'venue': venue_name, 'scores': section['scores']}])}\n```"
+    return text
+
+async def _acached_batch_sections(venues_info: List[Dict], time_period) -> Dict[int, Dict]:
+    cache = get_risk_report_cache()
+    sections = {}
+    if cache is None:
+        return sections
+    for number, venue in enumerate(venues_info, 1):
+        try:
+            entry = await cache.aget("batch", venue.get('name', 'Unknown Venue'), venue.get('location', 'Unknown'), time_period)
+        except Exception as e:
+            print(f"Risk report cache read failed: {e}")
+            entry = None
+        if entry is not None:
+            sections[number] = entry
+    return sections
+
+async def _acollect_chunk_reports(venues_info: List[Dict], time_period, numbers: List[int], chunks, reports, sections):
+    """Add split chunk reports to sections and cache them. Returns [(number, report)] for chunks that
+    could not be split per venue; those are kept whole and not cached."""
+    cache = get_risk_report_cache()
+    unsplit = []
+    for (indices, _), report in zip(chunks, reports):
+        numbered_venues = [(numbers[i], venues_info[numbers[i] - 1]) for i in indices]
+        chunk_sections = _chunk_sections(report, numbered_venues)
+        if chunk_sections is None:
+            unsplit.append((numbered_venues[0][0], report.strip()))
+            continue
+        sections.update(chunk_sections)
+        if cache is None:
+            continue
+        for number, venue in numbered_venues:
+            try:
+                await cache.aset("batch", venue.get('name', 'Unknown Venue'), venue.get('location', 'Unknown'),
+                                 time_period, chunk_sections[number])
+            except Exception as e:
+                print(f"Risk report cache write failed: {e}")
+    return unsplit
+
+def _assemble_batch_report(venues_info: List[Dict], sections: Dict[int, Dict], unsplit) -> str:
+    parts = [(number, _section_markdown(number, venue, sections[number]))
+             for number, venue in enumerate(venues_info, 1) if number in sections]
+    return "\n\n".join(text for _, text in sorted(parts + unsplit, key=lambda part: part[0]))
+
+def _missing_venues(venues_info: List[Dict], sections: Dict[int, Dict]):
+    numbers = [number for number in range(1, len(venues_info) + 1) if number not in sections]
+    if sections:
+        print(f"Risk report cache: {len(sections)} of {len(venues_info)} venues served from cache")
+    return numbers, [venues_info[number - 1] for number in numbers]
+
+async def _awrite_chunks(llm, chunks, emit=None) -> List[str]:
+    """Write chunk reports concurrently; the first streams live and later ones are sent in order as they finish."""
+    semaphore = asyncio.Semaphore(max(1, RISK_REPORT_CONCURRENCY))
+
+    async def write(prompt, chunk_emit):
+        async with semaphore:
+            return await astream_llm_text(llm, prompt, chunk_emit, run_name="batch_risk_report")
+
+    tasks = [asyncio.ensure_future(write(prompt, emit if i == 0 else None)) for i, (_, prompt) in enumerate(chunks)]
+    try:
+        reports = [await tasks[0]]
+        for task in tasks[1:]:
+            reports.append(await task)
+            await emit_event(emit, "token", text="\n\n" + reports[-1].strip())
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return reports
+
+async def abatch_assess_venue_risks(llm, venues_info: List[Dict], time_period="", emit=None):
+    """Batch risk assessment for multiple venues. Recently assessed venues are served from the risk
+    report cache; for the rest all searches run concurrently and the report is written in
+    token-budgeted chunks, run in parallel and merged in venue order.
+
+    Report tokens and per-venue stages are sent to emit, if given: cached venue sections first,
+    then the newly written report as it streams.
+    """
+    sections = await _acached_batch_sections(venues_info, time_period)
+    numbers, missing = _missing_venues(venues_info, sections)
+    for number, venue in enumerate(venues_info, 1):
+        venue_name = venue.get('name', 'Unknown Venue')
+        if number in sections:
+            await emit_stage(emit, "assessing_risk", f"Using recent risk assessment for {venue_name}", venue=venue_name, cached=True)
+        else:
+            await emit_stage(emit, "assessing_risk", f"Assessing risk for {venue_name}", venue=venue_name)
+    if sections:
+        await emit_event(emit, "token", text=_assemble_batch_report(venues_info, sections, []) + ("\n\n" if missing else ""))
+    unsplit = []
+    if missing:
+        search = get_cached_search()
+        plan = plan_risk_searches(missing, time_period, await asyncio.to_thread(_baseline_results, missing))
+        print(f"Running {len(plan)} risk searches for {len(missing)} venues")
+        all_venue_data = _batch_venue_data(missing, plan, await arun_searches(search, plan.queries, plan.categories))
+        await emit_stage(emit, "writing_risk_report", "Writing risk report")
+        chunks = _batch_risk_chunks(all_venue_data, numbers)
+        reports = await _awrite_chunks(llm, chunks, emit)
+        unsplit = await _acollect_chunk_reports(venues_info, time_period, numbers, chunks, reports, sections)
+    return _assemble_batch_report(venues_info, sections, unsplit)
+
+def batch_assess_venue_risks(llm, venues_info: List[Dict], time_period=""):
+    """Blocking wrapper around abatch_assess_venue_risks for scripts; not for use inside an event loop."""
+    return asyncio.run(abatch_assess_venue_risks(llm, venues_info, time_period))
+
+# --- Per-venue streaming risk assessment ---
+def _venue_assessment(number: int, venue: Dict, section: Dict, cached: bool, error=None) -> Dict:
+    return {
+        "number": number,
+        "venue": venue.get('name', 'Unknown Venue'),
+        "location": venue.get('location', 'Unknown'),
+        "markdown": extract_risk_scores(_section_markdown(number, venue, section))[0],
+        "scores": section.get("scores", {}),
+        "section": section,
+        "cached": cached,
+        "error": error
+    }
+
+def _venue_error_assessment(number: int, venue: Dict, e: Exception) -> Dict:
+    print(f"Error in streamed risk assessment for {venue.get('name', 'Unknown Venue')}: {str(e)}")
+    section = {
+        "markdown": f"**Error in Risk Assessment:**\nI encountered an error while assessing this venue: {str(e)}\n\n"
+                    "Please consult local authorities, venue management, or recent news sources for current risk information.",
+        "scores": {}
+    }
+    return _venue_assessment(number, venue, section, cached=False, error=str(e))
+
+async def astream_venue_risk_assessments(llm, venues_info: List[Dict], time_period=""):
+    """Yield each venue's risk assessment as soon as it is ready, in completion order.
+
+    Cached venues come first. Each remaining venue waits only for its own searches (location-scoped
+    searches are still shared) and gets its own LLM call, so the first report arrives long before a
+    whole batch would. Items are dicts with number, venue, location, markdown, scores, section, cached
+    and error. A venue whose searches or report fail is yielded with an error placeholder section and
+    error set to the message; the other venues keep streaming.
+    """
+    sections = await _acached_batch_sections(venues_info, time_period)
+    for number in sorted(sections):
+        yield _venue_assessment(number, venues_info[number - 1], sections[number], cached=True)
+    numbers, missing = _missing_venues(venues_info, sections)
+    if not missing:
+        return
+
+    plan = plan_risk_searches(missing, time_period, await asyncio.to_thread(_baseline_results, missing))
+    print(f"Running {len(plan)} risk searches for {len(missing)} venues")
+    searches = search_tasks(get_cached_search(), plan.queries, plan.categories)
+    llm_semaphore = asyncio.Semaphore(max(1, RISK_REPORT_CONCURRENCY))
+    cache = get_risk_report_cache()
+
+    async def assess_venue(number, venue, i):
+        results = {**plan.known[i], **{category: await searches[index] for category, index in plan.assignments[i].items()}}
+        venue_data = {"name": venue.get('name', 'Unknown Venue'), "location": venue.get('location', 'Unknown'), **results}
+        async with llm_semaphore:
+            report = await astream_llm_text(llm, _batch_risk_prompt([_venue_block(number, venue_data)]), run_name="batch_risk_report")
+        chunk_sections = _chunk_sections(report, [(number, venue)])
+        if chunk_sections is None:
+            # No usable heading: keep the whole report as the section, uncached
+            markdown, venue_scores = extract_risk_scores(report)
+            return _venue_assessment(number, venue, {"markdown": markdown, "scores": venue_scores[0]["scores"] if venue_scores else {}}, cached=False)
+        if cache is not None:
+            try:
+                await cache.aset("batch", venue_data["name"], venue_data["location"], time_period, chunk_sections[number])
+            except Exception as e:
+                print(f"Risk report cache write failed: {e}")
+        return _venue_assessment(number, venue, chunk_sections[number], cached=False)
+
+    async def assess(i):
+        number, venue = numbers[i], missing[i]
+        try:
+            return await assess_venue(number, venue, i)
+        except Exception as e:
+            return _venue_error_assessment(number, venue, e)
+
+    tasks = [asyncio.ensure_future(assess(i)) for i in range(len(missing))]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks + searches:
+            task.cancel()
+
+async def aassess_venue_risks_incrementally(llm, venues_info: List[Dict], time_period="", emit=None) -> str:
+    """Run astream_venue_risk_assessments, sending each assessment to emit as a venue_risk event.
+    Returns the combined report in venue order, like abatch_assess_venue_risks."""
+    for venue in venues_info:
+        venue_name = venue.get('name', 'Unknown Venue')
+        await emit_stage(emit, "assessing_risk", f"Assessing risk for {venue_name}", venue=venue_name)
+    sections = {}
+    async for assessment in astream_venue_risk_assessments(llm, venues_info, time_period):
+        sections[assessment["number"]] = assessment["section"]
+        await emit_event(emit, "venue_risk", **{key: value for key, value in assessment.items() if key != "section"})
+    return _assemble_batch_report(venues_info, sections, [])
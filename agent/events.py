@@ -0,0 +1,43 @@
+"""
+Progress events for streaming responses.
+
+Async graph functions accept an optional ``emit`` coroutine function with the
+signature ``emit(event: str, data: dict)``. It is threaded through the graph
+state under the ``"emit"`` key and is ``None`` for non-streaming requests.
+
+Events:
+- ``stage``: a pipeline milestone, e.g. ``{"stage": "searching_venues", "message": "..."}``
+- ``token``: a chunk of user-facing LLM output, ``{"text": "..."}``
+- ``venue_risk``: one venue's completed risk assessment, sent as soon as it is ready (completion order),
+  ``{"number": 2, "venue": "...", "location": "...", "markdown": "...", "scores": {...}, "cached": false, "error": null}``.
+  ``error`` is the failure message when that venue could not be assessed; its markdown is then a placeholder
+- ``risk_scores``: ranked per-venue, per-category risk scores after a batch risk report,
+  ``{"venues": [{"rank": 1, "venue": "...", "overall_score": 2.4, "risk_level": "Low", "scores": {...}}]}``.
+  The fenced ``risk-scores`` block it is parsed from may also arrive in the preceding tokens.
+"""
+
+
+async def emit_event(emit, event: str, **data):
+    """Send an event if an emitter is attached; no-op otherwise."""
+    if emit is not None:
+        await emit(event, data)
+
+
+async def emit_stage(emit, stage: str, message: str, **data):
+    await emit_event(emit, "stage", stage=stage, message=message, **data)
+
+
+async def astream_llm_text(llm, prompt, emit=None, run_name=None) -> str:
+    """Run an LLM call, forwarding tokens to ``emit`` as they arrive. Returns the full text."""
+    config = {"run_name": run_name} if run_name else None
+    if emit is None:
+        result = await llm.ainvoke(prompt, config=config)
+        return result.content if hasattr(result, 'content') else str(result)
+
+    parts = []
+    async for chunk in llm.astream(prompt, config=config):
+        text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+        if text:
+            parts.append(text)
+            await emit_event(emit, "token", text=text)
+    return "".join(parts)
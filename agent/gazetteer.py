@@ -0,0 +1,174 @@
+"""
+Gazetteer of Indian places for location extraction.
+
+Places come from two tab-separated files in agent/data: india_places.tsv, the
+GeoNames populated places (regenerate with scripts/build_gazetteer.py), and
+india_localities.tsv, a curated list of city localities and regions. All names
+and aliases are compiled into one Aho-Corasick automaton, so a lookup is a
+single pass over the input text. It takes microseconds, however many places
+are loaded.
+"""
+import os
+import re
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+PLACES_PATH = os.path.join(DATA_DIR, "india_places.tsv")
+LOCALITIES_PATH = os.path.join(DATA_DIR, "india_localities.tsv")
+
+
+def normalize_place_text(text: str, keep_case: bool = False) -> str:
+    """ASCII-fold, replace punctuation with spaces and collapse whitespace ("Mahābaleshwar" -> "mahabaleshwar")."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = " ".join(re.sub(r"[^0-9A-Za-z]+", " ", text).split())
+    return text if keep_case else text.lower()
+
+
+class Place(NamedTuple):
+    name: str
+    latitude: float
+    longitude: float
+    population: int = 0
+    kind: str = "place"  # place, locality or region
+    parent: str = ""
+
+    @property
+    def label(self) -> str:
+        """Name used in search queries, with the parent city for localities ("Bandra, Mumbai")."""
+        return f"{self.name}, {self.parent}" if self.parent else self.name
+
+
+class AhoCorasick:
+    """Multi-pattern matcher over normalized text. Patterns match whole words only."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[Tuple[int, object]]] = [None]  # (pattern length, value) ending at node
+        self._dict_link: List[int] = [0]  # nearest node on the fail chain with an output
+        self._built = False
+
+    def add(self, pattern: str, value) -> None:
+        # Padding with spaces makes matches respect word boundaries in padded text
+        pattern = f" {pattern} "
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._dict_link.append(0)
+            node = nxt
+        if self._output[node] is None:
+            self._output[node] = (len(pattern), value)
+        self._built = False
+
+    def build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._dict_link[child] = target if self._output[target] is not None else self._dict_link[target]
+        self._built = True
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, value) for every pattern occurrence in normalized text, by end position."""
+        if not self._built:
+            self.build()
+        padded = f" {text} "
+        goto, fail, output, dict_link = self._goto, self._fail, self._output, self._dict_link
+        node = 0
+        for i, char in enumerate(padded):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            hit = node if output[node] is not None else dict_link[node]
+            while hit:
+                length, value = output[hit]
+                # Offsets into the unpadded text, excluding the boundary spaces
+                yield i + 1 - length, i - 1, value
+                hit = dict_link[hit]
+
+
+class Gazetteer:
+    def __init__(self, places: List[Tuple[Place, List[str]]]):
+        self.size = len(places)
+        self._matcher = AhoCorasick()
+        best: Dict[str, Place] = {}
+        for place, names in places:
+            for name in names:
+                key = normalize_place_text(name)
+                current = best.get(key)
+                # A name shared by several places goes to the curated entry, else the most populous
+                if key and (current is None or _priority(place) > _priority(current)):
+                    best[key] = place
+        for key, place in best.items():
+            self._matcher.add(key, place)
+        self._matcher.build()
+
+    @classmethod
+    def from_files(cls, places_path: str = PLACES_PATH, localities_path: str = LOCALITIES_PATH) -> "Gazetteer":
+        places = []
+        for path in (places_path, localities_path):
+            if os.path.exists(path):
+                places.extend(_read_places(path, curated=path == localities_path))
+        return cls(places)
+
+    def find_all(self, text: str) -> List[Place]:
+        """Places mentioned in text, in order. Names inside a longer match ("Delhi" in "New Delhi") are dropped."""
+        matches = sorted(self._matcher.iter_matches(normalize_place_text(text)), key=lambda m: (m[0], -m[1]))
+        places, last_end = [], -1
+        for start, end, place in matches:
+            if start > last_end:
+                places.append(place)
+                last_end = end
+        return places
+
+    def find(self, text: str) -> Optional[Place]:
+        """The most specific place in text: the first locality or region if any, else the first place."""
+        places = self.find_all(text)
+        for place in places:
+            if place.kind != "place":
+                return place
+        return places[0] if places else None
+
+
+def _priority(place: Place):
+    return (place.kind != "place", place.population)
+
+
+def _read_places(path: str, curated: bool) -> List[Tuple[Place, List[str]]]:
+    places = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            if curated:
+                name, parent, latitude, longitude, kind, aliases = (fields + [""] * 6)[:6]
+                place = Place(name, float(latitude), float(longitude), 0, kind or "locality", parent)
+            else:
+                name, latitude, longitude, population, aliases = (fields + [""] * 5)[:5]
+                place = Place(name, float(latitude), float(longitude), int(population or 0))
+            places.append((place, [name] + [a for a in aliases.split("|") if a]))
+    return places
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer() -> Gazetteer:
+    """Process-wide gazetteer, built on first use."""
+    gazetteer = Gazetteer.from_files()
+    print(f"Loaded gazetteer with {gazetteer.size} places")
+    return gazetteer
@@ -0,0 +1,172 @@
+"""
+Chat history compaction for LLM prompts.
+
+Nodes used to put the whole chat history into every prompt, so prompt size grew
+linearly with conversation length. compact_history() keeps the most recent
+messages verbatim, folds older ones into a short extractive summary (cached, no
+LLM call) and drops internal bookkeeping messages such as VENUES_STORED, all
+within a token budget. Savings are recorded per node in HISTORY_STATS.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from langchain_core.messages import BaseMessage, SystemMessage
+
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "1500"))
+HISTORY_KEEP_RECENT_MESSAGES = int(os.getenv("HISTORY_KEEP_RECENT_MESSAGES", "6"))
+
+# Prefixes of messages that are stored in the history for bookkeeping and never shown to the LLM
+INTERNAL_MESSAGE_PREFIXES = ("VENUES_STORED:",)
+
+# Characters kept per message when folding it into the summary
+_SUMMARY_LINE_CHARS = 160
+_SUMMARY_CACHE_SIZE = 512
+
+# node name -> {"calls": int, "original_tokens": int, "compacted_tokens": int}
+HISTORY_STATS: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+# sha1 of the summarized messages -> summary; shared by request handlers and worker threads
+_summary_cache: "OrderedDict[str, str]" = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token), good enough for budgeting."""
+    return (len(text) + 3) // 4
+
+
+def is_internal_message(message) -> bool:
+    content = getattr(message, "content", "")
+    return isinstance(content, str) and content.startswith(INTERNAL_MESSAGE_PREFIXES)
+
+
+def _role(message) -> str:
+    return {"human": "User", "ai": "Assistant", "system": "System"}.get(getattr(message, "type", ""), "Message")
+
+
+def _message_text(message) -> str:
+    content = getattr(message, "content", message)
+    return content if isinstance(content, str) else str(content)
+
+
+@dataclass
+class CompactedHistory:
+    summary: str = ""
+    messages: List[BaseMessage] = field(default_factory=list)
+    original_tokens: int = 0
+    compacted_tokens: int = 0
+
+    def as_text(self) -> str:
+        """Render for string prompts."""
+        lines = []
+        if self.summary:
+            lines.append(f"Summary of earlier conversation:\n{self.summary}")
+        lines.extend(f"{_role(m)}: {_message_text(m)}" for m in self.messages)
+        return "\n".join(lines) if lines else "(no previous messages)"
+
+    def as_messages(self) -> List[BaseMessage]:
+        """Render for chat prompts / agent memory."""
+        if not self.summary:
+            return list(self.messages)
+        return [SystemMessage(content=f"Summary of earlier conversation:\n{self.summary}")] + list(self.messages)
+
+
+def _summary_line(message) -> str:
+    text = re.sub(r"\s+", " ", _message_text(message)).strip()
+    if len(text) > _SUMMARY_LINE_CHARS:
+        text = text[:_SUMMARY_LINE_CHARS].rsplit(" ", 1)[0] + " ..."
+    return f"- {_role(message)}: {text}"
+
+
+def _summary_key(messages: List[BaseMessage], token_budget: int) -> str:
+    """Stable digest of the messages and budget (hash() of strings is salted per process and can collide)."""
+    payload = json.dumps([token_budget, [[getattr(m, "type", ""), _message_text(m)] for m in messages]])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def summarize_messages(messages: List[BaseMessage], token_budget: int) -> str:
+    """Fold messages into one line each, keeping the newest lines that fit the budget. Results are cached."""
+    if not messages:
+        return ""
+    key = _summary_key(messages, token_budget)
+    with _summary_cache_lock:
+        cached = _summary_cache.get(key)
+        if cached is not None:
+            _summary_cache.move_to_end(key)
+            return cached
+
+    lines = []
+    used = 0
+    for message in reversed(messages):
+        line = _summary_line(message)
+        cost = estimate_tokens(line) + 1
+        if used + cost > token_budget:
+            lines.append(f"- ({len(messages) - len(lines)} earlier messages omitted)")
+            break
+        lines.append(line)
+        used += cost
+    summary = "\n".join(reversed(lines))
+
+    with _summary_cache_lock:
+        _summary_cache[key] = summary
+        if len(_summary_cache) > _SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+    return summary
+
+
+def compact_history(chat_history: Optional[List[BaseMessage]], node: str = "",
+                    token_budget: Optional[int] = None, keep_recent: Optional[int] = None) -> CompactedHistory:
+    """Compact chat_history to fit token_budget and record the savings for node."""
+    chat_history = chat_history or []
+    token_budget = HISTORY_TOKEN_BUDGET if token_budget is None else token_budget
+    keep_recent = HISTORY_KEEP_RECENT_MESSAGES if keep_recent is None else keep_recent
+
+    visible = [m for m in chat_history if not is_internal_message(m)]
+    recent = visible[-keep_recent:] if keep_recent > 0 else []
+    older = visible[:len(visible) - len(recent)]
+
+    # Recent messages get at most two thirds of the budget; overflow moves into the summary (newest always kept)
+    recent_budget = token_budget * 2 // 3
+    while len(recent) > 1 and sum(estimate_tokens(_message_text(m)) for m in recent) > recent_budget:
+        older.append(recent.pop(0))
+    recent_tokens = sum(estimate_tokens(_message_text(m)) for m in recent)
+
+    compacted = CompactedHistory(
+        summary=summarize_messages(older, max(token_budget - recent_tokens, token_budget // 3)),
+        messages=recent,
+    )
+    # What the prompt used to contain: the repr of the full message list
+    compacted.original_tokens = estimate_tokens(str(chat_history)) if chat_history else 0
+    compacted.compacted_tokens = estimate_tokens(compacted.as_text()) if visible else 0
+
+    if node:
+        with _stats_lock:
+            stats = HISTORY_STATS.setdefault(node, {"calls": 0, "original_tokens": 0, "compacted_tokens": 0})
+            stats["calls"] += 1
+            stats["original_tokens"] += compacted.original_tokens
+            stats["compacted_tokens"] += compacted.compacted_tokens
+        if chat_history:
+            print(f"History compaction [{node}]: {compacted.original_tokens} -> {compacted.compacted_tokens} tokens")
+    return compacted
+
+
+def history_savings() -> Dict[str, Dict[str, float]]:
+    """Per-node prompt-size savings since process start."""
+    with _stats_lock:
+        snapshot = {node: dict(stats) for node, stats in HISTORY_STATS.items()}
+    report = {}
+    for node, stats in snapshot.items():
+        saved = stats["original_tokens"] - stats["compacted_tokens"]
+        report[node] = {
+            **stats,
+            "saved_tokens": saved,
+            "saved_ratio": round(saved / stats["original_tokens"], 3) if stats["original_tokens"] else 0.0,
+        }
+    return report
@@ -0,0 +1,111 @@
+"""
+Search planning for venue risk assessments.
+
+Weather and health risks depend on the city or area rather than on the specific
+venue, so their queries are location-scoped and shared by every venue in the
+same location. Security, logistics and event-conflict queries stay
+venue-scoped. For N venues across L distinct locations a batch issues
+3N + 2L searches instead of 5N.
+"""
+from typing import Dict, List, Optional
+
+# Risk categories in report order
+RISK_CATEGORIES = ("weather", "security", "health", "logistics", "events")
+
+# Categories whose search results depend only on the location
+LOCATION_SCOPED_CATEGORIES = ("weather", "health")
+
+
+def _has_location(location: str) -> bool:
+    return bool(location) and location.strip().lower() not in ("unknown", "n/a", "")
+
+
+def location_key(location: str) -> str:
+    return " ".join(location.lower().replace(",", " ").split())
+
+
+def location_risk_queries(location: str, time_period="") -> Dict[str, str]:
+    """Location-scoped queries (weather, health), identical for every venue in the location."""
+    return {
+        "weather": f"current weather alerts warnings {location} {time_period} monsoon rain flood heat wave",
+        "health": f"health alerts disease outbreak COVID dengue health issues {location} current",
+    }
+
+
+def venue_risk_queries(venue_name: str, venue_location: str, time_period="") -> Dict[str, str]:
+    """Build the five targeted risk search queries for a venue, keyed by risk category."""
+    queries = {
+        # 1. Weather risks - current weather alerts and forecasts for the specific venue area
+        "weather": f"current weather alerts warnings {venue_name} {venue_location} {time_period} monsoon rain flood heat wave",
+        # 2. Political/security risks - recent incidents, protests, or security issues near the venue
+        "security": f"recent incidents protests security issues crime {venue_name} {venue_location} last week month",
+        # 3. Health risks - health alerts, disease outbreaks, or health-related issues in the venue area
+        "health": f"health alerts disease outbreak COVID dengue health issues {venue_name} {venue_location} current",
+        # 4. Logistical risks - traffic, construction, road closures, or infrastructure issues affecting the venue
+        "logistics": f"traffic construction road closure infrastructure issues parking {venue_name} {venue_location} current",
+        # 5. Event conflicts - conflicting events, VIP movements, or major events near the venue
+        "events": f"upcoming events VIP movement Prime Minister rally concert festival {venue_name} {venue_location} {time_period}",
+    }
+    # Without a usable location the venue name is the only anchor, so keep the venue-scoped form
+    if _has_location(venue_location):
+        queries.update(location_risk_queries(venue_location, time_period))
+    return queries
+
+
+class RiskSearchPlan:
+    """Deduplicated list of searches for a batch, plus where each result goes.
+
+    queries/categories are parallel lists to execute; assignments[i] maps each
+    risk category of venue i to an index into queries, and known[i] holds the
+    categories of venue i already answered by a city baseline.
+    """
+
+    def __init__(self):
+        self.queries: List[str] = []
+        self.categories: List[str] = []
+        self.assignments: List[Dict[str, int]] = []
+        self.known: List[Dict[str, str]] = []
+        self._index: Dict[tuple, int] = {}
+
+    def add(self, category: str, query: str, share_key=None) -> int:
+        """Add a search, reusing an earlier identical one. share_key groups location-scoped searches."""
+        key = (category, share_key if share_key is not None else " ".join(query.lower().split()))
+        if key not in self._index:
+            self._index[key] = len(self.queries)
+            self.queries.append(query)
+            self.categories.append(category)
+        return self._index[key]
+
+    def venue_results(self, results: List[str]) -> List[Dict[str, str]]:
+        """Map executed search results back to per-venue {category: result} dicts."""
+        return [
+            {**known, **{category: results[index] for category, index in assignment.items()}}
+            for known, assignment in zip(self.known, self.assignments)
+        ]
+
+    def __len__(self):
+        return len(self.queries)
+
+
+def plan_risk_searches(venues_info: List[Dict], time_period="",
+                       baselines: Optional[Dict[str, Dict[str, str]]] = None) -> RiskSearchPlan:
+    """Plan the risk searches for a batch of venues, sharing location-scoped searches.
+
+    baselines maps location_key(location) to {category: text} for location-scoped
+    categories already covered by a precomputed city baseline; those are not searched.
+    """
+    plan = RiskSearchPlan()
+    for venue in venues_info:
+        venue_name = venue.get('name', 'Unknown Venue')
+        venue_location = venue.get('location', 'Unknown')
+        shared = _has_location(venue_location)
+        known = dict((baselines or {}).get(location_key(venue_location), {})) if shared else {}
+        assignment = {}
+        for category, query in venue_risk_queries(venue_name, venue_location, time_period).items():
+            if category in known:
+                continue
+            share_key = location_key(venue_location) if shared and category in LOCATION_SCOPED_CATEGORIES else None
+            assignment[category] = plan.add(category, query, share_key)
+        plan.assignments.append(assignment)
+        plan.known.append(known)
+    return plan
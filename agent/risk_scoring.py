@@ -0,0 +1,146 @@
+"""
+Structured venue risk scores and vectorized ranking.
+
+Risk reports end with a fenced ``risk-scores`` JSON block giving, per venue,
+a 1-10 score for each risk category. extract_risk_scores() strips the block
+from the markdown and returns the parsed scores; rank_venues() turns any
+number of scored venues into weighted overall scores, risk levels and a
+top-k (lowest risk first) ranking with numpy.
+"""
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agent.risk_planner import RISK_CATEGORIES
+
+RISK_SCORES_FENCE = "risk-scores"
+
+# Relative weight of each risk category in the overall score
+DEFAULT_CATEGORY_WEIGHTS: Dict[str, float] = {category: 1.0 for category in RISK_CATEGORIES}
+
+# Score used for a venue with no usable category scores
+DEFAULT_RISK_SCORE = 5.0
+
+# Upper bounds (inclusive) of the Low and Medium risk levels
+_RISK_LEVELS = np.array(["Low", "Medium", "High"])
+_RISK_LEVEL_BOUNDS = np.array([3.0, 6.0])
+
+_SCORES_BLOCK = re.compile(r"\n?```[ \t]*" + re.escape(RISK_SCORES_FENCE) + r"[ \t]*\n(.*?)```[ \t]*\n?", re.DOTALL)
+
+RISK_SCORES_INSTRUCTIONS = (
+    f"After the markdown, end your response with a fenced code block tagged {RISK_SCORES_FENCE} containing only JSON "
+    "with one entry per venue, using the venue names exactly as given and an integer score from 1 to 10 for each category:\n"
+    f"```{RISK_SCORES_FENCE}\n"
+    '[{"venue": "<venue name>", "scores": {' + ", ".join(f'"{c}": <1-10>' for c in RISK_CATEGORIES) + "}}]\n"
+    "```\n"
+)
+
+
+def _clean_scores(scores) -> Dict[str, float]:
+    cleaned = {}
+    if not isinstance(scores, dict):
+        return cleaned
+    for category in RISK_CATEGORIES:
+        try:
+            value = float(scores.get(category))
+        except (TypeError, ValueError):
+            continue
+        if np.isfinite(value):
+            cleaned[category] = min(10.0, max(1.0, value))
+    return cleaned
+
+
+def _parse_block(text: str) -> List[Dict]:
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        print(f"Ignoring malformed {RISK_SCORES_FENCE} block: {e}")
+        return []
+    if isinstance(data, dict):
+        data = data.get("venues", [data])
+    venues = []
+    for entry in data if isinstance(data, list) else []:
+        if isinstance(entry, dict) and entry.get("venue"):
+            venues.append({"venue": str(entry["venue"]), "scores": _clean_scores(entry.get("scores"))})
+    return venues
+
+
+def extract_risk_scores(report: str) -> Tuple[str, List[Dict]]:
+    """Split a report into (markdown without score blocks, [{"venue": name, "scores": {category: score}}]).
+
+    Chunked batch reports carry one block per chunk; all are merged in order.
+    """
+    venues = []
+    for match in _SCORES_BLOCK.finditer(report):
+        venues.extend(_parse_block(match.group(1)))
+    return re.sub(r"\n{3,}", "\n\n", _SCORES_BLOCK.sub("\n", report)).strip(), venues
+
+
+def score_matrix(venue_scores: Sequence[Dict], categories: Sequence[str] = RISK_CATEGORIES) -> np.ndarray:
+    """(venues x categories) float matrix of scores; missing scores are NaN."""
+    matrix = np.full((len(venue_scores), len(categories)), np.nan)
+    for row, venue in enumerate(venue_scores):
+        scores = venue.get("scores", {})
+        for col, category in enumerate(categories):
+            if category in scores:
+                matrix[row, col] = scores[category]
+    return matrix
+
+
+def weighted_risk(matrix: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted mean per row, ignoring NaN cells. Rows with no scores get DEFAULT_RISK_SCORE."""
+    present = ~np.isnan(matrix)
+    effective = present * weights
+    totals = effective.sum(axis=1)
+    sums = (np.where(present, matrix, 0.0) * effective).sum(axis=1)
+    return np.where(totals > 0, sums / np.where(totals > 0, totals, 1.0), DEFAULT_RISK_SCORE)
+
+
+def risk_levels(overall: np.ndarray) -> np.ndarray:
+    return _RISK_LEVELS[np.searchsorted(_RISK_LEVEL_BOUNDS, overall, side="left")]
+
+
+def top_k_indices(overall: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k lowest scores, ascending; ties keep input order."""
+    n = len(overall)
+    if k < n:
+        candidates = np.argpartition(overall, k - 1)[:k]
+        # Pull in every venue tied with the k-th score so tie-breaking is by input order
+        cutoff = overall[candidates].max()
+        candidates = np.flatnonzero(overall <= cutoff)
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, overall[candidates]))
+    return candidates[order][:k]
+
+
+def rank_venues(venue_scores: Sequence[Dict], k: Optional[int] = None,
+                weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """Rank scored venues from lowest to highest overall risk, returning at most k entries."""
+    if not venue_scores:
+        return []
+    weights = {**DEFAULT_CATEGORY_WEIGHTS, **(weights or {})}
+    weight_vector = np.array([weights[category] for category in RISK_CATEGORIES], dtype=float)
+    overall = weighted_risk(score_matrix(venue_scores), weight_vector)
+    levels = risk_levels(overall)
+    k = len(venue_scores) if k is None else max(0, min(k, len(venue_scores)))
+    return [
+        {
+            "rank": rank,
+            "venue": venue_scores[i]["venue"],
+            "overall_score": round(float(overall[i]), 1),
+            "risk_level": str(levels[i]),
+            "scores": dict(venue_scores[i].get("scores", {})),
+        }
+        for rank, i in enumerate(top_k_indices(overall, k).tolist(), 1)
+    ] if k else []
+
+
+def format_risk_ranking(ranking: List[Dict]) -> str:
+    """Markdown summary of a ranking, lowest risk first."""
+    lines = ["## Venue Risk Ranking (lowest risk first)"]
+    lines.extend(f"{entry['rank']}. **{entry['venue']}**: {entry['overall_score']}/10 ({entry['risk_level']} risk)"
+                 for entry in ranking)
+    return "\n".join(lines)
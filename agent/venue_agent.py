@@ -1,37 +1,40 @@
 import os
 from typing import List, Dict, Any, Optional
 from langchain.agents import AgentExecutor, create_openai_functions_agent
-from langchain.memory import ConversationBufferMemory
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.schema import SystemMessage
+from langchain.schema import SystemMessage, HumanMessage, AIMessage
 from langchain.tools import Tool
-from langchain_community.utilities import GoogleSerperAPIWrapper
 from pydantic import BaseModel
 import logging
+import threading
+from agent.events import emit_event
+from agent.history import compact_history
+from agent.venue_tools import asearch_venues, check_location_availability, compare_venues, get_venue_details, search_venues
 
 # --- Tool and prompt setup as functions ---
 def create_tools():
-    search = GoogleSerperAPIWrapper()
+    # Catalog first (venues.db), web search only when the catalog has too few matches
     return [
         Tool(
             name="web_search_venues",
-            func=search.run,
-            description="""Search the web for venues, facilities, and places based on user requirements. Pay attention to the specific event type or activity mentioned in the query and search for appropriate venues. For example, if the user asks for a sports event, search for sports complexes, stadiums, athletic facilities. If they ask for a corporate event, search for conference centers, business venues. If they ask for a wedding, search for wedding venues, banquet halls. Always match the venue type to the event context. Input can be any natural language description of the place, event type, or experience the user wants. Present the results in a clear, conversational format."""
+            func=search_venues,
+            coroutine=asearch_venues,
+            description="""Search for venues, facilities, and places based on user requirements. Checks the VenueAI venue catalog first and searches the web when it has too few matches. Pay attention to the specific event type or activity mentioned in the query and search for appropriate venues. For example, if the user asks for a sports event, search for sports complexes, stadiums, athletic facilities. If they ask for a corporate event, search for conference centers, business venues. If they ask for a wedding, search for wedding venues, banquet halls. Always match the venue type to the event context. Input can be any natural language description of the place, event type, or experience the user wants; include the location, number of guests, budget and dates when known. Present the results in a clear, conversational format."""
         ),
         Tool(
             name="get_venue_details",
-            func=lambda venue_id: "Please use the web_search_venues tool to find details about the specified place.",
-            description="""Get detailed information about a specific place. Use the web_search_venues tool to search the web for details about the place and present them in a natural, conversational way. DO NOT show the function call or code in your response."""
+            func=get_venue_details,
+            description="""Get detailed information about a specific place. Input is a venue ID from earlier results (e.g. V001) or the venue name. Present the details in a natural, conversational way. DO NOT show the function call or code in your response."""
         ),
         Tool(
             name="compare_venues",
-            func=lambda venue_ids: "Please use the web_search_venues tool to find information about the specified places and present a comparison.",
-            description="""Compare multiple places based on user requirements. Use the web_search_venues tool to search the web for information about the places and present the comparison in a natural, conversational way. DO NOT show the function call or code in your response."""
+            func=compare_venues,
+            description="""Compare multiple places. Input is a comma-separated list of venue IDs or names. Present the comparison in a natural, conversational way. DO NOT show the function call or code in your response."""
         ),
         Tool(
             name="check_location_availability",
-            func=lambda location: "Please use the web_search_venues tool to check if places exist in the location.",
-            description="""Check if any places exist for the given location. Use the web_search_venues tool to search the web to determine if places exist in the location and respond accordingly."""
+            func=check_location_availability,
+            description="""Check how many venues exist for the given location, optionally for given dates (e.g. "Lonavla next month"), with their capacity and price range."""
         )
     ]
 
@@ -75,44 +78,93 @@ def create_prompt():
         MessagesPlaceholder(variable_name="agent_scratchpad"),
     ])
 
-# --- LangGraph node function ---
-def venue_finder_node(state: dict) -> dict:
-    """LangGraph node for venue finding. Expects state with 'input' and 'chat_history'. Returns updated state with 'output'."""
-    if "llm" not in state:
-        raise ValueError("LLM not found in state! State keys: " + str(list(state.keys())))
-    llm = state["llm"]
-    input_text = state["input"]
-    chat_history = state.get("chat_history", [])
-    
+# --- Agent executor setup ---
+# One executor per LLM instance, shared by all requests. Executors hold no per-request
+# state: chat history is passed in with each call instead of living in an agent memory.
+_agent_executors: Dict[int, tuple] = {}
+_agent_executors_lock = threading.Lock()
+
+def build_venue_agent_executor(llm):
+    """Build the venue finder AgentExecutor (tools, prompt and agent) for llm."""
     tools = create_tools()
     prompt = create_prompt()
-    memory = ConversationBufferMemory(
-        memory_key="chat_history",
-        return_messages=True
-    )
     agent = create_openai_functions_agent(
         llm=llm,
         tools=tools,
         prompt=prompt
     )
-    agent_executor = AgentExecutor(
+    return AgentExecutor(
         agent=agent,
         tools=tools,
-        memory=memory,
         verbose=True,
         max_iterations=3  # Allow multiple searches for comprehensive results
     )
-    # Set memory state if provided
-    if chat_history:
-        memory.chat_memory.messages = chat_history
+
+def get_venue_agent_executor(llm):
+    """Return the process-wide AgentExecutor for llm, building it on first use."""
+    key = id(llm)
+    entry = _agent_executors.get(key)
+    if entry is None or entry[0] is not llm:
+        with _agent_executors_lock:
+            entry = _agent_executors.get(key)
+            if entry is None or entry[0] is not llm:
+                # Keep a reference to llm so its id cannot be reused while cached
+                entry = (llm, build_venue_agent_executor(llm))
+                _agent_executors[key] = entry
+    return entry[1]
+
+def _agent_input(input_text, chat_history):
+    # Older turns are folded into a summary to cap prompt size
+    return {
+        "input": input_text,
+        "chat_history": compact_history(chat_history, node="venue_finder").as_messages()
+    }
+
+def _updated_chat_history(chat_history, input_text, output):
+    return list(chat_history) + [HumanMessage(content=input_text), AIMessage(content=output)]
+
+def _venue_finder_output(response) -> str:
+    return response["output"] if isinstance(response, dict) and "output" in response else str(response)
+
+async def _astream_agent(agent_executor, agent_input, emit):
+    """Run the agent, forwarding the chat model's tokens to emit. Returns the executor's final output."""
+    response = None
+    async for event in agent_executor.astream_events(agent_input, config={"run_name": "venue_agent"}, version="v2"):
+        if event["event"] == "on_chat_model_stream":
+            text = getattr(event["data"].get("chunk"), "content", "")
+            if text and isinstance(text, str):
+                await emit_event(emit, "token", text=text)
+        elif event["event"] == "on_chain_end" and not event.get("parent_ids"):
+            response = event["data"].get("output")
+    return response
+
+# --- LangGraph node function ---
+async def avenue_finder_node(state: dict) -> dict:
+    """LangGraph node for venue finding. Expects state with 'input' and 'chat_history'. Returns updated state with 'output'.
+
+    The agent's LLM and search calls are awaited, so they do not block the event loop.
+    """
+    if "llm" not in state:
+        raise ValueError("LLM not found in state! State keys: " + str(list(state.keys())))
+    llm = state["llm"]
+    input_text = state["input"]
+    chat_history = state.get("chat_history", [])
+    
+    emit = state.get("emit")
+    
+    agent_executor = get_venue_agent_executor(llm)
+    agent_input = _agent_input(input_text, chat_history)
     try:
-        response = agent_executor.invoke({"input": input_text})
-        output = response["output"] if isinstance(response, dict) and "output" in response else str(response)
+        if emit is None:
+            response = await agent_executor.ainvoke(agent_input, config={"run_name": "venue_agent"})
+        else:
+            response = await _astream_agent(agent_executor, agent_input, emit)
+        output = _venue_finder_output(response)
+        chat_history = _updated_chat_history(chat_history, input_text, output)
     except Exception as e:
         output = f"I apologize, but I encountered an error while processing your request: {str(e)}"
-    # Update state with output and chat_history
     return {
         **state,
         "output": output,
-        "chat_history": memory.chat_memory.messages
-    } 
\ No newline at end of file
+        "chat_history": chat_history
+    }
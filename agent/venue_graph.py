@@ -1,8 +1,20 @@
 from langgraph.graph import StateGraph, END
 from langchain_core.language_models.base import BaseLanguageModel
-from agent.venue_agent import venue_finder_node
-from agent.event_risk_agent import event_risk_assessment_node
+from agent.venue_agent import avenue_finder_node
+from agent.event_risk_agent import abatch_assess_venue_risks, aassess_venue_risks_incrementally
+from agent.events import emit_event, emit_stage
+from agent.risk_scoring import extract_risk_scores, format_risk_ranking, rank_venues
+from agent.history import compact_history, is_internal_message
+from utils.time_expressions import parse_time_expression
+import asyncio
+import json
+import os
 import re
+from functools import lru_cache
+
+# "consolidated": one coordinator LLM call per turn; venues are parsed from the venue agent's Markdown tables.
+# "legacy": a second coordinator call extracts venues from the venue agent's output.
+ORCHESTRATION_MODE = os.getenv("ORCHESTRATION_MODE", "consolidated").lower()
 
 # --- Router node ---
 def router_node(state: dict) -> dict:
@@ -18,15 +30,9 @@ def router_node(state: dict) -> dict:
     return state
 
 # --- LLM-based venue extraction and decision node ---
-def intelligent_venue_processor_node(state: dict) -> dict:
-    """Uses LLM to intelligently process venue output and decide next steps."""
-    llm = state["llm"]
-    venue_output = state.get("venue_output", "")
-    input_text = state["input"]
-    chat_history = state.get("chat_history", [])
-
-    # Use LLM to analyze the venue output and make decisions
-    analysis_prompt = f"""
+def _venue_processor_prompt(input_text, chat_history, venue_output):
+    history_text = compact_history(chat_history, node="venue_processor").as_text()
+    return f"""
     You are the coordinator for a venue and risk assessment system. You have access to:
     - The user's original query
     - The chat history
@@ -65,64 +71,148 @@ def intelligent_venue_processor_node(state: dict) -> dict:
       ]
     }}
     User's original query: {input_text}
-    Chat history: {chat_history}
+    Chat history: {history_text}
     Venue finder output: {venue_output}
     """
 
-    try:
-        response = llm.invoke(analysis_prompt)
-        response_text = response.content if hasattr(response, 'content') else str(response)
+def _parse_venue_processor_response(response_text, venue_output):
+    """Parse the coordinator's JSON decision, overriding premature risk assessment."""
+    # Find JSON in the response
+    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+    if json_match:
+        analysis_result = json.loads(json_match.group())
+    else:
+        # Fallback if JSON parsing fails
+        analysis_result = {
+            "action": "extract_venues",
+            "reasoning": "Could not parse LLM response",
+            "venues": []
+        }
 
-        # Extract JSON from response
-        import json
-        import re
+    print(f"LLM Analysis Result: {analysis_result}")
+
+    # --- FIX: If LLM returns risk_assessment but venue_output is empty or has no venues, override to extract_venues ---
+    action = analysis_result.get("action", "extract_venues")
+    venues = analysis_result.get("venues", [])
+    if action == "risk_assessment":
+        # Only override if both venues is empty and venue_output is empty/whitespace
+        if (not venue_output.strip()) and (not venues or all(v.get('name', '').lower() == 'unknown' for v in venues)):
+            analysis_result["action"] = "extract_venues"
+            print("Overriding action to 'extract_venues' because no real venues found in venue_output and venues list is empty.")
+    return analysis_result
+
+def _apply_venue_processor_result(state, analysis_result):
+    # Update state with analysis results
+    state.update({
+        "llm_analysis": analysis_result,
+        "extracted_venues": analysis_result.get("venues", []),
+        "next_action": analysis_result.get("action", "extract_venues")
+    })
+    return state
 
-        # Find JSON in the response
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            analysis_result = json.loads(json_match.group())
-        else:
-            # Fallback if JSON parsing fails
-            analysis_result = {
-                "action": "extract_venues",
-                "reasoning": "Could not parse LLM response",
-                "venues": []
-            }
+def _venue_processor_error(state, e):
+    print(f"Error in LLM venue analysis: {e}")
+    # Fallback to asking for info
+    state.update({
+        "llm_analysis": {"action": "extract_venues", "reasoning": "Error in analysis", "venues": []},
+        "extracted_venues": [],
+        "next_action": "extract_venues"
+    })
+    return state
 
-        print(f"LLM Analysis Result: {analysis_result}")
-
-        # --- FIX: If LLM returns risk_assessment but venue_output is empty or has no venues, override to extract_venues ---
-        action = analysis_result.get("action", "extract_venues")
-        venues = analysis_result.get("venues", [])
-        if action == "risk_assessment":
-            # Only override if both venues is empty and venue_output is empty/whitespace
-            if (not venue_output.strip()) and (not venues or all(v.get('name', '').lower() == 'unknown' for v in venues)):
-                analysis_result["action"] = "extract_venues"
-                print("Overriding action to 'extract_venues' because no real venues found in venue_output and venues list is empty.")
-
-        # Update state with analysis results
-        state.update({
-            "llm_analysis": analysis_result,
-            "extracted_venues": analysis_result.get("venues", []),
-            "next_action": analysis_result.get("action", "extract_venues")
-        })
+async def aintelligent_venue_processor_node(state: dict) -> dict:
+    """Uses LLM to intelligently process venue output and decide next steps."""
+    llm = state["llm"]
+    venue_output = state.get("venue_output", "")
+    input_text = state["input"]
+    chat_history = state.get("chat_history", [])
 
-        return state
+    analysis_prompt = _venue_processor_prompt(input_text, chat_history, venue_output)
 
+    try:
+        response = await llm.ainvoke(analysis_prompt, config={"run_name": "venue_processor"})
+        response_text = response.content if hasattr(response, 'content') else str(response)
+        analysis_result = _parse_venue_processor_response(response_text, venue_output)
+        return _apply_venue_processor_result(state, analysis_result)
     except Exception as e:
-        print(f"Error in LLM venue analysis: {e}")
-        # Fallback to asking for info
-        state.update({
-            "llm_analysis": {"action": "extract_venues", "reasoning": "Error in analysis", "venues": []},
-            "extracted_venues": [],
-            "next_action": "extract_venues"
+        return _venue_processor_error(state, e)
+
+# --- Markdown venue extraction (consolidated mode) ---
+_VENUE_COLUMN_ALIASES = {
+    "name": "name", "venue": "name", "venue name": "name",
+    "location": "location", "area": "location",
+    "type": "type", "venue type": "type",
+    "capacity": "capacity",
+    "price range": "price_range", "price": "price_range",
+    "key features": "features", "features": "features", "amenities": "features",
+}
+
+def _table_cells(line):
+    return [cell.strip().strip("*").strip() for cell in line.strip().strip("|").split("|")]
+
+def _is_separator_row(cells):
+    return all(re.fullmatch(r":?-{2,}:?", cell) for cell in cells if cell)
+
+def extract_venues_from_markdown(text: str) -> list:
+    """Parse venues out of the venue agent's Markdown tables, without an LLM call.
+
+    Handles both the prescribed "| Name | Location | Type | ... |" table and
+    per-venue two-column "| Feature | Details |" tables. Returns dicts with the
+    same keys as the coordinator's "venues" output.
+    """
+    tables, current = [], []
+    for line in (text or "").splitlines():
+        if line.strip().startswith("|"):
+            current.append(_table_cells(line))
+        elif current:
+            tables.append(current)
+            current = []
+    if current:
+        tables.append(current)
+
+    venues, seen = [], set()
+
+    def add(venue):
+        name = venue.get("name", "").strip()
+        if not name or name.lower() in seen or name.lower() in ("venue name", "name", "unknown"):
+            return
+        seen.add(name.lower())
+        venues.append({
+            "name": name,
+            "location": venue.get("location", "Unknown") or "Unknown",
+            "type": venue.get("type", ""),
+            "features": venue.get("features", ""),
         })
-        return state
+
+    for rows in tables:
+        rows = [row for row in rows if not _is_separator_row(row)]
+        if not rows:
+            continue
+        header = [_VENUE_COLUMN_ALIASES.get(cell.lower()) for cell in rows[0]]
+        if "name" in header:
+            for row in rows[1:]:
+                add({key: value for key, value in zip(header, row) if key})
+        else:
+            # Key/value table describing a single venue
+            venue = {}
+            for row in rows:
+                if len(row) >= 2 and _VENUE_COLUMN_ALIASES.get(row[0].lower()):
+                    venue[_VENUE_COLUMN_ALIASES[row[0].lower()]] = row[1]
+            add(venue)
+    return venues
 
 # --- Interactive collaborative venue and risk assessment node ---
-def interactive_collaborative_node(state: dict) -> dict:
+_NO_STORED_VENUES_OUTPUT = "I don't have any venues stored from our previous conversation. Please start by asking for venue recommendations."
+
+def _is_follow_up(input_text):
+    """Check if this is a follow-up response to venue recommendations."""
+    return any(phrase in input_text.lower() for phrase in [
+        'yes', 'risk assessment', 'assess risks', 'check risks', 'all venues', 
+        'venue 1', 'venue 2', 'first venue', 'second venue', 'the leela', 'taj palace'
+    ])
+
+async def ainteractive_collaborative_node(state: dict) -> dict:
     """Interactive collaborative workflow: venue finding first, then optional risk assessment."""
-    llm = state["llm"]
     input_text = state["input"]
     chat_history = state.get("chat_history", [])
     extracted_venues = state.get("extracted_venues", [])
@@ -130,27 +220,21 @@ def interactive_collaborative_node(state: dict) -> dict:
     print("Starting interactive collaborative venue and risk assessment")
     print(f"Current extracted venues: {len(extracted_venues)} venues")
     
-    # Check if this is a follow-up response to venue recommendations
-    is_follow_up = any(phrase in input_text.lower() for phrase in [
-        'yes', 'risk assessment', 'assess risks', 'check risks', 'all venues', 
-        'venue 1', 'venue 2', 'first venue', 'second venue', 'the leela', 'taj palace'
-    ])
+    is_follow_up = _is_follow_up(input_text)
     
     if is_follow_up and extracted_venues:
         print("Detected follow-up response with venues - proceeding to risk assessment")
-        # This is a follow-up response - handle risk assessment request
-        return handle_risk_assessment_request(state)
+        return await ahandle_risk_assessment_request(state)
     elif is_follow_up and not extracted_venues:
         print("Detected follow-up response but no venues found - asking user to start over")
         return {
             **state,
-            "output": "I don't have any venues stored from our previous conversation. Please start by asking for venue recommendations.",
+            "output": _NO_STORED_VENUES_OUTPUT,
             "chat_history": chat_history
         }
     else:
         print("New query detected - proceeding to venue finding")
-        # This is a new query - find venues first
-        return handle_venue_finding(state)
+        return await ahandle_venue_finding(state)
 
 # --- Utility to merge requirements from chat history and current input ---
 def merge_requirements_from_history(chat_history, current_input):
@@ -163,7 +247,7 @@ def merge_requirements_from_history(chat_history, current_input):
     # Collect previous user messages (excluding system/agent messages)
     user_msgs = []
     for msg in reversed(chat_history):
-        if hasattr(msg, 'content') and isinstance(msg.content, str):
+        if hasattr(msg, 'content') and isinstance(msg.content, str) and not is_internal_message(msg):
             # Heuristic: skip agent/system messages
             if not msg.content.strip().lower().startswith(("okay", "i can help", "here are", "i have searched", "would you like", "thank you", "no venues were found")):
                 user_msgs.append(msg.content.strip())
@@ -184,74 +268,150 @@ def merge_requirements_from_history(chat_history, current_input):
     return merged
 
 
-def handle_venue_finding(state: dict) -> dict:
+def _format_venue_section(input_text, venue_output, extracted_venues):
+    # Only show risk assessment option if venues are found
+    venue_section = f"## Venue Recommendations\n{venue_output}\n"
+    if extracted_venues:
+        venue_section += f"\n## Risk Assessment Option\n\nI found {len(extracted_venues)} venues that match your requirements. Would you like me to perform a detailed risk assessment for these venues?\n\n**Available venues:**\n"
+        for i, venue in enumerate(extracted_venues, 1):
+            venue_section += f"{i}. **{venue.get('name', 'Unknown')}** - {venue.get('location', 'Unknown')}\n"
+        # Removed the block that adds detailed instructions for requesting risk assessment
+    else:
+        # Only show fallback if venue_output is empty or whitespace
+        if not venue_output.strip():
+            # Check if user is asking for more options
+            if any(phrase in input_text.lower() for phrase in ["more options", "more venues", "show more", "additional venues", "other options"]):
+                venue_section += "\nI couldn't find any more venues matching your criteria. Would you like to adjust your requirements or search in a wider area?"
+            else:
+                venue_section += "\nNo venues were found that match your requirements. Please provide more details or adjust your criteria."
+    return venue_section
+
+def _venue_finding_error(state, chat_history, e):
+    print(f"Venue finding error: {e}")
+    error_output = f"I apologize, but I encountered an error during venue finding: {str(e)}"
+    return {
+        **state,
+        "output": error_output,
+        "chat_history": chat_history
+    }
+
+async def ahandle_venue_finding(state: dict) -> dict:
+    """Find venues for the (history-merged) request and offer a risk assessment for them."""
     llm = state["llm"]
     input_text = state["input"]
     chat_history = state.get("chat_history", [])
     
+    emit = state.get("emit")
+    
     print("Step 1: Finding venues")
+    await emit_stage(emit, "searching_venues", "Searching venues")
     
-    # --- Use merged requirements for follow-up queries ---
     merged_input = merge_requirements_from_history(chat_history, input_text)
-    
-    # Step 1: Find venues
     venue_state = {
         "llm": llm,
         "input": merged_input,
-        "chat_history": chat_history
+        "chat_history": chat_history,
+        "emit": emit
     }
     
     try:
-        venue_result = venue_finder_node(venue_state)
+        venue_result = await avenue_finder_node(venue_state)
         venue_output = venue_result.get("output", "")
         venue_chat_history = venue_result.get("chat_history", [])
         print("Venue finder completed")
         
-        # Step 2: Use LLM to analyze venue output
-        analysis_state = {
-            "llm": llm,
-            "venue_output": venue_output,
-            "input": merged_input
-        }
-        
-        analysis_result = intelligent_venue_processor_node(analysis_state)
-        next_action = analysis_result.get("next_action", "extract_venues")
-        extracted_venues = analysis_result.get("extracted_venues", [])
+        await emit_stage(emit, "extracting_venues", "Reviewing venue options")
+        if ORCHESTRATION_MODE == "consolidated":
+            extracted_venues = extract_venues_from_markdown(venue_output)
+        else:
+            analysis_state = {
+                "llm": llm,
+                "venue_output": venue_output,
+                "input": merged_input
+            }
+            analysis_result = await aintelligent_venue_processor_node(analysis_state)
+            next_action = analysis_result.get("next_action", "extract_venues")
+            extracted_venues = analysis_result.get("extracted_venues", [])
+            print(f"LLM decided next action: {next_action}")
         
-        print(f"LLM decided next action: {next_action}")
         print(f"Extracted venues: {[v.get('name', 'Unknown') for v in extracted_venues]}")
+        await emit_stage(emit, "venue_list_ready", "Venue list ready", venues=extracted_venues)
         
-        # Only show risk assessment option if venues are found
-        venue_section = f"## Venue Recommendations\n{venue_output}\n"
-        if extracted_venues:
-            venue_section += f"\n## Risk Assessment Option\n\nI found {len(extracted_venues)} venues that match your requirements. Would you like me to perform a detailed risk assessment for these venues?\n\n**Available venues:**\n"
-            for i, venue in enumerate(extracted_venues, 1):
-                venue_section += f"{i}. **{venue.get('name', 'Unknown')}** - {venue.get('location', 'Unknown')}\n"
-            # Removed the block that adds detailed instructions for requesting risk assessment
-        else:
-            # Only show fallback if venue_output is empty or whitespace
-            if not venue_output.strip():
-                # Check if user is asking for more options
-                if any(phrase in input_text.lower() for phrase in ["more options", "more venues", "show more", "additional venues", "other options"]):
-                    venue_section += "\nI couldn't find any more venues matching your criteria. Would you like to adjust your requirements or search in a wider area?"
-                else:
-                    venue_section += "\nNo venues were found that match your requirements. Please provide more details or adjust your criteria."
         return {
             **state,
-            "output": venue_section,
+            "output": _format_venue_section(input_text, venue_output, extracted_venues),
             "chat_history": venue_chat_history,
             "extracted_venues": extracted_venues
         }
     except Exception as e:
-        print(f"Venue finding error: {e}")
-        error_output = f"I apologize, but I encountered an error during venue finding: {str(e)}"
-        return {
-            **state,
-            "output": error_output,
-            "chat_history": chat_history
-        }
+        return _venue_finding_error(state, chat_history, e)
+
+def _select_venues_to_assess(input_text, extracted_venues):
+    """Determine which venues to assess based on user input. Returns an empty list if the selection is unclear."""
+    venues_to_assess = []
+    
+    if any(phrase in input_text.lower() for phrase in ['yes', 'all venues', 'all', 'risk assessment', 'assess risks']):
+        # User wants risk assessment for all venues
+        venues_to_assess = extracted_venues
+        print(f"User requested risk assessment for all {len(venues_to_assess)} venues")
+        return venues_to_assess
+
+    # Check for venue numbers (e.g., "venue 1", "first venue")
+    if '1' in input_text or 'first' in input_text:
+        if len(extracted_venues) >= 1:
+            venues_to_assess.append(extracted_venues[0])
+    if '2' in input_text or 'second' in input_text:
+        if len(extracted_venues) >= 2:
+            venues_to_assess.append(extracted_venues[1])
+    if '3' in input_text or 'third' in input_text:
+        if len(extracted_venues) >= 3:
+            venues_to_assess.append(extracted_venues[2])
+
+    # Check for venue names mentioned (allow partial, case-insensitive match)
+    input_lower = input_text.lower()
+    for venue in extracted_venues:
+        venue_name = venue.get('name', '').lower()
+        if venue_name in input_lower or venue_name.split()[0] in input_lower or any(part in input_lower for part in venue_name.split()):
+            if venue not in venues_to_assess:
+                venues_to_assess.append(venue)
+        elif any(input_part in venue_name for input_part in input_lower.split()):
+            if venue not in venues_to_assess:
+                venues_to_assess.append(venue)
+    return venues_to_assess
+
+def _venue_clarification_output(extracted_venues):
+    venue_list = "\n".join([f"{i+1}. {venue.get('name', 'Unknown')}" for i, venue in enumerate(extracted_venues)])
+    return f"""I'm not sure which venues you'd like me to assess for risks. \n\n{venue_list}\n\nPlease specify which venues you'd like me to assess by responding with:\n- \"All venues\" or \"Yes\" - for all venues\n- \"Venue 1\" or \"The Leela\" - for specific venue(s)\n- Venue numbers like \"1 and 3\" or \"first and third\""""
+
+def _time_period_from_history(input_text, chat_history):
+    """Absolute date range ("24-25 October 2026") from the request or the user's recent messages, or ""."""
+    # Only user messages: assistant replies quote dates from search results
+    texts = [input_text] + [msg.content for msg in reversed((chat_history or [])[-5:])
+                            if getattr(msg, 'type', '') == 'human' and isinstance(msg.content, str)]
+    for text in texts:
+        period = parse_time_expression(text)
+        if period:
+            return period.label
+    return ""
+
+def _risk_report_output(risk_report):
+    """Strip the structured scores from a batch report and rank the venues. Returns (markdown, ranking)."""
+    markdown, venue_scores = extract_risk_scores(risk_report)
+    ranking = rank_venues(venue_scores)
+    if len(ranking) > 1:
+        markdown = f"{markdown}\n\n{format_risk_ranking(ranking)}"
+    return markdown, ranking
+
+def _risk_assessment_error(state, chat_history, e):
+    print(f"Risk assessment error: {e}")
+    error_output = f"I apologize, but I encountered an error during risk assessment: {str(e)}"
+    return {
+        **state,
+        "output": error_output,
+        "chat_history": chat_history
+    }
 
-def handle_risk_assessment_request(state: dict) -> dict:
+async def ahandle_risk_assessment_request(state: dict) -> dict:
     """Handle the risk assessment step based on user's venue selection."""
     llm = state["llm"]
     input_text = state["input"]
@@ -263,98 +423,42 @@ def handle_risk_assessment_request(state: dict) -> dict:
     if not extracted_venues:
         return {
             **state,
-            "output": "I don't have any venues stored from our previous conversation. Please start by asking for venue recommendations.",
+            "output": _NO_STORED_VENUES_OUTPUT,
             "chat_history": chat_history
         }
     
-    # Determine which venues to assess based on user input
-    venues_to_assess = []
-    
-    if any(phrase in input_text.lower() for phrase in ['yes', 'all venues', 'all', 'risk assessment', 'assess risks']):
-        # User wants risk assessment for all venues
-        venues_to_assess = extracted_venues
-        print(f"User requested risk assessment for all {len(venues_to_assess)} venues")
-    else:
-        # User specified specific venues
-        venue_names = [venue.get('name', '').lower() for venue in extracted_venues]
-
-        # Check for venue numbers (e.g., "venue 1", "first venue")
-        if '1' in input_text or 'first' in input_text:
-            if len(extracted_venues) >= 1:
-                venues_to_assess.append(extracted_venues[0])
-        if '2' in input_text or 'second' in input_text:
-            if len(extracted_venues) >= 2:
-                venues_to_assess.append(extracted_venues[1])
-        if '3' in input_text or 'third' in input_text:
-            if len(extracted_venues) >= 3:
-                venues_to_assess.append(extracted_venues[2])
-
-        # Check for venue names mentioned (allow partial, case-insensitive match)
-        input_lower = input_text.lower()
-        for venue in extracted_venues:
-            venue_name = venue.get('name', '').lower()
-            if venue_name in input_lower or venue_name.split()[0] in input_lower or any(part in input_lower for part in venue_name.split()):
-                if venue not in venues_to_assess:
-                    venues_to_assess.append(venue)
-            elif any(input_part in venue_name for input_part in input_lower.split()):
-                if venue not in venues_to_assess:
-                    venues_to_assess.append(venue)
-
-        # If no specific venues found, ask for clarification
-        if not venues_to_assess:
-            venue_list = "\n".join([f"{i+1}. {venue.get('name', 'Unknown')}" for i, venue in enumerate(extracted_venues)])
-            return {
-                **state,
-                "output": f"""I'm not sure which venues you'd like me to assess for risks. \n\n{venue_list}\n\nPlease specify which venues you'd like me to assess by responding with:\n- \"All venues\" or \"Yes\" - for all venues\n- \"Venue 1\" or \"The Leela\" - for specific venue(s)\n- Venue numbers like \"1 and 3\" or \"first and third\"""" ,
-                "chat_history": chat_history
-            }
+    venues_to_assess = _select_venues_to_assess(input_text, extracted_venues)
+    if not venues_to_assess:
+        return {
+            **state,
+            "output": _venue_clarification_output(extracted_venues),
+            "chat_history": chat_history
+        }
     
     print(f"Assessing risks for {len(venues_to_assess)} venues: {[v.get('name', 'Unknown') for v in venues_to_assess]}")
     
-    # Perform batch risk assessment for selected venues
     try:
-        # Extract time period from original query or chat history
-        time_period = ""
-        original_query = ""
-        if chat_history:
-            # Look for time period in recent messages
-            for msg in reversed(chat_history[-5:]):  # Check last 5 messages
-                if hasattr(msg, 'content'):
-                    content = msg.content.lower()
-                    time_patterns = ["next week", "this week", "next month", "tomorrow", "today"]
-                    for pattern in time_patterns:
-                        if pattern in content:
-                            time_period = pattern
-                            original_query = msg.content
-                            break
-                if time_period:
-                    break
-        
-        from agent.event_risk_agent import batch_assess_venue_risks
-        risk_report = batch_assess_venue_risks(llm, venues_to_assess, time_period)
-        
-        # Return the batch risk report as output
+        time_period = _time_period_from_history(input_text, chat_history)
+        emit = state.get("emit")
+        if emit is not None:
+            # Streaming clients get each venue's assessment as soon as it is ready
+            risk_report = await aassess_venue_risks_incrementally(llm, venues_to_assess, time_period, emit=emit)
+        else:
+            risk_report = await abatch_assess_venue_risks(llm, venues_to_assess, time_period)
+        risk_report, ranking = _risk_report_output(risk_report)
+        await emit_event(emit, "risk_scores", venues=ranking)
         return {
             **state,
             "output": risk_report,
+            "risk_scores": ranking,
             "chat_history": chat_history
         }
     except Exception as e:
-        print(f"Risk assessment error: {e}")
-        error_output = f"I apologize, but I encountered an error during risk assessment: {str(e)}"
-        return {
-            **state,
-            "output": error_output,
-            "chat_history": chat_history
-        }
+        return _risk_assessment_error(state, chat_history, e)
 
-def orchestrator_node(state: dict) -> dict:
-    """LLM-driven orchestrator: decides which agent to call next based on user query and chat history."""
-    llm = state["llm"]
-    input_text = state["input"]
-    chat_history = state.get("chat_history", [])
-    
-    orchestrator_prompt = f"""
+def _orchestrator_prompt(input_text, chat_history):
+    history_text = compact_history(chat_history, node="orchestrator").as_text()
+    return f"""
     You are the orchestrator for a venue and risk assessment system.
     
     Given:
@@ -386,104 +490,127 @@ def orchestrator_node(state: dict) -> dict:
       ]
     }}
     User's message: {input_text}
-    Chat history: {chat_history}
+    Chat history: {history_text}
     """
+
+def _apply_orchestration(state, response_text):
+    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+    if json_match:
+        orchestration = json.loads(json_match.group())
+    else:
+        orchestration = {"action": "venue_finder", "reasoning": "Could not parse LLM response", "venues": []}
+    print(f"LLM Orchestrator Decision: {orchestration}")
+    state.update({
+        "orchestration": orchestration,
+        "extracted_venues": orchestration.get("venues", []),
+        "next_action": orchestration.get("action", "venue_finder")
+    })
+    return state
+
+def _orchestration_error(state, e):
+    print(f"Error in LLM orchestrator: {e}")
+    state.update({
+        "orchestration": {"action": "venue_finder", "reasoning": "Error in orchestration", "venues": []},
+        "extracted_venues": [],
+        "next_action": "venue_finder"
+    })
+    return state
+
+async def aorchestrator_node(state: dict) -> dict:
+    """LLM-driven orchestrator: decides which agent to call next based on user query and chat history."""
+    llm = state["llm"]
+    input_text = state["input"]
+    chat_history = state.get("chat_history", [])
+    
+    orchestrator_prompt = _orchestrator_prompt(input_text, chat_history)
     try:
-        response = llm.invoke(orchestrator_prompt)
+        response = await llm.ainvoke(orchestrator_prompt, config={"run_name": "orchestrator"})
         response_text = response.content if hasattr(response, 'content') else str(response)
-        import json, re
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            orchestration = json.loads(json_match.group())
-        else:
-            orchestration = {"action": "venue_finder", "reasoning": "Could not parse LLM response", "venues": []}
-        print(f"LLM Orchestrator Decision: {orchestration}")
-        state.update({
-            "orchestration": orchestration,
-            "extracted_venues": orchestration.get("venues", []),
-            "next_action": orchestration.get("action", "venue_finder")
-        })
-        return state
+        return _apply_orchestration(state, response_text)
     except Exception as e:
-        print(f"Error in LLM orchestrator: {e}")
-        state.update({
-            "orchestration": {"action": "venue_finder", "reasoning": "Error in orchestration", "venues": []},
-            "extracted_venues": [],
-            "next_action": "venue_finder"
-        })
-        return state
+        return _orchestration_error(state, e)
 
 # Main entry point for the graph
 
-def run_llm_orchestrated_graph(llm, input_text, chat_history=None):
+def _asks_for_venues_and_risk(input_text):
+    """Check whether the original query asks for both recommendations and risk."""
+    user_query_lower = input_text.lower()
+    risk_keywords = ["risk", "risks", "safety", "safe", "assessment", "flood", "weather"]
+    venue_keywords = ["venue", "venues", "recommend", "suggest", "find", "conference", "banquet", "resort", "hotel", "hall"]
+    asks_for_risk = any(word in user_query_lower for word in risk_keywords)
+    asks_for_venue = any(word in user_query_lower for word in venue_keywords)
+    return asks_for_risk and asks_for_venue
+
+def _resolve_next_action(analysis_result):
+    next_action = analysis_result.get("next_action", "venue_finder")
+    extracted_venues = analysis_result.get("extracted_venues", [])
+    print(f"LLM decided next action: {next_action}")
+    print(f"Extracted venues: {[v.get('name', 'Unknown') for v in extracted_venues]}")
+
+    # --- FIX: Always show venues before risk assessment if none found yet ---
+    if next_action == "risk_assessment" and not extracted_venues:
+        # No real venues yet, so do venue finding first
+        next_action = "venue_finder"
+    return next_action, extracted_venues
+
+_END_OUTPUT = "Thank you for using the Venue Finder and Risk Assessment system. If you have more questions, feel free to ask!"
+_UNCLEAR_OUTPUT = "I'm not sure how to proceed. Could you clarify your request?"
+
+async def arun_llm_orchestrated_graph(llm, input_text, chat_history=None, emit=None):
+    """Run one orchestrated chat turn. Every LLM, agent and search call is awaited.
+
+    If emit is given, stage markers and user-facing tokens are sent to it as they are produced (see agent.events).
+    """
     state = {
         "llm": llm,
         "input": input_text,
-        "chat_history": chat_history or []
+        "chat_history": chat_history or [],
+        "emit": emit
+    }
+    analysis_state = {
+        "llm": llm,
+        "input": state["input"],
+        "chat_history": state["chat_history"],
+        "venue_output": ""
     }
-    while True:
-        # Let the LLM decide the next action based on user query and chat history
-        analysis_state = {
+    await emit_stage(emit, "analyzing_request", "Analyzing your request")
+    analysis_result = await aintelligent_venue_processor_node(analysis_state)
+    next_action, extracted_venues = _resolve_next_action(analysis_result)
+
+    if next_action in ["venue_finder", "extract_venues"]:
+        venue_state = {
             "llm": llm,
             "input": state["input"],
             "chat_history": state["chat_history"],
-            "venue_output": state.get("venue_output", "")
+            "emit": emit
         }
-        analysis_result = intelligent_venue_processor_node(analysis_state)
-        next_action = analysis_result.get("next_action", "venue_finder")
-        extracted_venues = analysis_result.get("extracted_venues", [])
-        print(f"LLM decided next action: {next_action}")
-        print(f"Extracted venues: {[v.get('name', 'Unknown') for v in extracted_venues]}")
-
-        # --- FIX: Always show venues before risk assessment if none found yet ---
-        if next_action == "risk_assessment" and not extracted_venues:
-            # No real venues yet, so do venue finding first
-            next_action = "venue_finder"
+        venue_result = await ahandle_venue_finding(venue_state)
+        state["output"] = venue_result.get("output", "")
+        state["chat_history"] = venue_result.get("chat_history", state["chat_history"])
 
-        if next_action in ["venue_finder", "extract_venues"]:
-            # Use handle_venue_finding to get venue recommendations
-            venue_state = {
-                "llm": llm,
-                "input": state["input"],
-                "chat_history": state["chat_history"]
+        venues_found = venue_result.get("extracted_venues", [])
+        if _asks_for_venues_and_risk(state["input"]) and venues_found:
+            risk_state = {
+                **state,
+                "extracted_venues": venues_found
             }
-            venue_result = handle_venue_finding(venue_state)
-            state["output"] = venue_result.get("output", "")
-            state["chat_history"] = venue_result.get("chat_history", state["chat_history"])
-            state["venue_output"] = state["output"]
-            # After venue finding, show the venue output to the user and break (do not loop back to LLM)
-
-            # --- NEW: If the original query asks for both recommendations and risk, immediately follow with risk assessment ---
-            user_query_lower = state["input"].lower()
-            risk_keywords = ["risk", "risks", "safety", "safe", "assessment", "flood", "weather"]
-            venue_keywords = ["venue", "venues", "recommend", "suggest", "find", "conference", "banquet", "resort", "hotel", "hall"]
-            asks_for_risk = any(word in user_query_lower for word in risk_keywords)
-            asks_for_venue = any(word in user_query_lower for word in venue_keywords)
-            venues_found = venue_result.get("extracted_venues", [])
-            if asks_for_risk and asks_for_venue and venues_found:
-                # Perform risk assessment for all found venues and append to output
-                risk_state = {
-                    **state,
-                    "extracted_venues": venues_found
-                }
-                risk_result = handle_risk_assessment_request(risk_state)
-                risk_output = risk_result.get("output", "")
-                state["output"] += "\n\n---\n\n" + risk_output
-            break
-        elif next_action == "risk_assessment":
-            state["extracted_venues"] = extracted_venues
-            risk_result = handle_risk_assessment_request(state)
-            state["output"] = risk_result.get("output", "")
-            state["chat_history"] = risk_result.get("chat_history", state["chat_history"])
-            break
-        elif next_action == "end":
-            state["output"] = "Thank you for using the Venue Finder and Risk Assessment system. If you have more questions, feel free to ask!"
-            break
-        else:
-            state["output"] = "I'm not sure how to proceed. Could you clarify your request?"
-            break
+            risk_result = await ahandle_risk_assessment_request(risk_state)
+            state["output"] += "\n\n---\n\n" + risk_result.get("output", "")
+    elif next_action == "risk_assessment":
+        state["extracted_venues"] = extracted_venues
+        risk_result = await ahandle_risk_assessment_request(state)
+        state["output"] = risk_result.get("output", "")
+        state["chat_history"] = risk_result.get("chat_history", state["chat_history"])
+    elif next_action == "end":
+        state["output"] = _END_OUTPUT
+    else:
+        state["output"] = _UNCLEAR_OUTPUT
     return state["output"], state["chat_history"]
 
+def run_llm_orchestrated_graph(llm, input_text, chat_history=None):
+    """Blocking wrapper around arun_llm_orchestrated_graph for scripts; not for use inside an event loop."""
+    return asyncio.run(arun_llm_orchestrated_graph(llm, input_text, chat_history))
+
 def build_venue_finder_graph():
     print("build_venue_finder_graph called")
     graph = StateGraph(dict)
@@ -491,7 +618,7 @@ def build_venue_finder_graph():
     
     # Add nodes - only collaborative workflow
     graph.add_node("router", router_node)
-    graph.add_node("collaborative", interactive_collaborative_node)
+    graph.add_node("collaborative", ainteractive_collaborative_node)
     
     graph.set_entry_point("router")
     
@@ -505,16 +632,15 @@ def build_venue_finder_graph():
     print("Compiled graph in build_venue_finder_graph:", compiled)
     return compiled
 
+@lru_cache(maxsize=1)
+def get_venue_finder_graph():
+    """Compiled graph shared across requests; compiled graphs are stateless between invocations."""
+    return build_venue_finder_graph()
+
 # Expose a function to run the graph
 
-def run_venue_finder_graph(llm: BaseLanguageModel, input_text: str, chat_history=None):
-    # print("run_venue_finder_graph called with:")
-    # print("  llm:", llm)
-    # print("  input_text:", input_text)
-    # print("  chat_history:", chat_history)
-    compiled_graph = build_venue_finder_graph()
-    # print("Compiled graph:", compiled_graph)
-    
+async def arun_venue_finder_graph(llm: BaseLanguageModel, input_text: str, chat_history=None):
+    """Run the graph for one chat turn; every node is async, so nothing blocks the event loop."""
     # Extract venues from chat history if they exist
     extracted_venues = []
     if chat_history:
@@ -523,7 +649,6 @@ def run_venue_finder_graph(llm: BaseLanguageModel, input_text: str, chat_history
             if hasattr(msg, 'content') and isinstance(msg.content, str) and "VENUES_STORED:" in msg.content:
                 # Extract venues from the special message
                 try:
-                    import json
                     venues_str = msg.content.split("VENUES_STORED:")[1].strip()
                     extracted_venues = json.loads(venues_str)
                     break
@@ -536,16 +661,13 @@ def run_venue_finder_graph(llm: BaseLanguageModel, input_text: str, chat_history
         "chat_history": chat_history or [],
         "extracted_venues": extracted_venues  # Pass venues from previous conversation
     }
-    # print("State to be passed to graph:", state)
-    result = compiled_graph.invoke(state)
-    # print("Graph result keys:", list(result.keys()) if isinstance(result, dict) else "Not a dict")
-    
+    result = await get_venue_finder_graph().ainvoke(state)
+
     # Store venues in chat history for next call
     updated_chat_history = result.get("chat_history", chat_history or [])
     if "extracted_venues" in result and result["extracted_venues"]:
         # Add venues to chat history as a special message
         from langchain.schema import HumanMessage
-        import json
         venues_json = json.dumps(result["extracted_venues"])
         venue_msg = HumanMessage(content=f"VENUES_STORED:{venues_json}")
         updated_chat_history.append(venue_msg)
@@ -559,4 +681,8 @@ def run_venue_finder_graph(llm: BaseLanguageModel, input_text: str, chat_history
         return result["output"], updated_chat_history
     else:
         print("No output found in result, returning error message")
-        return "I apologize, but I encountered an error processing your request.", updated_chat_history 
\ No newline at end of file
+        return "I apologize, but I encountered an error processing your request.", updated_chat_history
+
+def run_venue_finder_graph(llm: BaseLanguageModel, input_text: str, chat_history=None):
+    """Blocking wrapper around arun_venue_finder_graph for scripts; not for use inside an event loop."""
+    return asyncio.run(arun_venue_finder_graph(llm, input_text, chat_history))
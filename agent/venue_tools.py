@@ -0,0 +1,354 @@
+"""
+Catalog-first venue tools for the venue agent.
+
+Each tool answers from the local venue catalog (venues.db) when it can and only
+falls back to a Serper web search when the catalog has too few matches
+(VENUE_CATALOG_MIN_MATCHES) or does not know the venue. Free-text tool input is
+parsed for location (gazetteer), capacity, budget, dates, food preference and
+the catalog's own amenity, event type and purpose names; catalog matches that
+mention more of the request's words (full-text index) are listed first, or with
+VENUE_TOOLS_SEMANTIC=true those closest to the request in meaning (local
+vector index), so "offsite" also favours retreats.
+
+"within 15 km of <place>" is a radius search around the gazetteer place,
+nearest first. A place with too few venues by name is widened to its parent
+city, then to venues within VENUE_NEARBY_RADIUS_KM of it.
+
+Answers per tool are recorded in VENUE_TOOL_STATS; every catalog answer is a
+Serper call avoided.
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from agent.gazetteer import get_gazetteer
+from models.venue_catalog import get_venue_catalog
+from utils.search_cache import get_cached_search
+from utils.time_expressions import DateRange, parse_time_expression
+
+VENUE_CATALOG_MIN_MATCHES = int(os.getenv("VENUE_CATALOG_MIN_MATCHES", "3"))
+VENUE_CATALOG_LIMIT = int(os.getenv("VENUE_CATALOG_LIMIT", "10"))
+VENUE_NEARBY_RADIUS_KM = float(os.getenv("VENUE_NEARBY_RADIUS_KM", "25"))
+VENUE_TOOLS_SEMANTIC = os.getenv("VENUE_TOOLS_SEMANTIC", "false").lower() in ("1", "true", "yes")
+
+# tool name -> {"catalog": answers from the catalog, "web": web search fallbacks}
+VENUE_TOOL_STATS: Dict[str, Dict[str, int]] = {}
+
+_CAPACITY = re.compile(
+    r"(\d[\d,]*)\s*\+?\s*(?:people|guests|attendees|pax|persons|participants|delegates|members|heads)\b"
+    r"|capacity\s*(?:of\s*)?(\d[\d,]*)"
+)
+_BUDGET = re.compile(
+    r"(?:under|below|within|upto|up to|less than|max(?:imum)?|budget(?:\s+of)?)\s*(?:rs\.?|inr|₹)?\s*"
+    r"(\d+(?:[.,]\d+)*)\s*(lakhs?|lacs?|l|k|thousand|crores?|cr)?\b"
+)
+_BUDGET_MULTIPLIERS = {"lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5, "l": 1e5, "k": 1e3, "thousand": 1e3,
+                       "crore": 1e7, "crores": 1e7, "cr": 1e7}
+_RADIUS = re.compile(r"\b(?:within|in|under|upto|up to)\s*(?:a\s+)?(\d+(?:\.\d+)?)\s*(?:km|kms|kilomet(?:er|re)s?)\b")
+_NON_VEG = re.compile(r"\bnon[\s-]?veg(?:etarian)?\b")
+_VEG = re.compile(r"\bveg(?:etarian)?\b")
+_VENUE_LIST_SEPARATORS = re.compile(r"\s*(?:,|;|\band\b|\bvs\.?|\bversus\b)\s*")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9₹]+", " ", text.lower()).split())
+
+
+@dataclass
+class VenueRequest:
+    """Structured filters parsed from a free-text venue request."""
+    locations: List[str] = field(default_factory=list)
+    nearby: List[str] = field(default_factory=list)  # parent city of a locality, tried when the locality has no venues
+    point: Optional[Tuple[float, float]] = None  # (latitude, longitude) of the place
+    radius_km: Optional[float] = None  # "within 15 km of ...": search around point instead of by location name
+    min_capacity: Optional[int] = None
+    max_price: Optional[float] = None
+    amenities: List[str] = field(default_factory=list)
+    event_types: List[str] = field(default_factory=list)
+    purposes: List[str] = field(default_factory=list)
+    period: Optional[DateRange] = None
+    veg: bool = False
+    non_veg: bool = False
+    text: str = ""  # the request itself, to rank catalog venues by how well they match it
+
+    def describe(self) -> str:
+        parts = [", ".join(self.locations)] if self.locations else []
+        if parts and self.radius_km:
+            parts[0] = f"within {self.radius_km:g} km of {parts[0]}"
+        if self.min_capacity:
+            parts.append(f"{self.min_capacity}+ guests")
+        if self.max_price:
+            parts.append(f"up to ₹{self.max_price:,.0f} per day")
+        parts.extend(self.purposes or self.event_types)
+        if self.amenities:
+            parts.append("with " + ", ".join(self.amenities))
+        if self.period:
+            parts.append(self.period.label)
+        return "; ".join(parts)
+
+
+def _vocabulary_matches(text: str, names: List[str]) -> List[str]:
+    """Catalog names mentioned in text, ignoring case, punctuation and a plural s ("Wi-Fi" matches "wifi")."""
+    found = []
+    padded = f" {text} "
+    for name in names:
+        variant = _normalize(name)
+        for candidate in {variant, variant.replace(" ", "")}:
+            if candidate and re.search(rf" {re.escape(candidate)}s? ", padded):
+                found.append(name)
+                break
+    return found
+
+
+def parse_venue_request(text: str, vocabulary: Optional[Dict[str, List[str]]] = None) -> VenueRequest:
+    lowered = text.lower()
+    normalized = _normalize(text)
+    request = VenueRequest(text=text)
+
+    place = get_gazetteer().find(text)
+    if place is not None:
+        request.locations = [place.name]
+        if place.parent:
+            request.nearby = [place.parent]
+        request.point = (place.latitude, place.longitude)
+
+    radius = _RADIUS.search(lowered)
+    if radius:
+        request.radius_km = float(radius.group(1))
+        lowered = lowered[:radius.start()] + " " + lowered[radius.end():]  # not a budget ("within 15")
+
+    capacity = _CAPACITY.search(lowered)
+    if capacity:
+        request.min_capacity = int((capacity.group(1) or capacity.group(2)).replace(",", ""))
+    budget = _BUDGET.search(lowered)
+    if budget:
+        amount = float(budget.group(1).replace(",", ""))
+        request.max_price = amount * _BUDGET_MULTIPLIERS.get(budget.group(2) or "", 1)
+
+    request.non_veg = bool(_NON_VEG.search(lowered))
+    request.veg = bool(_VEG.search(_NON_VEG.sub(" ", lowered)))
+    request.period = parse_time_expression(text)
+
+    vocabulary = vocabulary if vocabulary is not None else get_venue_catalog().vocabulary()
+    request.amenities = _vocabulary_matches(normalized, vocabulary.get("amenities", []))
+    request.event_types = _vocabulary_matches(normalized, vocabulary.get("event_types", []))
+    request.purposes = _vocabulary_matches(normalized, vocabulary.get("purposes", []))
+    return request
+
+
+def _record(tool: str, source: str) -> None:
+    stats = VENUE_TOOL_STATS.setdefault(tool, {"catalog": 0, "web": 0})
+    stats[source] += 1
+
+
+def venue_tool_stats() -> Dict:
+    """Catalog answers vs web searches per tool since process start."""
+    catalog = sum(stats["catalog"] for stats in VENUE_TOOL_STATS.values())
+    web = sum(stats["web"] for stats in VENUE_TOOL_STATS.values())
+    return {
+        "by_tool": {tool: dict(stats) for tool, stats in VENUE_TOOL_STATS.items()},
+        "serper_calls_avoided": catalog,
+        "web_searches": web,
+        "catalog_ratio": round(catalog / (catalog + web), 3) if catalog + web else 0.0,
+    }
+
+
+# --- Formatting ---
+def _format_date(day: date) -> str:
+    return day.strftime("%d %b %Y").lstrip("0")
+
+
+def format_venue(venue: Dict) -> str:
+    food = [label for label, flag in (("Veg", venue["has_veg"]), ("Non-veg", venue["has_non_veg"])) if flag]
+    lines = [
+        f"**{venue['name']}** (ID {venue['venue_id']}) - {venue['location']}"
+        + (f" ({venue['distance_km']:g} km away)" if venue.get("distance_km") is not None else ""),
+        f"  - Capacity: {venue['capacity']} guests",
+        f"  - Price: ₹{venue['price_per_day']:,.0f} per day",
+        f"  - Event types: {', '.join(venue['event_types']) or 'Not listed'}",
+        f"  - Suitable for: {', '.join(venue['purposes']) or 'Not listed'}",
+        f"  - Amenities: {', '.join(venue['amenities']) or 'Not listed'}",
+        f"  - Food: {', '.join(food) or 'Not listed'}",
+        f"  - Available: {'; '.join(f'{_format_date(s)} - {_format_date(e)}' for s, e in venue['available_dates']) or 'Not listed'}",
+        f"  - Contact: {venue['contact_number']}",
+    ]
+    if venue.get("description"):
+        lines.append(f"  - About: {venue['description']}")
+    return "\n".join(lines)
+
+
+def format_catalog_venues(venues: List[Dict], request: VenueRequest) -> str:
+    header = f"Found {len(venues)} venue{'' if len(venues) == 1 else 's'} in the VenueAI catalog"
+    if request.describe():
+        header += f" for {request.describe()}"
+    return header + ":\n\n" + "\n\n".join(f"{i}. {format_venue(v)}" for i, v in enumerate(venues, 1))
+
+
+def format_venue_comparison(venues: List[Dict]) -> str:
+    rows = [
+        ("Location", lambda v: v["location"]),
+        ("Capacity", lambda v: str(v["capacity"])),
+        ("Price per day", lambda v: f"₹{v['price_per_day']:,.0f}"),
+        ("Event types", lambda v: ", ".join(v["event_types"])),
+        ("Suitable for", lambda v: ", ".join(v["purposes"])),
+        ("Amenities", lambda v: ", ".join(v["amenities"])),
+        ("Veg / Non-veg", lambda v: f"{'Yes' if v['has_veg'] else 'No'} / {'Yes' if v['has_non_veg'] else 'No'}"),
+    ]
+    lines = [
+        "| Feature | " + " | ".join(f"{v['name']} ({v['venue_id']})" for v in venues) + " |",
+        "|---------|" + "|".join("---" for _ in venues) + "|",
+    ]
+    lines.extend(f"| {label} | " + " | ".join(value(v) or "-" for v in venues) + " |" for label, value in rows)
+    return "\n".join(lines)
+
+
+# --- Catalog lookups ---
+def _catalog_filters(request: VenueRequest) -> Dict:
+    return dict(
+        min_capacity=request.min_capacity, max_price=request.max_price, amenities=request.amenities,
+        event_types=request.event_types, purposes=request.purposes, veg=request.veg, non_veg=request.non_veg,
+        available_from=request.period.start if request.period else None,
+        available_to=request.period.end if request.period else None,
+        text=request.text, semantic=VENUE_TOOLS_SEMANTIC, limit=VENUE_CATALOG_LIMIT,
+    )
+
+
+def _catalog_matches(request: VenueRequest) -> List[Dict]:
+    """Catalog venues for the request; the parent city, then the surrounding area, is tried when a place has too few."""
+    if not request.locations:
+        return []
+    try:
+        catalog = get_venue_catalog()
+        if request.radius_km and request.point:
+            return catalog.search((), near=request.point, radius_km=request.radius_km, **_catalog_filters(request))
+        venues = catalog.search(request.locations, **_catalog_filters(request))
+        if len(venues) < VENUE_CATALOG_MIN_MATCHES and request.nearby:
+            venues = catalog.search(request.locations + request.nearby, **_catalog_filters(request))
+        if len(venues) < VENUE_CATALOG_MIN_MATCHES and request.point:
+            around = catalog.search((), near=request.point, radius_km=VENUE_NEARBY_RADIUS_KM, **_catalog_filters(request))
+            venues = around if len(around) > len(venues) else venues
+        return venues
+    except Exception as e:
+        print(f"Venue catalog search failed: {e}")
+        return []
+
+
+async def _acatalog_matches(request: VenueRequest) -> List[Dict]:
+    if not request.locations:
+        return []
+    try:
+        catalog = get_venue_catalog()
+        if request.radius_km and request.point:
+            return await catalog.asearch((), near=request.point, radius_km=request.radius_km, **_catalog_filters(request))
+        venues = await catalog.asearch(request.locations, **_catalog_filters(request))
+        if len(venues) < VENUE_CATALOG_MIN_MATCHES and request.nearby:
+            venues = await catalog.asearch(request.locations + request.nearby, **_catalog_filters(request))
+        if len(venues) < VENUE_CATALOG_MIN_MATCHES and request.point:
+            around = await catalog.asearch((), near=request.point, radius_km=VENUE_NEARBY_RADIUS_KM,
+                                           **_catalog_filters(request))
+            venues = around if len(around) > len(venues) else venues
+        return venues
+    except Exception as e:
+        print(f"Venue catalog search failed: {e}")
+        return []
+
+
+def _parse_request(query: str) -> VenueRequest:
+    try:
+        return parse_venue_request(query)
+    except Exception as e:
+        print(f"Venue catalog unavailable: {e}")
+        return VenueRequest()
+
+
+def _with_catalog_matches(web_result: str, venues: List[Dict], request: VenueRequest) -> str:
+    if not venues:
+        return web_result
+    return f"{format_catalog_venues(venues, request)}\n\nWeb search results:\n{web_result}"
+
+
+def search_venues(query: str) -> str:
+    """web_search_venues: catalog first, Serper when the catalog has fewer than VENUE_CATALOG_MIN_MATCHES venues."""
+    request = _parse_request(query)
+    venues = _catalog_matches(request)
+    if len(venues) >= VENUE_CATALOG_MIN_MATCHES:
+        _record("web_search_venues", "catalog")
+        print(f"Venue catalog answered with {len(venues)} venues: {request.describe()}")
+        return format_catalog_venues(venues, request)
+    _record("web_search_venues", "web")
+    return _with_catalog_matches(get_cached_search().run(query, category="venues"), venues, request)
+
+
+async def asearch_venues(query: str) -> str:
+    request = _parse_request(query)
+    venues = await _acatalog_matches(request)
+    if len(venues) >= VENUE_CATALOG_MIN_MATCHES:
+        _record("web_search_venues", "catalog")
+        print(f"Venue catalog answered with {len(venues)} venues: {request.describe()}")
+        return format_catalog_venues(venues, request)
+    _record("web_search_venues", "web")
+    return _with_catalog_matches(await get_cached_search().arun(query, category="venues"), venues, request)
+
+
+def _lookup_venue(venue_ref: str) -> Optional[Dict]:
+    try:
+        return get_venue_catalog().get(venue_ref)
+    except Exception as e:
+        print(f"Venue catalog lookup failed: {e}")
+        return None
+
+
+def get_venue_details(venue_ref: str) -> str:
+    """get_venue_details: a catalog venue by ID or name, else a web search for it."""
+    venue = _lookup_venue(venue_ref)
+    if venue is not None:
+        _record("get_venue_details", "catalog")
+        return format_venue(venue)
+    _record("get_venue_details", "web")
+    return get_cached_search().run(f"{venue_ref} venue details capacity price amenities", category="venues")
+
+
+def compare_venues(venue_refs: str) -> str:
+    """compare_venues: a comparison table of catalog venues; venues not in the catalog are web-searched together."""
+    refs = [ref for ref in _VENUE_LIST_SEPARATORS.split(venue_refs.strip()) if ref.strip()]
+    found, missing = [], []
+    for ref in refs:
+        venue = _lookup_venue(ref)
+        if venue is not None and venue not in found:
+            found.append(venue)
+        elif venue is None:
+            missing.append(ref.strip())
+    if not missing:
+        _record("compare_venues", "catalog")
+        return format_venue_comparison(found) if found else "No venues given to compare."
+    _record("compare_venues", "web")
+    web_result = get_cached_search().run(f"compare venues {' vs '.join(missing)}", category="venues")
+    if not found:
+        return web_result
+    return f"{format_venue_comparison(found)}\n\nNot in the catalog ({', '.join(missing)}), web search results:\n{web_result}"
+
+
+def check_location_availability(location: str) -> str:
+    """check_location_availability: catalog venue count, capacity and price range for a place (and dates)."""
+    request = _parse_request(location)
+    if request.locations:
+        try:
+            catalog = get_venue_catalog()
+            summary = catalog.location_summary(request.locations)
+            if summary["count"]:
+                answer = (
+                    f"The VenueAI catalog has {summary['count']} venues in {', '.join(request.locations)} "
+                    f"(capacity {summary['min_capacity']}-{summary['max_capacity']} guests, "
+                    f"₹{summary['min_price']:,.0f}-₹{summary['max_price']:,.0f} per day)."
+                )
+                if request.period:
+                    available = catalog.available_count(request.locations, request.period.start, request.period.end)
+                    answer += f" {available} of them are available during {request.period.label}."
+                _record("check_location_availability", "catalog")
+                return answer
+        except Exception as e:
+            print(f"Venue catalog lookup failed: {e}")
+    _record("check_location_availability", "web")
+    return get_cached_search().run(f"event venues in {location}", category="venues")
@@ -1,12 +1,29 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-from agent.venue_graph import run_venue_finder_graph, run_llm_orchestrated_graph
+from agent.venue_graph import arun_venue_finder_graph, arun_llm_orchestrated_graph, get_venue_finder_graph
+from agent.venue_agent import get_venue_agent_executor
 from models.venue_models import VenueSearchCriteria, VenueSearchResponse, VenueComparison
+from agent.history import history_savings
+from agent.gazetteer import get_gazetteer
+from agent.venue_tools import venue_tool_stats
+from models.database import dispose_async_engine
+from models.venue_search import SearchPointError, asearch_venue_page
+from models.venue_snapshot import get_venue_snapshot
+from models.venue_vectors import get_venue_vector_index
+from utils.session_store import create_session_store
+from utils.llm_metrics import count_llm_calls, llm_call_stats
+from utils.resilience import resilience_stats, resilient_llm
+from utils.risk_baselines import get_risk_baseline_store
+from utils.risk_report_cache import get_risk_report_cache
+from utils.search_cache import get_search_cache
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
 import os
+import json
+import asyncio
 import logging
 
 # Configure logging
@@ -31,17 +48,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize the LLM
-llm = ChatGoogleGenerativeAI(
+# Initialize the LLM; calls get timeouts, retries and a circuit breaker (see utils/resilience.py)
+llm = resilient_llm(ChatGoogleGenerativeAI(
     model="gemini-2.0-flash",
     temperature=0,
     google_api_key=os.getenv("GOOGLE_API_KEY"),
     convert_system_message_to_human=True
-)
+))
 logger.info("LLM initialized successfully")
 
-# Store chat history in memory for /api/chat endpoint
-chat_histories = {}
+# Build the shared graph and venue agent once at startup instead of on the first request.
+# The venue database schema is created and migrated by scripts/init_db.py, not here.
+try:
+    get_venue_finder_graph()
+    get_venue_agent_executor(llm)
+    get_gazetteer()
+    if get_venue_snapshot() is not None:
+        get_venue_snapshot().refresh()
+    get_venue_vector_index()
+    logger.info("Venue finder graph, agent, gazetteer, snapshot and vectors initialized")
+except Exception as e:
+    logger.warning(f"Deferred venue agent initialization: {str(e)}")
+
+@app.on_event("shutdown")
+async def close_venue_database():
+    await dispose_async_engine()
+
+# Chat history store for /api/chat endpoints (bounded; backend chosen by SESSION_STORE_BACKEND)
+session_store = create_session_store()
 
 class ChatRequest(BaseModel):
     message: str
@@ -55,43 +89,83 @@ async def chat(request: ChatRequest):
     """Process a chat message and return the agent's response."""
     try:
         session_id = request.session_id or "default"
-        chat_history = chat_histories.get(session_id, [])
+        chat_history = await session_store.aget(session_id)
         
         logger.info(f"Processing chat request: {request.message}")
         logger.info(f"Session ID: {session_id}")
         logger.info(f"Chat history length: {len(chat_history)}")
         
-        response, updated_history = run_llm_orchestrated_graph(llm, request.message, chat_history)
+        with count_llm_calls() as llm_calls:
+            response, updated_history = await arun_llm_orchestrated_graph(llm, request.message, chat_history)
         
         # Store updated chat history
-        chat_histories[session_id] = updated_history
+        await session_store.aset(session_id, updated_history)
         
-        logger.info(f"Response generated successfully. Length: {len(response)}")
+        logger.info(f"Response generated successfully. Length: {len(response)}, {llm_calls.summary()}")
         
         return ChatResponse(response=response)
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse_message(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Process a chat message, streaming stage markers and tokens as Server-Sent Events.
+
+    Emits `stage`, `token`, `venue_risk` (one per assessed venue) and `risk_scores` events while the pipeline runs, then a final `done`
+    event carrying the complete response (or an `error` event).
+    """
+    session_id = request.session_id or "default"
+    chat_history = await session_store.aget(session_id)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    logger.info(f"Processing streaming chat request: {request.message}")
+    logger.info(f"Session ID: {session_id}")
+
+    async def emit(event: str, data: dict):
+        await queue.put((event, data))
+
+    async def run_pipeline():
+        try:
+            with count_llm_calls() as llm_calls:
+                response, updated_history = await arun_llm_orchestrated_graph(llm, request.message, chat_history, emit=emit)
+            await session_store.aset(session_id, updated_history)
+            logger.info(f"Streamed response generated successfully. Length: {len(response)}, {llm_calls.summary()}")
+            await queue.put(("done", {"response": response}))
+        except Exception as e:
+            logger.error(f"Error in chat stream endpoint: {str(e)}")
+            await queue.put(("error", {"detail": str(e)}))
+
+    async def event_stream():
+        yield _sse_message("stage", {"stage": "received", "message": "Request received"})
+        task = asyncio.create_task(run_pipeline())
+        try:
+            while True:
+                event, data = await queue.get()
+                yield _sse_message(event, data)
+                if event in ("done", "error"):
+                    break
+        finally:
+            # Client disconnected before completion
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/venue/search", response_model=VenueSearchResponse)
 async def search_venues(criteria: VenueSearchCriteria):
-    """Search for venues based on the provided criteria."""
+    """Search the venue catalog with structured filters (no LLM), one page at a time."""
     try:
-        query = f"Find venues in {criteria.location} for {criteria.event_type} event "
-        query += f"from {criteria.start_date} to {criteria.end_date} "
-        query += f"with capacity {criteria.min_capacity} to {criteria.max_capacity} "
-        query += f"and {criteria.food_preference} food options"
-        
-        logger.info(f"Venue search query: {query}")
-        
-        response, _ = run_venue_finder_graph(llm, query, [])
-        # TODO: Parse response and convert to VenueSearchResponse
-        return VenueSearchResponse(
-            venues=[],
-            total_count=0,
-            page=1,
-            total_pages=1
-        )
+        return await asearch_venue_page(criteria)
+    except SearchPointError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in venue search: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -100,7 +174,7 @@ async def search_venues(criteria: VenueSearchCriteria):
 async def get_venue_details(venue_id: str):
     """Get detailed information about a specific venue."""
     try:
-        response, _ = run_venue_finder_graph(llm, f"Get details for venue {venue_id}", [])
+        response, _ = await arun_venue_finder_graph(llm, f"Get details for venue {venue_id}", [])
         # TODO: Parse response and return venue details
         return {"message": "Venue details retrieved successfully"}
     except Exception as e:
@@ -111,13 +185,36 @@ async def get_venue_details(venue_id: str):
 async def compare_venues(venue_ids: List[str]):
     """Compare multiple venues."""
     try:
-        response, _ = run_venue_finder_graph(llm, f"Compare venues {', '.join(venue_ids)}", [])
+        response, _ = await arun_venue_finder_graph(llm, f"Compare venues {', '.join(venue_ids)}", [])
         # TODO: Parse response and return comparison
         return {"message": "Venue comparison completed successfully"}
     except Exception as e:
         logger.error(f"Error comparing venues: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _stats(component):
+    return component.stats() if component is not None else None
+
+def _metrics() -> dict:
+    return {
+        "sessions": session_store.stats(),
+        "history_compaction": history_savings(),
+        "llm_calls": llm_call_stats(),
+        "search_cache": _stats(get_search_cache()),
+        "risk_report_cache": _stats(get_risk_report_cache()),
+        "risk_baselines": _stats(get_risk_baseline_store()),
+        "resilience": resilience_stats(),
+        "venue_catalog": venue_tool_stats(),
+        "venue_snapshot": _stats(get_venue_snapshot()),
+        "venue_vectors": _stats(get_venue_vector_index()),
+    }
+
+@app.get("/api/metrics")
+async def metrics():
+    """Process-level performance counters."""
+    # The session store and the caches count their rows in SQLite
+    return await asyncio.to_thread(_metrics)
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
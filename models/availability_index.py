@@ -0,0 +1,72 @@
+"""
+Interval index over venue availability windows.
+
+Windows are inclusive day ranges (days since 1970-01-01) owned by a venue row
+id. Each venue's windows are merged first, so windows that overlap or touch
+(one ends the day before the next starts) count as one continuous stretch,
+and a venue is free for a range when a single merged interval contains it.
+
+Merged intervals are bucketed by length class (2^k <= length < 2^(k+1)) and
+sorted by start. An interval of class k that reaches day d must start in
+(d - 2^(k+1), d], so a query is one binary search per class followed by a
+vectorized check of that slice only, instead of a scan of every window.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+
+def merge_windows(owners: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per owner, merge overlapping or adjacent inclusive intervals; returns (owners, starts, ends) sorted by owner, start."""
+    owners, starts, ends = (np.asarray(a, dtype=np.int64) for a in (owners, starts, ends))
+    valid = ends >= starts
+    owners, starts, ends = owners[valid], starts[valid], ends[valid]
+    if not len(owners):
+        return owners, starts, ends
+    order = np.lexsort((starts, owners))
+    owners, starts, ends = owners[order], starts[order], ends[order]
+    # Running max of the end within each owner: shift each owner's ends above the previous owner's
+    group = np.concatenate([[0], np.cumsum(owners[1:] != owners[:-1])])
+    offset = group * (int(ends.max() - ends.min()) + 2)
+    reach = np.maximum.accumulate(ends - ends.min() + offset) - offset + ends.min()
+    heads = np.ones(len(owners), dtype=bool)
+    heads[1:] = (owners[1:] != owners[:-1]) | (starts[1:] > reach[:-1] + 1)
+    head_positions = np.flatnonzero(heads)
+    return owners[head_positions], starts[head_positions], np.maximum.reduceat(ends, head_positions)
+
+
+class AvailabilityIndex:
+    """Containment and overlap queries over merged availability windows."""
+
+    def __init__(self, owners, starts, ends):
+        owners, starts, ends = merge_windows(owners, starts, ends)
+        self.intervals = len(owners)
+        lengths = ends - starts + 1
+        classes = np.floor(np.log2(lengths)).astype(np.int64) if len(lengths) else lengths
+        # (longest possible length, starts, ends, owners) per length class, sorted by start
+        self._buckets: List[Tuple[int, np.ndarray, np.ndarray, np.ndarray]] = []
+        for k in np.unique(classes):
+            members = np.flatnonzero(classes == k)
+            members = members[np.argsort(starts[members], kind="stable")]
+            self._buckets.append((2 ** (int(k) + 1) - 1, starts[members], ends[members], owners[members]))
+
+    def _reaching(self, max_start: int, min_end: int) -> np.ndarray:
+        """Owners of intervals with start <= max_start and end >= min_end."""
+        found = []
+        for longest, starts, ends, owners in self._buckets:
+            # An interval of this class starting before min_end - longest + 1 ends before min_end
+            lo = np.searchsorted(starts, min_end - longest + 1, side="left")
+            hi = np.searchsorted(starts, max_start, side="right")
+            if hi > lo:
+                found.append(owners[lo:hi][ends[lo:hi] >= min_end])
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+    def containing(self, start: int, end: int) -> np.ndarray:
+        """Owners with one merged interval covering every day of start..end (one entry per owner)."""
+        start, end = min(start, end), max(start, end)
+        return self._reaching(start, end)
+
+    def overlapping(self, start: int, end: int) -> np.ndarray:
+        """Owners with availability on at least one day of start..end, sorted and unique."""
+        start, end = min(start, end), max(start, end)
+        return np.unique(self._reaching(end, start))
@@ -1 +1,383 @@
+"""
+SQLAlchemy models for the venue catalog in venues.db.
 
+The mapping follows the existing schema: venues with many-to-many amenities,
+event types and purposes, and one-to-many availability windows. The database
+location comes from VENUES_DATABASE_URL (default: venues.db in the project root).
+
+Connection handling:
+- every SQLite connection gets SQLITE_PRAGMAS (WAL, synchronous=NORMAL, a larger
+  page cache, memory-mapped reads, a busy timeout and foreign keys)
+- connections are pooled (VENUES_DB_POOL_SIZE, VENUES_DB_MAX_OVERFLOW, VENUES_DB_POOL_TIMEOUT)
+- get_async_sessionmaker() gives sessions on an aiosqlite engine with the same
+  settings; aiosqlite is optional and only needed when it is used
+- with_venue_relations() eager-loads a venue's amenities, event types, purposes
+  and dates with one extra query each instead of one per venue (N+1)
+
+Indexes for the structured venue search (models/venue_search.py) are declared
+here; ensure_indexes() adds any that an existing database is missing.
+Nullable columns added to a model later (e.g. venue latitude and longitude)
+are added to existing tables by ensure_columns(). init_db() runs all of this; it
+is called by scripts/init_db.py and the maintenance scripts, never on import.
+
+venue_changes is a change log filled by SQLite triggers on every catalog table,
+so the in-memory snapshot (models/venue_snapshot.py) can reload only the venues
+that changed. create_all() (init_db) creates the table and the triggers.
+init_db() and rebuild_venue_fts() prune it to the newest VENUE_CHANGES_KEEP
+rows; a reader that missed pruned rows (venue_changes_after() returns None)
+reloads everything.
+
+venues_fts is an FTS5 full-text index over venue name, description and
+location (external content: it reads the text from venues), kept in sync by
+triggers and created the same way; rebuild_venue_fts() re-indexes everything.
+"""
+import os
+
+from sqlalchemy import (Boolean, Column, Date, Float, ForeignKey, Index, Integer, String, Table, create_engine, delete,
+                        event, func, inspect, select, text)
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import declarative_base, relationship, selectinload, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATABASE_URL = os.getenv("VENUES_DATABASE_URL", f"sqlite:///{os.path.join(_PROJECT_ROOT, 'venues.db')}")
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",  # readers don't block the writer
+    "synchronous": "NORMAL",  # safe with WAL, far fewer fsyncs than FULL
+    "foreign_keys": "ON",
+    "busy_timeout": 5000,  # ms to wait for a lock instead of failing with "database is locked"
+    "cache_size": -32000,  # 32 MB page cache per connection
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+
+def _is_sqlite(url) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _engine_options(url, poolclass) -> dict:
+    # Pooled connections move between threads; SQLite's same-thread check would reject that
+    options = {"connect_args": {"check_same_thread": False}} if _is_sqlite(url) else {}
+    if _is_sqlite(url) and make_url(url).database in (None, "", ":memory:"):
+        # A pool of in-memory databases would give each connection its own empty database
+        return options
+    return {
+        **options,
+        "poolclass": poolclass,
+        "pool_size": int(os.getenv("VENUES_DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("VENUES_DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("VENUES_DB_POOL_TIMEOUT", "30")),
+    }
+
+
+def create_venue_engine(url: str = DATABASE_URL):
+    """Pooled engine with the SQLite pragmas applied to every new connection."""
+    new_engine = create_engine(url, **_engine_options(url, QueuePool))
+    if _is_sqlite(url):
+        event.listen(new_engine, "connect", _apply_sqlite_pragmas)
+    return new_engine
+
+
+engine = create_venue_engine()
+SessionLocal = sessionmaker(bind=engine, autoflush=False)
+Base = declarative_base()
+
+# --- Association tables ---
+venue_amenities = Table(
+    "venue_amenities", Base.metadata,
+    Column("venue_id", Integer, ForeignKey("venues.id")),
+    Column("amenity_id", Integer, ForeignKey("amenities.id")),
+)
+
+venue_event_types = Table(
+    "venue_event_types", Base.metadata,
+    Column("venue_id", Integer, ForeignKey("venues.id")),
+    Column("event_type_id", Integer, ForeignKey("event_types.id")),
+)
+
+venue_purposes = Table(
+    "venue_purposes", Base.metadata,
+    Column("venue_id", Integer, ForeignKey("venues.id")),
+    Column("purpose_id", Integer, ForeignKey("purposes.id")),
+)
+
+
+# --- Models ---
+class Venue(Base):
+    __tablename__ = "venues"
+
+    id = Column(Integer, primary_key=True)
+    venue_id = Column(String(10), unique=True, nullable=False)
+    name = Column(String(100), nullable=False)
+    location = Column(String(100), nullable=False)
+    capacity = Column(Integer, nullable=False)
+    price_per_day = Column(Float, nullable=False)
+    contact_number = Column(String(20), nullable=False)
+    description = Column(String(500))
+    has_veg = Column(Boolean)
+    has_non_veg = Column(Boolean)
+    # WGS84 coordinates for radius search; NULL until geocoded (scripts/geocode_venues.py)
+    latitude = Column(Float)
+    longitude = Column(Float)
+
+    amenities = relationship("Amenity", secondary=venue_amenities, back_populates="venues")
+    event_types = relationship("EventType", secondary=venue_event_types, back_populates="venues")
+    purposes = relationship("Purpose", secondary=venue_purposes, back_populates="venues")
+    available_dates = relationship("AvailableDate", back_populates="venue", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<Venue {self.venue_id} {self.name!r}>"
+
+
+class Amenity(Base):
+    __tablename__ = "amenities"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), unique=True, nullable=False)
+
+    venues = relationship("Venue", secondary=venue_amenities, back_populates="amenities")
+
+
+class EventType(Base):
+    __tablename__ = "event_types"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), unique=True, nullable=False)
+
+    venues = relationship("Venue", secondary=venue_event_types, back_populates="event_types")
+
+
+class Purpose(Base):
+    __tablename__ = "purposes"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), unique=True, nullable=False)
+
+    venues = relationship("Venue", secondary=venue_purposes, back_populates="purposes")
+
+
+class AvailableDate(Base):
+    __tablename__ = "available_dates"
+
+    id = Column(Integer, primary_key=True)
+    venue_id = Column(Integer, ForeignKey("venues.id"))
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+
+    venue = relationship("Venue", back_populates="available_dates")
+
+
+class VenueChange(Base):
+    """One row per write touching a venue; venue_row_id is venues.id, or NULL when a name table changed."""
+    __tablename__ = "venue_changes"
+    __table_args__ = {"sqlite_autoincrement": True}  # ids never reused, readers track the last one seen
+
+    id = Column(Integer, primary_key=True)
+    venue_row_id = Column(Integer)
+
+
+# --- Indexes ---
+# Location is matched case-insensitively, then capacity and price as ranges
+Index("ix_venues_location_capacity_price", Venue.location.collate("NOCASE"), Venue.capacity, Venue.price_per_day)
+Index("ix_venues_capacity_price", Venue.capacity, Venue.price_per_day)
+Index("ix_venues_price_venue_id", Venue.price_per_day, Venue.venue_id)  # default result order
+Index("ix_venues_latitude_longitude", Venue.latitude, Venue.longitude)  # radius search bounding box
+# Relation lookups by venue (EXISTS filters and eager loading)
+Index("ix_venue_amenities_venue_amenity", venue_amenities.c.venue_id, venue_amenities.c.amenity_id)
+Index("ix_venue_event_types_venue_event_type", venue_event_types.c.venue_id, venue_event_types.c.event_type_id)
+Index("ix_venue_purposes_venue_purpose", venue_purposes.c.venue_id, venue_purposes.c.purpose_id)
+Index("ix_available_dates_venue_dates", AvailableDate.venue_id, AvailableDate.start_date, AvailableDate.end_date)
+
+
+# --- Change log triggers ---
+# Change log rows kept by prune_venue_changes(); readers further behind reload everything
+VENUE_CHANGES_KEEP = int(os.getenv("VENUE_CHANGES_KEEP", "10000"))
+
+
+# table -> {operation: venue row ids to log}
+_CHANGE_TRIGGERS = {
+    "venues": {"INSERT": ["NEW.id"], "UPDATE": ["OLD.id", "NEW.id"], "DELETE": ["OLD.id"]},
+    "venue_amenities": {"INSERT": ["NEW.venue_id"], "UPDATE": ["OLD.venue_id", "NEW.venue_id"], "DELETE": ["OLD.venue_id"]},
+    "venue_event_types": {"INSERT": ["NEW.venue_id"], "UPDATE": ["OLD.venue_id", "NEW.venue_id"], "DELETE": ["OLD.venue_id"]},
+    "venue_purposes": {"INSERT": ["NEW.venue_id"], "UPDATE": ["OLD.venue_id", "NEW.venue_id"], "DELETE": ["OLD.venue_id"]},
+    "available_dates": {"INSERT": ["NEW.venue_id"], "UPDATE": ["OLD.venue_id", "NEW.venue_id"], "DELETE": ["OLD.venue_id"]},
+    # Renaming or removing a name affects every venue using it
+    "amenities": {"UPDATE": ["NULL"], "DELETE": ["NULL"]},
+    "event_types": {"UPDATE": ["NULL"], "DELETE": ["NULL"]},
+    "purposes": {"UPDATE": ["NULL"], "DELETE": ["NULL"]},
+}
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_change_triggers(metadata, connection, **kw):
+    """Runs after every create_all(), so databases created before the change log get the triggers too."""
+    if connection.dialect.name != "sqlite":
+        return
+    for table, operations in _CHANGE_TRIGGERS.items():
+        for operation, refs in operations.items():
+            values = ", ".join(f"({ref})" for ref in refs)
+            connection.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_{operation.lower()}_log AFTER {operation} ON {table} "
+                f"BEGIN INSERT INTO venue_changes (venue_row_id) VALUES {values}; END"
+            ))
+
+
+def venue_changes_after(db, last_change_id: int):
+    """(id, venue_row_id) log rows after last_change_id, oldest first; None when some of them were pruned."""
+    changes = db.execute(select(VenueChange.id, VenueChange.venue_row_id)
+                         .where(VenueChange.id > last_change_id).order_by(VenueChange.id)).all()
+    # Ids are never reused, so a missing successor was pruned (at worst a reader reloads needlessly)
+    if changes and changes[0].id != last_change_id + 1:
+        return None
+    return changes
+
+
+def prune_venue_changes(bind=None, keep: int = VENUE_CHANGES_KEEP) -> int:
+    """Delete all but the newest keep change log rows; returns the number deleted."""
+    with (bind or engine).begin() as conn:
+        newest = conn.scalar(select(func.max(VenueChange.id)))
+        if newest is None:
+            return 0
+        return conn.execute(delete(VenueChange).where(VenueChange.id <= newest - keep)).rowcount
+
+
+# --- Full-text index ---
+VENUE_FTS_TABLE = "venues_fts"
+
+_VENUE_FTS_TRIGGERS = {
+    "insert": f"AFTER INSERT ON venues BEGIN "
+              f"INSERT INTO {VENUE_FTS_TABLE} (rowid, name, description, location) "
+              f"VALUES (NEW.id, NEW.name, NEW.description, NEW.location); END",
+    "delete": f"AFTER DELETE ON venues BEGIN "
+              f"INSERT INTO {VENUE_FTS_TABLE} ({VENUE_FTS_TABLE}, rowid, name, description, location) "
+              f"VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.location); END",
+    "update": f"AFTER UPDATE OF name, description, location ON venues BEGIN "
+              f"INSERT INTO {VENUE_FTS_TABLE} ({VENUE_FTS_TABLE}, rowid, name, description, location) "
+              f"VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.location); "
+              f"INSERT INTO {VENUE_FTS_TABLE} (rowid, name, description, location) "
+              f"VALUES (NEW.id, NEW.name, NEW.description, NEW.location); END",
+}
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_venue_fts(metadata, connection, **kw):
+    """Create venues_fts and its triggers if missing; a new index is filled from the existing venues."""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": VENUE_FTS_TABLE}).first()
+    if exists is None:
+        try:
+            connection.execute(text(
+                f"CREATE VIRTUAL TABLE {VENUE_FTS_TABLE} USING fts5("
+                f"name, description, location, content='venues', content_rowid='id', tokenize='porter unicode61')"
+            ))
+        except OperationalError as e:
+            print(f"Venue full-text search disabled, SQLite has no FTS5: {e}")
+            return
+        connection.execute(text(f"INSERT INTO {VENUE_FTS_TABLE} ({VENUE_FTS_TABLE}) VALUES ('rebuild')"))
+    for operation, body in _VENUE_FTS_TRIGGERS.items():
+        connection.execute(text(f"CREATE TRIGGER IF NOT EXISTS trg_venues_fts_{operation} {body}"))
+
+
+def rebuild_venue_fts(bind=None):
+    """Re-index every venue, merge the index segments and prune the change log. For bulk loads that bypassed the triggers."""
+    with (bind or engine).begin() as conn:
+        conn.execute(text(f"INSERT INTO {VENUE_FTS_TABLE} ({VENUE_FTS_TABLE}) VALUES ('rebuild')"))
+        conn.execute(text(f"INSERT INTO {VENUE_FTS_TABLE} ({VENUE_FTS_TABLE}) VALUES ('optimize')"))
+    prune_venue_changes(bind)
+
+
+def with_venue_relations(query):
+    """Eager-load everything venue_to_dict() and the tools read: 4 extra queries in total rather than 4 per venue."""
+    return query.options(
+        selectinload(Venue.amenities),
+        selectinload(Venue.event_types),
+        selectinload(Venue.purposes),
+        selectinload(Venue.available_dates),
+    )
+
+
+def ensure_indexes(bind=None):
+    """Create declared indexes missing from an existing database (create_all skips tables that exist)."""
+    bind = bind or engine
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
+def ensure_columns(bind=None):
+    """Add nullable model columns missing from existing tables (create_all skips tables that exist)."""
+    bind = bind or engine
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=conn.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    print(f"Added column {table.name}.{column.name}")
+
+
+def init_db():
+    """Create any missing tables, columns, indexes, change log triggers and the full-text index; prune the change log."""
+    Base.metadata.create_all(bind=engine)
+    ensure_columns()
+    ensure_indexes()
+    prune_venue_changes()
+
+
+# --- Async engine (optional, needs aiosqlite) ---
+_async_engine = None
+_async_sessionmaker = None
+
+
+def async_database_url(url: str = DATABASE_URL) -> str:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.get_driver_name() != "aiosqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def create_async_venue_engine(url: str = DATABASE_URL):
+    """aiosqlite engine with the same pragmas and pool settings as create_venue_engine()."""
+    try:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        import aiosqlite  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("The async venue database engine needs aiosqlite: pip install aiosqlite") from e
+    url = async_database_url(url)
+    async_engine = create_async_engine(url, **_engine_options(url, AsyncAdaptedQueuePool))
+    if _is_sqlite(url):
+        event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return async_engine
+
+
+def get_async_sessionmaker():
+    """Process-wide async session factory for VENUES_DATABASE_URL."""
+    global _async_engine, _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        _async_engine = create_async_venue_engine()
+        _async_sessionmaker = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_sessionmaker
+
+
+async def dispose_async_engine():
+    """Close pooled async connections. Each holds a non-daemon aiosqlite thread, so call this before the loop ends."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
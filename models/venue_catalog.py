@@ -0,0 +1,353 @@
+"""
+Read-only queries over the local venue catalog (venues.db).
+
+Results are plain dicts so they can be used after the session closes. Venue
+relations are eager-loaded (with_venue_relations), so a search costs a fixed
+number of queries however many venues it returns. The agent tools in
+agent/venue_tools.py answer from here before falling back to web search.
+
+Async callers use the a* methods. With VENUES_DB_ASYNC=true they run on the
+aiosqlite engine; otherwise the sync query runs in a worker thread.
+
+With the in-memory snapshot enabled, date filters for a location are answered
+by its availability interval index and passed to SQL as venue ids.
+
+When the full-text index exists, searches given the request text rank venues
+that mention its words first, and get() also finds a venue by a loose name.
+With semantic=True the text ranks venues by meaning instead (local vector
+index, models/venue_vectors.py), so "team offsite" also favours retreats.
+
+near=(latitude, longitude) limits a search to venues within radius_km of the
+point, nearest first, and adds each venue's distance_km (models/venue_geo.py).
+"""
+import asyncio
+import os
+import threading
+import time
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, func, or_, select, text as sql_text
+
+from models.database import (VENUE_FTS_TABLE, Amenity, AvailableDate, EventType, Purpose, SessionLocal, Venue,
+                             get_async_sessionmaker, with_venue_relations)
+from models.venue_geo import DEFAULT_RADIUS_KM, bounding_box_filter, within_radius
+from models.venue_snapshot import get_venue_snapshot
+from models.venue_text_search import relevance_statement
+from models.venue_vectors import get_venue_vector_index, rank_order
+
+# Amenity, event type and purpose names change rarely; re-read them after this many seconds
+VOCABULARY_TTL_SECONDS = 300
+
+# Snapshot availability matches beyond this fall back to the SQL date filter
+MAX_SNAPSHOT_ROW_IDS = 5000
+
+# A radius search considers at most this many of the nearest venues
+MAX_NEAR_ROW_IDS = 1000
+
+
+def venue_to_dict(venue: Venue) -> Dict:
+    return {
+        "venue_id": venue.venue_id,
+        "name": venue.name,
+        "location": venue.location,
+        "capacity": venue.capacity,
+        "price_per_day": venue.price_per_day,
+        "contact_number": venue.contact_number,
+        "description": venue.description,
+        "has_veg": bool(venue.has_veg),
+        "has_non_veg": bool(venue.has_non_veg),
+        "amenities": sorted(a.name for a in venue.amenities),
+        "event_types": sorted(e.name for e in venue.event_types),
+        "purposes": sorted(p.name for p in venue.purposes),
+        "available_dates": sorted((d.start_date, d.end_date) for d in venue.available_dates),
+        "latitude": venue.latitude,
+        "longitude": venue.longitude,
+    }
+
+
+def _venue_dicts(venues, distances: Optional[Dict[int, float]] = None) -> List[Dict]:
+    if distances is None:
+        return [venue_to_dict(v) for v in venues]
+    return [{**venue_to_dict(v), "distance_km": round(distances[v.id], 1)} for v in venues]
+
+
+# --- Statements (shared by the sync and async paths) ---
+def location_filter(locations: Sequence[str]):
+    """Venues whose location contains any of locations, ignoring case ("Mumbai" also matches "Navi Mumbai").
+
+    The one location rule for the catalog, the venue tools and /api/venue/search.
+    """
+    return or_(*(func.lower(Venue.location).contains(loc.strip().lower(), autoescape=True) for loc in locations))
+
+
+def search_statement(locations: Sequence[str] = (), min_capacity: Optional[int] = None,
+                     max_price: Optional[float] = None, amenities: Sequence[str] = (),
+                     event_types: Sequence[str] = (), purposes: Sequence[str] = (),
+                     available_from: Optional[date] = None, available_to: Optional[date] = None,
+                     veg: Optional[bool] = None, non_veg: Optional[bool] = None,
+                     row_ids: Optional[Sequence[int]] = None, text: Optional[str] = None,
+                     rank_ids: Optional[Sequence[int]] = None, limit: int = 10):
+    """Venues matching every given filter, cheapest first.
+
+    locations match as case-insensitive substrings of the venue location (any of them).
+    Every listed amenity is required; any one of the event types or purposes is enough.
+    With a date range, the venue needs an availability window overlapping it.
+    row_ids restricts the search to those venues.id values.
+    text only orders: venues whose name, description or location best match it come first.
+    rank_ids only orders too: those venues.id values come first, in that order (instead of text).
+    """
+    stmt = select(Venue)
+    order = (Venue.price_per_day, Venue.venue_id)
+    relevance = relevance_statement(text) if text and rank_ids is None else None
+    if rank_ids is not None:
+        order = (rank_order(rank_ids),) + order
+    elif relevance is not None:
+        ranked = relevance.subquery()
+        stmt = stmt.outerjoin(ranked, ranked.c.venue_row_id == Venue.id)
+        order = (ranked.c.score.is_(None), ranked.c.score) + order
+    if row_ids is not None:
+        stmt = stmt.where(Venue.id.in_(row_ids))
+    if locations:
+        stmt = stmt.where(location_filter(locations))
+    if min_capacity is not None:
+        stmt = stmt.where(Venue.capacity >= min_capacity)
+    if max_price is not None:
+        stmt = stmt.where(Venue.price_per_day <= max_price)
+    for amenity in amenities:
+        stmt = stmt.where(Venue.amenities.any(func.lower(Amenity.name) == amenity.lower()))
+    if event_types:
+        stmt = stmt.where(Venue.event_types.any(func.lower(EventType.name).in_([e.lower() for e in event_types])))
+    if purposes:
+        stmt = stmt.where(Venue.purposes.any(func.lower(Purpose.name).in_([p.lower() for p in purposes])))
+    if available_from is not None:
+        available_to = available_to or available_from
+        stmt = stmt.where(Venue.available_dates.any(and_(
+            AvailableDate.start_date <= available_to, AvailableDate.end_date >= available_from)))
+    if veg:
+        stmt = stmt.where(Venue.has_veg.is_(True))
+    if non_veg:
+        stmt = stmt.where(Venue.has_non_veg.is_(True))
+    return with_venue_relations(stmt.order_by(*order).limit(limit))
+
+
+def _lookup_statements(ref: str):
+    """By catalog ID, then exact name, then partial name (case-insensitive)."""
+    ref = ref.lower()
+    return [
+        with_venue_relations(select(Venue).where(func.lower(Venue.venue_id) == ref)),
+        with_venue_relations(select(Venue).where(func.lower(Venue.name) == ref).order_by(Venue.venue_id).limit(1)),
+        with_venue_relations(select(Venue).where(func.lower(Venue.name).contains(ref)).order_by(Venue.venue_id).limit(1)),
+    ]
+
+
+def _full_text_lookup_statement(ref: str):
+    """The best full-text match containing every word of ref, or None."""
+    relevance = relevance_statement(ref, match_all=True, limit=1)
+    if relevance is None:
+        return None
+    ranked = relevance.subquery()
+    return with_venue_relations(select(Venue).join(ranked, ranked.c.venue_row_id == Venue.id))
+
+
+def _nearby_statement(latitude: float, longitude: float, radius_km: float):
+    return select(Venue.id, Venue.latitude, Venue.longitude).where(*bounding_box_filter(latitude, longitude, radius_km))
+
+
+def _summary_statement(locations: Sequence[str]):
+    return select(
+        func.count(Venue.id), func.min(Venue.capacity), func.max(Venue.capacity),
+        func.min(Venue.price_per_day), func.max(Venue.price_per_day),
+    ).where(location_filter(locations))
+
+
+def _summary(row) -> Dict:
+    count, min_capacity, max_capacity, min_price, max_price = row
+    return {"count": count, "min_capacity": min_capacity, "max_capacity": max_capacity,
+            "min_price": min_price, "max_price": max_price}
+
+
+def _available_count_statement(locations: Sequence[str], available_from: date, available_to: date):
+    return select(func.count(Venue.id)).where(location_filter(locations), Venue.available_dates.any(and_(
+        AvailableDate.start_date <= available_to, AvailableDate.end_date >= available_from)))
+
+
+def _clean_ref(venue_ref: str) -> str:
+    return venue_ref.strip().strip("'\"")
+
+
+class VenueCatalog:
+    """Venue lookups and filtered search against the catalog database."""
+
+    def __init__(self, session_factory=SessionLocal, async_session_factory=None, snapshot=None, vectors=None):
+        self.session_factory = session_factory
+        self.async_session_factory = async_session_factory
+        self.snapshot = snapshot
+        self.vectors = vectors
+        self._full_text: Optional[bool] = None
+        self._vocabulary: Optional[Dict[str, List[str]]] = None
+        self._vocabulary_loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def vocabulary(self) -> Dict[str, List[str]]:
+        """Names of all amenities, event types and purposes, for matching free-text requests."""
+        with self._lock:
+            if self._vocabulary is not None and time.monotonic() - self._vocabulary_loaded_at < VOCABULARY_TTL_SECONDS:
+                return self._vocabulary
+        with self.session_factory() as db:
+            vocabulary = {
+                "amenities": list(db.scalars(select(Amenity.name))),
+                "event_types": list(db.scalars(select(EventType.name))),
+                "purposes": list(db.scalars(select(Purpose.name))),
+            }
+        with self._lock:
+            self._vocabulary, self._vocabulary_loaded_at = vocabulary, time.monotonic()
+        return vocabulary
+
+    def full_text(self) -> bool:
+        """Whether the database has the venues_fts index (checked once)."""
+        if self._full_text is None:
+            with self.session_factory() as db:
+                self._full_text = db.execute(sql_text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+                                             {"name": VENUE_FTS_TABLE}).first() is not None
+        return self._full_text
+
+    def _lookups(self, ref: str):
+        """Lookup statements in order; the full-text one is only built (and the index checked) if the others miss."""
+        yield from _lookup_statements(ref)
+        stmt = _full_text_lookup_statement(ref) if self.full_text() else None
+        if stmt is not None:
+            yield stmt
+
+    def _with_full_text(self, filters: Dict) -> Dict:
+        return filters if not filters.get("text") or self.full_text() else {**filters, "text": None}
+
+    def _with_semantic(self, filters: Dict) -> Dict:
+        """semantic=True: rank by the vector index's venues most similar to the text (keywords without an index).
+
+        After _with_near, only venues within the radius are scored: the similar ones come first, best match
+        first, then the rest of the radius nearest first.
+        """
+        semantic = filters.pop("semantic", False)
+        if not semantic or not filters.get("text") or self.vectors is None:
+            return filters
+        rank_ids = self.vectors.ranked_ids(filters["text"], candidates=filters.get("row_ids"))
+        if filters.get("rank_ids") is not None:
+            ranked = set(rank_ids)
+            rank_ids += [row_id for row_id in filters["rank_ids"] if row_id not in ranked]
+        return {**filters, "rank_ids": rank_ids}
+
+    def _available_ids(self, locations: Sequence[str], available_from: Optional[date],
+                       available_to: Optional[date]) -> Optional[List[int]]:
+        """venues.id in the locations available during the dates, from the snapshot; None to filter in SQL."""
+        if self.snapshot is None or not locations or available_from is None:
+            return None
+        row_ids = self.snapshot.available_row_ids(locations, available_from, available_to or available_from)
+        # Keep the IN list well under SQLite's bound parameter limit
+        return row_ids if len(row_ids) <= MAX_SNAPSHOT_ROW_IDS else None
+
+    def _with_snapshot_dates(self, locations: Sequence[str], filters: Dict) -> Dict:
+        row_ids = self._available_ids(locations, filters.get("available_from"), filters.get("available_to"))
+        if row_ids is None:
+            return filters
+        if filters.get("row_ids") is not None:
+            available = set(row_ids)
+            row_ids = [row_id for row_id in filters["row_ids"] if row_id in available]
+        return {**filters, "available_from": None, "available_to": None, "row_ids": row_ids}
+
+    def nearby(self, latitude: float, longitude: float, radius_km: float = DEFAULT_RADIUS_KM) -> Dict[int, float]:
+        """venues.id within radius_km of the point -> distance in km, nearest first (snapshot grid or SQL box)."""
+        if self.snapshot is not None:
+            return self.snapshot.nearby(latitude, longitude, radius_km)
+        with self.session_factory() as db:
+            return within_radius(db.execute(_nearby_statement(latitude, longitude, radius_km)).all(),
+                                 latitude, longitude, radius_km)
+
+    def _with_near(self, filters: Dict):
+        """(filters limited to and ordered by the nearest venues, their distances) for near=(lat, lon); else (filters, None)."""
+        near, radius_km = filters.pop("near", None), filters.pop("radius_km", None)
+        if near is None:
+            return filters, None
+        distances = self.nearby(*near, radius_km or DEFAULT_RADIUS_KM)
+        row_ids = list(distances)[:MAX_NEAR_ROW_IDS]
+        return {**filters, "row_ids": row_ids, "rank_ids": row_ids}, distances
+
+    # --- sync ---
+    def search(self, locations: Sequence[str] = (), **filters) -> List[Dict]:
+        """See search_statement() for the filters; semantic=True ranks by meaning instead of words,
+        near=(latitude, longitude) keeps venues within radius_km (default 25), nearest first.
+
+        With both, semantic ranking wins within the radius: similar venues first, then the others nearest first.
+        """
+        filters, distances = self._with_near(filters)
+        filters = self._with_snapshot_dates(locations, self._with_full_text(self._with_semantic(filters)))
+        with self.session_factory() as db:
+            return _venue_dicts(db.scalars(search_statement(locations, **filters)), distances)
+
+    def get(self, venue_ref: str) -> Optional[Dict]:
+        """A venue by catalog ID (V001) or by name."""
+        ref = _clean_ref(venue_ref)
+        if not ref:
+            return None
+        with self.session_factory() as db:
+            for stmt in self._lookups(ref):
+                venue = db.scalars(stmt).first()
+                if venue is not None:
+                    return venue_to_dict(venue)
+        return None
+
+    def location_summary(self, locations: Sequence[str]) -> Dict:
+        """Number of venues, capacity and price range for the given locations."""
+        with self.session_factory() as db:
+            return _summary(db.execute(_summary_statement(locations)).one())
+
+    def available_count(self, locations: Sequence[str], available_from: date, available_to: Optional[date] = None) -> int:
+        """Number of venues in the locations with availability overlapping the dates."""
+        if self.snapshot is not None and locations:
+            return len(self.snapshot.available_row_ids(locations, available_from, available_to or available_from))
+        with self.session_factory() as db:
+            return db.scalar(_available_count_statement(locations, available_from, available_to or available_from))
+
+    # --- async ---
+    async def asearch(self, locations: Sequence[str] = (), **filters) -> List[Dict]:
+        if self.async_session_factory is None:
+            return await asyncio.to_thread(self.search, locations, **filters)
+        distances = None
+        if filters.get("near") is not None:
+            # Radius lookups use the snapshot or the sync engine
+            filters, distances = await asyncio.to_thread(self._with_near, filters)
+        if filters.get("semantic"):
+            # Scoring and a due vector index sync run in a worker thread
+            filters = await asyncio.to_thread(self._with_semantic, filters)
+        filters = self._with_full_text({k: v for k, v in filters.items() if k not in ("semantic", "near", "radius_km")})
+        if self.snapshot is not None and filters.get("available_from") is not None:
+            # A due snapshot refresh reads the change log with the sync engine
+            filters = await asyncio.to_thread(self._with_snapshot_dates, locations, filters)
+        async with self.async_session_factory() as db:
+            return _venue_dicts(await db.scalars(search_statement(locations, **filters)), distances)
+
+    async def aget(self, venue_ref: str) -> Optional[Dict]:
+        if self.async_session_factory is None:
+            return await asyncio.to_thread(self.get, venue_ref)
+        ref = _clean_ref(venue_ref)
+        if not ref:
+            return None
+        async with self.async_session_factory() as db:
+            for stmt in self._lookups(ref):
+                venue = (await db.scalars(stmt)).first()
+                if venue is not None:
+                    return venue_to_dict(venue)
+        return None
+
+
+_catalog: Optional[VenueCatalog] = None
+
+
+def get_venue_catalog() -> VenueCatalog:
+    """Process-wide catalog; VENUES_DB_ASYNC=true serves async callers from the aiosqlite engine."""
+    global _catalog
+    if _catalog is None:
+        use_async = os.getenv("VENUES_DB_ASYNC", "false").lower() in ("1", "true", "yes")
+        _catalog = VenueCatalog(async_session_factory=get_async_sessionmaker() if use_async else None,
+                                snapshot=get_venue_snapshot(), vectors=get_venue_vector_index())
+    return _catalog
@@ -0,0 +1,125 @@
+"""
+Radius search over venue coordinates (venues.latitude / longitude).
+
+Distances are great-circle (haversine) kilometres, computed with numpy for
+every candidate at once. Venues without coordinates never match; fill them
+with scripts/geocode_venues.py.
+
+GeoGrid is the spatial index the snapshot builds at load time: points are
+bucketed into square cells of VENUE_GEO_CELL_KM (in latitude degrees) and
+sorted by cell key, so a radius query reads one contiguous slice per row of
+cells overlapping the circle's bounding box and measures only those points.
+Without the snapshot, the same bounding box is a range query on the
+(latitude, longitude) index and within_radius() does the measuring.
+"""
+import math
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.database import Venue
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+VENUE_GEO_CELL_KM = float(os.getenv("VENUE_GEO_CELL_KM", "10"))
+
+# Radius of a search around a point when none is given
+DEFAULT_RADIUS_KM = float(os.getenv("VENUE_SEARCH_RADIUS_KM", "25"))
+
+
+def haversine_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to each of the given points, in km."""
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) containing every point within radius_km; all longitudes near the poles
+    or across the antimeridian."""
+    delta = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = latitude - delta, latitude + delta
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+    lon_delta = delta / math.cos(math.radians(widest))
+    if longitude - lon_delta < -180 or longitude + lon_delta > 180:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, longitude - lon_delta, longitude + lon_delta
+
+
+def bounding_box_filter(latitude: float, longitude: float, radius_km: float) -> list:
+    """WHERE clauses for venues in the bounding box (uses ix_venues_latitude_longitude)."""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    return [Venue.latitude.between(min_lat, max_lat), Venue.longitude.between(min_lon, max_lon)]
+
+
+def _nearest_first(owners: np.ndarray, distances: np.ndarray, radius_km: float) -> Dict[int, float]:
+    inside = distances <= radius_km
+    owners, distances = owners[inside], distances[inside]
+    order = np.lexsort((owners, distances))
+    return dict(zip(owners[order].tolist(), distances[order].tolist()))
+
+
+def within_radius(rows: Sequence[Tuple[int, Optional[float], Optional[float]]], latitude: float, longitude: float,
+                  radius_km: float) -> Dict[int, float]:
+    """(venues.id, latitude, longitude) rows within radius_km -> distance in km, nearest first."""
+    if not rows:
+        return {}
+    # Rows as tuples: numpy probes a Row for array attributes, which is very slow
+    columns = np.array([tuple(row) for row in rows], dtype=np.float64).reshape(-1, 3)
+    located = ~np.isnan(columns[:, 1:]).any(axis=1)
+    columns = columns[located]
+    return _nearest_first(columns[:, 0].astype(np.int64),
+                          haversine_km(latitude, longitude, columns[:, 1], columns[:, 2]), radius_km)
+
+
+class GeoGrid:
+    """Grid index over points; points with a NaN coordinate are left out."""
+
+    def __init__(self, owners, latitudes, longitudes, cell_km: float = VENUE_GEO_CELL_KM):
+        owners = np.asarray(owners, dtype=np.int64)
+        latitudes, longitudes = np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64)
+        located = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        self.cell_degrees = cell_km / KM_PER_DEGREE
+        self._columns = int(math.ceil(360 / self.cell_degrees)) + 1
+        keys = self._key(self._row(latitudes[located]), self._column(longitudes[located]))
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._owners = owners[located][order]
+        self._latitudes = latitudes[located][order]
+        self._longitudes = longitudes[located][order]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _row(self, latitudes):
+        return np.floor((np.asarray(latitudes) + 90) / self.cell_degrees).astype(np.int64)
+
+    def _column(self, longitudes):
+        return np.floor((np.asarray(longitudes) + 180) / self.cell_degrees).astype(np.int64)
+
+    def _key(self, rows, columns):
+        return rows * self._columns + columns
+
+    def _candidates(self, latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+        """Positions of the points in cells overlapping the bounding box."""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        rows = np.arange(self._row(min_lat), self._row(max_lat) + 1)
+        starts = np.searchsorted(self._keys, self._key(rows, self._column(min_lon)), side="left")
+        ends = np.searchsorted(self._keys, self._key(rows, self._column(max_lon)), side="right")
+        lengths = ends - starts
+        if not lengths.sum():
+            return np.zeros(0, dtype=np.int64)
+        # Concatenated ranges starts[i]..ends[i] without a Python loop
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return np.arange(lengths.sum()) + offsets
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> Dict[int, float]:
+        """Owner -> distance in km for points within radius_km, nearest first (ties by owner)."""
+        positions = self._candidates(latitude, longitude, radius_km)
+        distances = haversine_km(latitude, longitude, self._latitudes[positions], self._longitudes[positions])
+        return _nearest_first(self._owners[positions], distances, radius_km)
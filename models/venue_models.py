@@ -30,6 +30,8 @@ class Amenity(str, Enum):
     SCENIC_VIEW = "scenic_view"
     BUSINESS_LOUNGE = "business_lounge"
     CENTRAL_LOCATION = "central_location"
+    ACCOMMODATION = "accommodation"
+    DECOR = "decor"
 
 class Venue(BaseModel):
     venue_id: str = Field(..., description="Unique identifier for the venue")
@@ -48,9 +50,13 @@ class Venue(BaseModel):
     rating: Optional[float] = Field(None, description="Venue rating out of 5")
     reviews: Optional[List[str]] = Field(None, description="List of reviews")
     available_dates: Dict[str, datetime] = Field(..., description="Available dates for booking")
+    latitude: Optional[float] = Field(None, description="Venue latitude (WGS84)")
+    longitude: Optional[float] = Field(None, description="Venue longitude (WGS84)")
+    distance_km: Optional[float] = Field(None, description="Distance from the searched point in km")
 
 class VenueSearchCriteria(BaseModel):
-    location: Optional[str] = Field(None, description="Location to search in")
+    location: Optional[str] = Field(None, description="Location to search in: venues whose location contains it, ignoring case "
+                                    "('Mumbai' also finds 'Navi Mumbai'), the same rule as the chat venue tools")
     start_date: Optional[datetime] = Field(None, description="Start date for the event")
     end_date: Optional[datetime] = Field(None, description="End date for the event")
     min_capacity: Optional[int] = Field(None, description="Minimum capacity required")
@@ -60,6 +66,14 @@ class VenueSearchCriteria(BaseModel):
     min_price: Optional[float] = Field(None, description="Minimum price per day")
     max_price: Optional[float] = Field(None, description="Maximum price per day")
     required_amenities: Optional[List[Amenity]] = Field(None, description="Required amenities")
+    query: Optional[str] = Field(None, description="Free text matched against venue names, descriptions and locations; results are ranked by relevance")
+    latitude: Optional[float] = Field(None, ge=-90, le=90, description="Search around this point (with longitude); results are nearest first")
+    longitude: Optional[float] = Field(None, ge=-180, le=180, description="Longitude of the point to search around")
+    near: Optional[str] = Field(None, description="Search around a known place instead of latitude/longitude, e.g. 'Koregaon Park'")
+    radius_km: Optional[float] = Field(None, gt=0, le=1000, description="Search radius around the point in km (default 25)")
+    semantic: bool = Field(False, description="Match query by meaning (local vector index) instead of by its words, e.g. 'offsite' also finds retreats")
+    page: int = Field(1, ge=1, description="Page number, starting at 1")
+    page_size: int = Field(20, ge=1, le=100, description="Venues per page")
 
 class VenueSearchResponse(BaseModel):
     venues: List[Venue] = Field(..., description="List of matching venues")
@@ -0,0 +1,378 @@
+"""
+Structured venue search for /api/venue/search.
+
+VenueSearchCriteria becomes one filtered SQL query over the catalog plus a
+COUNT for pagination; no LLM is involved. API enums are mapped to catalog
+names (CATALOG_EVENT_TYPES, CATALOG_AMENITIES), and catalog rows are
+converted back to the API Venue model.
+
+The filters use the composite indexes declared in models/database.py:
+- location (case-insensitive substring, as in the chat tools), then capacity and price ranges
+- amenities, event types and purposes (EXISTS by venue)
+- availability covering every day of the event (start_date..end_date)
+
+With criteria.query, only venues matching the text (full-text index, see
+models/venue_text_search.py) are returned, best match first instead of cheapest.
+With criteria.semantic as well, matching is by meaning instead of by words
+(local vector index, see models/venue_vectors.py). Both rank only venues that
+pass the other filters, so a selective filter never loses matches to a cap.
+
+Around a point (criteria.latitude/longitude, or a gazetteer place in
+criteria.near) only venues within criteria.radius_km match, nearest first
+(models/venue_geo.py); a text query still orders by relevance.
+
+When the in-memory snapshot is enabled (models/venue_snapshot.py), it does the
+filtering and ordering and SQL only loads the venues on the requested page.
+"""
+import asyncio
+import math
+from datetime import date, datetime, time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, func, or_, select
+from sqlalchemy.orm import aliased
+
+from agent.gazetteer import get_gazetteer
+from models.database import (Amenity as AmenityRow, AvailableDate, EventType as EventTypeRow, Purpose, SessionLocal,
+                             Venue as VenueRow, with_venue_relations)
+from models.venue_catalog import get_venue_catalog, location_filter
+from models.venue_geo import DEFAULT_RADIUS_KM, bounding_box_filter, within_radius
+from models.venue_models import Amenity, EventType, FoodPreference, Venue, VenueSearchCriteria, VenueSearchResponse
+from models.venue_snapshot import get_venue_snapshot
+from models.venue_text_search import relevance_statement
+from models.venue_vectors import get_venue_vector_index, rank_order
+
+# API event type -> catalog event type and purpose names
+CATALOG_EVENT_TYPES: Dict[EventType, Tuple[str, ...]] = {
+    EventType.CORPORATE: ("Corporate",),
+    EventType.WEDDING: ("Wedding", "Reception", "Engagement"),
+    EventType.PARTY: ("Social", "Birthday", "Birthday Party"),
+    EventType.SEMINAR: ("Seminar", "Seminars"),
+    EventType.CONFERENCE: ("Conference",),
+    EventType.TEAM_OFFSITE: ("Team Offsite",),
+    EventType.PRODUCT_LAUNCH: ("Product Launch",),
+}
+
+# API amenity -> catalog amenity names
+CATALOG_AMENITIES: Dict[Amenity, Tuple[str, ...]] = {
+    Amenity.PARKING: ("Parking",),
+    Amenity.CATERING: ("Catering",),
+    Amenity.WIFI: ("Wi-Fi", "WiFi"),
+    Amenity.AUDIO_VISUAL: ("AV", "Audio Visual"),
+    Amenity.AIR_CONDITIONING: ("AC", "Air Conditioning"),
+    Amenity.OUTDOOR_SPACE: ("Outdoor Space", "Lawn"),
+    Amenity.POOL: ("Pool",),
+    Amenity.GYM: ("Gym",),
+    Amenity.SPA: ("Spa",),
+    Amenity.SCENIC_VIEW: ("Scenic View",),
+    Amenity.BUSINESS_LOUNGE: ("Business Lounge",),
+    Amenity.CENTRAL_LOCATION: ("Central Location",),
+    Amenity.ACCOMMODATION: ("Accommodation",),
+    Amenity.DECOR: ("Decor",),
+}
+
+_EVENT_TYPE_BY_NAME = {name.lower(): api for api, names in CATALOG_EVENT_TYPES.items() for name in names}
+_AMENITY_BY_NAME = {name.lower(): api for api, names in CATALOG_AMENITIES.items() for name in names}
+
+
+def _lowered(names) -> List[str]:
+    return [name.lower() for name in names]
+
+
+def _as_date(value: Optional[datetime]) -> Optional[date]:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def search_filters(criteria: VenueSearchCriteria) -> list:
+    """WHERE clauses for the criteria; every given criterion must hold."""
+    clauses = []
+    if criteria.location:
+        clauses.append(location_filter([criteria.location]))
+    if criteria.min_capacity is not None:
+        clauses.append(VenueRow.capacity >= criteria.min_capacity)
+    if criteria.max_capacity is not None:
+        clauses.append(VenueRow.capacity <= criteria.max_capacity)
+    if criteria.min_price is not None:
+        clauses.append(VenueRow.price_per_day >= criteria.min_price)
+    if criteria.max_price is not None:
+        clauses.append(VenueRow.price_per_day <= criteria.max_price)
+    if criteria.event_type is not None:
+        names = _lowered(CATALOG_EVENT_TYPES.get(criteria.event_type, (criteria.event_type.value,)))
+        clauses.append(or_(
+            VenueRow.event_types.any(func.lower(EventTypeRow.name).in_(names)),
+            VenueRow.purposes.any(func.lower(Purpose.name).in_(names)),
+        ))
+    if criteria.food_preference in (FoodPreference.VEG, FoodPreference.BOTH):
+        clauses.append(VenueRow.has_veg.is_(True))
+    if criteria.food_preference in (FoodPreference.NON_VEG, FoodPreference.BOTH):
+        clauses.append(VenueRow.has_non_veg.is_(True))
+    for amenity in criteria.required_amenities or []:
+        names = _lowered(CATALOG_AMENITIES.get(amenity, (amenity.value,)))
+        clauses.append(VenueRow.amenities.any(func.lower(AmenityRow.name).in_(names)))
+    dates = event_dates(criteria)
+    if dates:
+        clauses.append(_available_throughout(*dates))
+    return clauses
+
+
+def event_dates(criteria: VenueSearchCriteria) -> Optional[Tuple[date, date]]:
+    """(first, last) day of the event; one given date means a one-day event."""
+    start, end = _as_date(criteria.start_date), _as_date(criteria.end_date)
+    if not (start or end):
+        return None
+    start, end = start or end, end or start
+    return (start, end) if start <= end else (end, start)
+
+
+def _available_throughout(start: date, end: date):
+    """Every day of start..end falls in one of the venue's windows (overlapping or touching windows combine).
+
+    Same rule as AvailabilityIndex.containing(): the first day is covered, and no window ending
+    inside the range is followed by an uncovered day. Uses SQLite date arithmetic.
+    """
+    def covered(venue_id, day):
+        window = aliased(AvailableDate)
+        return exists().where(window.venue_id == venue_id, window.start_date <= day, window.end_date >= day)
+
+    last = aliased(AvailableDate)
+    gap = exists().where(last.venue_id == VenueRow.id, last.end_date >= start, last.end_date < end,
+                         ~covered(last.venue_id, func.date(last.end_date, "+1 day")))
+    return and_(covered(VenueRow.id, start), ~gap)
+
+
+def to_api_venue(row: VenueRow, distance_km: Optional[float] = None) -> Venue:
+    """Catalog row (with relations loaded) -> API Venue. Catalog names without an API enum are left out."""
+    event_types = []
+    for name in [e.name for e in row.event_types] + [p.name for p in row.purposes]:
+        api = _EVENT_TYPE_BY_NAME.get(name.lower())
+        if api is not None and api not in event_types:
+            event_types.append(api)
+    amenities = [_AMENITY_BY_NAME[a.name.lower()] for a in row.amenities if a.name.lower() in _AMENITY_BY_NAME]
+    food = [preference for preference, flag in ((FoodPreference.VEG, row.has_veg), (FoodPreference.NON_VEG, row.has_non_veg)) if flag]
+    if len(food) == 2:
+        food.append(FoodPreference.BOTH)
+    available_dates = {}
+    for i, window in enumerate(sorted(row.available_dates, key=lambda d: d.start_date), 1):
+        available_dates[f"window_{i}_start"] = datetime.combine(window.start_date, time.min)
+        available_dates[f"window_{i}_end"] = datetime.combine(window.end_date, time.min)
+    return Venue(
+        venue_id=row.venue_id,
+        name=row.name,
+        location=row.location,
+        city=row.location,
+        capacity=row.capacity,
+        price_per_day=row.price_per_day,
+        amenities=sorted(set(amenities), key=list(Amenity).index),
+        event_types=event_types,
+        food_preferences=food,
+        contact_number=row.contact_number,
+        description=row.description,
+        available_dates=available_dates,
+        latitude=row.latitude,
+        longitude=row.longitude,
+        distance_km=round(distance_km, 3) if distance_km is not None else None,
+    )
+
+
+def _wants_semantic(criteria: VenueSearchCriteria, vectors) -> bool:
+    return bool(criteria.query and criteria.semantic) and vectors is not None
+
+
+def _semantic_ids(criteria: VenueSearchCriteria, vectors, candidates: Optional[List[int]] = None) -> Optional[List[int]]:
+    """venues.id similar to criteria.query among candidates (None: all venues), best first;
+    None unless a semantic query and a vector index."""
+    if not _wants_semantic(criteria, vectors):
+        return None
+    return vectors.ranked_ids(criteria.query, candidates=candidates)
+
+
+def _candidates_statement(criteria: VenueSearchCriteria):
+    """venues.id matching the filters, for semantic ranking; None when nothing is filtered."""
+    clauses = search_filters(criteria)
+    return select(VenueRow.id).where(*clauses) if clauses else None
+
+
+def _semantic_candidates(criteria: VenueSearchCriteria, snapshot,
+                         distances: Optional[Dict[int, float]]) -> Optional[List[int]]:
+    """Filter matches (from the snapshot) inside the circle (distances, already filtered in SQL); None for all venues."""
+    row_ids = snapshot.matching_ids(criteria) if snapshot is not None else None
+    if distances is None:
+        return row_ids
+    if row_ids is None:
+        return list(distances)
+    return [row_id for row_id in row_ids if row_id in distances]
+
+
+def _ranked_semantic(criteria: VenueSearchCriteria, vectors, snapshot,
+                     distances: Optional[Dict[int, float]]) -> Optional[List[int]]:
+    return _semantic_ids(criteria, vectors, _semantic_candidates(criteria, snapshot, distances))
+
+
+def _relevance(criteria: VenueSearchCriteria):
+    """Every full-text match, best first: the filters apply afterwards, so a cap could drop matching venues."""
+    return relevance_statement(criteria.query, limit=None) if criteria.query else None
+
+
+def _statements(criteria: VenueSearchCriteria, semantic_ids: Optional[List[int]] = None):
+    clauses = search_filters(criteria)
+    if semantic_ids is not None:
+        clauses.append(VenueRow.id.in_(semantic_ids))
+    count = select(func.count(VenueRow.id)).where(*clauses)
+    page = select(VenueRow).where(*clauses)
+    relevance = _relevance(criteria) if semantic_ids is None else None
+    if semantic_ids is not None:
+        page = page.order_by(rank_order(semantic_ids, VenueRow.id), VenueRow.venue_id)
+    elif relevance is not None:
+        ranked = relevance.subquery()
+        count = count.join(ranked, ranked.c.venue_row_id == VenueRow.id)
+        page = page.join(ranked, ranked.c.venue_row_id == VenueRow.id).order_by(ranked.c.score, VenueRow.venue_id)
+    else:
+        page = page.order_by(VenueRow.price_per_day, VenueRow.venue_id)
+    page = with_venue_relations(page.offset((criteria.page - 1) * criteria.page_size).limit(criteria.page_size))
+    return count, page
+
+
+def _response(criteria: VenueSearchCriteria, total: int, rows,
+              distances: Optional[Dict[int, float]] = None) -> VenueSearchResponse:
+    return VenueSearchResponse(
+        venues=[to_api_venue(row, distances.get(row.id) if distances else None) for row in rows],
+        total_count=total,
+        page=criteria.page,
+        total_pages=max(1, math.ceil(total / criteria.page_size)),
+    )
+
+
+def _rows_statement(row_ids: List[int]):
+    return with_venue_relations(select(VenueRow).where(VenueRow.id.in_(row_ids)))
+
+
+def _in_order(rows, row_ids: List[int]) -> list:
+    by_id = {row.id: row for row in rows}
+    return [by_id[row_id] for row_id in row_ids if row_id in by_id]
+
+
+# --- Radius search ---
+class SearchPointError(ValueError):
+    """criteria.near names no place the gazetteer knows, or only one of latitude/longitude is given."""
+
+
+def search_point(criteria: VenueSearchCriteria) -> Optional[Tuple[float, float]]:
+    """(latitude, longitude) to search around: the given coordinates, else the gazetteer place in criteria.near."""
+    if (criteria.latitude is None) != (criteria.longitude is None):
+        raise SearchPointError("latitude and longitude must be given together")
+    if criteria.latitude is not None:
+        return criteria.latitude, criteria.longitude
+    if criteria.near:
+        place = get_gazetteer().find(criteria.near)
+        if place is None:
+            raise SearchPointError(f"Unknown place: {criteria.near}")
+        return place.latitude, place.longitude
+    return None
+
+
+def _radius(criteria: VenueSearchCriteria) -> float:
+    return criteria.radius_km or DEFAULT_RADIUS_KM
+
+
+def _nearby_statement(criteria: VenueSearchCriteria, point: Tuple[float, float]):
+    """(id, latitude, longitude) of venues matching the criteria in the bounding box of the search circle."""
+    return select(VenueRow.id, VenueRow.latitude, VenueRow.longitude).where(
+        *search_filters(criteria), *bounding_box_filter(*point, _radius(criteria)))
+
+
+def _near_first(ranked_ids: Optional[List[int]], distances: Dict[int, float]) -> List[int]:
+    """Text matches inside the circle, best first; without a text query, every venue inside, nearest first."""
+    if ranked_ids is None:
+        return list(distances)
+    return [row_id for row_id in ranked_ids if row_id in distances]
+
+
+def _page_ids(criteria: VenueSearchCriteria, ranked_ids: List[int]) -> List[int]:
+    offset = (criteria.page - 1) * criteria.page_size
+    return ranked_ids[offset:offset + criteria.page_size]
+
+
+def search_venue_page(criteria: VenueSearchCriteria, session_factory=SessionLocal, snapshot=None,
+                      vectors=None) -> VenueSearchResponse:
+    """One page of venues matching criteria, cheapest first, with the total match count.
+
+    With a VenueSnapshot the matches come from its columns and SQL only loads the page.
+    Semantic queries need a VenueVectorIndex (vectors); without one they match by words.
+    Around a point (latitude/longitude or near) only venues within radius_km match, nearest first.
+    """
+    point = search_point(criteria)
+    semantic = _wants_semantic(criteria, vectors)
+    with session_factory() as db:
+        if snapshot is None and point is None:
+            candidates = _candidates_statement(criteria) if semantic else None
+            semantic_ids = _semantic_ids(criteria, vectors, db.scalars(candidates).all() if candidates is not None else None)
+            count, page = _statements(criteria, semantic_ids)
+            total = db.scalar(count)
+            rows = db.scalars(page).all() if total else []
+            return _response(criteria, total, rows)
+        distances = None
+        if point is not None:
+            if snapshot is not None:
+                distances = snapshot.nearby(*point, _radius(criteria))
+            else:
+                distances = within_radius(db.execute(_nearby_statement(criteria, point)).all(), *point, _radius(criteria))
+        if semantic:
+            ranked_ids = _ranked_semantic(criteria, vectors, snapshot, distances)
+        else:
+            relevance = _relevance(criteria)
+            ranked_ids = db.scalars(relevance).all() if relevance is not None else None
+        if distances is not None:
+            ranked_ids = _near_first(ranked_ids, distances)
+        if snapshot is not None:
+            total, row_ids = snapshot.search(criteria, ranked_ids)
+        else:
+            total, row_ids = len(ranked_ids), _page_ids(criteria, ranked_ids)
+        rows = db.scalars(_rows_statement(row_ids)).all() if row_ids else []
+        return _response(criteria, total, _in_order(rows, row_ids), distances)
+
+
+async def asearch_venue_page(criteria: VenueSearchCriteria, catalog=None, snapshot=None,
+                             vectors=None) -> VenueSearchResponse:
+    """Async variant; uses the catalog's async engine when configured (VENUES_DB_ASYNC), else a worker thread.
+
+    snapshot and vectors default to the process-wide ones (get_venue_snapshot(), get_venue_vector_index()).
+    """
+    catalog = catalog or get_venue_catalog()
+    snapshot = snapshot if snapshot is not None else get_venue_snapshot()
+    if criteria.semantic and vectors is None:
+        vectors = get_venue_vector_index()
+    if catalog.async_session_factory is None:
+        return await asyncio.to_thread(search_venue_page, criteria, catalog.session_factory, snapshot, vectors)
+    point = search_point(criteria)
+    semantic = _wants_semantic(criteria, vectors)
+    async with catalog.async_session_factory() as db:
+        if snapshot is None and point is None:
+            candidates = _candidates_statement(criteria) if semantic else None
+            candidates = (await db.scalars(candidates)).all() if candidates is not None else None
+            # Scoring and a due vector index sync run in a worker thread
+            semantic_ids = await asyncio.to_thread(_semantic_ids, criteria, vectors, candidates) if semantic else None
+            count, page = _statements(criteria, semantic_ids)
+            total = await db.scalar(count)
+            rows = (await db.scalars(page)).all() if total else []
+            return _response(criteria, total, rows)
+        distances = None
+        if point is not None:
+            if snapshot is not None:
+                # A due refresh reads the change log with the sync engine
+                distances = await asyncio.to_thread(snapshot.nearby, *point, _radius(criteria))
+            else:
+                nearby = (await db.execute(_nearby_statement(criteria, point))).all()
+                distances = within_radius(nearby, *point, _radius(criteria))
+        if semantic:
+            ranked_ids = await asyncio.to_thread(_ranked_semantic, criteria, vectors, snapshot, distances)
+        else:
+            relevance = _relevance(criteria)
+            ranked_ids = (await db.scalars(relevance)).all() if relevance is not None else None
+        if distances is not None:
+            ranked_ids = _near_first(ranked_ids, distances)
+        if snapshot is not None:
+            total, row_ids = await asyncio.to_thread(snapshot.search, criteria, ranked_ids)
+        else:
+            total, row_ids = len(ranked_ids), _page_ids(criteria, ranked_ids)
+        rows = (await db.scalars(_rows_statement(row_ids))).all() if row_ids else []
+        return _response(criteria, total, _in_order(rows, row_ids), distances)
@@ -0,0 +1,414 @@
+"""
+Read-optimized, in-memory snapshot of the venue catalog for /api/venue/search.
+
+Every venue is one position in a set of numpy columns: capacity, price and the
+veg/non-veg flags, a location code, coordinates, and amenity/event type/purpose
+bitmasks (one bit per catalog name, packed in uint64 words). Availability
+windows are parallel day arrays. A search is a few vectorized masks over all
+venues (and a grid index lookup for a radius); only the requested page is then
+loaded from the database.
+
+The snapshot stays current through the venue_changes log (filled by triggers,
+see models/database.py): at most every VENUE_SNAPSHOT_REFRESH_SECONDS a search
+reads the new log entries and reloads just those venues. Set
+VENUES_SNAPSHOT=false to filter in SQL instead.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import String, cast, func, inspect, select
+
+from models.availability_index import AvailabilityIndex
+from models.database import (Amenity, AvailableDate, EventType, Purpose, SessionLocal, Venue, VenueChange, engine,
+                             venue_amenities, venue_changes_after, venue_event_types, venue_purposes)
+from models.venue_geo import GeoGrid
+from models.venue_models import FoodPreference, VenueSearchCriteria
+
+VENUE_SNAPSHOT_REFRESH_SECONDS = float(os.getenv("VENUE_SNAPSHOT_REFRESH_SECONDS", "5"))
+
+# More changed venues than this in one refresh: reload everything instead
+MAX_INCREMENTAL_CHANGES = 5000
+
+# SQLite's NOCASE and lower() only fold ASCII letters; match them exactly
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# (relation table, its name column, name table) per bitmask
+_RELATIONS = {
+    "amenities": (venue_amenities, venue_amenities.c.amenity_id, Amenity),
+    "event_types": (venue_event_types, venue_event_types.c.event_type_id, EventType),
+    "purposes": (venue_purposes, venue_purposes.c.purpose_id, Purpose),
+}
+
+
+def fold(name: str) -> str:
+    return name.translate(_ASCII_LOWER)
+
+
+def location_codes(vocabulary: "_Vocabulary", locations: Sequence[str]) -> List[int]:
+    """Codes of the locations containing any of locations, ignoring case (models.venue_catalog.location_filter)."""
+    needles = [fold(location.strip()) for location in locations]
+    return [code for name, code in vocabulary.locations.items() if any(needle in name for needle in needles)]
+
+
+def _day(value) -> int:
+    """Days since 1970-01-01, like the window columns."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return int(np.datetime64(value, "D").astype(np.int32))
+
+
+@dataclass
+class _Vocabulary:
+    """Folded name -> code (locations) or bit number (relations). Only ever grows."""
+    locations: Dict[str, int] = field(default_factory=dict)
+    bits: Dict[str, Dict[str, int]] = field(default_factory=lambda: {kind: {} for kind in _RELATIONS})
+
+    def copy(self) -> "_Vocabulary":
+        return _Vocabulary(dict(self.locations), {kind: dict(names) for kind, names in self.bits.items()})
+
+    def words(self, kind: str) -> int:
+        return max(1, (len(self.bits[kind]) + 63) // 64)
+
+    def mask(self, kind: str, names: Sequence[str]) -> np.ndarray:
+        """Bitmask with the bits of the given names; unknown names set nothing."""
+        mask = np.zeros(self.words(kind), dtype=np.uint64)
+        for name in names:
+            bit = self.bits[kind].get(fold(name))
+            if bit is not None:
+                mask[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        return mask
+
+
+@dataclass(frozen=True)
+class _Columns:
+    """One immutable generation of the snapshot; positions are ordered by venues.id."""
+    vocabulary: _Vocabulary
+    ids: np.ndarray  # venues.id
+    venue_ids: np.ndarray  # catalog IDs (V001)
+    locations: np.ndarray  # location codes
+    capacity: np.ndarray
+    price: np.ndarray
+    veg: np.ndarray
+    non_veg: np.ndarray
+    latitude: np.ndarray  # NaN when not geocoded
+    longitude: np.ndarray
+    bitmasks: Dict[str, np.ndarray]  # kind -> (venues, words) uint64
+    window_owners: np.ndarray  # venues.id per availability window
+    window_starts: np.ndarray  # days since 1970-01-01
+    window_ends: np.ndarray
+    rank: np.ndarray = None  # position in the result order (price, then catalog ID)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @cached_property
+    def availability(self) -> AvailabilityIndex:
+        """Built on first use by a date query; each refresh makes a new generation."""
+        return AvailabilityIndex(self.window_owners, self.window_starts, self.window_ends)
+
+    @cached_property
+    def geo(self) -> GeoGrid:
+        """Built on first use by a radius query, like availability."""
+        return GeoGrid(self.ids, self.latitude, self.longitude)
+
+    def positions(self, row_ids: np.ndarray) -> np.ndarray:
+        """Positions of the given venues.id values, in their order; unknown ids are dropped."""
+        positions = np.searchsorted(self.ids, row_ids)
+        inside = positions < len(self.ids)
+        positions, row_ids = positions[inside], row_ids[inside]
+        return positions[self.ids[positions] == row_ids]
+
+    def member_mask(self, row_ids: np.ndarray) -> np.ndarray:
+        """Boolean mask of the positions of the given venues.id values (unknown ids ignored)."""
+        mask = np.zeros(len(self.ids), dtype=bool)
+        mask[self.positions(row_ids)] = True
+        return mask
+
+    def with_rank(self) -> "_Columns":
+        rank = np.empty(len(self.ids), dtype=np.int64)
+        rank[np.lexsort((self.venue_ids, self.price))] = np.arange(len(self.ids))
+        return replace(self, rank=rank)
+
+
+def _pad_words(bits: np.ndarray, words: int) -> np.ndarray:
+    return bits if bits.shape[1] == words else np.pad(bits, ((0, 0), (0, words - bits.shape[1])))
+
+
+def _days(values) -> np.ndarray:
+    """ISO dates -> days since 1970-01-01."""
+    return np.array(values, dtype="datetime64[D]").astype(np.int32)
+
+
+def _load(db, vocabulary: _Vocabulary, row_ids: Optional[Sequence[int]] = None) -> _Columns:
+    """Columns for the given venues (all when row_ids is None); vocabulary is extended in place.
+
+    Plain Core rows and vectorized conversion: a full load runs over every relation row.
+    """
+    conn = db.connection()
+
+    def only(stmt, column):
+        return stmt if row_ids is None else stmt.where(column.in_(row_ids))
+
+    venues = conn.execute(only(select(
+        Venue.id, Venue.venue_id, Venue.location, Venue.capacity, Venue.price_per_day, Venue.has_veg, Venue.has_non_veg,
+        Venue.latitude, Venue.longitude,
+    ), Venue.id).order_by(Venue.id)).all()
+    ids = np.array([v[0] for v in venues], dtype=np.int64)
+    locations = np.array([vocabulary.locations.setdefault(fold(v[2]), len(vocabulary.locations)) for v in venues],
+                         dtype=np.int32)
+
+    bitmasks = {}
+    for kind, (relation, name_id, names) in _RELATIONS.items():
+        kind_bits = vocabulary.bits[kind]
+        name_rows = conn.execute(select(names.id, names.name)).all()
+        bit_by_name_id = np.full(max((row[0] for row in name_rows), default=0) + 1, -1, dtype=np.int64)
+        for row_id, name in name_rows:
+            bit_by_name_id[row_id] = kind_bits.setdefault(fold(name), len(kind_bits))
+        # Rows as tuples: numpy probes a Row for array attributes, which is very slow
+        pairs = np.array([tuple(row) for row in conn.execute(only(select(relation.c.venue_id, name_id),
+                                                                  relation.c.venue_id)).all()], dtype=np.int64).reshape(-1, 2)
+        owners, bit_numbers = pairs[:, 0], bit_by_name_id[pairs[:, 1]]
+        # Relation rows of venues that no longer exist (or of names that don't) are ignored
+        positions = np.searchsorted(ids, owners)
+        known = positions < len(ids)
+        known[known] = ids[positions[known]] == owners[known]
+        known &= bit_numbers >= 0
+        bits = np.zeros((len(ids), vocabulary.words(kind)), dtype=np.uint64)
+        np.bitwise_or.at(bits, (positions[known], bit_numbers[known] // 64),
+                         np.left_shift(np.uint64(1), (bit_numbers[known] % 64).astype(np.uint64)))
+        bitmasks[kind] = bits
+
+    windows = conn.execute(only(
+        select(AvailableDate.venue_id, cast(AvailableDate.start_date, String), cast(AvailableDate.end_date, String))
+        .where(AvailableDate.venue_id.is_not(None)), AvailableDate.venue_id,
+    )).all()
+
+    return _Columns(
+        vocabulary=vocabulary,
+        ids=ids,
+        venue_ids=np.array([v[1] for v in venues], dtype=str),
+        locations=locations,
+        capacity=np.array([v[3] for v in venues], dtype=np.int64),
+        price=np.array([v[4] for v in venues], dtype=np.float64),
+        veg=np.array([bool(v[5]) for v in venues], dtype=bool),
+        non_veg=np.array([bool(v[6]) for v in venues], dtype=bool),
+        latitude=np.array([v[7] for v in venues], dtype=np.float64),  # None -> NaN
+        longitude=np.array([v[8] for v in venues], dtype=np.float64),
+        bitmasks=bitmasks,
+        window_owners=np.array([w[0] for w in windows], dtype=np.int64),
+        window_starts=_days([w[1][:10] for w in windows]),
+        window_ends=_days([w[2][:10] for w in windows]),
+    )
+
+
+def _merge(old: _Columns, changed: np.ndarray, part: _Columns) -> _Columns:
+    """old without the changed venues, plus their reloaded state in part (deleted venues are simply absent)."""
+    keep = ~np.isin(old.ids, changed)
+    ids = np.concatenate([old.ids[keep], part.ids])
+    order = np.argsort(ids, kind="stable")
+
+    def column(name):
+        return np.concatenate([getattr(old, name)[keep], getattr(part, name)])[order]
+
+    bitmasks = {}
+    for kind in _RELATIONS:
+        words = part.vocabulary.words(kind)
+        bitmasks[kind] = np.concatenate([_pad_words(old.bitmasks[kind][keep], words),
+                                         _pad_words(part.bitmasks[kind], words)])[order]
+    window_keep = ~np.isin(old.window_owners, changed)
+    return _Columns(
+        vocabulary=part.vocabulary,
+        ids=ids[order],
+        venue_ids=column("venue_ids"),
+        locations=column("locations"),
+        capacity=column("capacity"),
+        price=column("price"),
+        veg=column("veg"),
+        non_veg=column("non_veg"),
+        latitude=column("latitude"),
+        longitude=column("longitude"),
+        bitmasks=bitmasks,
+        window_owners=np.concatenate([old.window_owners[window_keep], part.window_owners]),
+        window_starts=np.concatenate([old.window_starts[window_keep], part.window_starts]),
+        window_ends=np.concatenate([old.window_ends[window_keep], part.window_ends]),
+    )
+
+
+def _has_any(bits: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    return (bits & mask).any(axis=1)
+
+
+def snapshot_mask(columns: _Columns, criteria: VenueSearchCriteria) -> np.ndarray:
+    """Boolean mask of matching venues; the same semantics as models.venue_search.search_filters()."""
+    # Imported here: venue_search uses the snapshot
+    from models.venue_search import CATALOG_AMENITIES, CATALOG_EVENT_TYPES, event_dates
+
+    vocabulary = columns.vocabulary
+    mask = np.ones(len(columns), dtype=bool)
+    if criteria.location:
+        mask &= np.isin(columns.locations, location_codes(vocabulary, [criteria.location]))
+    if criteria.min_capacity is not None:
+        mask &= columns.capacity >= criteria.min_capacity
+    if criteria.max_capacity is not None:
+        mask &= columns.capacity <= criteria.max_capacity
+    if criteria.min_price is not None:
+        mask &= columns.price >= criteria.min_price
+    if criteria.max_price is not None:
+        mask &= columns.price <= criteria.max_price
+    if criteria.event_type is not None:
+        names = CATALOG_EVENT_TYPES.get(criteria.event_type, (criteria.event_type.value,))
+        mask &= (_has_any(columns.bitmasks["event_types"], vocabulary.mask("event_types", names))
+                 | _has_any(columns.bitmasks["purposes"], vocabulary.mask("purposes", names)))
+    if criteria.food_preference in (FoodPreference.VEG, FoodPreference.BOTH):
+        mask &= columns.veg
+    if criteria.food_preference in (FoodPreference.NON_VEG, FoodPreference.BOTH):
+        mask &= columns.non_veg
+    for amenity in criteria.required_amenities or []:
+        names = CATALOG_AMENITIES.get(amenity, (amenity.value,))
+        mask &= _has_any(columns.bitmasks["amenities"], vocabulary.mask("amenities", names))
+    dates = event_dates(criteria)
+    if dates:
+        mask &= columns.member_mask(columns.availability.containing(_day(dates[0]), _day(dates[1])))
+    return mask
+
+
+class VenueSnapshot:
+    """Columnar copy of the catalog, refreshed from the venue_changes log."""
+
+    def __init__(self, session_factory=SessionLocal, refresh_seconds: float = VENUE_SNAPSHOT_REFRESH_SECONDS):
+        self.session_factory = session_factory
+        self.refresh_seconds = refresh_seconds
+        self._columns: Optional[_Columns] = None
+        self._last_change_id = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.full_loads = 0
+        self.incremental_refreshes = 0
+        self.venues_reloaded = 0
+        self.last_refresh_ms = 0.0
+
+    def columns(self) -> _Columns:
+        """The current generation, refreshing it first if the change log is due for a check."""
+        if self._columns is None or time.monotonic() - self._checked_at >= self.refresh_seconds:
+            self.refresh()
+        return self._columns
+
+    def refresh(self, force: bool = False):
+        """Apply new change log entries. Other threads keep using the previous generation meanwhile."""
+        if not self._lock.acquire(blocking=self._columns is None or force):
+            return
+        try:
+            if not force and self._columns is not None and time.monotonic() - self._checked_at < self.refresh_seconds:
+                return
+            started = time.perf_counter()
+            with self.session_factory() as db:
+                # Read the log position before the data: a write in between is just applied again next time
+                if self._columns is None:
+                    self._full_load(db)
+                else:
+                    self._apply_changes(db)
+            self._checked_at = time.monotonic()
+            self.last_refresh_ms = (time.perf_counter() - started) * 1000
+        finally:
+            self._lock.release()
+
+    def _full_load(self, db):
+        self._last_change_id = db.scalar(select(func.max(VenueChange.id))) or 0
+        self._columns = _load(db, _Vocabulary()).with_rank()
+        self.full_loads += 1
+
+    def _apply_changes(self, db):
+        changes = venue_changes_after(db, self._last_change_id)
+        if changes is None:
+            # Changes we have not seen were pruned from the log
+            self._full_load(db)
+            return
+        if not changes:
+            return
+        changed = {row.venue_row_id for row in changes}
+        if None in changed or len(changed) > MAX_INCREMENTAL_CHANGES:
+            self._full_load(db)
+            return
+        self._last_change_id = changes[-1].id
+        changed = np.array(sorted(changed), dtype=np.int64)
+        part = _load(db, self._columns.vocabulary.copy(), changed.tolist())
+        self._columns = _merge(self._columns, changed, part).with_rank()
+        self.incremental_refreshes += 1
+        self.venues_reloaded += len(changed)
+
+    def search(self, criteria: VenueSearchCriteria, ranked_ids: Optional[Sequence[int]] = None) -> Tuple[int, List[int]]:
+        """(number of matches, venues.id of the requested page), cheapest first like the SQL search.
+
+        With ranked_ids (full-text matches, best first) only those venues match, in that order.
+        """
+        columns = self.columns()
+        mask = snapshot_mask(columns, criteria)
+        offset = (criteria.page - 1) * criteria.page_size
+        end = offset + criteria.page_size
+        if ranked_ids is not None:
+            positions = columns.positions(np.asarray(ranked_ids, dtype=np.int64))
+            matches = positions[mask[positions]]
+            return len(matches), columns.ids[matches[offset:end]].tolist()
+        matches = np.flatnonzero(mask)
+        total = len(matches)
+        if offset >= total:
+            return total, []
+        ranks = columns.rank[matches]
+        if end < total:
+            # Only the first `end` results need sorting
+            first = np.argpartition(ranks, end - 1)[:end]
+            matches, ranks = matches[first], ranks[first]
+        page = matches[np.argsort(ranks)][offset:end]
+        return total, columns.ids[page].tolist()
+
+    def matching_ids(self, criteria: VenueSearchCriteria) -> Optional[List[int]]:
+        """venues.id of venues matching the criteria's filters; None when every venue does."""
+        columns = self.columns()
+        mask = snapshot_mask(columns, criteria)
+        return None if mask.all() else columns.ids[mask].tolist()
+
+    def nearby(self, latitude: float, longitude: float, radius_km: float) -> Dict[int, float]:
+        """venues.id within radius_km of the point -> distance in km, nearest first."""
+        return self.columns().geo.within(latitude, longitude, radius_km)
+
+    def available_row_ids(self, locations: Sequence[str], start, end) -> List[int]:
+        """venues.id of venues whose location contains any of locations (case-insensitive, like
+        VenueCatalog.search) and that are available on at least one day of start..end."""
+        columns = self.columns()
+        mask = np.isin(columns.locations, location_codes(columns.vocabulary, locations))
+        mask &= columns.member_mask(columns.availability.overlapping(_day(start), _day(end)))
+        return columns.ids[mask].tolist()
+
+    def stats(self) -> Dict:
+        columns = self._columns
+        return {
+            "venues": len(columns) if columns is not None else 0,
+            "full_loads": self.full_loads,
+            "incremental_refreshes": self.incremental_refreshes,
+            "venues_reloaded": self.venues_reloaded,
+            "last_refresh_ms": round(self.last_refresh_ms, 2),
+        }
+
+
+_snapshot: Optional[VenueSnapshot] = None
+_snapshot_checked = False
+
+
+def get_venue_snapshot() -> Optional[VenueSnapshot]:
+    """Process-wide snapshot, or None when disabled (VENUES_SNAPSHOT=false) or the change log is missing (run init_db)."""
+    global _snapshot, _snapshot_checked
+    if not _snapshot_checked:
+        _snapshot_checked = True
+        if os.getenv("VENUES_SNAPSHOT", "true").lower() not in ("1", "true", "yes"):
+            return None
+        if not inspect(engine).has_table(VenueChange.__tablename__):
+            print("Venue snapshot disabled: venue_changes table missing, run init_db()")
+            return None
+        _snapshot = VenueSnapshot()
+    return _snapshot
@@ -0,0 +1,62 @@
+"""
+Full-text venue search over names, descriptions and locations (SQLite FTS5).
+
+The venues_fts index is created with the schema and kept in sync by triggers
+(models/database.py). Matches are ranked by BM25 with name hits weighted
+highest. Free text becomes a safe FTS5 query: words are quoted (no FTS
+syntax reaches SQLite), filler words are dropped, and porter stemming lets
+"resorts" match "resort".
+
+- any-word queries rank venues for /api/venue/search (criteria.query) and
+  order the agent tools' catalog results by relevance
+- all-word queries find a venue from a loose name ("hillside resort lonavla")
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import column, func, literal_column, select, table
+
+from models.database import VENUE_FTS_TABLE, Venue
+
+# BM25 weight of a hit in the name, description and location columns
+BM25_WEIGHTS = (10.0, 1.0, 4.0)
+
+# Relevance ranking stops after this many matches by default (/api/venue/search filters first and keeps all)
+TEXT_SEARCH_MAX_MATCHES = 2000
+
+STOPWORDS = frozenset(
+    "a an and any at best by for from good in into is me near nearby of on or please show some the to with within "
+    "find looking need want venue venues place places".split()
+)
+_WORD = re.compile(r"\w+")
+
+_fts = table(VENUE_FTS_TABLE, column("rowid"))
+
+
+def fts_query(text: str, match_all: bool = False) -> Optional[str]:
+    """FTS5 MATCH expression for free text, or None when nothing searchable is left."""
+    words = []
+    for word in _WORD.findall((text or "").lower()):
+        if word not in STOPWORDS and word not in words:
+            words.append(word)
+    if not words:
+        return None
+    return (" AND " if match_all else " OR ").join(f'"{word}"' for word in words)
+
+
+def relevance_statement(text: str, match_all: bool = False, limit: Optional[int] = TEXT_SEARCH_MAX_MATCHES):
+    """SELECT venue_row_id (venues.id), score for venues matching text, best first; None without search words.
+
+    BM25 scores are negative, lower is better; ties go by catalog ID. limit=None keeps every match.
+    """
+    query = fts_query(text, match_all)
+    if query is None:
+        return None
+    score = func.bm25(literal_column(VENUE_FTS_TABLE), *BM25_WEIGHTS)
+    return (
+        select(Venue.id.label("venue_row_id"), score.label("score"))
+        .join_from(_fts, Venue, Venue.id == _fts.c.rowid)
+        .where(literal_column(VENUE_FTS_TABLE).match(query))
+        .order_by(score, Venue.venue_id)
+        .limit(limit)
+    )
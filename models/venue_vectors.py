@@ -0,0 +1,447 @@
+"""
+Local semantic index over venue text; no embedding service or model download.
+
+Each venue's name, location, description and catalog names (amenities, event
+types, purposes) become a dense vector with the hashing trick: words, word
+pairs and synonym concepts (SYNONYM_GROUPS: "offsite" and "retreat", "banquet"
+and "reception hall" share one) are hashed into VENUE_VECTOR_DIM signed
+buckets, weighted by sublinear TF and IDF and L2-normalized, so a dot product
+is the cosine similarity.
+
+The matrix is stored in VENUE_VECTORS_DIR as vectors.npy (memory-mapped when
+loaded) next to the venue ids, IDF weights and meta.json. It is built once
+(here on first use, or by scripts/build_venue_vectors.py); afterwards new and
+changed venues from the venue_changes log are encoded with the stored IDF and
+kept in memory until the next save(). search() scores a batch of queries
+against one block of rows at a time and keeps the best k per query.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import case, func, inspect, literal, select
+
+from models.database import (Amenity, EventType, Purpose, SessionLocal, Venue, VenueChange, engine, venue_amenities,
+                             venue_changes_after, venue_event_types, venue_purposes)
+from models.venue_text_search import STOPWORDS
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VENUE_VECTORS_DIR = os.getenv("VENUE_VECTORS_DIR", os.path.join(_PROJECT_ROOT, "venue_vectors"))
+VENUE_VECTOR_DIM = int(os.getenv("VENUE_VECTOR_DIM", "512"))
+VENUE_VECTORS_SYNC_SECONDS = float(os.getenv("VENUE_VECTORS_SYNC_SECONDS", "5"))
+
+# Cosine similarity below which a venue is not a semantic match
+SEMANTIC_MIN_SCORE = float(os.getenv("VENUE_SEMANTIC_MIN_SCORE", "0.1"))
+
+# Semantic ranking stops after this many matches among the candidates (like TEXT_SEARCH_MAX_MATCHES)
+SEMANTIC_MAX_MATCHES = 2000
+
+# Rows scored per matrix product in search()
+SEARCH_BLOCK_ROWS = 16384
+
+# More changed venues than this in one sync: rebuild instead
+MAX_INCREMENTAL_CHANGES = 5000
+
+# Words and phrases that mean the same thing when looking for a venue; a text
+# mentioning any of them gets the group's concept feature
+SYNONYM_GROUPS = [
+    ("offsite", "off site", "retreat", "getaway", "outing", "team building", "workation"),
+    ("banquet", "banquet hall", "reception", "reception hall", "function hall", "party hall", "ballroom",
+     "marriage hall", "convention hall"),
+    ("wedding", "marriage", "shaadi", "sangeet", "mehendi", "engagement", "reception"),
+    ("conference", "convention", "summit", "symposium", "seminar", "meeting", "boardroom", "workshop"),
+    ("party", "celebration", "birthday", "anniversary", "get together", "social"),
+    ("resort", "villa", "cottage", "farmhouse", "farm house", "homestay", "stay", "accommodation", "rooms",
+     "lodging", "hotel"),
+    ("lawn", "garden", "outdoor", "open air", "terrace", "rooftop", "poolside"),
+    ("scenic", "view", "valley", "hilltop", "hill", "lake", "lakeside", "beach", "sea", "mountain", "nature"),
+    ("corporate", "business", "company", "office", "team", "client"),
+    ("launch", "product launch", "exhibition", "expo", "showcase"),
+    ("av", "audio visual", "projector", "sound system"),
+    ("catering", "food", "buffet", "dining", "cuisine"),
+    ("wifi", "wi fi", "internet"),
+    ("pool", "swimming"),
+    ("luxury", "premium", "upscale", "grand", "five star", "heritage", "palace"),
+]
+
+_WORD = re.compile(r"[^\W_]+")
+
+# Concept features are a little weaker than the words themselves
+_CONCEPT_WEIGHT = 0.8
+
+
+def _stem(word: str) -> str:
+    """Plural -> singular, enough for venue vocabulary (cottages, getaways, facilities)."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def _words(text: str) -> List[str]:
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+def _concepts() -> Dict[str, Tuple[str, ...]]:
+    """Stemmed word or word pair -> concepts it stands for."""
+    concepts: Dict[str, Tuple[str, ...]] = {}
+    for group in SYNONYM_GROUPS:
+        concept = group[0]
+        for term in group:
+            key = " ".join(_words(term))
+            if concept not in concepts.get(key, ()):
+                concepts[key] = concepts.get(key, ()) + (concept,)
+    return concepts
+
+
+_CONCEPTS = _concepts()
+
+
+def features(text: str) -> Counter:
+    """Feature -> weighted count: words (w:), adjacent word pairs (b:) and synonym concepts (c:)."""
+    words = _words(text or "")
+    pairs = [f"{a} {b}" for a, b in zip(words, words[1:])]
+    counts = Counter()
+    counts.update(f"w:{word}" for word in words)
+    counts.update(f"b:{pair}" for pair in pairs)
+    for term in words + pairs:
+        for concept in _CONCEPTS.get(term, ()):
+            counts[f"c:{concept}"] += _CONCEPT_WEIGHT
+    return counts
+
+
+@lru_cache(maxsize=1 << 18)
+def _bucket(feature: str, dim: int) -> Tuple[int, float]:
+    """(bucket, sign) of a feature; crc32 so the buckets are the same in every process."""
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % dim, 1.0 if (h // dim) % 2 else -1.0
+
+
+class HashingEncoder:
+    """Text -> L2-normalized float32 vectors of length dim (signed feature hashing, sublinear TF, IDF)."""
+
+    def __init__(self, dim: int = VENUE_VECTOR_DIM, idf: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.idf = np.ones(dim, dtype=np.float32) if idf is None else np.asarray(idf, dtype=np.float32)
+
+    def terms(self, text: str) -> Dict[int, float]:
+        """bucket -> signed 1 + log(tf), before IDF."""
+        weights: Dict[int, float] = {}
+        for feature, count in features(text).items():
+            bucket, sign = _bucket(feature, self.dim)
+            weights[bucket] = weights.get(bucket, 0.0) + sign * (1.0 + math.log(count) if count >= 1 else count)
+        return weights
+
+    def _vectors(self, term_lists: Sequence[Dict[int, float]]) -> np.ndarray:
+        vectors = np.zeros((len(term_lists), self.dim), dtype=np.float32)
+        for row, weights in enumerate(term_lists):
+            if weights:
+                vectors[row, list(weights)] = list(weights.values())
+        vectors *= self.idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        return self._vectors([self.terms(text) for text in texts])
+
+    @classmethod
+    def fit_encode(cls, texts: Sequence[str], dim: int = VENUE_VECTOR_DIM) -> Tuple["HashingEncoder", np.ndarray]:
+        """Encoder with IDF weights learned from texts, and the texts' vectors."""
+        term_lists = [cls(dim).terms(text) for text in texts]
+        df = np.zeros(dim, dtype=np.float64)
+        for weights in term_lists:
+            df[[bucket for bucket, value in weights.items() if value]] += 1
+        encoder = cls(dim, np.log((1 + len(texts)) / (1 + df)) + 1)
+        return encoder, encoder._vectors(term_lists)
+
+
+def rank_order(row_ids: Sequence[int], column=Venue.id):
+    """ORDER BY expression putting row_ids first, in the given order."""
+    if not row_ids:
+        return literal(0)
+    return case({row_id: rank for rank, row_id in enumerate(row_ids)}, value=column, else_=len(row_ids))
+
+
+# --- Venue documents ---
+_NAME_RELATIONS = [
+    (venue_amenities.c.venue_id, venue_amenities.c.amenity_id, Amenity),
+    (venue_event_types.c.venue_id, venue_event_types.c.event_type_id, EventType),
+    (venue_purposes.c.venue_id, venue_purposes.c.purpose_id, Purpose),
+]
+
+# Row ids per IN list when loading changed venues
+_IN_CHUNK = 900
+
+
+def _document_rows(db, row_ids: Optional[Sequence[int]]) -> Dict[int, List[str]]:
+    stmt = select(Venue.id, Venue.name, Venue.location, Venue.description)
+    if row_ids is not None:
+        stmt = stmt.where(Venue.id.in_(row_ids))
+    # The name counts twice: it says most about the venue
+    parts = {row.id: [row.name, row.name, row.location, row.description or ""] for row in db.execute(stmt)}
+    for venue_id, name_id, names in _NAME_RELATIONS:
+        stmt = select(venue_id, names.name).join(names, names.id == name_id)
+        if row_ids is not None:
+            stmt = stmt.where(venue_id.in_(row_ids))
+        for row_id, name in db.execute(stmt):
+            if row_id in parts:
+                parts[row_id].append(name)
+    return parts
+
+
+def venue_documents(db, row_ids: Optional[Sequence[int]] = None) -> Tuple[List[int], List[str]]:
+    """(venues.id, text) of the given venues (all by default), by id; missing ids are left out."""
+    if row_ids is None:
+        parts = _document_rows(db, None)
+    else:
+        parts = {}
+        for start in range(0, len(row_ids), _IN_CHUNK):
+            parts.update(_document_rows(db, list(row_ids[start:start + _IN_CHUNK])))
+    ids = sorted(parts)
+    return ids, [". ".join(part for part in parts[row_id] if part) for row_id in ids]
+
+
+def database_source(bind) -> str:
+    """The database an index is built from (URL without password), stored with the saved index."""
+    return bind.url.render_as_string(hide_password=True)
+
+
+# --- Index ---
+def _top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Best k columns per row (unordered)."""
+    if scores.shape[1] <= k:
+        return scores, ids
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(scores, best, axis=1), np.take_along_axis(ids, best, axis=1)
+
+
+class VenueVectorIndex:
+    """Venue vectors: a saved (memory-mapped) block plus venues added since, searched by cosine similarity."""
+
+    def __init__(self, encoder: HashingEncoder, ids: np.ndarray, vectors: np.ndarray, last_change_id: int = 0,
+                 session_factory=None, sync_seconds: float = VENUE_VECTORS_SYNC_SECONDS):
+        self.encoder = encoder
+        self.session_factory = session_factory
+        self.sync_seconds = sync_seconds
+        self.last_change_id = last_change_id
+        self.source = ""  # database the saved vectors were built from
+        # (saved ids (sorted), saved vectors, which saved rows are current, added ids, added vectors);
+        # replaced as a whole so searches never see a half-applied change
+        self._state = (np.asarray(ids, dtype=np.int64), vectors, np.ones(len(ids), dtype=bool),
+                       np.zeros(0, dtype=np.int64), np.zeros((0, encoder.dim), dtype=np.float32))
+        self._lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        self.full_builds = 0
+        self.venues_added = 0
+        self.last_sync_ms = 0.0
+
+    def __len__(self):
+        _, _, alive, added_ids, _ = self._state
+        return int(alive.sum()) + len(added_ids)
+
+    # --- building and storage ---
+    @classmethod
+    def build(cls, session_factory=SessionLocal, dim: int = VENUE_VECTOR_DIM, **kwargs) -> "VenueVectorIndex":
+        """Encode every venue; IDF weights are learned from the catalog."""
+        with session_factory() as db:
+            # Read the log position before the data: a write in between is just applied again next sync
+            last_change_id = db.scalar(select(func.max(VenueChange.id))) or 0
+            ids, texts = venue_documents(db)
+        encoder, vectors = HashingEncoder.fit_encode(texts, dim)
+        index = cls(encoder, np.array(ids, dtype=np.int64), vectors, last_change_id, session_factory, **kwargs)
+        index.full_builds += 1
+        return index
+
+    def save(self, directory: str = VENUE_VECTORS_DIR, source: str = ""):
+        """Write every current vector to directory; each file is replaced atomically, meta.json last."""
+        ids, vectors = self.vectors()
+        os.makedirs(directory, exist_ok=True)
+        meta = {"dim": self.encoder.dim, "count": len(ids), "last_change_id": self.last_change_id,
+                "source": source, "saved_at": time.time()}
+        for name, array in (("vectors.npy", vectors), ("ids.npy", ids), ("idf.npy", self.encoder.idf)):
+            path = os.path.join(directory, name)
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, array)
+            os.replace(path + ".tmp", path)
+        with open(os.path.join(directory, "meta.json.tmp"), "w") as f:
+            json.dump(meta, f)
+        os.replace(os.path.join(directory, "meta.json.tmp"), os.path.join(directory, "meta.json"))
+
+    @classmethod
+    def load(cls, directory: str = VENUE_VECTORS_DIR, mmap: bool = True, **kwargs) -> Optional["VenueVectorIndex"]:
+        """The saved index, or None when missing or inconsistent. Vectors stay on disk (mmap) until read."""
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            return None
+        try:
+            with open(os.path.join(directory, "meta.json")) as f:
+                meta = json.load(f)
+            ids = np.load(os.path.join(directory, "ids.npy"))
+            idf = np.load(os.path.join(directory, "idf.npy"))
+            vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r" if mmap else None)
+        except (OSError, ValueError) as e:
+            print(f"Venue vectors not loaded from {directory}: {e}")
+            return None
+        if vectors.shape != (len(ids), meta["dim"]) or len(idf) != meta["dim"]:
+            print(f"Venue vectors in {directory} are inconsistent, ignoring them")
+            return None
+        index = cls(HashingEncoder(meta["dim"], idf), ids, vectors, meta["last_change_id"], **kwargs)
+        index.source = meta.get("source", "")
+        return index
+
+    def vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, vectors) of every current venue, by id."""
+        ids, vectors, alive, added_ids, added_vectors = self._state
+        all_ids = np.concatenate([ids[alive], added_ids])
+        order = np.argsort(all_ids, kind="stable")
+        return all_ids[order], np.concatenate([np.asarray(vectors[alive]), added_vectors])[order]
+
+    # --- changes ---
+    def add(self, row_ids: Sequence[int], texts: Sequence[str]):
+        """Encode and add venues, replacing any earlier vectors of the same ids."""
+        self._replace(row_ids, row_ids, self.encoder.encode(texts))
+
+    def remove(self, row_ids: Sequence[int]):
+        self._replace(row_ids, [], np.zeros((0, self.encoder.dim), dtype=np.float32))
+
+    def _replace(self, removed: Sequence[int], row_ids: Sequence[int], new_vectors: np.ndarray):
+        removed = np.asarray(removed, dtype=np.int64)
+        with self._lock:
+            ids, vectors, alive, added_ids, added_vectors = self._state
+            keep = ~np.isin(added_ids, removed)
+            self._state = (ids, vectors, alive & ~np.isin(ids, removed),
+                           np.concatenate([added_ids[keep], np.asarray(row_ids, dtype=np.int64)]),
+                           np.concatenate([added_vectors[keep], new_vectors]))
+        self.venues_added += len(row_ids)
+
+    def refresh(self, force: bool = False):
+        """Encode venues changed since the last sync (venue_changes log); a renamed amenity etc. means a rebuild."""
+        if self.session_factory is None or not self._lock.acquire(blocking=force):
+            return
+        try:
+            if not force and time.monotonic() - self._checked_at < self.sync_seconds:
+                return
+            started = time.perf_counter()
+            with self.session_factory() as db:
+                # None: changes we have not seen were pruned from the log, so rebuild
+                changes = venue_changes_after(db, self.last_change_id)
+                changed = {row.venue_row_id for row in changes or ()}
+                documents = None
+                if changes and None not in changed and len(changed) <= MAX_INCREMENTAL_CHANGES:
+                    documents = venue_documents(db, sorted(changed))
+            self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+        if changes is not None and not changes:
+            return
+        if documents is None:
+            rebuilt = type(self).build(self.session_factory, self.encoder.dim, sync_seconds=self.sync_seconds)
+            with self._lock:
+                self.encoder, self._state, self.last_change_id = rebuilt.encoder, rebuilt._state, rebuilt.last_change_id
+            self.full_builds += 1
+        else:
+            ids, texts = documents
+            # Deleted venues are in changed but have no document
+            self._replace(sorted(changed), ids, self.encoder.encode(texts))
+            self.last_change_id = changes[-1].id
+        self.last_sync_ms = (time.perf_counter() - started) * 1000
+
+    # --- search ---
+    def search(self, queries: Sequence[str], k: int = 10, candidates: Optional[Sequence[int]] = None,
+               min_score: float = 0.0) -> List[List[Tuple[int, float]]]:
+        """Per query, up to k (venues.id, cosine similarity) with similarity above min_score, best first.
+
+        candidates restricts the search to those venues.id values.
+        """
+        if time.monotonic() - self._checked_at >= self.sync_seconds:
+            self.refresh()
+        query_vectors = self.encoder.encode(queries)
+        ids, vectors, alive, added_ids, added_vectors = self._state
+        wanted = None if candidates is None else np.unique(np.asarray(candidates, dtype=np.int64))
+        best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+        best_ids = np.zeros((len(queries), 0), dtype=np.int64)
+        for block_ids, block_vectors, block_alive in ((ids, vectors, alive),
+                                                      (added_ids, added_vectors, np.ones(len(added_ids), dtype=bool))):
+            for start in range(0, len(block_ids), SEARCH_BLOCK_ROWS):
+                stop = start + SEARCH_BLOCK_ROWS
+                keep = block_alive[start:stop]
+                if wanted is not None:
+                    keep = keep & np.isin(block_ids[start:stop], wanted)
+                if keep.all():
+                    chunk_ids, chunk_vectors = block_ids[start:stop], block_vectors[start:stop]
+                else:
+                    rows = np.flatnonzero(keep) + start
+                    if not len(rows):
+                        continue
+                    chunk_ids, chunk_vectors = block_ids[rows], block_vectors[rows]
+                scores = query_vectors @ np.asarray(chunk_vectors).T
+                best_scores, best_ids = _top_k(
+                    np.concatenate([best_scores, scores], axis=1),
+                    np.concatenate([best_ids, np.broadcast_to(chunk_ids, scores.shape)], axis=1), k)
+        results = []
+        for scores, row_ids in zip(best_scores, best_ids):
+            order = np.lexsort((row_ids, -scores))
+            results.append([(int(row_ids[i]), float(scores[i])) for i in order if scores[i] > min_score])
+        return results
+
+    def ranked_ids(self, text: str, limit: int = SEMANTIC_MAX_MATCHES, candidates: Optional[Sequence[int]] = None,
+                   min_score: float = SEMANTIC_MIN_SCORE) -> List[int]:
+        """venues.id of venues similar to text, best first."""
+        return [row_id for row_id, _ in self.search([text], limit, candidates, min_score)[0]]
+
+    def stats(self) -> Dict:
+        ids, _, alive, added_ids, _ = self._state
+        return {
+            "venues": len(self),
+            "dim": self.encoder.dim,
+            "saved_venues": int(alive.sum()),
+            "added_venues": len(added_ids),
+            "full_builds": self.full_builds,
+            "venues_added": self.venues_added,
+            "last_sync_ms": round(self.last_sync_ms, 2),
+        }
+
+
+def load_or_build_index(directory: str = VENUE_VECTORS_DIR, session_factory=SessionLocal,
+                        source: str = "") -> VenueVectorIndex:
+    """The saved index if it was built from source, else a new one (saved when the directory is writable)."""
+    index = VenueVectorIndex.load(directory, session_factory=session_factory)
+    if index is not None and index.source == source:
+        return index
+    started = time.perf_counter()
+    index = VenueVectorIndex.build(session_factory)
+    try:
+        index.save(directory, source)
+    except OSError as e:
+        print(f"Venue vectors not saved to {directory}: {e}")
+    print(f"Built venue vector index: {len(index)} venues in {time.perf_counter() - started:.1f}s")
+    return index
+
+
+_index: Optional[VenueVectorIndex] = None
+_index_checked = False
+
+
+def get_venue_vector_index() -> Optional[VenueVectorIndex]:
+    """Process-wide index, or None when disabled (VENUE_VECTORS=false) or the change log is missing (run init_db)."""
+    global _index, _index_checked
+    if not _index_checked:
+        _index_checked = True
+        if os.getenv("VENUE_VECTORS", "true").lower() not in ("1", "true", "yes"):
+            return None
+        if not inspect(engine).has_table(VenueChange.__tablename__):
+            print("Venue vector index disabled: venue_changes table missing, run init_db()")
+            return None
+        _index = load_or_build_index(source=database_source(engine))
+    return _index
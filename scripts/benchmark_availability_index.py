@@ -0,0 +1,97 @@
+"""
+Benchmark availability queries: interval index vs a full scan vs SQL.
+
+"Free for every day of a range" (containment) and "free on some day of a
+range" (overlap) over a synthetic catalog of --venues venues with 1-3
+availability windows each, answered by:
+- AvailabilityIndex (models/availability_index.py)
+- a vectorized numpy scan of every window (containment per single window)
+- SQL on venues.db (the /api/venue/search date filter, and the overlap EXISTS)
+
+    python scripts/benchmark_availability_index.py --venues 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import numpy as np
+from sqlalchemy import and_, select
+from sqlalchemy.orm import sessionmaker
+
+from models.availability_index import AvailabilityIndex
+from models.database import AvailableDate, Venue, create_venue_engine
+from models.venue_search import _available_throughout
+from models.venue_snapshot import VenueSnapshot
+from scripts.benchmark_venue_search import populate_synthetic_catalog
+
+
+def _time_ms(fn, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - t) * 1000)
+    return result, statistics.median(timings)
+
+
+def main(venue_count: int, queries: int, sql_queries: int):
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_venue_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        start = time.perf_counter()
+        populate_synthetic_catalog(engine, venue_count)
+        print(f"Built synthetic catalog of {venue_count} venues in {time.perf_counter() - start:.1f}s")
+        Session = sessionmaker(bind=engine)
+        columns = VenueSnapshot(Session).columns()
+        owners, starts, ends = columns.window_owners, columns.window_starts, columns.window_ends
+
+        index, build_ms = _time_ms(lambda: AvailabilityIndex(owners, starts, ends), 3)
+        print(f"{len(owners)} windows, {index.intervals} after merging; index built in {build_ms:.1f}ms\n")
+
+        ranges = []
+        for _ in range(queries):
+            first = date(2026, 1, 1) + timedelta(days=rng.randint(0, 400))
+            ranges.append((first, first + timedelta(days=rng.randint(0, 6))))
+        days = [(int(np.datetime64(a, "D").astype(np.int64)), int(np.datetime64(b, "D").astype(np.int64))) for a, b in ranges]
+
+        def timed(label, fn, pairs):
+            timings, found = [], 0
+            for pair in pairs:
+                t = time.perf_counter()
+                found += len(fn(*pair))
+                timings.append((time.perf_counter() - t) * 1000)
+            print(f"    {label:28} {statistics.median(timings):9.3f}ms p50 {max(timings):9.3f}ms max  "
+                  f"({found / len(pairs):.0f} venues per query)")
+
+        print("Containment (free for every day of the range):")
+        timed("interval index", index.containing, days)
+        timed("numpy scan (single window)", lambda s, e: np.unique(owners[(starts <= s) & (ends >= e)]), days)
+        with Session() as db:
+            timed("sql", lambda s, e: db.scalars(select(Venue.id).where(_available_throughout(s, e))).all(),
+                  ranges[:sql_queries])
+
+        print("\nOverlap (free on some day of the range):")
+        timed("interval index", index.overlapping, days)
+        timed("numpy scan", lambda s, e: np.unique(owners[(starts <= e) & (ends >= s)]), days)
+        with Session() as db:
+            timed("sql", lambda s, e: db.scalars(select(Venue.id).where(Venue.available_dates.any(and_(
+                AvailableDate.start_date <= e, AvailableDate.end_date >= s)))).all(), ranges[:sql_queries])
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the availability interval index")
+    parser.add_argument("--venues", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--sql-queries", type=int, default=10)
+    args = parser.parse_args()
+    main(args.venues, args.queries, args.sql_queries)
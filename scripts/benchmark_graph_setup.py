@@ -0,0 +1,58 @@
+"""
+Measure per-request setup overhead of the venue finder graph and agent.
+
+Compares rebuilding the LangGraph and the venue AgentExecutor on every request
+(the previous behaviour) with the process-wide cached instances. No LLM or
+search calls are made; only construction cost is timed.
+
+Usage: python scripts/benchmark_graph_setup.py [iterations]
+"""
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+# GoogleSerperAPIWrapper validates that a key is configured when tools are built
+os.environ.setdefault("SERPER_API_KEY", "benchmark")
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+
+def _timed(fn, iterations):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - wall) / iterations * 1000, (time.process_time() - cpu) / iterations * 1000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    start = time.perf_counter()
+    from agent.venue_graph import build_venue_finder_graph, get_venue_finder_graph
+    from agent.venue_agent import build_venue_agent_executor, get_venue_agent_executor
+    print(f"Import of agent modules: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    llm = FakeListChatModel(responses=["ok"])
+    devnull = open(os.devnull, "w")
+    stdout = sys.stdout
+    sys.stdout = devnull  # graph construction prints diagnostics
+    try:
+        cold_wall, cold_cpu = _timed(lambda: (get_venue_finder_graph(), get_venue_agent_executor(llm)), 1)
+        rebuild_wall, rebuild_cpu = _timed(lambda: (build_venue_finder_graph(), build_venue_agent_executor(llm)), iterations)
+        cached_wall, cached_cpu = _timed(lambda: (get_venue_finder_graph(), get_venue_agent_executor(llm)), iterations)
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+
+    print(f"First request (cold build):     {cold_wall:8.3f} ms wall, {cold_cpu:8.3f} ms CPU")
+    print(f"Rebuild per request (before):   {rebuild_wall:8.3f} ms wall, {rebuild_cpu:8.3f} ms CPU")
+    print(f"Cached per request (after):     {cached_wall:8.3f} ms wall, {cached_cpu:8.3f} ms CPU")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure batch risk report latency versus venue count.
+
+Compares one LLM call over every venue (the previous behaviour) with
+token-budgeted chunks written in parallel. Searches and the LLM are simulated:
+each search returns a fixed-size result, and the fake LLM takes a fixed
+overhead plus time per prompt token and per output token, so a larger prompt
+gives a slower call.
+
+Usage: python scripts/benchmark_risk_batching.py [max_venues]
+"""
+import asyncio
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+os.environ.setdefault("SERPER_API_KEY", "benchmark")
+os.environ["SEARCH_CACHE_ENABLED"] = "false"
+os.environ["RISK_REPORT_CACHE_ENABLED"] = "false"
+
+from langchain_core.messages import AIMessage
+
+import agent.event_risk_agent as risk_agent
+from agent.history import estimate_tokens
+
+# Simulated LLM cost model
+CALL_OVERHEAD_S = 0.3
+PROMPT_TOKEN_S = 0.00005
+OUTPUT_TOKENS_PER_VENUE = 250
+OUTPUT_TOKEN_S = 0.002
+SEARCH_RESULT = "Lorem ipsum search snippet with dates, places and headlines. " * 25
+
+
+class SimulatedLLM:
+    async def ainvoke(self, prompt, config=None):
+        venues = prompt.count("\nWeather: ")
+        await asyncio.sleep(CALL_OVERHEAD_S + estimate_tokens(prompt) * PROMPT_TOKEN_S
+                   + venues * OUTPUT_TOKENS_PER_VENUE * OUTPUT_TOKEN_S)
+        return AIMessage(content=f"Report for {venues} venues")
+
+
+class SimulatedSearch:
+    async def arun(self, query, category="general"):
+        return SEARCH_RESULT
+
+
+def _timed(venue_count, token_budget):
+    risk_agent.RISK_PROMPT_TOKEN_BUDGET = token_budget
+    venues = [{"name": f"Venue {i}", "location": f"City {i % 3}"} for i in range(venue_count)]
+    start = time.perf_counter()
+    risk_agent.batch_assess_venue_risks(SimulatedLLM(), venues, "next week")
+    return time.perf_counter() - start
+
+
+def main():
+    max_venues = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    budget = risk_agent.RISK_PROMPT_TOKEN_BUDGET
+    risk_agent.get_cached_search = lambda: SimulatedSearch()
+
+    devnull = open(os.devnull, "w")
+    stdout = sys.stdout
+    rows = []
+    try:
+        for venue_count in sorted({1, 2, 5, 10, 15, max_venues}):
+            if venue_count > max_venues:
+                continue
+            sys.stdout = devnull  # the assessment prints diagnostics
+            single = _timed(venue_count, 10 ** 9)
+            chunked = _timed(venue_count, budget)
+            sys.stdout = stdout
+            rows.append((venue_count, single, chunked))
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+
+    print(f"Chunk budget: {budget} tokens, report concurrency: {risk_agent.RISK_REPORT_CONCURRENCY}")
+    print(f"{'venues':>6}  {'single call':>12}  {'chunked':>9}")
+    for venue_count, single, chunked in rows:
+        print(f"{venue_count:>6}  {single:>10.2f} s  {chunked:>7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
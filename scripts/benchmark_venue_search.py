@@ -0,0 +1,136 @@
+"""
+Benchmark /api/venue/search's structured query on a synthetic catalog.
+
+Builds a temporary venues database with --venues rows (relations and
+availability windows included), then times representative searches and prints
+their query plans, so missing or unused indexes show up as SCAN lines. Each
+search is also timed on the in-memory snapshot (models/venue_snapshot.py),
+filtering alone and with the page loaded, along with snapshot load and
+incremental refresh times.
+
+    python scripts/benchmark_venue_search.py --venues 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from sqlalchemy import insert, text, update
+from sqlalchemy.orm import sessionmaker
+
+from models.database import (Amenity, AvailableDate, Base, EventType, Purpose, Venue, create_venue_engine,
+                             venue_amenities, venue_event_types, venue_purposes)
+from models.venue_models import Amenity as ApiAmenity, EventType as ApiEventType, FoodPreference, VenueSearchCriteria
+from models.venue_search import _statements, search_venue_page
+from models.venue_snapshot import VenueSnapshot
+
+SYNTHETIC_LOCATIONS = ["Lonavla", "Pune", "Mumbai", "Bengaluru", "Goa", "Jaipur", "Udaipur", "Hyderabad",
+                       "Chennai", "Kolkata", "Delhi", "Gurugram", "Noida", "Kochi", "Mysuru", "Nashik"]
+SYNTHETIC_AMENITIES = ["AV", "Wi-Fi", "Parking", "Catering", "Accommodation", "Decor", "Pool", "Spa"]
+SYNTHETIC_EVENT_TYPES = ["Corporate", "Social"]
+SYNTHETIC_PURPOSES = ["Seminars", "Conference", "Birthday Party", "Product Launch", "Team Offsite", "Wedding", "Reception"]
+
+
+def populate_synthetic_catalog(engine, venue_count: int, seed: int = 7, start: date = date(2026, 1, 1)):
+    """Bulk-insert venue_count random venues with amenities, event types, purposes and 1-3 availability windows."""
+    rng = random.Random(seed)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Amenity.__table__), [{"id": i, "name": n} for i, n in enumerate(SYNTHETIC_AMENITIES, 1)])
+        conn.execute(insert(EventType.__table__), [{"id": i, "name": n} for i, n in enumerate(SYNTHETIC_EVENT_TYPES, 1)])
+        conn.execute(insert(Purpose.__table__), [{"id": i, "name": n} for i, n in enumerate(SYNTHETIC_PURPOSES, 1)])
+        venues, amenities, event_types, purposes, windows = [], [], [], [], []
+        for i in range(1, venue_count + 1):
+            venues.append({
+                "id": i, "venue_id": f"S{i:07d}", "name": f"Synthetic Venue {i}",
+                "location": rng.choice(SYNTHETIC_LOCATIONS), "capacity": rng.randint(20, 2000),
+                "price_per_day": float(rng.randrange(50000, 1500000, 5000)), "contact_number": "9876543210",
+                "description": "Synthetic benchmark venue", "has_veg": rng.random() < 0.9, "has_non_veg": rng.random() < 0.6,
+            })
+            amenities += [{"venue_id": i, "amenity_id": a} for a in rng.sample(range(1, len(SYNTHETIC_AMENITIES) + 1), rng.randint(2, 5))]
+            event_types += [{"venue_id": i, "event_type_id": e} for e in rng.sample(range(1, len(SYNTHETIC_EVENT_TYPES) + 1), rng.randint(1, 2))]
+            purposes += [{"venue_id": i, "purpose_id": p} for p in rng.sample(range(1, len(SYNTHETIC_PURPOSES) + 1), rng.randint(1, 3))]
+            for _ in range(rng.randint(1, 3)):
+                window_start = start + timedelta(days=rng.randint(0, 365))
+                windows.append({"venue_id": i, "start_date": window_start,
+                                "end_date": window_start + timedelta(days=rng.randint(1, 45))})
+        conn.execute(insert(Venue.__table__), venues)
+        conn.execute(insert(venue_amenities), amenities)
+        conn.execute(insert(venue_event_types), event_types)
+        conn.execute(insert(venue_purposes), purposes)
+        conn.execute(insert(AvailableDate.__table__), windows)
+        conn.execute(text("ANALYZE"))
+
+
+BENCHMARK_CRITERIA = {
+    "location only": VenueSearchCriteria(location="pune"),
+    "location + capacity + price": VenueSearchCriteria(location="Lonavla", min_capacity=200, max_capacity=600, max_price=500000),
+    "wedding, veg, amenities": VenueSearchCriteria(location="Goa", event_type=ApiEventType.WEDDING,
+                                                   food_preference=FoodPreference.VEG,
+                                                   required_amenities=[ApiAmenity.PARKING, ApiAmenity.CATERING]),
+    "dates + capacity, page 3": VenueSearchCriteria(location="Mumbai", min_capacity=100, start_date=datetime(2026, 5, 10),
+                                                    end_date=datetime(2026, 5, 12), page=3, page_size=10),
+    "no location, capacity range": VenueSearchCriteria(min_capacity=500, max_capacity=520, page_size=50),
+    "text query + capacity": VenueSearchCriteria(query="beach resort in goa", min_capacity=300),
+}
+
+
+def _time_ms(fn, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - t) * 1000)
+    return result, statistics.median(timings), max(timings)
+
+
+def main(venue_count: int, repeats: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_venue_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        start = time.perf_counter()
+        populate_synthetic_catalog(engine, venue_count)
+        print(f"Built synthetic catalog of {venue_count} venues in {time.perf_counter() - start:.1f}s")
+        Session = sessionmaker(bind=engine)
+        snapshot = VenueSnapshot(Session, refresh_seconds=3600)
+        snapshot.refresh()
+        print(f"Loaded snapshot in {snapshot.last_refresh_ms:.1f}ms\n")
+
+        for label, criteria in BENCHMARK_CRITERIA.items():
+            response, sql_p50, sql_max = _time_ms(lambda: search_venue_page(criteria, Session), repeats)
+            _, filter_p50, filter_max = _time_ms(lambda: snapshot.search(criteria), repeats)
+            snapshot_response, page_p50, page_max = _time_ms(
+                lambda: search_venue_page(criteria, Session, snapshot=snapshot), repeats)
+            assert snapshot_response == response, label
+            print(f"{label:32} {response.total_count:6} matches, page {response.page}/{response.total_pages}")
+            print(f"    sql                {sql_p50:8.3f}ms p50 {sql_max:8.3f}ms max")
+            print(f"    snapshot filter    {filter_p50:8.3f}ms p50 {filter_max:8.3f}ms max")
+            print(f"    snapshot + page    {page_p50:8.3f}ms p50 {page_max:8.3f}ms max")
+
+            with engine.connect() as conn:
+                for stmt in _statements(criteria):
+                    compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+                    for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")):
+                        print(f"    | {row[-1]}")
+
+        with engine.begin() as conn:
+            conn.execute(update(Venue).where(Venue.id % max(1, venue_count // 100) == 0)
+                         .values(price_per_day=Venue.price_per_day + 1000))
+        snapshot.refresh(force=True)
+        print(f"\nIncremental refresh of {snapshot.venues_reloaded} changed venues: {snapshot.last_refresh_ms:.1f}ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the structured venue search")
+    parser.add_argument("--venues", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    main(args.venues, args.repeats)
@@ -0,0 +1,76 @@
+"""
+Build agent/data/india_places.tsv, the gazetteer used for location extraction.
+
+Reads the GeoNames "cities500" extract bundled with the geonamescache package
+(pip install geonamescache; only needed to regenerate the file) and keeps every
+Indian populated place with its coordinates, population and usable ASCII alternate
+names. Names that are ordinary English or event-planning words ("Along",
+"Mango", "Durga") and names shorter than four letters (other than a few known
+towns) are left out so they don't match ordinary chat text.
+
+Place data: GeoNames (https://www.geonames.org), CC BY 4.0.
+
+Usage: python scripts/build_gazetteer.py
+"""
+import os
+import sys
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from agent.gazetteer import PLACES_PATH, normalize_place_text
+
+# Short names that are real places people ask about and not common words
+SHORT_NAME_ALLOWLIST = {"leh", "diu", "mau", "una", "ara"}
+
+# Place names that collide with ordinary words in venue and risk requests
+COMMON_WORD_STOPLIST = {
+    "along", "bally", "bang", "bazar", "bazaar", "beach", "camp", "city", "colony", "deli", "durga", "fort",
+    "garden", "gola", "hall", "hills", "kalan", "karma", "khurd", "lake", "lala", "lone", "mango", "manor",
+    "market", "mohan", "nagar", "pale", "palace", "park", "party", "raja", "rail", "rani", "road", "salon",
+    "sector", "station", "toto", "town", "venue", "weir", "zero", "mall", "club", "hotel", "resort", "event",
+    "dinner", "lunch", "farm", "villa", "temple", "church", "school", "college", "india", "indian",
+    "national", "central", "north", "south", "east", "west", "new", "old", "upper", "lower", "main",
+    "than", "bare", "bank", "punch", "tetra", "lanka", "raga", "pail", "raman", "mandal", "dari", "moira",
+    "bissau", "karo", "patpat",
+}
+
+
+def _usable(name: str) -> bool:
+    key = normalize_place_text(name)
+    if not key or key in COMMON_WORD_STOPLIST:
+        return False
+    return len(key) >= 4 or key in SHORT_NAME_ALLOWLIST
+
+
+def _usable_alias(alias: str) -> bool:
+    # Alternate names include airport codes and loose romanizations ("bmbyy"); keep proper-cased names only
+    return alias.isascii() and alias[:1].isupper() and not alias.isupper() and _usable(alias)
+
+
+def main():
+    import geonamescache
+
+    cities = [c for c in geonamescache.GeonamesCache(min_city_population=500).get_cities().values()
+              if c["countrycode"] == "IN"]
+    cities.sort(key=lambda c: (-c["population"], c["geonameid"]))
+
+    rows = []
+    for city in cities:
+        display = normalize_place_text(city["name"], keep_case=True)
+        if not _usable(display):
+            continue
+        aliases = sorted({normalize_place_text(a, keep_case=True) for a in city["alternatenames"] if a and _usable_alias(a)}
+                         - {display})
+        rows.append("\t".join([display, f"{city['latitude']:.5f}", f"{city['longitude']:.5f}",
+                               str(city["population"]), "|".join(aliases)]))
+
+    with open(PLACES_PATH, "w", encoding="utf-8") as f:
+        f.write("# name\tlatitude\tlongitude\tpopulation\taliases (|-separated). Source: GeoNames cities500, CC BY 4.0\n")
+        f.write("\n".join(rows) + "\n")
+    print(f"Wrote {len(rows)} places to {PLACES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Build the semantic venue vector index (models/venue_vectors.py) for venues.db.
+
+A full build re-learns the IDF weights from the whole catalog. --incremental
+loads the saved index, encodes only the venues changed since it was saved
+(venue_changes log) and saves it again; the API does the same in memory, so
+run this after large imports to keep startup fast.
+
+    python scripts/build_venue_vectors.py
+    python scripts/build_venue_vectors.py --incremental
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from models.database import SessionLocal, engine, init_db
+from models.venue_vectors import VENUE_VECTOR_DIM, VENUE_VECTORS_DIR, VenueVectorIndex, database_source
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dir", default=VENUE_VECTORS_DIR, help="index directory (VENUE_VECTORS_DIR)")
+    parser.add_argument("--dim", type=int, default=VENUE_VECTOR_DIM, help="vector length for a full build")
+    parser.add_argument("--incremental", action="store_true", help="update the saved index from the change log")
+    args = parser.parse_args()
+
+    init_db()
+    source = database_source(engine)
+    start = time.perf_counter()
+    index = VenueVectorIndex.load(args.dir, session_factory=SessionLocal) if args.incremental else None
+    if index is not None and index.source == source:
+        before = index.last_change_id
+        index.refresh(force=True)
+        print(f"Applied change log {before} -> {index.last_change_id}: {index.stats()}")
+    else:
+        if args.incremental:
+            print("No saved index for this database, building it")
+        index = VenueVectorIndex.build(SessionLocal, args.dim)
+    index.save(args.dir, source)
+    print(f"Saved {len(index)} venue vectors ({index.encoder.dim} dims) to {args.dir} "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Local fake of the Serper search API that injects latency and faults.
+
+Used to exercise the timeouts, retries, circuit breakers and hedging in
+utils/resilience.py without touching the real service:
+
+    python scripts/fake_upstream.py --port 8765 --delay 0.2 --jitter 0.5 --fail-rate 0.2 --hang-rate 0.05
+    SERPER_BASE_URL=http://127.0.0.1:8765 uvicorn main:app
+
+Faults can also be changed while it runs with POST /_faults {"delay": 0, "fail_rate": 1.0, ...};
+"hang_next": n makes the next n requests hang, for deterministic hedging tests.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeUpstream:
+    """Threaded HTTP server answering Serper-style POSTs with configurable delay, jitter, errors and hangs."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0, jitter: float = 0.0,
+                 fail_rate: float = 0.0, hang_rate: float = 0.0, hang_seconds: float = 30.0):
+        self.faults = {"delay": delay, "jitter": jitter, "fail_rate": fail_rate,
+                       "hang_rate": hang_rate, "hang_seconds": hang_seconds, "hang_next": 0}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def configure(self, **faults) -> None:
+        with self._lock:
+            self.faults.update(faults)
+
+    def _handler(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if url.path == "/_faults":
+                    length = int(self.headers.get("Content-Length") or 0)
+                    upstream.configure(**json.loads(self.rfile.read(length) or b"{}"))
+                    return self._send(200, upstream.faults)
+
+                with upstream._lock:
+                    upstream.requests += 1
+                    faults = dict(upstream.faults)
+                    hang_next = faults["hang_next"] > 0
+                    if hang_next:
+                        upstream.faults["hang_next"] -= 1
+                if hang_next or random.random() < faults["hang_rate"]:
+                    time.sleep(faults["hang_seconds"])
+                time.sleep(faults["delay"] + random.uniform(0, faults["jitter"]))
+                if random.random() < faults["fail_rate"]:
+                    return self._send(503, {"message": "injected failure"})
+
+                query = parse_qs(url.query).get("q", [""])[0]
+                self._send(200, {
+                    "searchParameters": {"q": query},
+                    "organic": [{"title": f"Result for {query}", "link": "https://example.com",
+                                 "snippet": f"Fake search result for {query}."}],
+                })
+
+        return Handler
+
+    def start(self) -> "FakeUpstream":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Serper API with injected delays and faults")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay of up to this many seconds")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 503")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Fraction of requests that hang for --hang-seconds")
+    parser.add_argument("--hang-seconds", type=float, default=30.0)
+    args = parser.parse_args()
+
+    upstream = FakeUpstream(args.host, args.port, args.delay, args.jitter, args.fail_rate, args.hang_rate, args.hang_seconds)
+    print(f"Fake Serper listening on {upstream.url}")
+    try:
+        upstream.server.serve_forever()
+    except KeyboardInterrupt:
+        upstream.stop()
@@ -0,0 +1,62 @@
+"""
+Fill venue coordinates (venues.latitude / longitude) from the gazetteer.
+
+Each venue without coordinates gets those of the place its location names
+(agent/gazetteer.py), so radius search finds it. This is the place's centre,
+not the venue's address: set exact coordinates directly where they are known,
+and they are left alone (--overwrite replaces them too).
+
+    python scripts/geocode_venues.py
+    python scripts/geocode_venues.py --overwrite
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from sqlalchemy import or_, select, update
+
+from agent.gazetteer import get_gazetteer
+from models.database import SessionLocal, Venue, init_db
+
+
+def geocode_venues(session_factory=SessionLocal, overwrite: bool = False):
+    """Set coordinates from the venue location; returns (venues geocoded, locations not found)."""
+    gazetteer = get_gazetteer()
+    stmt = select(Venue.location).distinct()
+    if not overwrite:
+        stmt = stmt.where(or_(Venue.latitude.is_(None), Venue.longitude.is_(None)))
+    geocoded, unknown = 0, []
+    with session_factory() as db:
+        for location in db.scalars(stmt).all():
+            place = gazetteer.find(location)
+            if place is None:
+                unknown.append(location)
+                continue
+            venues = update(Venue).where(Venue.location == location)
+            if not overwrite:
+                venues = venues.where(or_(Venue.latitude.is_(None), Venue.longitude.is_(None)))
+            geocoded += db.execute(venues.values(latitude=place.latitude, longitude=place.longitude)).rowcount
+        db.commit()
+    return geocoded, unknown
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--overwrite", action="store_true", help="replace existing coordinates too")
+    args = parser.parse_args()
+
+    init_db()
+    start = time.perf_counter()
+    geocoded, unknown = geocode_venues(overwrite=args.overwrite)
+    print(f"Geocoded {geocoded} venues in {time.perf_counter() - start:.2f}s")
+    if unknown:
+        print(f"Locations not in the gazetteer: {', '.join(sorted(unknown))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,11 @@
+"""
+Create or migrate the venue database, then add sample venues to an empty one.
+
+Schema changes (new tables, columns, indexes, change log triggers and the
+full-text index) are applied here rather than when the app starts:
+
+    python scripts/init_db.py
+"""
 import os
 import sys
 
@@ -5,13 +13,17 @@ import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
-from models.database import SessionLocal, Venue, Amenity, EventType, Purpose, AvailableDate
+from models.database import SessionLocal, Venue, Amenity, EventType, Purpose, AvailableDate, init_db
 from datetime import date
 
-def init_db():
+def seed_venues():
     db = SessionLocal()
     
     try:
+        if db.query(Venue).count():
+            print("Database already has venues, sample data not added")
+            return
+
         # Create amenities
         amenities = {
             "AV": Amenity(name="AV"),
@@ -185,4 +197,5 @@ def init_db():
         db.close()
 
 if __name__ == "__main__":
-    init_db() 
\ No newline at end of file
+    init_db()
+    seed_venues()
@@ -0,0 +1,87 @@
+"""
+Precompute city-level risk baselines.
+
+Runs the generic city risk assessment (one search and one LLM call per city)
+for a list of cities and stores each report with its category scores in the
+risk baseline store (RISK_BASELINE_PATH, default risk_baselines.db). The API
+serves city assessments from these baselines and uses them as location context
+for venue assessments while they are younger than RISK_BASELINE_MAX_AGE_SECONDS.
+
+Run it once, from cron, or as a long-lived job with --interval.
+
+Usage:
+    python scripts/precompute_risk_baselines.py [--cities "Mumbai,Pune,Lonavla"] [--interval SECONDS] [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from dotenv import load_dotenv
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from agent.event_risk_agent import baseline_city, compute_risk_baseline
+from utils.resilience import resilient_llm
+from utils.risk_baselines import get_risk_baseline_store
+
+DEFAULT_CITIES = [
+    "Delhi", "Mumbai", "Bengaluru", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad", "Jaipur", "Lucknow",
+    "Gurugram", "Noida", "Goa", "Lonavla", "Udaipur", "Kochi", "Chandigarh", "Indore",
+]
+
+
+def precompute(llm, cities, workers):
+    """Compute baselines for cities concurrently. Returns the number that succeeded."""
+    def run(city):
+        start = time.perf_counter()
+        try:
+            entry = compute_risk_baseline(llm, city)
+            print(f"  {city}: stored in {time.perf_counter() - start:.1f}s, scores {entry['scores'] or 'n/a'}")
+            return True
+        except Exception as e:
+            print(f"  {city}: failed: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return sum(pool.map(run, cities))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute city-level risk baselines.")
+    parser.add_argument("--cities", default=os.getenv("RISK_BASELINE_CITIES", ",".join(DEFAULT_CITIES)),
+                        help="comma-separated city names (default: RISK_BASELINE_CITIES or a built-in list)")
+    parser.add_argument("--interval", type=int, default=0,
+                        help="seconds between runs; 0 runs once and exits")
+    parser.add_argument("--workers", type=int, default=4, help="cities computed in parallel")
+    args = parser.parse_args()
+
+    load_dotenv()
+    if get_risk_baseline_store() is None:
+        sys.exit("Risk baselines are disabled (RISK_BASELINES_ENABLED=false)")
+
+    # Canonical names so baselines are found for aliases (Bangalore -> Bengaluru)
+    cities = list(dict.fromkeys(baseline_city(c.strip()) for c in args.cities.split(",") if c.strip()))
+    llm = resilient_llm(ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash",
+        temperature=0,
+        google_api_key=os.getenv("GOOGLE_API_KEY"),
+        convert_system_message_to_human=True
+    ))
+
+    while True:
+        start = time.perf_counter()
+        print(f"Precomputing risk baselines for {len(cities)} cities")
+        done = precompute(llm, cities, args.workers)
+        print(f"Stored {done}/{len(cities)} baselines in {time.perf_counter() - start:.1f}s")
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Rebuild the venue full-text index (venues_fts) in venues.db.
+
+Triggers keep the index in step with the venues table; run this after bulk
+loads that bypassed them (another tool writing the file directly, restored
+backups) or to merge index segments after many writes.
+
+    python scripts/rebuild_venue_fts.py
+"""
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from sqlalchemy import func, select, text
+
+from models.database import VENUE_FTS_TABLE, SessionLocal, Venue, init_db, rebuild_venue_fts
+
+
+def main():
+    init_db()
+    start = time.perf_counter()
+    rebuild_venue_fts()
+    with SessionLocal() as db:
+        venues = db.scalar(select(func.count(Venue.id)))
+        indexed = db.scalar(text(f"SELECT count(*) FROM {VENUE_FTS_TABLE}_docsize"))
+    print(f"Indexed {indexed} of {venues} venues in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from models.availability_index import AvailabilityIndex, merge_windows
+from models.database import Venue, create_venue_engine
+from models.venue_catalog import VenueCatalog
+from models.venue_models import VenueSearchCriteria
+from models.venue_search import search_filters
+from models.venue_snapshot import VenueSnapshot
+from scripts.benchmark_venue_search import SYNTHETIC_LOCATIONS, populate_synthetic_catalog
+
+
+def day_number(value: date) -> int:
+    return int(np.datetime64(value, "D").astype(np.int64))
+
+
+def brute_force(owners, starts, ends):
+    """owner -> set of available days."""
+    days = {}
+    for owner, start, end in zip(owners, starts, ends):
+        days.setdefault(int(owner), set()).update(range(int(start), int(end) + 1))
+    return days
+
+
+def test_availability_index():
+    """Interval index vs day sets, and the SQL and catalog paths vs the index."""
+    rng = np.random.default_rng(5)
+
+    # Test 1: Merging
+    print("Test 1: Merging windows...")
+    owners, starts, ends = merge_windows([1, 1, 1, 1, 2, 2], [0, 5, 11, 20, 0, 3], [4, 10, 12, 30, 1, 4])
+    assert owners.tolist() == [1, 1, 2, 2] and starts.tolist() == [0, 20, 0, 3] and ends.tolist() == [12, 30, 1, 4]
+    print("✓ overlapping and touching windows merge per venue only")
+
+    # Test 2: Containment and overlap vs brute force
+    print("\nTest 2: Queries vs day sets...")
+    owners = rng.integers(0, 3000, 8000)
+    starts = rng.integers(0, 365, 8000)
+    ends = starts + rng.integers(0, 45, 8000)
+    ends[:100] += rng.integers(100, 1000, 100)
+    index = AvailabilityIndex(owners, starts, ends)
+    days = brute_force(owners, starts, ends)
+    for _ in range(500):
+        start = int(rng.integers(-20, 1400))
+        end = start + int(rng.integers(0, 30))
+        containing = index.containing(start, end)
+        assert len(containing) == len(set(containing.tolist()))
+        assert sorted(containing.tolist()) == sorted(o for o, d in days.items() if d.issuperset(range(start, end + 1)))
+        assert index.overlapping(start, end).tolist() == sorted(o for o, d in days.items() if d.intersection(range(start, end + 1)))
+    print(f"✓ 500 random ranges matched over {index.intervals} merged intervals")
+
+    # Test 3: SQL, snapshot and catalog agree
+    print("\nTest 3: SQL and catalog vs the index...")
+    py_rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_venue_engine(f"sqlite:///{os.path.join(tmp, 'venues_test.db')}")
+        populate_synthetic_catalog(engine, 2000)
+        Session = sessionmaker(bind=engine)
+        snapshot = VenueSnapshot(Session)
+        plain, indexed = VenueCatalog(Session), VenueCatalog(Session, snapshot=snapshot)
+        for _ in range(100):
+            first = date(2026, 1, 1) + timedelta(days=py_rng.randint(0, 400))
+            last = first + timedelta(days=py_rng.randint(0, 14))
+            criteria = VenueSearchCriteria(start_date=first, end_date=last)
+            with Session() as db:
+                in_sql = set(db.scalars(select(Venue.id).where(*search_filters(criteria))))
+            columns = snapshot.columns()
+            assert in_sql == set(columns.availability.containing(day_number(first), day_number(last)).tolist())
+            locations = py_rng.sample([loc.lower() for loc in SYNTHETIC_LOCATIONS], 2)
+            assert plain.available_count(locations, first, last) == indexed.available_count(locations, first, last)
+            filters = dict(available_from=first, available_to=last, min_capacity=py_rng.randint(20, 1000), limit=20)
+            assert plain.search(locations, **filters) == indexed.search(locations, **filters)
+        engine.dispose()
+    print("✓ 100 date ranges matched across SQL, snapshot and catalog")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_availability_index()
@@ -0,0 +1,146 @@
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import sessionmaker
+
+from models.database import (Amenity, AvailableDate, Base, EventType, Purpose, SQLITE_PRAGMAS, Venue,
+                             create_async_venue_engine, create_venue_engine, with_venue_relations)
+from models.venue_catalog import VenueCatalog
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SQL statements run on engine inside the block."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def populate(Session, venue_count):
+    with Session() as db:
+        amenities = [Amenity(name=name) for name in ("AV", "Wi-Fi", "Parking", "Catering")]
+        event_types = [EventType(name=name) for name in ("Corporate", "Social")]
+        purposes = [Purpose(name=name) for name in ("Conference", "Wedding", "Team Offsite")]
+        for i in range(venue_count):
+            venue = Venue(venue_id=f"V{i:04d}", name=f"Test Venue {i}", location="Lonavla" if i % 2 else "Pune",
+                          capacity=50 + 10 * i, price_per_day=100000 + 5000 * i, contact_number="9876543210",
+                          has_veg=True, has_non_veg=bool(i % 3))
+            venue.amenities = amenities[: 1 + i % 4]
+            venue.event_types = event_types[: 1 + i % 2]
+            venue.purposes = purposes[: 1 + i % 3]
+            start = date(2026, 1, 1) + timedelta(days=i)
+            venue.available_dates = [AvailableDate(start_date=start, end_date=start + timedelta(days=30))]
+            db.add(venue)
+        db.commit()
+
+
+def list_venues(db, eager):
+    query = select(Venue).order_by(Venue.id)
+    if eager:
+        query = with_venue_relations(query)
+    return [(v.name, [a.name for a in v.amenities], [e.name for e in v.event_types],
+             [p.name for p in v.purposes], [(d.start_date, d.end_date) for d in v.available_dates])
+            for v in db.scalars(query)]
+
+
+def test_query_counts():
+    """Query counts for listing venues with their relations, lazy vs eager, plus pragmas, pooling and async."""
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'venues_test.db')}"
+        engine = create_venue_engine(url)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        populate(Session, 40)
+
+        # Test 1: Pragmas
+        print("Test 1: Checking SQLite pragmas...")
+        with engine.connect() as conn:
+            journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+            foreign_keys = conn.execute(text("PRAGMA foreign_keys")).scalar()
+            busy_timeout = conn.execute(text("PRAGMA busy_timeout")).scalar()
+        assert journal_mode == "wal", journal_mode
+        assert foreign_keys == 1, foreign_keys
+        assert busy_timeout == SQLITE_PRAGMAS["busy_timeout"], busy_timeout
+        print(f"✓ journal_mode={journal_mode}, foreign_keys={foreign_keys}, busy_timeout={busy_timeout}")
+
+        # Test 2: Lazy loading is N+1
+        print("\nTest 2: Listing venues with lazy loading...")
+        with Session() as db, count_queries(engine) as statements:
+            lazy = list_venues(db, eager=False)
+        assert len(statements) == 1 + 4 * len(lazy), len(statements)
+        print(f"✓ {len(lazy)} venues took {len(statements)} queries (1 + 4 per venue)")
+
+        # Test 3: Eager loading is constant
+        print("\nTest 3: Listing venues with with_venue_relations()...")
+        with Session() as db, count_queries(engine) as statements:
+            eager = list_venues(db, eager=True)
+        assert eager == lazy
+        assert len(statements) == 5, len(statements)
+        print(f"✓ {len(eager)} venues took {len(statements)} queries")
+
+        # Test 4: Catalog search and lookup stay constant
+        print("\nTest 4: Catalog queries...")
+        catalog = VenueCatalog(session_factory=Session)
+        with count_queries(engine) as statements:
+            results = catalog.search(["lonavla"], min_capacity=100, amenities=["Wi-Fi"], limit=50)
+        assert results and len(statements) == 5, (len(results), len(statements))
+        with count_queries(engine) as statements:
+            venue = catalog.get("V0007")
+        assert venue["name"] == "Test Venue 7" and len(statements) == 5, len(statements)
+        print(f"✓ search returned {len(results)} venues in 5 queries; get by ID took 5 queries")
+
+        # Test 5: Pooled connections are reused
+        print("\nTest 5: Connection pooling...")
+        for _ in range(20):
+            with Session() as db:
+                db.execute(text("SELECT 1"))
+        assert engine.pool.checkedin() == 1, engine.pool.status()
+        print(f"✓ {engine.pool.status()}")
+
+        # Test 6: Async engine
+        print("\nTest 6: Async engine...")
+        try:
+            async_engine = create_async_venue_engine(url)
+        except RuntimeError as e:
+            print(f"- Skipped: {e}")
+        else:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+
+            async def run_async():
+                async_catalog = VenueCatalog(session_factory=Session,
+                                             async_session_factory=async_sessionmaker(async_engine, expire_on_commit=False))
+                try:
+                    with count_queries(async_engine.sync_engine) as statements:
+                        found = await async_catalog.asearch(["lonavla"], min_capacity=100, amenities=["Wi-Fi"], limit=50)
+                    async with async_engine.connect() as conn:
+                        mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+                    return found, len(statements), mode
+                finally:
+                    await async_engine.dispose()
+
+            found, query_count, mode = asyncio.run(run_async())
+            assert found == results and query_count == 5 and mode == "wal", (query_count, mode)
+            print(f"✓ async search returned {len(found)} venues in {query_count} queries (journal_mode={mode})")
+
+        engine.dispose()
+        print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_query_counts()
@@ -0,0 +1,89 @@
+import io
+import os
+import random
+import sys
+from contextlib import redirect_stdout
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from agent.gazetteer import AhoCorasick, Gazetteer, Place, get_gazetteer, normalize_place_text
+
+
+def naive_matches(patterns, text):
+    """Whole-word occurrences (start, end exclusive, pattern) of each pattern, found by brute force."""
+    padded = f" {text} "
+    matches = set()
+    for pattern in patterns:
+        needle = f" {pattern} "
+        start = padded.find(needle)
+        while start != -1:
+            matches.add((start, start + len(pattern), pattern))
+            start = padded.find(needle, start + 1)
+    return matches
+
+
+def test_gazetteer():
+    """Aho-Corasick matching, name conflicts, longest-match selection and lookups in the shipped place files."""
+    # Test 1: The automaton agrees with a brute-force whole-word search
+    print("Test 1: Aho-Corasick vs brute force...")
+    rng = random.Random(14)
+    words = ["a", "ab", "b", "ba", "aba", "bab"]
+    for _ in range(300):
+        patterns = {" ".join(rng.choices(words, k=rng.randint(1, 3))) for _ in range(rng.randint(1, 6))}
+        text = " ".join(rng.choices(words, k=rng.randint(0, 12)))
+        matcher = AhoCorasick()
+        for pattern in patterns:
+            matcher.add(pattern, pattern)
+        assert set(matcher.iter_matches(text)) == naive_matches(patterns, text), (patterns, text)
+    print("✓ 300 random pattern sets matched exactly, overlaps and word boundaries included")
+
+    # Test 2: Normalization
+    print("\nTest 2: Normalizing place text...")
+    assert normalize_place_text("  Mahābaleshwar,  MAHARASHTRA!! ") == "mahabaleshwar maharashtra"
+    assert normalize_place_text("Navi-Mumbai", keep_case=True) == "Navi Mumbai"
+    print("✓ Accents folded, punctuation and case removed")
+
+    # Test 3: Name conflicts and longest matches
+    print("\nTest 3: Conflicts and longest matches...")
+    gazetteer = Gazetteer([
+        (Place("Aurangabad", 24.75, 84.37, 100000), ["Aurangabad"]),
+        (Place("Aurangabad", 19.88, 75.34, 1200000), ["Aurangabad"]),
+        (Place("Delhi", 28.65, 77.23, 11000000), ["Delhi"]),
+        (Place("New Delhi", 28.61, 77.21, 300000), ["New Delhi"]),
+        (Place("Mumbai", 19.07, 72.88, 12000000), ["Mumbai", "Bombay"]),
+        (Place("Bandra", 19.06, 72.83, 0, "locality", "Mumbai"), ["Bandra", "Bandra West"]),
+    ])
+    assert gazetteer.find("Aurangabad").latitude == 19.88  # the most populous place wins the name
+    assert [p.name for p in gazetteer.find_all("from New Delhi to Bombay")] == ["New Delhi", "Mumbai"]
+    assert [p.name for p in gazetteer.find_all("Delhiwala cafe")] == []  # whole words only
+    assert gazetteer.find("Mumbai, Bandra West").label == "Bandra, Mumbai"  # localities before cities
+    assert gazetteer.find("no place here") is None
+    print("✓ Populous places win shared names; \"Delhi\" inside \"New Delhi\" is dropped; localities win")
+
+    # Test 4: Shipped place files
+    print("\nTest 4: Shipped gazetteer...")
+    with redirect_stdout(io.StringIO()):
+        gazetteer = get_gazetteer()
+    assert gazetteer.size > 6000
+    lookups = {
+        "wedding in Lonavala next month": "Lonavla",
+        "venues near Poona": "Pune",
+        "Mahābaleshwar resort": "Mahabaleshwar",
+        "party at Bandra West": "Bandra, Mumbai",
+        "beach venue in North Goa": "Goa",
+        "halls in Navi Mumbai": "Navi Mumbai",
+        "Chhatrapati Sambhaji Nagar": "Aurangabad",
+    }
+    for text, label in lookups.items():
+        place = gazetteer.find(text)
+        assert place is not None and place.label == label, (text, place)
+    assert gazetteer.find("Aurangabad").population > 1000000
+    print(f"✓ {len(lookups)} lookups across {gazetteer.size} places resolved via names and aliases")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_gazetteer()
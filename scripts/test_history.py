@@ -0,0 +1,83 @@
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+import agent.history as history
+from agent.history import HISTORY_STATS, compact_history, estimate_tokens, history_savings, summarize_messages
+
+
+def conversation(turns, words=40):
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"Question {i}: " + "venue " * words))
+        messages.append(AIMessage(content=f"Answer {i}: " + "option " * words))
+    return messages
+
+
+def test_history():
+    """History compaction to a token budget, the summary cache and the per-node counters."""
+    # Test 1: Short histories are kept verbatim, internal messages dropped
+    print("Test 1: Short history...")
+    short = [HumanMessage(content="Venues in Pune"), AIMessage(content="Here are 5 venues"),
+             HumanMessage(content='VENUES_STORED:[{"name": "A"}]')]
+    compacted = compact_history(short, token_budget=1000, keep_recent=6)
+    assert compacted.summary == "" and [m.content for m in compacted.messages] == ["Venues in Pune", "Here are 5 venues"]
+    assert compacted.as_text() == "User: Venues in Pune\nAssistant: Here are 5 venues"
+    assert compact_history([]).as_text() == "(no previous messages)"
+    print("✓ Recent messages kept as-is; VENUES_STORED bookkeeping removed")
+
+    # Test 2: Long histories fit the budget
+    print("\nTest 2: Long history...")
+    long = conversation(30)
+    for budget in (300, 800, 1500):
+        compacted = compact_history(long, token_budget=budget, keep_recent=6)
+        assert compacted.messages[-1] is long[-1] and len(compacted.messages) <= 6
+        assert compacted.compacted_tokens <= budget * 1.1, (budget, compacted.compacted_tokens)
+        assert compacted.compacted_tokens < compacted.original_tokens
+        assert "earlier messages omitted" in compacted.summary
+        messages = compacted.as_messages()
+        assert isinstance(messages[0], SystemMessage) and messages[1:] == compacted.messages
+    huge = [HumanMessage(content="word " * 5000)]
+    assert compact_history(huge, token_budget=100).messages == huge  # the newest message is always kept
+    print(f"✓ 60 messages compacted from {compacted.original_tokens} to {compacted.compacted_tokens} tokens")
+
+    # Test 3: Summary cache keyed by a stable digest
+    print("\nTest 3: Summary cache...")
+    history._summary_cache.clear()
+    older = conversation(10)
+    first = summarize_messages(older, 200)
+    assert summarize_messages(conversation(10), 200) == first and len(history._summary_cache) == 1
+    assert summarize_messages(older, 100) != first and len(history._summary_cache) == 2
+    key = history._summary_key(older, 200)
+    assert len(key) == 40 and key == history._summary_key(conversation(10), 200)
+    assert key != history._summary_key([HumanMessage(content=m.content) for m in older], 200)  # roles matter
+    assert all(estimate_tokens(line) <= 60 for line in first.splitlines())
+    print(f"✓ Equal messages share one entry: {key[:12]}...")
+
+    # Test 4: Counters under concurrent compaction
+    print("\nTest 4: Concurrent counters...")
+    HISTORY_STATS.pop("test_node", None)
+    messages = conversation(8)
+    expected = compact_history(messages, token_budget=500)
+    with ThreadPoolExecutor(max_workers=8) as pool, redirect_stdout(io.StringIO()):  # one log line per call
+        list(pool.map(lambda _: compact_history(messages, node="test_node", token_budget=500), range(400)))
+    stats = history_savings()["test_node"]
+    assert stats["calls"] == 400, stats
+    assert stats["original_tokens"] == 400 * expected.original_tokens
+    assert stats["compacted_tokens"] == 400 * expected.compacted_tokens
+    assert 0 < stats["saved_ratio"] < 1
+    print(f"✓ 400 concurrent calls counted exactly, saved ratio {stats['saved_ratio']}")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_history()
@@ -0,0 +1,95 @@
+import asyncio
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from agent.venue_graph import arun_llm_orchestrated_graph, extract_venues_from_markdown
+from utils.llm_metrics import count_llm_calls, llm_call_stats
+
+PRESCRIBED_TABLE = """Here are some venues in Lonavla:
+
+| Name | Location | Type | Capacity | Price Range | Key Features |
+|------|----------|------|----------|-------------|--------------|
+| **Misty Hills Retreat** | Tungarli, Lonavla | Resort | 150 | ₹2-3 lakhs | Pool, lawns |
+| Royal Banquets | Lonavla | Banquet Hall | 400 | ₹1.5 lakhs | AC hall |
+| misty hills retreat | Lonavla | Resort | 150 | ₹2 lakhs | Duplicate row |
+
+Would you like a risk assessment?"""
+
+PER_VENUE_TABLES = """### Option 1
+| Feature | Details |
+|---|---|
+| Venue Name | Sunset Lawns |
+| Area | Khandala |
+| Amenities | Open air, parking |
+
+### Option 2
+| Feature | Details |
+| :--- | :--- |
+| Name | Harbour Cafe |
+| Location | Colaba, Mumbai |
+"""
+
+
+def test_llm_metrics():
+    """Per-request LLM call counting and the LLM-free venue extraction used by consolidated mode."""
+    # Test 1: Calls are counted by run name, including from spawned tasks
+    print("Test 1: Counting LLM calls...")
+    llm = FakeListChatModel(responses=["ok"] * 10)
+
+    async def calls():
+        await llm.ainvoke("a", config={"run_name": "coordinator"})
+        await asyncio.gather(*(llm.ainvoke("b", config={"run_name": "report"}) for _ in range(3)))
+
+    before = llm_call_stats()
+    with count_llm_calls() as counter:
+        asyncio.run(calls())
+        llm.invoke("c")
+    assert counter.total == 5 and counter.by_name["report"] == 3 and counter.by_name["coordinator"] == 1, counter.by_name
+    assert counter.summary().startswith("5 LLM calls (")
+    llm.invoke("outside")  # not counted
+    assert counter.total == 5
+    after = llm_call_stats()
+    assert after["requests"] == before["requests"] + 1 and after["llm_calls"] == before["llm_calls"] + 5
+    print(f"✓ {counter.summary()}")
+
+    # Test 2: A chat turn that ends needs one coordinator call
+    print("\nTest 2: One coordinator call per turn...")
+    llm = FakeListChatModel(responses=['{"action": "end", "reasoning": "done", "venues": []}'])
+    with count_llm_calls() as counter, redirect_stdout(io.StringIO()):
+        output, _ = asyncio.run(arun_llm_orchestrated_graph(llm, "thanks, that's all", []))
+    assert counter.total == 1 and output.startswith("Thank you"), counter.summary()
+    print(f"✓ {counter.summary()}")
+
+    # Test 3: Venues from the prescribed table
+    print("\nTest 3: Extracting venues from the prescribed table...")
+    venues = extract_venues_from_markdown(PRESCRIBED_TABLE)
+    assert [v["name"] for v in venues] == ["Misty Hills Retreat", "Royal Banquets"], venues
+    assert venues[0] == {"name": "Misty Hills Retreat", "location": "Tungarli, Lonavla", "type": "Resort",
+                         "features": "Pool, lawns"}
+    print(f"✓ {len(venues)} venues; bold markers stripped and case-insensitive duplicates dropped")
+
+    # Test 4: Per-venue key/value tables and text without tables
+    print("\nTest 4: Per-venue tables...")
+    venues = extract_venues_from_markdown(PER_VENUE_TABLES)
+    assert venues == [
+        {"name": "Sunset Lawns", "location": "Khandala", "type": "", "features": "Open air, parking"},
+        {"name": "Harbour Cafe", "location": "Colaba, Mumbai", "type": "", "features": ""},
+    ], venues
+    assert extract_venues_from_markdown("No venues were found.") == []
+    assert extract_venues_from_markdown("") == [] and extract_venues_from_markdown(None) == []
+    assert extract_venues_from_markdown("| Name | Location |\n|---|---|\n| Unknown | Pune |") == []
+    print("✓ Key/value tables parsed; empty and placeholder rows ignored")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_llm_metrics()
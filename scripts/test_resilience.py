@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import requests
+from google.api_core import exceptions as google_exceptions
+
+from scripts.fake_upstream import FakeUpstream
+from utils.resilience import (CircuitBreaker, CircuitOpenError, ResiliencePolicy, ResilientCaller, RetryBudget, UpstreamTimeout,
+                              is_transient_error)
+from utils.serper import SerperSearch
+
+
+def make_caller(breaker_threshold=3, reset_timeout=0.5, budget=None, **policy):
+    policy = {"timeout": 0.5, "max_attempts": 3, "backoff_base": 0.01, **policy}
+    return ResilientCaller("serper", ResiliencePolicy(**policy),
+                           CircuitBreaker("serper", breaker_threshold, reset_timeout), budget)
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def failing(error):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise error
+
+    return fn, calls
+
+
+def test_resilience():
+    """Exercise timeouts, retries, circuit breaking and hedging against a local fake Serper."""
+    upstream = FakeUpstream(hang_seconds=2.0).start()
+    search = SerperSearch(serper_api_key="test", base_url=upstream.url, request_timeout=3.0)
+    try:
+        # Test 1: Healthy upstream
+        print("Test 1: Calling a healthy upstream...")
+        caller = make_caller()
+        result = caller.call(search.run, "venues in Pune")
+        assert "venues in Pune" in result, result
+        print(f"✓ Got result: {result[:60]}")
+
+        # Test 2: Failures are retried
+        print("\nTest 2: Retrying an injected failure...")
+        upstream.configure(fail_rate=1.0)
+        before = upstream.requests
+        try:
+            caller.call(search.run, "venues in Pune")
+            raise AssertionError("expected the call to fail")
+        except Exception as e:
+            assert not isinstance(e, CircuitOpenError), e
+        assert upstream.requests - before == 3, upstream.requests - before
+        print(f"✓ Failed after 3 attempts: {dict(caller.counts)}")
+
+        # Test 3: Circuit breaker opens and fails fast
+        print("\nTest 3: Circuit breaker fails fast while open...")
+        assert caller.breaker.state == CircuitBreaker.OPEN, caller.breaker.state
+        before = upstream.requests
+        start = time.perf_counter()
+        try:
+            caller.call(search.run, "venues in Pune")
+            raise AssertionError("expected CircuitOpenError")
+        except CircuitOpenError:
+            pass
+        assert upstream.requests == before
+        print(f"✓ Rejected in {(time.perf_counter() - start) * 1000:.1f}ms without calling the upstream")
+
+        # Test 4: Half-open probe closes the breaker once the upstream recovers
+        print("\nTest 4: Probing after the reset timeout...")
+        upstream.configure(fail_rate=0.0)
+        time.sleep(0.6)
+        caller.call(search.run, "venues in Pune")
+        assert caller.breaker.state == CircuitBreaker.CLOSED, caller.breaker.state
+        print("✓ Breaker closed again after a successful probe")
+
+        # Test 5: Hanging upstream is timed out
+        print("\nTest 5: Timing out a hanging upstream...")
+        caller = make_caller(timeout=0.3, max_attempts=2)
+        upstream.configure(hang_next=2)
+        start = time.perf_counter()
+        try:
+            caller.call(search.run, "venues in Pune")
+            raise AssertionError("expected UpstreamTimeout")
+        except UpstreamTimeout:
+            pass
+        elapsed = time.perf_counter() - start
+        assert elapsed < 1.0, elapsed
+        assert caller.counts["timeouts"] == 2
+        print(f"✓ Gave up after 2 timed-out attempts in {elapsed:.2f}s")
+
+        # Test 6: Retry budget stops retries when exhausted
+        print("\nTest 6: Retry budget...")
+        caller = make_caller(breaker_threshold=100, budget=RetryBudget(ratio=0.0, refill_per_second=0.0, max_tokens=1))
+        upstream.configure(fail_rate=1.0)
+        before = upstream.requests
+        for _ in range(3):
+            try:
+                caller.call(search.run, "venues in Pune")
+            except Exception:
+                pass
+        assert upstream.requests - before == 4, upstream.requests - before
+        upstream.configure(fail_rate=0.0)
+        print(f"✓ 3 calls made 4 requests (1 retry allowed): {dict(caller.counts)}")
+
+        # Test 7: Hedged request wins over a hanging one
+        print("\nTest 7: Hedging a slow request...")
+        caller = make_caller(timeout=1.5, hedge_after=0.1)
+        upstream.configure(hang_next=1)
+        start = time.perf_counter()
+        caller.call(search.run, "venues in Pune")
+        elapsed = time.perf_counter() - start
+        assert elapsed < 1.0, elapsed
+        assert caller.counts["hedge_wins"] == 1
+        print(f"✓ Hedge answered in {elapsed:.2f}s")
+
+        # Test 8: Async calls
+        print("\nTest 8: Async timeout, hedging and breaker...")
+
+        async def run_async():
+            caller = make_caller(timeout=1.5, hedge_after=0.1, breaker_threshold=2)
+            upstream.configure(hang_next=1)
+            start = time.perf_counter()
+            await caller.acall(search.arun, "venues in Goa")
+            assert time.perf_counter() - start < 1.0
+            assert caller.counts["hedge_wins"] == 1
+
+            caller = make_caller(timeout=0.3, max_attempts=2, breaker_threshold=2)
+            upstream.configure(hang_next=2)
+            try:
+                await caller.acall(search.arun, "venues in Goa")
+                raise AssertionError("expected UpstreamTimeout")
+            except UpstreamTimeout:
+                pass
+            try:
+                await caller.acall(search.arun, "venues in Goa")
+                raise AssertionError("expected CircuitOpenError")
+            except CircuitOpenError:
+                pass
+            return dict(caller.counts)
+
+        print(f"✓ Async checks passed: {asyncio.run(run_async())}")
+
+        # Test 9: Only transient errors are retried or open the breaker
+        print("\nTest 9: Classifying errors...")
+        transient = [TimeoutError(), ConnectionError(), requests.ConnectionError(), requests.ReadTimeout(),
+                     http_error(429), http_error(503), google_exceptions.ResourceExhausted("quota"),
+                     google_exceptions.ServiceUnavailable("down")]
+        permanent = [ValueError("bad input"), http_error(400), http_error(401), http_error(404),
+                     google_exceptions.InvalidArgument("bad request"), google_exceptions.PermissionDenied("no key")]
+        wrapped = RuntimeError("gemini failed")
+        wrapped.__cause__ = google_exceptions.InternalServerError("oops")
+        assert all(is_transient_error(e) for e in transient + [wrapped])
+        assert not any(is_transient_error(e) for e in permanent)
+        caller = make_caller()
+        for error in permanent:
+            fn, calls = failing(error)
+            try:
+                caller.call(fn)
+                raise AssertionError("expected the error to be re-raised")
+            except type(error) as e:
+                assert e is error
+            assert len(calls) == 1, error
+        assert caller.breaker.state == CircuitBreaker.CLOSED and caller.breaker.failures == 0
+        assert caller.counts["non_retryable"] == len(permanent) and caller.counts["retries"] == 0
+        fn, calls = failing(http_error(429))
+        try:
+            caller.call(fn)
+        except requests.HTTPError:
+            pass
+        assert len(calls) == 3 and caller.breaker.state == CircuitBreaker.OPEN
+        print(f"✓ {len(permanent)} permanent errors raised after one attempt; 429 retried and opened the breaker")
+
+        # Test 10: A permanent error on the half-open probe frees the probe slot
+        print("\nTest 10: Permanent error while half-open...")
+        time.sleep(0.6)
+        fn, _ = failing(http_error(401))
+        try:
+            caller.call(fn)
+        except requests.HTTPError:
+            pass
+        assert caller.breaker.state == CircuitBreaker.HALF_OPEN
+        assert caller.call(lambda: "ok") == "ok" and caller.breaker.state == CircuitBreaker.CLOSED
+        print("✓ The next call probed the upstream and closed the breaker")
+
+        # Test 11: Retries are logged
+        print("\nTest 11: Retry logging...")
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger = logging.getLogger("utils.resilience")
+        logger.addHandler(handler)
+        try:
+            fn, _ = failing(ConnectionError("reset"))
+            try:
+                make_caller(max_attempts=2).call(fn)
+            except ConnectionError:
+                pass
+        finally:
+            logger.removeHandler(handler)
+        assert [r.levelno for r in records] == [logging.WARNING]
+        assert records[0].getMessage() == "serper call failed (ConnectionError: reset); retry 1/1"
+        print(f"✓ {records[0].getMessage()}")
+
+        print("\n✓ All tests completed successfully!")
+
+    finally:
+        upstream.stop()
+
+
+if __name__ == "__main__":
+    test_resilience()
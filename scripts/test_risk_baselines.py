@@ -0,0 +1,120 @@
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+os.environ["SEARCH_CACHE_ENABLED"] = "false"
+os.environ["RISK_REPORT_CACHE_ENABLED"] = "false"
+
+from langchain_core.messages import AIMessage
+
+import agent.event_risk_agent as risk_agent
+import utils.risk_baselines as baselines_module
+from utils.risk_baselines import RiskBaselineStore
+
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, prompt, config=None):
+        self.calls += 1
+        return AIMessage(content="Live risk report.")
+
+
+class RecordingSearch:
+    def __init__(self):
+        self.categories = []
+
+    async def arun(self, query, category="general"):
+        self.categories.append(category)
+        return f"{category} result"
+
+
+class BrokenStore:
+    def get(self, location, max_age_seconds=None):
+        raise OSError("database is locked")
+
+
+def assess(coro_fn, *args):
+    search, llm = RecordingSearch(), CountingLLM()
+    risk_agent.get_cached_search = lambda: search
+    with redirect_stdout(io.StringIO()):
+        report = asyncio.run(coro_fn(llm, *args))
+    return report, search.categories, llm.calls
+
+
+def test_risk_baselines():
+    """Baseline storage and expiry, serving city assessments from baselines, and falling back to live assessments."""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Test 1: Store round trip and expiry
+        print("Test 1: Baseline store...")
+        store = RiskBaselineStore(os.path.join(tmp, "baselines.db"))
+        store.set("Pune", "Pune is calm.", {"weather": 3, "health": 2})
+        assert store.get("pune,")["scores"] == {"weather": 3, "health": 2}
+        store.set("Colaba, Mumbai", "Colaba is calm.", {"weather": 2, "health": 2})
+        assert store.get(" colaba  MUMBAI")["location"] == "Colaba, Mumbai"  # the planner's location_key()
+        assert store.get("Goa") is None
+        time.sleep(0.2)
+        assert store.get("Pune", max_age_seconds=0.1) is None
+        assert [b["location"] for b in store.list()] == ["Colaba, Mumbai", "Pune"] and store.stats()["hits"] == 2
+        print(f"✓ {store.stats()}")
+
+        get_store = risk_agent.get_risk_baseline_store
+        risk_agent.get_risk_baseline_store = lambda: store
+        try:
+            # Test 2: City assessments are served from a fresh baseline
+            print("\nTest 2: Serving a city baseline...")
+            report, searches, calls = assess(risk_agent.aassess_risks_directly, "Pune")
+            assert report.startswith("Pune is calm.") and "Baseline risk assessment for Pune" in report
+            assert searches == [] and calls == 0
+            print("✓ No search or LLM call for Pune")
+
+            # Test 3: Fallback to a live assessment
+            print("\nTest 3: Falling back to live assessments...")
+            for location in ("Goa", "Bandra, Mumbai"):  # no baseline; a locality of a city
+                report, searches, calls = assess(risk_agent.aassess_risks_directly, location)
+                assert report == "Live risk report." and searches == ["location"] and calls == 1, location
+            store.set("Mumbai", "Mumbai is busy.", {})
+            report, _, calls = assess(risk_agent.aassess_risks_directly, "Bandra, Mumbai")
+            assert report == "Live risk report." and calls == 1  # localities never get the city baseline
+            print("✓ Cities without a baseline and localities are assessed live")
+
+            # Test 4: Venue assessments reuse the baseline for location-scoped categories only
+            print("\nTest 4: Venue assessments...")
+            _, searches, _ = assess(risk_agent.aassess_venue_risks_directly, {"name": "Hall A", "location": "Pune"})
+            assert sorted(searches) == ["events", "logistics", "security"], searches
+            _, searches, _ = assess(risk_agent.aassess_venue_risks_directly, {"name": "Hall B", "location": "Goa"})
+            assert sorted(searches) == ["events", "health", "logistics", "security", "weather"], searches
+            print("✓ Pune venues skip weather and health searches; Goa venues search all five categories")
+
+            # Test 5: Stale baselines and store failures fall back too
+            print("\nTest 5: Stale baselines and read failures...")
+            max_age = baselines_module.RISK_BASELINE_MAX_AGE_SECONDS
+            baselines_module.RISK_BASELINE_MAX_AGE_SECONDS = 0
+            try:
+                report, searches, calls = assess(risk_agent.aassess_risks_directly, "Pune")
+                assert report == "Live risk report." and calls == 1
+            finally:
+                baselines_module.RISK_BASELINE_MAX_AGE_SECONDS = max_age
+            risk_agent.get_risk_baseline_store = lambda: BrokenStore()
+            report, searches, calls = assess(risk_agent.aassess_risks_directly, "Pune")
+            assert report == "Live risk report." and calls == 1
+            _, searches, _ = assess(risk_agent.aassess_venue_risks_directly, {"name": "Hall A", "location": "Pune"})
+            assert len(searches) == 5
+            print("✓ Expired baselines and a failing store lead to live assessments")
+        finally:
+            risk_agent.get_risk_baseline_store = get_store
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_risk_baselines()
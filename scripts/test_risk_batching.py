@@ -0,0 +1,93 @@
+import asyncio
+import io
+import os
+import re
+import sys
+from contextlib import redirect_stdout
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+os.environ["SEARCH_CACHE_ENABLED"] = "false"
+os.environ["RISK_REPORT_CACHE_ENABLED"] = "false"
+os.environ["RISK_BASELINES_ENABLED"] = "false"
+
+from langchain_core.messages import AIMessage
+
+import agent.event_risk_agent as risk_agent
+from agent.event_risk_agent import chunk_venue_blocks, split_venue_sections
+from agent.history import estimate_tokens
+
+
+class EchoLLM:
+    """Writes one "### Venue N: name" section per venue in the prompt; records the prompts."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt, config=None):
+        self.prompts.append(prompt)
+        venues = re.findall(r"^Venue (\d+): (.+) \(", prompt, re.MULTILINE)
+        return AIMessage(content="\n\n".join(f"### Venue {n}: {name}\nRisk for {name} is low." for n, name in venues))
+
+
+class FixedSearch:
+    async def arun(self, query, category="general"):
+        return f"{category} result " + "detail " * 60
+
+
+def blocks(sizes):
+    return [f"Venue {i}: " + "x" * (4 * size - 10) for i, size in enumerate(sizes, 1)]
+
+
+def test_risk_batching():
+    """Token-budgeted chunking of venue blocks and the merged, consistently numbered batch report."""
+    # Test 1: Greedy chunking under the budget
+    print("Test 1: Chunking venue blocks...")
+    chunked = chunk_venue_blocks(blocks([100] * 10), token_budget=350)
+    assert [len(chunk) for chunk in chunked] == [3, 3, 3, 1], [len(chunk) for chunk in chunked]
+    assert all(sum(estimate_tokens(block) for block in chunk) <= 350 for chunk in chunked)
+    assert [block for chunk in chunked for block in chunk] == blocks([100] * 10)  # order kept
+    print(f"✓ 10 blocks of ~100 tokens in chunks of {[len(chunk) for chunk in chunked]}")
+
+    # Test 2: Oversized blocks and edge cases
+    print("\nTest 2: Oversized blocks...")
+    chunked = chunk_venue_blocks(blocks([50, 500, 50, 50]), token_budget=200)
+    assert [len(chunk) for chunk in chunked] == [1, 1, 2]
+    assert chunk_venue_blocks([], token_budget=100) == []
+    assert len(chunk_venue_blocks(blocks([100] * 10), token_budget=10 ** 9)) == 1
+    print("✓ A block over the budget gets its own chunk; an unlimited budget gives one chunk")
+
+    # Test 3: Section splitting
+    print("\nTest 3: Splitting a report on venue headings...")
+    report = "Intro\n### Venue 3: A\nabout A\n## Venue 7: B (Pune)\nabout B\n#### Venue 10 - C\nabout C"
+    assert split_venue_sections(report) == {3: "about A", 7: "about B", 10: "about C"}
+    assert split_venue_sections("no headings") == {}
+    print("✓ Headings of any level split the report by venue number")
+
+    # Test 4: A large batch is written in chunks and merged in venue order
+    print("\nTest 4: Chunked batch report...")
+    risk_agent.get_cached_search = lambda: FixedSearch()
+    venues = [{"name": f"Hall {i}", "location": ["Pune", "Lonavla", "Mumbai"][i % 3]} for i in range(1, 13)]
+    budget = risk_agent.RISK_PROMPT_TOKEN_BUDGET
+    try:
+        for token_budget, expected_calls in ((10 ** 9, 1), (1500, None)):
+            risk_agent.RISK_PROMPT_TOKEN_BUDGET = token_budget
+            llm = EchoLLM()
+            with redirect_stdout(io.StringIO()):
+                report = asyncio.run(risk_agent.abatch_assess_venue_risks(llm, venues, "next week"))
+            assert expected_calls is None or len(llm.prompts) == expected_calls
+            assert all(estimate_tokens(p) < token_budget + 1000 for p in llm.prompts)
+            headings = re.findall(r"^### Venue (\d+): (Hall \d+)", report, re.MULTILINE)
+            assert headings == [(str(i), f"Hall {i}") for i in range(1, 13)], headings
+        assert len(llm.prompts) > 2
+        print(f"✓ 12 venues written in {len(llm.prompts)} chunk calls and merged as Venue 1..12")
+    finally:
+        risk_agent.RISK_PROMPT_TOKEN_BUDGET = budget
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_risk_batching()
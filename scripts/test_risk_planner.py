@@ -0,0 +1,70 @@
+import os
+import sys
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from agent.risk_planner import RISK_CATEGORIES, location_key, plan_risk_searches
+
+VENUES = [
+    {"name": "Misty Hills Retreat", "location": "Lonavla"},
+    {"name": "Royal Banquets", "location": "lonavla,"},
+    {"name": "Sunset Lawns", "location": "Lonavla"},
+    {"name": "Harbour Cafe", "location": "Colaba, Mumbai"},
+    {"name": "Sea View Hall", "location": "Colaba  Mumbai"},
+]
+
+
+def test_risk_planner():
+    """Location-scoped search sharing (3N + 2L), duplicate venues, unknown locations and city baselines."""
+    # Test 1: 3N + 2L searches
+    print("Test 1: Sharing location-scoped searches...")
+    assert location_key("Colaba, Mumbai") == location_key("colaba  mumbai") == "colaba mumbai"
+    plan = plan_risk_searches(VENUES, "24-25 October 2026")
+    assert len(plan) == 3 * 5 + 2 * 2, len(plan)
+    assert len(plan.queries) == len(plan.categories) == len(plan)
+    assert all(set(assignment) == set(RISK_CATEGORIES) for assignment in plan.assignments)
+    for category in ("weather", "health"):
+        assert len({plan.assignments[i][category] for i in (0, 1, 2)}) == 1
+        assert plan.assignments[0][category] != plan.assignments[3][category]
+        assert plan.assignments[3][category] == plan.assignments[4][category]
+    assert len({plan.assignments[i]["security"] for i in range(5)}) == 5
+    assert "24-25 October 2026" in plan.queries[plan.assignments[0]["weather"]]
+    assert "Misty Hills" not in plan.queries[plan.assignments[0]["weather"]]
+    print(f"✓ 5 venues in 2 locations: {len(plan)} searches instead of 25")
+
+    # Test 2: Results map back to every venue
+    print("\nTest 2: Mapping results back...")
+    results = [f"result {i}" for i in range(len(plan))]
+    per_venue = plan.venue_results(results)
+    assert len(per_venue) == 5 and all(set(r) == set(RISK_CATEGORIES) for r in per_venue)
+    assert per_venue[0]["weather"] == per_venue[2]["weather"] != per_venue[3]["weather"]
+    assert per_venue[0]["security"] != per_venue[1]["security"]
+    print("✓ Shared results appear under each venue of the location")
+
+    # Test 3: Duplicate venues and unknown locations
+    print("\nTest 3: Duplicates and unknown locations...")
+    plan = plan_risk_searches([VENUES[0], dict(VENUES[0])])
+    assert len(plan) == 5 and plan.assignments[0] == plan.assignments[1]
+    plan = plan_risk_searches([{"name": "Hall A", "location": "Unknown"}, {"name": "Hall B"}])
+    assert len(plan) == 10  # no location to share on, so every query is venue-scoped
+    assert "Hall A" in plan.queries[plan.assignments[0]["weather"]]
+    assert plan_risk_searches([]).queries == []
+    print("✓ Identical venues searched once; venues without a location keep venue-scoped queries")
+
+    # Test 4: City baselines replace location-scoped searches
+    print("\nTest 4: Baselines...")
+    baseline = {"weather": "Lonavla baseline", "health": "Covered by the Lonavla baseline"}
+    plan = plan_risk_searches(VENUES, baselines={location_key("Lonavla"): baseline})
+    assert len(plan) == 3 * 5 + 2 * 1, len(plan)
+    assert set(plan.assignments[0]) == {"security", "logistics", "events"}
+    per_venue = plan.venue_results(["x"] * len(plan))
+    assert per_venue[1]["weather"] == "Lonavla baseline" and per_venue[3]["weather"] == "x"
+    print(f"✓ Lonavla served from its baseline: {len(plan)} searches")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_risk_planner()
@@ -0,0 +1,121 @@
+import asyncio
+import io
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import date
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+os.environ["SEARCH_CACHE_ENABLED"] = "false"
+os.environ["RISK_BASELINES_ENABLED"] = "false"
+
+from langchain_core.messages import AIMessage
+
+import agent.event_risk_agent as risk_agent
+from utils.risk_report_cache import RiskReportCache, time_bucket
+
+
+class ThreadRecordingCache(RiskReportCache):
+    """RiskReportCache that records which threads touched SQLite."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = set()
+
+    def get(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().get(*args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        super().set(*args, **kwargs)
+
+
+class SectionLLM:
+    """Writes one "### Venue N: name" section per venue in the prompt; counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, prompt, config=None):
+        self.calls += 1
+        venues = re.findall(r"^Venue (\d+): (.+) \(", prompt, re.MULTILINE)
+        if not venues:
+            return AIMessage(content="Single venue report.")
+        return AIMessage(content="\n\n".join(f"### Venue {n}: {name}\nRisk for {name} is low." for n, name in venues))
+
+
+class FixedSearch:
+    async def arun(self, query, category="general"):
+        return f"{category} result"
+
+
+def test_risk_report_cache():
+    """Venue and batch cache keys, time buckets, TTL, and cache I/O off the event loop in the risk agent."""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Test 1: Keys
+        print("Test 1: Cache keys...")
+        key = RiskReportCache.make_key
+        assert key("venue", "Misty Hills Retreat!", "Lonavla,", "") == key("venue", "misty hills  retreat", "lonavla", "")
+        assert key("venue", "Misty Hills Retreat", "Lonavla", "") != key("batch", "Misty Hills Retreat", "Lonavla", "")
+        assert key("batch", "Misty Hills Retreat", "Lonavla", "") != key("batch", "Misty Hills Retreat", "Pune", "")
+        print("✓ Names and locations are normalized; venue and batch entries are kept apart")
+
+        # Test 2: Time buckets
+        print("\nTest 2: Time buckets...")
+        monday, tuesday = date(2026, 10, 12), date(2026, 10, 13)
+        assert time_bucket("next week", monday) == time_bucket("next week", tuesday) == time_bucket("19-25 October", monday)
+        assert time_bucket("next week", monday) != time_bucket("this week", monday)
+        assert time_bucket("") == time_bucket("  ") == "unspecified"
+        assert time_bucket("sometime soon!") == "sometime soon"
+        print(f"✓ \"next week\" on Monday and Tuesday share the bucket {time_bucket('next week', monday)}")
+
+        # Test 3: Round trip and expiry
+        print("\nTest 3: TTL...")
+        cache = RiskReportCache(db_path=os.path.join(tmp, "ttl.db"), ttl_seconds=1)
+        cache.set("batch", "Royal Banquets", "Pune", "", {"markdown": "Low risk", "scores": {"weather": 2}})
+        assert cache.get("batch", "royal banquets", "pune") == {"markdown": "Low risk", "scores": {"weather": 2}}
+        assert cache.get("venue", "Royal Banquets", "Pune") is None
+        time.sleep(1.1)
+        assert cache.get("batch", "Royal Banquets", "Pune") is None
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+        print(f"✓ {cache.stats()}")
+
+        # Test 4: The risk agent reuses reports and keeps SQLite off the event loop
+        print("\nTest 4: Cached reports in the risk agent...")
+        cache = ThreadRecordingCache(db_path=os.path.join(tmp, "agent.db"))
+        get_cache, get_search = risk_agent.get_risk_report_cache, risk_agent.get_cached_search
+        risk_agent.get_risk_report_cache = lambda: cache
+        risk_agent.get_cached_search = lambda: FixedSearch()
+        venues = [{"name": f"Hall {i}", "location": "Pune"} for i in range(1, 4)]
+        try:
+            async def assess():
+                llm = SectionLLM()
+                single = [await risk_agent.aassess_venue_risks_directly(llm, venues[0], "next week") for _ in range(2)]
+                await risk_agent.abatch_assess_venue_risks(llm, venues[:2], "next week")
+                streamed = [item async for item in risk_agent.astream_venue_risk_assessments(llm, venues, "next week")]
+                return threading.get_ident(), llm.calls, single, streamed
+
+            with redirect_stdout(io.StringIO()):
+                loop_thread, calls, single, streamed = asyncio.run(assess())
+        finally:
+            risk_agent.get_risk_report_cache, risk_agent.get_cached_search = get_cache, get_search
+        assert single == ["Single venue report."] * 2
+        assert calls == 3, calls  # one single-venue report, one batch chunk, one streamed venue
+        assert [(item["venue"], item["cached"]) for item in streamed] == [
+            ("Hall 1", True), ("Hall 2", True), ("Hall 3", False)]
+        assert cache.stats()["entries"] == 4 and cache.threads and loop_thread not in cache.threads
+        print(f"✓ {calls} LLM calls for 7 assessments; cache I/O ran on {len(cache.threads)} worker thread(s)")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_risk_report_cache()
@@ -0,0 +1,90 @@
+import os
+import sys
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import numpy as np
+
+from agent.risk_planner import RISK_CATEGORIES
+from agent.risk_scoring import (extract_risk_scores, format_risk_ranking, rank_venues, risk_levels, score_matrix,
+                                top_k_indices, weighted_risk)
+
+REPORT = """## Risk Assessment
+
+### Venue 1: Misty Hills Retreat
+Low risk overall.
+
+```risk-scores
+[{"venue": "Misty Hills Retreat", "scores": {"weather": 2, "security": 1, "health": 3, "logistics": 2, "events": 1}}]
+```
+
+
+### Venue 2: Royal Banquets
+Heavy traffic expected.
+
+```risk-scores
+{"venue": "Royal Banquets", "scores": {"weather": "7", "security": 12, "health": 0, "logistics": null, "crowds": 9}}
+```
+"""
+
+
+def test_risk_scoring():
+    """Score block extraction, the score matrix, NaN-aware weighted scores, risk levels and top-k ranking."""
+    # Test 1: Score blocks are parsed, cleaned and stripped
+    print("Test 1: Extracting score blocks...")
+    markdown, venue_scores = extract_risk_scores(REPORT)
+    assert "risk-scores" not in markdown and "\n\n\n" not in markdown and "Heavy traffic expected." in markdown
+    assert venue_scores == [
+        {"venue": "Misty Hills Retreat", "scores": {"weather": 2.0, "security": 1.0, "health": 3.0, "logistics": 2.0, "events": 1.0}},
+        {"venue": "Royal Banquets", "scores": {"weather": 7.0, "security": 10.0, "health": 1.0}},
+    ], venue_scores
+    assert extract_risk_scores("Plain report") == ("Plain report", [])
+    assert extract_risk_scores("Text\n```risk-scores\nnot json\n```\n") == ("Text", [])
+    print("✓ Two blocks merged; scores clamped to 1-10, unknown categories and nulls dropped")
+
+    # Test 2: Matrix and weighted scores
+    print("\nTest 2: Weighted overall scores...")
+    matrix = score_matrix(venue_scores)
+    assert matrix.shape == (2, len(RISK_CATEGORIES)) and np.isnan(matrix[1, 3]) and matrix[0, 0] == 2
+    weights = np.ones(len(RISK_CATEGORIES))
+    assert np.allclose(weighted_risk(matrix, weights), [1.8, 6.0])
+    weights[RISK_CATEGORIES.index("security")] = 3
+    assert np.allclose(weighted_risk(matrix, weights), [(2 + 3 + 3 + 2 + 1) / 7, (7 + 30 + 1) / 5])
+    empty = score_matrix([{"venue": "No scores", "scores": {}}])
+    assert weighted_risk(empty, np.ones(len(RISK_CATEGORIES))).tolist() == [5.0]
+    print("✓ Weighted means ignore missing categories; unscored venues default to 5")
+
+    # Test 3: Risk levels at the boundaries
+    print("\nTest 3: Risk levels...")
+    levels = risk_levels(np.array([1.0, 3.0, 3.01, 6.0, 6.5, 10.0]))
+    assert levels.tolist() == ["Low", "Low", "Medium", "Medium", "High", "High"]
+    print("✓ <=3 Low, <=6 Medium, above High")
+
+    # Test 4: Top-k matches a full stable sort
+    print("\nTest 4: Top-k vs full sort...")
+    rng = np.random.default_rng(11)
+    for _ in range(200):
+        overall = rng.integers(1, 11, size=int(rng.integers(1, 60))).astype(float)
+        k = int(rng.integers(1, len(overall) + 2))
+        expected = np.argsort(overall, kind="stable")[:k]
+        assert top_k_indices(overall, k).tolist() == expected.tolist(), (overall, k)
+    print("✓ 200 random score vectors with many ties ranked like a stable sort")
+
+    # Test 5: Ranking
+    print("\nTest 5: Ranking venues...")
+    ranking = rank_venues(venue_scores + [{"venue": "Sunset Lawns", "scores": {"weather": 9}}])
+    assert [(r["rank"], r["venue"], r["overall_score"], r["risk_level"]) for r in ranking] == [
+        (1, "Misty Hills Retreat", 1.8, "Low"), (2, "Royal Banquets", 6.0, "Medium"), (3, "Sunset Lawns", 9.0, "High")]
+    assert [r["venue"] for r in rank_venues(venue_scores, weights={"security": 0, "weather": 0})] == [
+        "Royal Banquets", "Misty Hills Retreat"]
+    assert len(rank_venues(venue_scores, k=1)) == 1 and rank_venues(venue_scores, k=0) == [] and rank_venues([]) == []
+    assert format_risk_ranking(ranking).splitlines()[1] == "1. **Misty Hills Retreat**: 1.8/10 (Low risk)"
+    print(f"✓ {[r['venue'] for r in ranking]}")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_risk_scoring()
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.search_cache import NO_RESULT_MESSAGE, CachedSearch, SearchCache, normalize_query
+
+
+class FakeSearch:
+    """Search client answering from a dict; counts upstream calls."""
+
+    def __init__(self, answers=None):
+        self.answers = answers or {}
+        self.calls = 0
+
+    def run(self, query):
+        self.calls += 1
+        return self.answers.get(query, f"results for {query}")
+
+    async def arun(self, query):
+        return self.run(query)
+
+
+class ThreadRecordingCache(SearchCache):
+    """SearchCache that records which threads touched SQLite."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = set()
+
+    def get(self, category, query):
+        self.threads.add(threading.get_ident())
+        return super().get(category, query)
+
+    def set(self, category, query, result):
+        self.threads.add(threading.get_ident())
+        super().set(category, query, result)
+
+
+def test_search_cache():
+    """Per-category expiry, periodic LRU eviction, what gets cached, and cache I/O off the event loop."""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Test 1: Hits on normalized queries
+        print("Test 1: Cache hits...")
+        cache = SearchCache(db_path=os.path.join(tmp, "cache.db"))
+        search = CachedSearch(FakeSearch(), cache)
+        assert normalize_query("  Weather   in PUNE?! ") == "weather in pune"
+        first = search.run("Weather in Pune", category="weather")
+        assert search.run("  weather in pune? ", category="weather") == first and search.search.calls == 1
+        search.run("Weather in Pune", category="events")  # categories are cached separately
+        assert search.search.calls == 2 and cache.stats()["hits"] == 1
+        print(f"✓ {cache.stats()}")
+
+        # Test 2: Expiry per category
+        print("\nTest 2: Per-category TTL...")
+        cache = SearchCache(db_path=os.path.join(tmp, "ttl.db"), ttls={"weather": 0.2, "venues": 60})
+        assert cache.ttl_for("unknown") == cache.ttl_for("general")
+        cache.set("weather", "rain in pune", "heavy rain")
+        cache.set("venues", "halls in pune", "10 halls")
+        time.sleep(0.3)
+        assert cache.get("weather", "rain in pune") is None and cache.get("venues", "halls in pune") == "10 halls"
+        assert cache.stats()["by_category"] == {"venues": {"hits": 1, "misses": 0}, "weather": {"hits": 0, "misses": 1}}
+        print("✓ Weather expired after its TTL while venue listings stayed fresh")
+
+        # Test 3: Eviction every 100 writes
+        print("\nTest 3: Periodic eviction...")
+        cache = SearchCache(db_path=os.path.join(tmp, "evict.db"), max_entries=50, ttls={"weather": 0.2})
+        for i in range(10):
+            cache.set("weather", f"stale {i}", "old")
+        time.sleep(0.3)
+        for i in range(89):
+            cache.set("general", f"query {i}", "result")
+            time.sleep(0.001)
+        assert cache.stats()["entries"] == 99 and cache.evictions == 0  # nothing evicted before the 100th write
+        cache.get("general", "query 0")  # recently used, so it survives
+        cache.set("general", "query 89", "result")
+        assert cache.stats()["entries"] == 50 and cache.evictions == 50, cache.stats()
+        assert cache.get("general", "query 0") == "result" and cache.get("general", "query 1") is None
+        assert cache.get("general", "query 89") == "result"
+        print("✓ 10 expired and 40 least recently used rows removed on the 100th write")
+
+        # Test 4: Only successful results are cached
+        print("\nTest 4: Failed and empty results...")
+        cache = SearchCache(db_path=os.path.join(tmp, "results.db"))
+        upstream = FakeSearch({"nothing": NO_RESULT_MESSAGE, "blank": "  "})
+        search = CachedSearch(upstream, cache)
+        for query in ("nothing", "blank", "nothing", "blank"):
+            search.run(query)
+        assert upstream.calls == 4 and cache.stats()["entries"] == 0
+
+        class FailingSearch(FakeSearch):
+            def run(self, query):
+                self.calls += 1
+                raise ConnectionError("serper down")
+
+        failing = CachedSearch(FailingSearch(), cache)
+        for _ in range(2):
+            try:
+                failing.run("venues in goa")
+                raise AssertionError("expected ConnectionError")
+            except ConnectionError:
+                pass
+        assert failing.search.calls == 2 and cache.stats()["entries"] == 0
+        print("✓ \"No good Google Search Result\", blank results and errors were not cached")
+
+        # Test 5: arun keeps SQLite off the event loop
+        print("\nTest 5: Async cache I/O...")
+        cache = ThreadRecordingCache(db_path=os.path.join(tmp, "async.db"))
+        search = CachedSearch(FakeSearch(), cache)
+
+        async def run_searches():
+            loop_thread = threading.get_ident()
+            results = await asyncio.gather(*(search.arun(f"query {i % 5}", "events") for i in range(20)))
+            results += [await search.arun("query 0", "events")]
+            return loop_thread, results
+
+        loop_thread, results = asyncio.run(run_searches())
+        assert results[-1] == "results for query 0" and cache.threads and loop_thread not in cache.threads
+        assert cache.stats()["entries"] == 5
+        print(f"✓ {len(results)} async searches; cache reads and writes ran on {len(cache.threads)} worker thread(s)")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_search_cache()
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from utils.session_store import InMemorySessionStore, SQLiteSessionStore, SessionStore, estimate_history_bytes
+
+
+def history(text, turns=1):
+    return [message for i in range(turns) for message in (HumanMessage(content=f"{text} {i}"), AIMessage(content=f"reply {i}"))]
+
+
+def test_session_store():
+    """LRU, idle-TTL and byte-cap eviction in memory, and the SQLite store's round trip, expiry and cap."""
+    # Test 1: Incomplete backends fail at construction
+    print("Test 1: Abstract interface...")
+
+    class Incomplete(SessionStore):
+        def get(self, session_id):
+            return []
+
+    try:
+        Incomplete()
+        raise AssertionError("expected TypeError")
+    except TypeError:
+        pass
+    print("✓ A backend without set/delete cannot be instantiated")
+
+    # Test 2: LRU eviction by count
+    print("\nTest 2: LRU eviction...")
+    store = InMemorySessionStore(max_sessions=3, ttl_seconds=60)
+    for session_id in ("a", "b", "c"):
+        store.set(session_id, history(session_id))
+    assert store.get("a")  # a is now the most recently used
+    store.set("d", history("d"))
+    assert store.get("b") == [] and store.get("a") and store.get("c") and store.get("d")
+    assert len(store) == 3 and store.stats()["evictions"] == 1
+    print(f"✓ Least recently used session evicted: {store.stats()}")
+
+    # Test 3: Byte cap
+    print("\nTest 3: Memory cap...")
+    big = history("x" * 1000, turns=5)
+    size = estimate_history_bytes(big)
+    store = InMemorySessionStore(max_sessions=100, ttl_seconds=60, max_bytes=int(size * 2.5))
+    for session_id in ("a", "b", "c", "d"):
+        store.set(session_id, big)
+    assert len(store) == 2 and store.stats()["total_bytes"] == 2 * size
+    store.set("huge", history("y" * 10000, turns=10))
+    assert len(store) == 1 and store.get("huge")  # the newest session is always kept
+    store.delete("huge")
+    assert len(store) == 0 and store.stats()["total_bytes"] == 0
+    print("✓ Oldest sessions dropped to stay under the cap; the newest is kept even when oversized")
+
+    # Test 4: Idle TTL
+    print("\nTest 4: Idle expiry...")
+    store = InMemorySessionStore(max_sessions=100, ttl_seconds=0.2)
+    store.set("idle", history("idle"))
+    store.set("active", history("active"))
+    time.sleep(0.15)
+    assert store.get("active")
+    time.sleep(0.1)
+    assert store.get("idle") == [] and store.get("active")
+    store.set("new", history("new"))
+    assert len(store) == 2
+    print("✓ Idle sessions expire; reads refresh the idle timer")
+
+    # Test 5: SQLite round trip, expiry and cap, shared across instances
+    print("\nTest 5: SQLite store...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sessions.db")
+        store = SQLiteSessionStore(db_path=path, ttl_seconds=60, max_sessions=3)
+        messages = history("venues in Pune", turns=2)
+        store.set("a", messages)
+        other_worker = SQLiteSessionStore(db_path=path, ttl_seconds=60, max_sessions=3)
+        loaded = other_worker.get("a")
+        assert [(m.type, m.content) for m in loaded] == [(m.type, m.content) for m in messages]
+        for session_id in ("b", "c", "d"):
+            time.sleep(0.01)
+            store.set(session_id, history(session_id))
+        assert store.get("a") == [] and store.stats()["sessions"] == 3
+        store.delete("d")
+        assert store.get("d") == [] and store.stats()["sessions"] == 2
+
+        expiring = SQLiteSessionStore(db_path=os.path.join(tmp, "expiring.db"), ttl_seconds=0.1)
+        expiring.set("old", history("old"))
+        time.sleep(0.15)
+        assert expiring.get("old") == []
+        expiring.set("new", history("new"))
+        assert expiring.stats()["sessions"] == 1
+        print(f"✓ Round trip across instances, capped at 3 sessions, expired rows purged: {store.stats()}")
+
+        # Test 6: Async access
+        print("\nTest 6: aget/aset...")
+
+        async def round_trip(store):
+            await store.aset("async", messages)
+            return await store.aget("async")
+
+        for backend in (store, InMemorySessionStore()):
+            assert [m.content for m in asyncio.run(round_trip(backend))] == [m.content for m in messages]
+        print("✓ Both backends serve aget/aset")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_session_store()
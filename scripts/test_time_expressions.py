@@ -0,0 +1,86 @@
+import os
+import sys
+from datetime import date
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.time_expressions import find_time_expressions, parse_time_expression
+
+WEDNESDAY, SATURDAY, SUNDAY = date(2026, 10, 14), date(2026, 10, 17), date(2026, 10, 18)
+
+WEEKENDS = [
+    ("venue for this weekend", WEDNESDAY, date(2026, 10, 17), date(2026, 10, 18)),
+    ("party next weekend", WEDNESDAY, date(2026, 10, 24), date(2026, 10, 25)),
+    ("the coming weekend", WEDNESDAY, date(2026, 10, 17), date(2026, 10, 18)),
+    ("this weekend", SATURDAY, date(2026, 10, 17), date(2026, 10, 18)),
+    ("this weekend", SUNDAY, date(2026, 10, 18), date(2026, 10, 18)),  # only the remaining day
+    ("next weekend", SUNDAY, date(2026, 10, 24), date(2026, 10, 25)),
+    ("weekend", date(2026, 12, 30), date(2027, 1, 2), date(2027, 1, 3)),
+]
+
+CROSS_YEAR = [
+    ("28 Dec - 3 Jan", date(2026, 12, 20), date(2026, 12, 28), date(2027, 1, 3)),
+    ("28th December to 3rd January", date(2026, 10, 14), date(2026, 12, 28), date(2027, 1, 3)),
+    ("Dec 30 to Jan 2", date(2026, 10, 14), date(2026, 12, 30), date(2027, 1, 2)),
+    ("28 Dec - 3 Jan 2027", date(2026, 10, 14), date(2026, 12, 28), date(2027, 1, 3)),
+    ("2026-12-28 to 2027-01-03", date(2026, 10, 14), date(2026, 12, 28), date(2027, 1, 3)),
+    ("30/12/2026 - 02/01/2027", date(2026, 10, 14), date(2026, 12, 30), date(2027, 1, 2)),
+    ("this week", date(2026, 12, 30), date(2026, 12, 30), date(2027, 1, 3)),
+    ("next week", date(2026, 12, 30), date(2027, 1, 4), date(2027, 1, 10)),
+    ("next month", date(2026, 12, 15), date(2027, 1, 1), date(2027, 1, 31)),
+    ("in 2 weeks", date(2026, 12, 24), date(2027, 1, 4), date(2027, 1, 10)),
+    ("within two weeks", date(2026, 12, 25), date(2026, 12, 25), date(2027, 1, 7)),
+    ("in January", date(2026, 10, 14), date(2027, 1, 1), date(2027, 1, 31)),
+    ("new year's day", date(2026, 12, 20), date(2027, 1, 1), date(2027, 1, 1)),
+    ("Christmas", date(2026, 12, 26), date(2027, 12, 25), date(2027, 12, 25)),
+]
+
+
+def check(cases):
+    for text, today, start, end in cases:
+        period = parse_time_expression(text, today)
+        assert period is not None and (period.start, period.end) == (start, end), (text, today, period)
+        # Labels are used in search queries and must parse back to the same days
+        assert parse_time_expression(period.label, today)[:2] == period[:2], (text, period.label)
+
+
+def test_time_expressions():
+    """Weekend resolution on different weekdays, ranges crossing the new year and label round trips."""
+    # Test 1: Weekends
+    print("Test 1: Weekends...")
+    check(WEEKENDS)
+    print(f"✓ {len(WEEKENDS)} weekend phrases resolved, including from Saturday, Sunday and across the new year")
+
+    # Test 2: Cross-year ranges
+    print("\nTest 2: Ranges crossing the new year...")
+    check(CROSS_YEAR)
+    period = parse_time_expression("28 Dec - 3 Jan", date(2026, 12, 20))
+    assert period.label == "28 December 2026 - 3 January 2027" and period.days == 7
+    assert period.key == "2026-12-28/2027-01-03"
+    print(f"✓ {len(CROSS_YEAR)} phrases; e.g. \"28 Dec - 3 Jan\" -> {period.label}")
+
+    # Test 3: Words that are not dates
+    print("\nTest 3: Ambiguous words...")
+    for text in ("May I book a hall?", "sat in the garden", "a march past", "", None):
+        assert parse_time_expression(text, WEDNESDAY) is None, text
+    assert parse_time_expression("in May", WEDNESDAY)[:2] == (date(2027, 5, 1), date(2027, 5, 31))
+    assert parse_time_expression("31 February", WEDNESDAY)[:2] == (date(2027, 2, 1), date(2027, 2, 28))  # invalid day dropped
+    print("✓ \"May\", \"sat\" and \"march\" are ignored unless they read as dates")
+
+    # Test 4: Several expressions and overlap checks
+    print("\nTest 4: Multiple expressions...")
+    ranges = find_time_expressions("this weekend or else next Friday", WEDNESDAY)
+    assert [(r.start, r.end, r.phrase) for r in ranges] == [
+        (date(2026, 10, 17), date(2026, 10, 18), "this weekend"), (date(2026, 10, 23), date(2026, 10, 23), "next friday")]
+    weekend = ranges[0]
+    assert weekend.overlaps(date(2026, 10, 18), date(2026, 10, 30)) and not weekend.overlaps(date(2026, 10, 19))
+    assert weekend.contains(date(2026, 10, 17)) and not weekend.contains(date(2026, 10, 16))
+    print(f"✓ {[r.label for r in ranges]}")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_time_expressions()
@@ -0,0 +1,133 @@
+import os
+import random
+import sys
+import tempfile
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import numpy as np
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import sessionmaker
+
+from agent.venue_tools import parse_venue_request
+from models.database import Venue, create_venue_engine
+from models.venue_catalog import VenueCatalog
+from models.venue_geo import GeoGrid, bounding_box, haversine_km
+from models.venue_models import VenueSearchCriteria
+from models.venue_search import SearchPointError, search_venue_page
+from models.venue_snapshot import VenueSnapshot
+from scripts.benchmark_venue_search import populate_synthetic_catalog
+from scripts.test_venue_snapshot import random_criteria
+
+PUNE = (18.51957, 73.85535)
+MUMBAI = (19.07283, 72.88261)
+
+
+def brute_force(owners, latitudes, longitudes, latitude, longitude, radius_km):
+    distances = haversine_km(latitude, longitude, latitudes, longitudes)
+    return sorted((d, o) for o, d in zip(owners, distances) if d <= radius_km)
+
+
+def set_coordinates(Session, rng, count):
+    """Random coordinates within ~60 km of Pune for most venues; the rest stay NULL."""
+    with Session() as db:
+        rows = [{"row_id": i, "latitude": PUNE[0] + rng.uniform(-0.5, 0.5), "longitude": PUNE[1] + rng.uniform(-0.5, 0.5)}
+                for i in range(1, count + 1) if rng.random() < 0.9]
+        db.connection().execute(update(Venue.__table__).where(Venue.__table__.c.id == bindparam("row_id"))
+                                .values(latitude=bindparam("latitude"), longitude=bindparam("longitude")), rows)
+        db.commit()
+
+
+def test_venue_geo():
+    """Distances, the grid index vs brute force, and radius search through the API, catalog and tools."""
+    rng = np.random.default_rng(3)
+
+    # Test 1: Distances and bounding boxes
+    print("Test 1: Haversine and bounding boxes...")
+    assert abs(haversine_km(*PUNE, np.array([MUMBAI[0]]), np.array([MUMBAI[1]]))[0] - 120) < 2
+    assert haversine_km(0, 0, np.array([0.0]), np.array([180.0]))[0] > 20000
+    min_lat, max_lat, min_lon, max_lon = bounding_box(*PUNE, 25)
+    assert min_lat < PUNE[0] < max_lat and min_lon < PUNE[1] < max_lon and max_lon - min_lon > max_lat - min_lat
+    assert bounding_box(89.9, 0, 50)[2:] == (-180.0, 180.0) and bounding_box(0, 179.9, 50)[2:] == (-180.0, 180.0)
+    print("✓ Pune-Mumbai ~120 km; boxes widen with latitude and cover the poles and antimeridian")
+
+    # Test 2: Grid vs brute force
+    print("\nTest 2: Grid index vs brute force...")
+    count = 20000
+    owners = np.arange(count)
+    latitudes = np.concatenate([rng.uniform(8, 35, count - 2000), rng.uniform(-90, 90, 2000)])
+    longitudes = np.concatenate([rng.uniform(68, 97, count - 2000), rng.uniform(-180, 180, 2000)])
+    latitudes[::50] = np.nan
+    grid = GeoGrid(owners, latitudes, longitudes, cell_km=10)
+    assert len(grid) == count - count // 50
+    for _ in range(300):
+        latitude, longitude = float(rng.uniform(-89, 89)), float(rng.uniform(-179.9, 179.9))
+        if rng.random() < 0.7:
+            latitude, longitude = float(rng.uniform(8, 35)), float(rng.uniform(68, 97))
+        radius = float(rng.choice([1, 5, 25, 100, 800]))
+        found = grid.within(latitude, longitude, radius)
+        expected = brute_force(owners, latitudes, longitudes, latitude, longitude, radius)
+        assert list(found) == [o for _, o in expected], (latitude, longitude, radius)
+        assert np.allclose(list(found.values()), [d for d, _ in expected])
+    print(f"✓ 300 radius queries matched brute force over {len(grid)} points")
+
+    # Test 3: API search around a point, SQL vs snapshot
+    print("\nTest 3: /api/venue/search around a point...")
+    py_rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_venue_engine(f"sqlite:///{os.path.join(tmp, 'venues_test.db')}")
+        populate_synthetic_catalog(engine, 3000)
+        Session = sessionmaker(bind=engine)
+        set_coordinates(Session, py_rng, 3000)
+        snapshot = VenueSnapshot(Session, refresh_seconds=0)
+        for _ in range(150):
+            criteria = random_criteria(py_rng).model_copy(update={
+                "latitude": PUNE[0] + py_rng.uniform(-0.3, 0.3), "longitude": PUNE[1] + py_rng.uniform(-0.3, 0.3),
+                "radius_km": py_rng.choice([None, 2, 10, 40]), "query": py_rng.choice([None, None, "venue 12", "pune"])})
+            expected = search_venue_page(criteria, Session)
+            assert search_venue_page(criteria, Session, snapshot=snapshot) == expected, criteria
+            distances = [v.distance_km for v in expected.venues]
+            assert all(d <= (criteria.radius_km or 25) for d in distances)
+            assert criteria.query or distances == sorted(distances)  # text matches keep relevance order
+        near = search_venue_page(VenueSearchCriteria(near="Koregaon Park, Pune", radius_km=5, page_size=100), Session)
+        assert near.total_count and all(v.distance_km <= 5 for v in near.venues)
+        for bad in (VenueSearchCriteria(near="Atlantis"), VenueSearchCriteria(latitude=18.5)):
+            try:
+                search_venue_page(bad, Session)
+                assert False, bad
+            except SearchPointError:
+                pass
+        print(f"✓ 150 searches matched; {near.total_count} venues within 5 km of Koregaon Park")
+
+        # Test 4: Moved venues are picked up by the snapshot
+        print("\nTest 4: Coordinate changes...")
+        with Session() as db:
+            db.execute(update(Venue).where(Venue.id <= 20).values(latitude=MUMBAI[0], longitude=MUMBAI[1]))
+            db.commit()
+        criteria = VenueSearchCriteria(latitude=MUMBAI[0], longitude=MUMBAI[1], radius_km=1, page_size=50)
+        expected = search_venue_page(criteria, Session)
+        assert search_venue_page(criteria, Session, snapshot=snapshot) == expected and expected.total_count == 20
+        print(f"✓ 20 moved venues found around Mumbai ({snapshot.stats()['incremental_refreshes']} incremental refreshes)")
+
+        # Test 5: Catalog and tool requests
+        print("\nTest 5: Catalog and tools...")
+        request = parse_venue_request("venues within 15 km of Koregaon Park for 200 guests under 5 lakhs",
+                                      {"amenities": [], "event_types": [], "purposes": []})
+        assert request.radius_km == 15 and request.max_price == 500000 and request.min_capacity == 200
+        assert request.describe().startswith("within 15 km of Koregaon Park")
+        assert parse_venue_request("within 10 km of Pune", {}).max_price is None  # not a budget of 10
+        filters = dict(min_capacity=200, max_price=500000, limit=10, near=request.point, radius_km=15)
+        plain = VenueCatalog(Session).search((), **filters)
+        indexed = VenueCatalog(Session, snapshot=snapshot).search((), **filters)
+        assert plain == indexed and plain, plain
+        assert [v["distance_km"] for v in plain] == sorted(v["distance_km"] for v in plain)
+        print(f"✓ {len(plain)} catalog venues, nearest {plain[0]['distance_km']} km")
+        engine.dispose()
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_venue_geo()
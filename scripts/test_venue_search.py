@@ -0,0 +1,157 @@
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+import models.venue_snapshot as venue_snapshot
+from models.database import AvailableDate, Base, Venue, create_async_venue_engine, create_venue_engine
+from models.venue_catalog import VenueCatalog
+from models.venue_models import VenueSearchCriteria
+from models.venue_search import SearchPointError, asearch_venue_page, search_point, search_venue_page
+from models.venue_snapshot import VenueSnapshot
+from models.venue_text_search import TEXT_SEARCH_MAX_MATCHES
+from models.venue_vectors import SEMANTIC_MAX_MATCHES, VenueVectorIndex
+
+# venue_id -> (location, price, availability windows)
+VENUES = {
+    "M1": ("Mumbai", 1000, [(date(2026, 3, 1), date(2026, 3, 10)), (date(2026, 3, 11), date(2026, 3, 20))]),  # touching
+    "M2": ("Navi Mumbai", 2000, [(date(2026, 3, 1), date(2026, 3, 10)), (date(2026, 3, 12), date(2026, 3, 20))]),  # gap on 11
+    "M3": ("Bandra, MUMBAI", 3000, [(date(2026, 3, 1), date(2026, 3, 12)), (date(2026, 3, 5), date(2026, 3, 20))]),  # overlap
+    "P1": ("Pune", 4000, []),
+    "X1": ("100% Lawns", 5000, []),
+    **{f"L{i:02d}": ("Lonavla", 10000 + i, [(date(2026, 3, 1), date(2026, 3, 31))]) for i in range(1, 22)},
+}
+
+
+def populate(Session):
+    with Session() as db:
+        for venue_id, (location, price, windows) in VENUES.items():
+            venue = Venue(venue_id=venue_id, name=f"Venue {venue_id}", location=location, capacity=100,
+                          price_per_day=float(price), contact_number="9876543210", has_veg=True, has_non_veg=False)
+            venue.available_dates = [AvailableDate(start_date=start, end_date=end) for start, end in windows]
+            db.add(venue)
+        db.commit()
+
+
+def search(Session, snapshot, **criteria):
+    """Venue ids from SQL; the snapshot must return the same page."""
+    criteria = VenueSearchCriteria(**criteria)
+    expected = search_venue_page(criteria, Session)
+    assert search_venue_page(criteria, Session, snapshot=snapshot) == expected, criteria
+    return expected, [venue.venue_id for venue in expected.venues]
+
+
+def add_banquet_halls(Session):
+    """More Mumbai banquet halls than either ranking cap, all better matches than the 10 in Pune."""
+    cap = max(TEXT_SEARCH_MAX_MATCHES, SEMANTIC_MAX_MATCHES)
+    halls = ([("Mumbai", "Banquet hall for banquets", 19.07, 72.88)] * (cap + 100)
+             + [("Pune", "Rooftop garden with a banquet room", 18.52, 73.86)] * 10)
+    with Session() as db:
+        db.add_all(Venue(venue_id=f"B{i:04d}", name=f"Banquet Hall {i}", location=location, description=description,
+                         capacity=100, price_per_day=50000.0, contact_number="9876543210", has_veg=True,
+                         has_non_veg=False, latitude=latitude, longitude=longitude)
+                   for i, (location, description, latitude, longitude) in enumerate(halls))
+        db.commit()
+
+
+def test_venue_search():
+    """Location matching shared with the catalog, pagination, all-days availability, search point errors
+    and text or semantic matches beyond the ranking caps."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_venue_engine(f"sqlite:///{os.path.join(tmp, 'venues_test.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        populate(Session)
+        snapshot = VenueSnapshot(Session, refresh_seconds=0)
+        catalog = VenueCatalog(Session)
+
+        # Test 1: One location rule for the API and the catalog
+        print("Test 1: Location matching...")
+        for location, expected in (("Mumbai", ["M1", "M2", "M3"]), ("  mumbai ", ["M1", "M2", "M3"]),
+                                   ("Navi Mumbai", ["M2"]), ("100%", ["X1"]), ("0% L", ["X1"]), ("%", ["X1"]),
+                                   ("Goa", [])):
+            _, ids = search(Session, snapshot, location=location)
+            assert ids == expected, (location, ids)
+            assert [v["venue_id"] for v in catalog.search([location], limit=50)] == expected, location
+        print("✓ \"Mumbai\" finds Navi Mumbai and Bandra, MUMBAI in the API, the snapshot and the catalog")
+
+        # Test 2: Pagination
+        print("\nTest 2: Pagination...")
+        pages = [search(Session, snapshot, location="Lonavla", page=page, page_size=5) for page in range(1, 7)]
+        assert all(response.total_count == 21 and response.total_pages == 5 for response, _ in pages)
+        assert [len(ids) for _, ids in pages] == [5, 5, 5, 5, 1, 0]
+        assert [venue_id for _, ids in pages for venue_id in ids] == [f"L{i:02d}" for i in range(1, 22)]  # cheapest first
+        response, ids = search(Session, snapshot, location="Goa")
+        assert response.total_count == 0 and response.total_pages == 1 and ids == []
+        print("✓ 21 venues over 5 pages of 5, in price order; an empty result has one page")
+
+        # Test 3: Available on every day of the event
+        print("\nTest 3: Availability throughout the event...")
+        cases = [
+            ((datetime(2026, 3, 5), datetime(2026, 3, 15)), ["M1", "M3"]),  # M2 has a gap on the 11th
+            ((datetime(2026, 3, 1), datetime(2026, 3, 10)), ["M1", "M2", "M3"]),
+            ((datetime(2026, 3, 11), None), ["M1", "M3"]),  # one-day event
+            ((None, datetime(2026, 3, 12)), ["M1", "M2", "M3"]),
+            ((datetime(2026, 3, 15), datetime(2026, 3, 5)), ["M1", "M3"]),  # reversed dates
+            ((datetime(2026, 2, 28), datetime(2026, 3, 2)), []),  # starts before every window
+            ((datetime(2026, 3, 19), datetime(2026, 3, 21)), []),  # runs past every window
+        ]
+        for (start, end), expected in cases:
+            _, ids = search(Session, snapshot, location="mumbai", start_date=start, end_date=end)
+            assert ids == expected, (start, end, ids)
+        print(f"✓ {len(cases)} date ranges: touching and overlapping windows combine, gaps exclude")
+
+        # Test 4: Search point errors
+        print("\nTest 4: Search points...")
+        assert search_point(VenueSearchCriteria()) is None
+        assert search_point(VenueSearchCriteria(latitude=18.5, longitude=73.8)) == (18.5, 73.8)
+        assert search_point(VenueSearchCriteria(near="Koregaon Park")) is not None
+        for criteria in (VenueSearchCriteria(latitude=18.5), VenueSearchCriteria(longitude=73.8),
+                         VenueSearchCriteria(near="Atlantis")):
+            try:
+                search_venue_page(criteria, Session)
+                raise AssertionError(f"expected SearchPointError for {criteria}")
+            except SearchPointError as e:
+                assert isinstance(e, ValueError)
+        print("✓ Half a coordinate pair and unknown places raise SearchPointError (a ValueError)")
+
+        # Test 5: Filters apply before the ranking caps
+        print("\nTest 5: Selective filters with more text matches than the caps...")
+        add_banquet_halls(Session)
+        vectors = VenueVectorIndex.build(Session, sync_seconds=0)
+        async_engine = create_async_venue_engine(f"sqlite:///{os.path.join(tmp, 'venues_test.db')}")
+        async_catalog = VenueCatalog(Session, async_sessionmaker(async_engine, expire_on_commit=False))
+        venue_snapshot._snapshot, venue_snapshot._snapshot_checked = None, True  # no process-wide snapshot
+
+        async def asearch(cases):
+            try:
+                return [await asearch_venue_page(criteria, async_catalog, snapshot=use, vectors=vectors)
+                        for criteria, _ in cases for use in (None, snapshot)]
+            finally:
+                await async_engine.dispose()
+
+        cases = []
+        for semantic in (False, True):
+            for filters in (dict(location="Pune"), dict(near="Koregaon Park", radius_km=20)):
+                criteria = VenueSearchCriteria(query="banquet", semantic=semantic, page_size=100, **filters)
+                response = search_venue_page(criteria, Session, vectors=vectors)
+                assert search_venue_page(criteria, Session, snapshot=snapshot, vectors=vectors) == response, criteria
+                assert response.total_count == 10, (criteria, response.total_count)
+                assert {v.location for v in response.venues} == {"Pune"}
+                cases.append((criteria, response))
+        assert asyncio.run(asearch(cases)) == [response for _, response in cases for _ in range(2)]
+        print(f"✓ The 10 Pune matches are found behind {TEXT_SEARCH_MAX_MATCHES}+ better Mumbai ones, by words and by meaning")
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_venue_search()
@@ -0,0 +1,152 @@
+import os
+import random
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import numpy as np
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import sessionmaker
+
+from models.database import Amenity, AvailableDate, Venue, VenueChange, create_venue_engine, prune_venue_changes
+from models.venue_models import Amenity as ApiAmenity, EventType, FoodPreference, VenueSearchCriteria
+from models.venue_search import search_venue_page
+from models.venue_snapshot import VenueSnapshot
+from models.venue_vectors import VenueVectorIndex, venue_documents
+from scripts.benchmark_venue_search import SYNTHETIC_LOCATIONS, populate_synthetic_catalog
+
+
+def random_criteria(rng):
+    fields = {}
+    if rng.random() < 0.7:
+        location = rng.choice(SYNTHETIC_LOCATIONS + ["Nowhere"])
+        fields["location"] = rng.choice([location, location.upper(), f" {location.lower()} "])
+    if rng.random() < 0.5:
+        fields["min_capacity"] = rng.randint(20, 1500)
+    if rng.random() < 0.3:
+        fields["max_capacity"] = rng.randint(200, 2000)
+    if rng.random() < 0.5:
+        fields["max_price"] = rng.randrange(100000, 1500000, 5000)
+    if rng.random() < 0.2:
+        fields["min_price"] = rng.randrange(50000, 500000, 5000)
+    if rng.random() < 0.4:
+        fields["event_type"] = rng.choice(list(EventType))
+    if rng.random() < 0.4:
+        fields["food_preference"] = rng.choice(list(FoodPreference))
+    if rng.random() < 0.4:
+        fields["required_amenities"] = rng.sample(list(ApiAmenity), rng.randint(1, 2))
+    if rng.random() < 0.3:
+        start = datetime(2026, 1, 1) + timedelta(days=rng.randint(0, 380))
+        fields["start_date"], fields["end_date"] = start, start + timedelta(days=rng.randint(0, 10))
+    return VenueSearchCriteria(page=rng.randint(1, 3), page_size=rng.choice([5, 20, 50]), **fields)
+
+
+def assert_same_results(Session, snapshot, rng, rounds):
+    for _ in range(rounds):
+        criteria = random_criteria(rng)
+        expected = search_venue_page(criteria, Session)
+        actual = search_venue_page(criteria, Session, snapshot=snapshot)
+        assert actual == expected, (criteria, expected.total_count, actual.total_count)
+
+
+def test_venue_snapshot():
+    """The snapshot answers exactly like the SQL search, before and after incremental refreshes and log pruning."""
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_venue_engine(f"sqlite:///{os.path.join(tmp, 'venues_test.db')}")
+        populate_synthetic_catalog(engine, 3000)
+        Session = sessionmaker(bind=engine)
+        snapshot = VenueSnapshot(Session, refresh_seconds=0)
+
+        # Test 1: Same results as SQL
+        print("Test 1: Snapshot vs SQL on random criteria...")
+        assert_same_results(Session, snapshot, rng, 300)
+        assert snapshot.full_loads == 1
+        print(f"✓ 300 searches matched SQL ({snapshot.stats()})")
+
+        # Test 2: Venue, relation and availability changes are applied incrementally
+        print("\nTest 2: Incremental refresh...")
+        with Session() as db:
+            db.execute(update(Venue).where(Venue.id <= 50).values(price_per_day=1000.0, location="Lonavla"))
+            db.execute(delete(AvailableDate).where(AvailableDate.venue_id.between(51, 60)))
+            venue = db.get(Venue, 61)
+            venue.amenities = [db.scalars(select(Amenity).where(Amenity.name == "Pool")).one()]
+            venue.available_dates.append(AvailableDate(start_date=date(2026, 3, 1), end_date=date(2026, 3, 31)))
+            removed = db.get(Venue, 62)
+            removed.amenities, removed.event_types, removed.purposes = [], [], []
+            db.delete(removed)
+            new = Venue(venue_id="N0000001", name="New Venue", location="Shimla", capacity=120, price_per_day=2000.0,
+                        contact_number="9876543210", has_veg=True, has_non_veg=False)
+            new.amenities = [Amenity(name="Gym"), db.scalars(select(Amenity).where(Amenity.name == "AV")).one()]
+            new.available_dates = [AvailableDate(start_date=date(2026, 3, 1), end_date=date(2026, 3, 10))]
+            db.add(new)
+            db.commit()
+        assert_same_results(Session, snapshot, rng, 200)
+        found = search_venue_page(VenueSearchCriteria(location="shimla", required_amenities=[ApiAmenity.GYM],
+                                                      start_date=datetime(2026, 3, 2)), Session, snapshot=snapshot)
+        assert [v.venue_id for v in found.venues] == ["N0000001"], found
+        assert snapshot.full_loads == 1 and snapshot.incremental_refreshes == 1, snapshot.stats()
+        assert snapshot.venues_reloaded == 63, snapshot.stats()
+        print(f"✓ {snapshot.venues_reloaded} changed venues reloaded in {snapshot.last_refresh_ms:.1f}ms, results still match")
+
+        # Test 3: Renaming an amenity reloads everything
+        print("\nTest 3: Name table change...")
+        with Session() as db:
+            db.execute(update(Amenity).where(Amenity.name == "Pool").values(name="Swimming Pool"))
+            db.commit()
+        assert_same_results(Session, snapshot, rng, 50)
+        assert snapshot.full_loads == 2, snapshot.stats()
+        print(f"✓ full reload after rename ({snapshot.stats()})")
+
+        # Test 4: No changes, no reload
+        print("\nTest 4: Idle refresh...")
+        snapshot.refresh(force=True)
+        assert snapshot.full_loads == 2 and snapshot.incremental_refreshes == 1, snapshot.stats()
+        print("✓ nothing reloaded without new change log entries")
+
+        # Test 5: Readers behind a pruned change log reload everything
+        print("\nTest 5: Change log pruning...")
+        vectors = VenueVectorIndex.build(Session, sync_seconds=0)
+
+        def change(venue_id, **values):
+            with Session() as db:
+                db.execute(update(Venue).where(Venue.id == venue_id).values(**values))
+                db.commit()
+
+        def log_size():
+            with Session() as db:
+                return db.scalar(select(func.count(VenueChange.id)))
+
+        change(100, price_per_day=1500.0)
+        assert prune_venue_changes(engine, keep=log_size()) == 0  # nothing beyond keep
+        assert_same_results(Session, snapshot, rng, 20)
+        vectors.refresh(force=True)
+        assert snapshot.full_loads == 2 and snapshot.incremental_refreshes == 2, snapshot.stats()
+        assert vectors.full_builds == 1, vectors.stats()
+        change(101, price_per_day=1600.0)
+        change(102, description="Rooftop wedding venue")
+        pruned = prune_venue_changes(engine, keep=1)
+        assert pruned > 0 and log_size() == 1
+        assert_same_results(Session, snapshot, rng, 50)
+        vectors.refresh(force=True)
+        assert snapshot.full_loads == 3 and snapshot.incremental_refreshes == 2, snapshot.stats()
+        assert vectors.full_builds == 2, vectors.stats()
+        ids, encoded = vectors.vectors()
+        with Session() as db:
+            expected_ids, texts = venue_documents(db)
+        assert ids.tolist() == expected_ids and np.allclose(encoded, vectors.encoder.encode(texts))
+        change(103, price_per_day=1700.0)
+        assert_same_results(Session, snapshot, rng, 20)
+        assert snapshot.full_loads == 3 and snapshot.incremental_refreshes == 3, snapshot.stats()
+        print(f"✓ {pruned} log rows pruned; the snapshot and vector index reloaded once, then went on incrementally")
+
+        engine.dispose()
+        print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_venue_snapshot()
@@ -0,0 +1,90 @@
+import os
+import sys
+import tempfile
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from sqlalchemy import delete, text, update
+from sqlalchemy.orm import sessionmaker
+
+from models.database import Base, Venue, create_venue_engine, rebuild_venue_fts
+from models.venue_catalog import VenueCatalog
+from models.venue_models import VenueSearchCriteria
+from models.venue_search import search_venue_page
+from models.venue_snapshot import VenueSnapshot
+from models.venue_text_search import fts_query, relevance_statement
+
+VENUES = [
+    ("T001", "The Hillside Resort", "Lonavla", "Scenic hilltop resort with valley views and cottages"),
+    ("T002", "Lonavla Convention Center", "Lonavla", "Modern convention center for corporate events"),
+    ("T003", "Green Valley Resort", "Lonavla", "Lush lawns for weddings"),
+    ("T004", "Harbour Hall", "Mumbai", "Banquet hall near the harbour with a scenic terrace"),
+    ("T005", "City Banquets", "Pune", None),
+]
+
+
+def matches(Session, query, match_all=False):
+    with Session() as db:
+        return [db.get(Venue, row_id).venue_id for row_id in db.scalars(relevance_statement(query, match_all))]
+
+
+def test_venue_text_search():
+    """FTS5 index sync, query building, ranking, and the API and catalog paths."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_venue_engine(f"sqlite:///{os.path.join(tmp, 'venues_test.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as db:
+            for venue_id, name, location, description in VENUES:
+                db.add(Venue(venue_id=venue_id, name=name, location=location, description=description, capacity=100,
+                             price_per_day=100000, contact_number="9876543210", has_veg=True, has_non_veg=True))
+            db.commit()
+
+        # Test 1: Queries are quoted words
+        print("Test 1: Building FTS queries...")
+        assert fts_query("Scenic resort with a view near Lonavla") == '"scenic" OR "resort" OR "view" OR "lonavla"'
+        assert fts_query('hall" OR NEAR(x', match_all=True) == '"hall" AND "x"'
+        assert fts_query("the venues near") is None and relevance_statement("in the") is None
+        assert matches(Session, 'harbour") OR ("') == ["T004"]
+        print("✓ filler words dropped, FTS syntax never reaches SQLite")
+
+        # Test 2: Ranking
+        print("\nTest 2: BM25 ranking...")
+        assert matches(Session, "scenic resort")[:2] == ["T001", "T003"], matches(Session, "scenic resort")
+        assert sorted(matches(Session, "resorts")) == ["T001", "T003"]  # porter stemming
+        assert matches(Session, "hillside resort lonavla", match_all=True) == ["T001"]
+        print(f"✓ 'scenic resort' -> {matches(Session, 'scenic resort')}")
+
+        # Test 3: Triggers keep the index in sync
+        print("\nTest 3: Insert, update and delete...")
+        with Session() as db:
+            db.execute(update(Venue).where(Venue.venue_id == "T005").values(description="Rooftop banquet with skyline views"))
+            db.execute(delete(Venue).where(Venue.venue_id == "T002"))
+            db.commit()
+        assert matches(Session, "rooftop") == ["T005"] and matches(Session, "convention") == []
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM venues_fts"))  # e.g. a bulk load that bypassed the triggers
+        assert matches(Session, "rooftop") == []
+        rebuild_venue_fts(engine)
+        assert matches(Session, "rooftop") == ["T005"]
+        print("✓ index follows venue writes; rebuild restores it")
+
+        # Test 4: API search (SQL and snapshot) and catalog
+        print("\nTest 4: /api/venue/search and catalog...")
+        criteria = VenueSearchCriteria(query="scenic views", location="lonavla")
+        sql = search_venue_page(criteria, Session)
+        snapshot = search_venue_page(criteria, Session, snapshot=VenueSnapshot(Session))
+        assert sql == snapshot and [v.venue_id for v in sql.venues] == ["T001"], sql
+        catalog = VenueCatalog(Session)
+        assert [v["venue_id"] for v in catalog.search(["lonavla"], text="green weddings")] == ["T003", "T001"]
+        assert catalog.get("harbour scenic hall")["venue_id"] == "T004" and catalog.get("taj palace") is None
+        print(f"✓ {[v.name for v in sql.venues]}; catalog ranks and finds loose names")
+
+        engine.dispose()
+        print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_venue_text_search()
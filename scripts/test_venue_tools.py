@@ -0,0 +1,141 @@
+import asyncio
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+os.environ["SEARCH_CACHE_ENABLED"] = "false"
+
+import agent.venue_tools as venue_tools
+from agent.venue_tools import VENUE_NEARBY_RADIUS_KM, VenueRequest, parse_venue_request
+
+VOCABULARY = {
+    "amenities": ["Parking", "Wi-Fi", "Swimming Pool", "AC"],
+    "event_types": ["Wedding", "Conference"],
+    "purposes": ["Team Offsite", "Birthday"],
+}
+
+
+def venue(venue_id):
+    return {"venue_id": venue_id, "name": f"Venue {venue_id}", "location": "Somewhere", "capacity": 100,
+            "price_per_day": 50000.0, "event_types": [], "purposes": [], "amenities": [], "has_veg": True,
+            "has_non_veg": False, "available_dates": [], "contact_number": "-", "description": ""}
+
+
+class FakeCatalog:
+    """Answers by location set or radius search; records every search."""
+
+    def __init__(self, by_locations=None, around=None, fail=False):
+        self.by_locations = by_locations or {}
+        self.around = around or {}
+        self.fail = fail
+        self.searches = []
+
+    def search(self, locations, near=None, radius_km=None, **filters):
+        self.searches.append((tuple(locations), radius_km))
+        if self.fail:
+            raise RuntimeError("database is locked")
+        if near is not None:
+            return [venue(i) for i in range(self.around.get(radius_km, 0))]
+        return [venue(i) for i in range(self.by_locations.get(tuple(locations), 0))]
+
+    async def asearch(self, locations, **kwargs):
+        return self.search(locations, **kwargs)
+
+
+def matches(catalog, request):
+    """Run the sync and async fallback chains; both must make the same searches and agree."""
+    venue_tools.get_venue_catalog = lambda: catalog
+    with redirect_stdout(io.StringIO()):
+        venues = venue_tools._catalog_matches(request)
+        searches, catalog.searches = catalog.searches, []
+        avenues = asyncio.run(venue_tools._acatalog_matches(request))
+    assert catalog.searches == searches and len(avenues) == len(venues), (searches, catalog.searches)
+    return len(venues), searches
+
+
+def test_venue_tools():
+    """Request parsing (place, capacity, budget, radius, food, vocabulary) and the catalog fallback chain."""
+    # Test 1: A full request
+    print("Test 1: Parsing a venue request...")
+    request = parse_venue_request("Wedding venue in Bandra for 200 guests under 5 lakhs with parking, WiFi and a "
+                                  "swimming pools, veg only, next weekend", VOCABULARY)
+    assert request.locations == ["Bandra"] and request.nearby == ["Mumbai"] and request.point is not None
+    assert request.min_capacity == 200 and request.max_price == 500000 and request.radius_km is None
+    assert request.amenities == ["Parking", "Wi-Fi", "Swimming Pool"] and request.event_types == ["Wedding"]
+    assert request.veg and not request.non_veg and request.period is not None
+    print(f"✓ {request.describe()}")
+
+    # Test 2: Capacity, budget and radius variants
+    print("\nTest 2: Regex variants...")
+    cases = {
+        "team offsite within 15 km of Pune, budget 80k, non-veg": dict(radius_km=15.0, max_price=80000, non_veg=True, veg=False),
+        "hall with capacity of 1,500 up to rs. 1.5 lakh": dict(min_capacity=1500, max_price=150000),
+        "300+ pax conference in Goa below ₹2 cr": dict(min_capacity=300, max_price=2e7),
+        "birthday party under 20000 within a 5 km radius of Juhu": dict(max_price=20000, radius_km=5.0),
+        "AC hall for 50 people in Pune": dict(min_capacity=50, max_price=None, radius_km=None),
+        "non vegetarian and vegetarian food": dict(veg=True, non_veg=True),
+    }
+    for text, expected in cases.items():
+        request = parse_venue_request(text, VOCABULARY)
+        actual = {key: getattr(request, key) for key in expected}
+        assert actual == expected, (text, actual)
+    request = parse_venue_request("team offsite within 15 km of Pune", VOCABULARY)
+    assert request.purposes == ["Team Offsite"] and request.max_price is None  # "within 15" is the radius
+    assert parse_venue_request("a quiet hall", VOCABULARY).locations == []
+    print(f"✓ {len(cases) + 2} requests parsed")
+
+    get_catalog, get_search = venue_tools.get_venue_catalog, venue_tools.get_cached_search
+    try:
+        bandra = parse_venue_request("hall in Bandra", VOCABULARY)
+        pune = parse_venue_request("hall in Pune", VOCABULARY)
+        # Test 3: Fallback chain
+        print("\nTest 3: Catalog fallback chain...")
+        name, with_city = ("Bandra",), ("Bandra", "Mumbai")
+        around = (), VENUE_NEARBY_RADIUS_KM
+        assert matches(FakeCatalog({name: 3}), bandra) == (3, [(name, None)])
+        assert matches(FakeCatalog({name: 1, with_city: 4}), bandra) == (4, [(name, None), (with_city, None)])
+        assert matches(FakeCatalog({name: 1, with_city: 2}, {VENUE_NEARBY_RADIUS_KM: 5}), bandra) == (
+            5, [(name, None), (with_city, None), around])
+        assert matches(FakeCatalog({name: 1, with_city: 2}, {VENUE_NEARBY_RADIUS_KM: 1}), bandra)[0] == 2
+        assert matches(FakeCatalog({("Pune",): 1}, {VENUE_NEARBY_RADIUS_KM: 4}), pune) == (4, [(("Pune",), None), around])
+        print("✓ Place, then parent city, then the surrounding area; the larger answer wins")
+
+        # Test 4: Radius requests, no place and failures
+        print("\nTest 4: Radius searches and failures...")
+        request = parse_venue_request("hall within 10 km of Pune", VOCABULARY)
+        assert matches(FakeCatalog({("Pune",): 9}, {10.0: 2}), request) == (2, [((), 10.0)])
+        assert matches(FakeCatalog({("Pune",): 9}), VenueRequest()) == (0, [])
+        assert matches(FakeCatalog(fail=True), pune) == (0, [(("Pune",), None)])
+        print("✓ Radius requests search around the place only; catalog errors give no matches")
+
+        # Test 5: Catalog answers vs web fallback
+        print("\nTest 5: Catalog vs web answers...")
+
+        class FakeSearch:
+            def run(self, query, category="general"):
+                return f"web results for {query}"
+
+        venue_tools.get_cached_search = lambda: FakeSearch()
+        venue_tools.parse_venue_request = lambda text: parse_venue_request(text, VOCABULARY)
+        venue_tools.get_venue_catalog = lambda: FakeCatalog({("Pune",): 3})
+        with redirect_stdout(io.StringIO()):
+            answer = venue_tools.search_venues("hall in Pune")
+            assert answer.startswith("Found 3 venues in the VenueAI catalog for Pune") and "web results" not in answer
+            venue_tools.get_venue_catalog = lambda: FakeCatalog({("Pune",): 1})
+            answer = venue_tools.search_venues("hall in Pune")
+        assert answer.startswith("Found 1 venue in") and answer.endswith("Web search results:\nweb results for hall in Pune")
+        print("✓ Enough catalog matches skip the web search; too few are listed above the web results")
+    finally:
+        venue_tools.get_venue_catalog, venue_tools.get_cached_search = get_catalog, get_search
+        venue_tools.parse_venue_request = parse_venue_request
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_venue_tools()
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import numpy as np
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+import models.venue_vectors as venue_vectors
+from models.database import Base, Venue, create_async_venue_engine, create_venue_engine
+from models.venue_catalog import VenueCatalog
+from models.venue_models import VenueSearchCriteria
+from models.venue_search import search_venue_page
+from models.venue_snapshot import VenueSnapshot
+from models.venue_vectors import VenueVectorIndex, features, venue_documents
+from scripts.benchmark_venue_search import populate_synthetic_catalog
+
+VENUES = [
+    ("T001", "Misty Hills Retreat", "Lonavla", "Quiet getaway with cottages for corporate teams"),
+    ("T002", "Royal Banquets", "Lonavla", "Elegant banquet hall with grand chandeliers"),
+    ("T003", "Tech Park Convention Centre", "Pune", "Conference rooms with projectors and a boardroom"),
+    ("T004", "Sunset Lawns", "Lonavla", "Open air garden for birthday celebrations"),
+    ("T005", "Harbour Cafe", "Mumbai", "Coffee shop by the sea"),
+]
+LONAVLA, PUNE, MUMBAI = (18.75, 73.40), (18.52, 73.86), (19.08, 72.88)
+
+
+def top_ids(index, query, k=3):
+    return [row_id for row_id, _ in index.search([query], k, min_score=0.05)[0]]
+
+
+def venue_ids(Session, row_ids):
+    with Session() as db:
+        return [db.get(Venue, row_id).venue_id for row_id in row_ids]
+
+
+def test_venue_vectors():
+    """Synonym matching, top-k vs brute force, incremental changes, the saved (mmap) index and the search paths."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_venue_engine(f"sqlite:///{os.path.join(tmp, 'venues_test.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as db:
+            for venue_id, name, location, description in VENUES:
+                db.add(Venue(venue_id=venue_id, name=name, location=location, description=description, capacity=100,
+                             price_per_day=100000, contact_number="9876543210", has_veg=True, has_non_veg=True))
+            db.commit()
+        index = VenueVectorIndex.build(Session, sync_seconds=0)
+
+        # Test 1: Meaning beyond shared words
+        print("Test 1: Synonym matching...")
+        assert "c:offsite" in features("Team offsites") and "c:banquet" in features("a reception hall")
+        assert venue_ids(Session, top_ids(index, "team offsite")[:1]) == ["T001"]
+        assert venue_ids(Session, top_ids(index, "reception hall")[:1]) == ["T002"]
+        assert venue_ids(Session, top_ids(index, "summit with audio visual")[:1]) == ["T003"]
+        assert venue_ids(Session, top_ids(index, "outdoor party")[:1]) == ["T004"]
+        assert top_ids(index, "the venues near") == []
+        print("✓ offsite -> retreat, reception hall -> banquet, summit -> conference, outdoor party -> lawns")
+
+        # Test 2: Incremental changes from the change log
+        print("\nTest 2: Incremental changes...")
+        with Session() as db:
+            db.execute(update(Venue).where(Venue.venue_id == "T005").values(description="Rooftop wedding venue"))
+            db.execute(delete(Venue).where(Venue.venue_id == "T001"))
+            db.add(Venue(venue_id="T006", name="Forest Hideaway", location="Lonavla", description="Team retreat stays",
+                         capacity=80, price_per_day=90000, contact_number="9876543210", has_veg=True, has_non_veg=False))
+            db.commit()
+        assert venue_ids(Session, top_ids(index, "marriage ceremony")[:1]) == ["T005"]
+        assert venue_ids(Session, top_ids(index, "team offsite")[:1]) == ["T006"]
+        assert len(index) == 5 and index.stats()["added_venues"] == 2 and index.full_builds == 1, index.stats()
+        ids, vectors = index.vectors()
+        with Session() as db:
+            expected_ids, texts = venue_documents(db)
+        assert ids.tolist() == expected_ids and np.allclose(vectors, index.encoder.encode(texts))
+        print(f"✓ update, delete and insert applied without a rebuild ({index.stats()})")
+
+        # Test 3: API search (SQL and snapshot) and catalog
+        print("\nTest 3: /api/venue/search and catalog...")
+        criteria = VenueSearchCriteria(query="corporate offsite", semantic=True, location="lonavla")
+        sql = search_venue_page(criteria, Session, vectors=index)
+        snapshot = search_venue_page(criteria, Session, snapshot=VenueSnapshot(Session), vectors=index)
+        assert sql == snapshot and [v.venue_id for v in sql.venues][:1] == ["T006"], sql
+        keywords = search_venue_page(VenueSearchCriteria(query="corporate offsite", location="lonavla"), Session)
+        assert keywords.total_count == 0  # no venue uses those words
+        nothing = VenueSearchCriteria(query="xyzzy", semantic=True)
+        assert search_venue_page(nothing, Session, vectors=index).total_count == 0
+        catalog = VenueCatalog(Session, vectors=index)
+        assert [v["venue_id"] for v in catalog.search(["lonavla"], text="wedding reception", semantic=True)][0] == "T002"
+        assert len(catalog.search(["lonavla"], text="wedding reception", semantic=True)) == 3
+        print(f"✓ semantic matches {[v.name for v in sql.venues]}; keywords match none")
+
+        # Test 4: Semantic ranking within a radius
+        print("\nTest 4: near + semantic...")
+        coordinates = {"T004": (18.755, 73.405), "T006": (18.78, 73.40), "T002": (18.80, 73.40),
+                       "T003": PUNE, "T005": MUMBAI}  # T005 is a wedding venue, but 65 km away
+        with Session() as db:
+            for venue_id, (latitude, longitude) in coordinates.items():
+                db.execute(update(Venue).where(Venue.venue_id == venue_id).values(latitude=latitude, longitude=longitude))
+            db.commit()
+        filters = dict(text="wedding reception", semantic=True, near=LONAVLA, radius_km=10)
+        found = catalog.search((), **filters)
+        assert [v["venue_id"] for v in found] == ["T002", "T004", "T006"], found  # best match, then nearest first
+        assert [v["distance_km"] for v in found] == [5.6, 0.8, 3.3], found
+        nearest = catalog.search((), near=LONAVLA, radius_km=10)
+        assert [v["venue_id"] for v in nearest] == ["T004", "T006", "T002"]
+        async_engine = create_async_venue_engine(f"sqlite:///{os.path.join(tmp, 'venues_test.db')}")
+
+        async def run_async():
+            try:
+                return await VenueCatalog(Session, async_sessionmaker(async_engine, expire_on_commit=False),
+                                          vectors=index).asearch((), **filters)
+            finally:
+                await async_engine.dispose()
+
+        assert asyncio.run(run_async()) == found
+        print(f"✓ {[(v['name'], v['distance_km']) for v in found]}; the wedding venue outside the radius is left out")
+        engine.dispose()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_venue_engine(f"sqlite:///{os.path.join(tmp, 'venues_test.db')}")
+        populate_synthetic_catalog(engine, 3000)
+        Session = sessionmaker(bind=engine)
+        index = VenueVectorIndex.build(Session, sync_seconds=3600)
+
+        # Test 5: Blocked top-k vs brute force
+        print("\nTest 5: Top-k vs brute force...")
+        venue_vectors.SEARCH_BLOCK_ROWS = 700  # several blocks
+        queries = ["team offsite in goa with pool", "wedding reception", "seminar with wifi and av", "spa"]
+        ids, vectors = index.vectors()
+        scores = vectors @ index.encoder.encode(queries).T
+        candidates = ids[::3]
+        for results, column in zip(index.search(queries, k=25), scores.T):
+            assert np.allclose([s for _, s in results], np.sort(column)[::-1][:25], atol=1e-5)
+            assert all(abs(column[np.searchsorted(ids, row_id)] - s) < 1e-5 for row_id, s in results)
+        for results, column in zip(index.search(queries, k=10, candidates=candidates), scores.T):
+            assert np.allclose([s for _, s in results], np.sort(column[::3])[::-1][:10], atol=1e-5)
+            assert set(row_id for row_id, _ in results) <= set(candidates.tolist())
+        venue_vectors.SEARCH_BLOCK_ROWS = 16384
+        print(f"✓ {len(queries)} batched queries matched brute force over {len(index)} venues")
+
+        # Test 6: Saved index is memory-mapped and answers the same
+        print("\nTest 6: Save and load...")
+        index.add([1, 999999], ["Lakeside retreat with cottages", "Brand new rooftop ballroom"])
+        index.save(os.path.join(tmp, "vectors"), "test")
+        loaded = VenueVectorIndex.load(os.path.join(tmp, "vectors"), sync_seconds=3600)
+        assert isinstance(loaded._state[1], np.memmap) and loaded.source == "test" and len(loaded) == len(index)
+        assert loaded.search(queries + ["ballroom"], k=5) == index.search(queries + ["ballroom"], k=5)
+        assert VenueVectorIndex.load(os.path.join(tmp, "missing")) is None
+        print(f"✓ {len(loaded)} vectors reloaded with mmap, same results")
+        engine.dispose()
+
+    print("\n✓ All tests completed successfully!")
+
+
+if __name__ == "__main__":
+    test_venue_vectors()
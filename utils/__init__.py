@@ -0,0 +1,3 @@
+"""
+Utilities package for the VenueAI application.
+"""
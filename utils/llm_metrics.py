@@ -0,0 +1,74 @@
+"""
+Per-request LLM call counting.
+
+count_llm_calls() installs an LLMCallCounter for the current context; LangChain
+attaches it to every LLM run started inside the block (direct invokes, agent
+steps, streams), including runs started from asyncio tasks spawned within it.
+Calls are tallied by run name, so pass config={"run_name": ...} to label them.
+"""
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+# Totals across all requests since process start
+LLM_CALL_STATS = {"requests": 0, "llm_calls": 0}
+_stats_lock = threading.Lock()
+
+
+class LLMCallCounter(BaseCallbackHandler):
+    """Callback handler that counts LLM and chat model runs."""
+
+    run_inline = True
+
+    def __init__(self):
+        self.total = 0
+        self.by_name = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, serialized, kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name") or "llm"
+        with self._lock:
+            self.total += 1
+            self.by_name[name] += 1
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self._count(serialized, kwargs)
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self._count(serialized, kwargs)
+
+    def summary(self) -> str:
+        breakdown = ", ".join(f"{name}={count}" for name, count in sorted(self.by_name.items()))
+        return f"{self.total} LLM calls ({breakdown})" if breakdown else "0 LLM calls"
+
+
+_llm_call_counter: ContextVar[Optional[LLMCallCounter]] = ContextVar("llm_call_counter", default=None)
+register_configure_hook(_llm_call_counter, inheritable=True)
+
+
+@contextmanager
+def count_llm_calls():
+    """Count the LLM calls made inside the block. Yields the LLMCallCounter."""
+    counter = LLMCallCounter()
+    token = _llm_call_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _llm_call_counter.reset(token)
+        with _stats_lock:
+            LLM_CALL_STATS["requests"] += 1
+            LLM_CALL_STATS["llm_calls"] += counter.total
+
+
+def llm_call_stats() -> dict:
+    with _stats_lock:
+        requests = LLM_CALL_STATS["requests"]
+        return {
+            **LLM_CALL_STATS,
+            "avg_llm_calls_per_request": round(LLM_CALL_STATS["llm_calls"] / requests, 2) if requests else 0.0,
+        }
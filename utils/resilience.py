@@ -0,0 +1,463 @@
+"""
+Resilient calls to upstream services (Serper search, Gemini).
+
+Every call to an upstream goes through a ResilientCaller, which adds:
+- a per-attempt timeout,
+- retries with full-jitter exponential backoff, limited by a retry budget so a
+  failing upstream is not hit with a retry storm,
+- a circuit breaker per upstream that fails fast while the upstream is down and
+  lets a single probe through after a cool-down,
+- optional hedging: if an attempt has not answered after hedge_after seconds, a
+  duplicate is started and the first success wins.
+
+Policies are read from the environment per call name, e.g. SERPER_TIMEOUT_SECONDS,
+SERPER_MAX_ATTEMPTS, SERPER_HEDGE_AFTER_SECONDS, SERPER_BREAKER_THRESHOLD and
+SERPER_BREAKER_RESET_SECONDS (LLM_* for Gemini).
+
+Only transient errors are retried and counted against the breaker: timeouts,
+connection errors, HTTP 429 and 5xx. Anything else (auth, other 4xx, invalid
+arguments, validation errors) is re-raised at once.
+
+Sync calls run on a shared thread pool so they can be timed out. A timed-out
+call keeps running in the background until the client's own timeout ends it,
+so upstream clients should also be given a request timeout.
+"""
+import asyncio
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import aiohttp
+import requests
+from langchain_core.language_models.chat_models import BaseChatModel
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the upstream while its circuit breaker is open."""
+
+
+class UpstreamTimeout(TimeoutError):
+    pass
+
+
+_TRANSIENT_ERRORS = (TimeoutError, ConnectionError, requests.Timeout, requests.ConnectionError,
+                     aiohttp.ClientConnectionError)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP status of an upstream error: requests/httpx (response.status_code), aiohttp (status) or
+    google.api_core (code)."""
+    for value in (getattr(getattr(error, "response", None), "status_code", None),
+                  getattr(error, "status", None), getattr(error, "code", None)):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether a failed call is worth retrying: a timeout, a connection error, HTTP 429 or a 5xx."""
+    while error is not None:
+        if isinstance(error, _TRANSIENT_ERRORS):
+            return True
+        status = _status_code(error)
+        if status is not None:
+            return status == 429 or 500 <= status < 600
+        error = error.__cause__
+    return False
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures; after reset_timeout one probe call is let through."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+                return True
+            return self.state == self.CLOSED
+
+    def release(self) -> None:
+        """End a call that says nothing about upstream health, freeing the half-open probe slot."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                if self.state != self.OPEN:
+                    self.opened += 1
+                    logger.warning("Circuit breaker for %s opened after %d failures", self.name, self.failures)
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures, "times_opened": self.opened}
+
+
+class RetryBudget:
+    """Caps retries at a fraction of traffic: each call deposits ratio tokens, each retry spends one.
+
+    A slow refill keeps a few retries available at low traffic; max_tokens bounds bursts.
+    """
+
+    def __init__(self, ratio: float = 0.2, refill_per_second: float = 0.1, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.refill_per_second = refill_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, amount: float = 0.0) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + amount + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def record_call(self) -> None:
+        with self._lock:
+            self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+@dataclass
+class ResiliencePolicy:
+    timeout: Optional[float] = 30.0
+    max_attempts: int = 2
+    backoff_base: float = 0.2
+    backoff_max: float = 2.0
+    hedge_after: Optional[float] = None  # None disables hedging
+
+    @classmethod
+    def from_env(cls, prefix: str, **defaults) -> "ResiliencePolicy":
+        def number(name, default, cast=float):
+            value = os.getenv(f"{prefix}_{name}")
+            if value is None or value == "":
+                return default
+            return None if value.lower() in ("none", "off") else cast(value)
+
+        policy = cls(**defaults)
+        return cls(
+            timeout=number("TIMEOUT_SECONDS", policy.timeout),
+            max_attempts=number("MAX_ATTEMPTS", policy.max_attempts, int),
+            backoff_base=number("BACKOFF_SECONDS", policy.backoff_base),
+            backoff_max=policy.backoff_max,
+            hedge_after=number("HEDGE_AFTER_SECONDS", policy.hedge_after),
+        )
+
+
+# Sync attempts run here so they can be timed out and hedged
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv("RESILIENCE_THREADS", "32")), thread_name_prefix="resilient")
+
+
+class ResilientCaller:
+    def __init__(self, name: str, policy: ResiliencePolicy, breaker: CircuitBreaker, budget: Optional[RetryBudget] = None):
+        self.name = name
+        self.policy = policy
+        self.breaker = breaker
+        self.budget = budget or RetryBudget()
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[key] += amount
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.policy.backoff_max, self.policy.backoff_base * 2 ** attempt))
+
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError(f"{self.breaker.name} is unavailable (circuit open)")
+
+    def _record_error(self, error: Exception) -> bool:
+        """Count a failed attempt; only transient errors count against the breaker. Returns whether it was transient."""
+        if not is_transient_error(error):
+            self.breaker.release()
+            self._count("non_retryable")
+            return False
+        self.breaker.record_failure()
+        self._count("failures")
+        if isinstance(error, UpstreamTimeout):
+            self._count("timeouts")
+        return True
+
+    def _should_retry(self, attempt: int, error: Exception) -> bool:
+        if not self._record_error(error):
+            return False
+        if attempt >= self.policy.max_attempts or not self.budget.try_spend():
+            return False
+        self._count("retries")
+        logger.warning("%s call failed (%s: %s); retry %d/%d", self.name, type(error).__name__, error,
+                       attempt, self.policy.max_attempts - 1)
+        return True
+
+    def _succeeded(self) -> None:
+        self.breaker.record_success()
+        self._count("successes")
+
+    # --- sync ---
+    def _submit(self, fn, args, kwargs):
+        context = contextvars.copy_context()
+        return _executor.submit(context.run, fn, *args, **kwargs)
+
+    def _next_wait(self, elapsed: float, hedging: bool) -> Optional[float]:
+        """Seconds until the attempt times out or the hedge is due, whichever is first."""
+        waits = []
+        if self.policy.timeout is not None:
+            waits.append(self.policy.timeout - elapsed)
+        if hedging:
+            waits.append(self.policy.hedge_after - elapsed)
+        return max(0.0, min(waits)) if waits else None
+
+    def _settled(self, attempts) -> tuple:
+        """(done, result) from the first successful attempt; raises if every attempt failed."""
+        for i, attempt in enumerate(attempts):
+            if attempt.done() and attempt.exception() is None:
+                if i > 0:
+                    self._count("hedge_wins")
+                return True, attempt.result()
+        if all(attempt.done() for attempt in attempts):
+            raise attempts[0].exception()
+        return False, None
+
+    def _attempt(self, fn, args, kwargs):
+        if self.policy.timeout is None and self.policy.hedge_after is None:
+            return fn(*args, **kwargs)
+        start = time.monotonic()
+        attempts = [self._submit(fn, args, kwargs)]
+        while True:
+            done, result = self._settled(attempts)
+            if done:
+                return result
+            elapsed = time.monotonic() - start
+            if self.policy.timeout is not None and elapsed >= self.policy.timeout:
+                raise UpstreamTimeout(f"{self.name} call timed out after {self.policy.timeout}s")
+            hedging = self.policy.hedge_after is not None and len(attempts) == 1
+            if hedging and elapsed >= self.policy.hedge_after:
+                self._count("hedges")
+                attempts.append(self._submit(fn, args, kwargs))
+                continue
+            wait([a for a in attempts if not a.done()], timeout=self._next_wait(elapsed, hedging), return_when=FIRST_COMPLETED)
+
+    def call(self, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs) with timeout, hedging, retries and the circuit breaker."""
+        self._count("calls")
+        self.budget.record_call()
+        attempt = 0
+        while True:
+            self._admit()
+            attempt += 1
+            try:
+                result = self._attempt(fn, args, kwargs)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            self._succeeded()
+            return result
+
+    def stream(self, fn, *args, **kwargs):
+        """Iterate a sync generator; only the circuit breaker applies (chunks cannot be replayed)."""
+        self._count("calls")
+        self._admit()
+        try:
+            yield from fn(*args, **kwargs)
+        except Exception as e:
+            self._record_error(e)
+            raise
+        self._succeeded()
+
+    # --- async ---
+    async def _aattempt(self, fn, args, kwargs):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        attempts = [asyncio.ensure_future(fn(*args, **kwargs))]
+        try:
+            while True:
+                done, result = self._settled(attempts)
+                if done:
+                    return result
+                elapsed = loop.time() - start
+                if self.policy.timeout is not None and elapsed >= self.policy.timeout:
+                    raise UpstreamTimeout(f"{self.name} call timed out after {self.policy.timeout}s")
+                hedging = self.policy.hedge_after is not None and len(attempts) == 1
+                if hedging and elapsed >= self.policy.hedge_after:
+                    self._count("hedges")
+                    attempts.append(asyncio.ensure_future(fn(*args, **kwargs)))
+                    continue
+                await asyncio.wait([a for a in attempts if not a.done()], timeout=self._next_wait(elapsed, hedging),
+                                   return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def acall(self, fn, *args, **kwargs):
+        """Async variant of call; fn returns an awaitable."""
+        self._count("calls")
+        self.budget.record_call()
+        attempt = 0
+        while True:
+            self._admit()
+            attempt += 1
+            try:
+                result = await self._aattempt(fn, args, kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            self._succeeded()
+            return result
+
+    async def astream(self, fn, *args, **kwargs):
+        """Iterate an async generator. The timeout and retries apply until the first chunk arrives."""
+        self._count("calls")
+        self.budget.record_call()
+        attempt = 0
+        while True:
+            self._admit()
+            attempt += 1
+            iterator = fn(*args, **kwargs).__aiter__()
+            try:
+                first = await asyncio.wait_for(iterator.__anext__(), self.policy.timeout)
+                break
+            except StopAsyncIteration:
+                self._succeeded()
+                return
+            except asyncio.TimeoutError:
+                error = UpstreamTimeout(f"{self.name} stream produced nothing within {self.policy.timeout}s")
+            except Exception as e:
+                error = e
+            await iterator.aclose()
+            if not self._should_retry(attempt, error):
+                raise error
+            await asyncio.sleep(self._backoff(attempt))
+        try:
+            yield first
+            async for chunk in iterator:
+                yield chunk
+        except Exception as e:
+            self._record_error(e)
+            raise
+        self._succeeded()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+        return {**counts, "policy": vars(self.policy), "breaker": self.breaker.snapshot()}
+
+
+class ResilientChatModel(BaseChatModel):
+    """Chat model that routes every generation of the wrapped model through a ResilientCaller.
+
+    Being a chat model itself, it also covers calls made by agents and chains built on it.
+    """
+
+    inner: BaseChatModel
+    caller: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return self.inner._llm_type
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return self.inner._identifying_params
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self.caller.call(self.inner._generate, messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return await self.caller.acall(self.inner._agenerate, messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    # Token callbacks for streamed chunks are fired by this model, so the inner one gets no run manager
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        yield from self.caller.stream(self.inner._stream, messages, stop=stop, **kwargs)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        async for chunk in self.caller.astream(self.inner._astream, messages, stop=stop, **kwargs):
+            yield chunk
+
+
+# Default policies per call name; overridable with <NAME>_* environment variables
+_DEFAULT_POLICIES = {
+    "serper": {"timeout": 10.0, "max_attempts": 3, "backoff_base": 0.3},
+    "llm": {"timeout": 60.0, "max_attempts": 2, "backoff_base": 1.0},
+}
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_callers: Dict[str, ResilientCaller] = {}
+_registry_lock = threading.Lock()
+
+
+def get_resilient_caller(name: str) -> ResilientCaller:
+    """Process-wide caller for an upstream ("serper", "llm"), configured from the environment."""
+    caller = _callers.get(name)
+    if caller is None:
+        with _registry_lock:
+            caller = _callers.get(name)
+            if caller is None:
+                prefix = name.upper()
+                breaker = CircuitBreaker(
+                    name,
+                    failure_threshold=int(os.getenv(f"{prefix}_BREAKER_THRESHOLD", "5")),
+                    reset_timeout=float(os.getenv(f"{prefix}_BREAKER_RESET_SECONDS", "30")),
+                )
+                policy = ResiliencePolicy.from_env(prefix, **_DEFAULT_POLICIES.get(name, {}))
+                caller = _callers[name] = ResilientCaller(name, policy, _breakers.setdefault(name, breaker))
+    return caller
+
+
+def resilient_llm(llm: BaseChatModel) -> ResilientChatModel:
+    return ResilientChatModel(inner=llm, caller=get_resilient_caller("llm"))
+
+
+def resilience_stats() -> Dict[str, dict]:
+    return {name: caller.stats() for name, caller in _callers.items()}
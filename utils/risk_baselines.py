@@ -0,0 +1,95 @@
+"""
+Precomputed city-level risk baselines.
+
+scripts/precompute_risk_baselines.py periodically writes a baseline risk
+report and category scores for each configured city. The live risk path reads
+them here: a generic city assessment is served straight from a fresh baseline,
+and venue assessments reuse it for the location-level categories instead of
+searching again. Locations are keyed with the planner's location_key(), so a
+baseline is found for every spelling the live path would share searches for.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from agent.risk_planner import location_key
+from utils.sqlite import enable_wal, sqlite_connection
+
+# Baselines older than this are ignored by the live path
+RISK_BASELINE_MAX_AGE_SECONDS = int(os.getenv("RISK_BASELINE_MAX_AGE_SECONDS", str(24 * 60 * 60)))
+
+
+class RiskBaselineStore:
+    """SQLite table of the latest baseline per location."""
+
+    def __init__(self, db_path: str = "risk_baselines.db"):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        enable_wal(db_path)
+        with sqlite_connection(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS risk_baselines ("
+                "location_key TEXT PRIMARY KEY, location TEXT NOT NULL, report TEXT NOT NULL, "
+                "scores TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def get(self, location: str, max_age_seconds: Optional[int] = None) -> Optional[Dict]:
+        """Latest baseline for location if younger than max_age_seconds, else None."""
+        max_age_seconds = RISK_BASELINE_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+        with sqlite_connection(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT location, report, scores, created_at FROM risk_baselines WHERE location_key = ? AND created_at > ?",
+                (location_key(location), time.time() - max_age_seconds),
+            ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return {"location": row[0], "report": row[1], "scores": json.loads(row[2]), "created_at": row[3]}
+
+    def set(self, location: str, report: str, scores: Dict[str, float]) -> Dict:
+        entry = {"location": location, "report": report, "scores": scores, "created_at": time.time()}
+        with sqlite_connection(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO risk_baselines (location_key, location, report, scores, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (location_key(location), location, report, json.dumps(scores), entry["created_at"]),
+            )
+        return entry
+
+    def list(self) -> List[Dict]:
+        with sqlite_connection(self.db_path) as conn:
+            rows = conn.execute("SELECT location, created_at FROM risk_baselines ORDER BY location").fetchall()
+        now = time.time()
+        return [{"location": location, "age_seconds": round(now - created_at)} for location, created_at in rows]
+
+    def stats(self) -> dict:
+        baselines = self.list()
+        with self._lock:
+            return {
+                "locations": len(baselines),
+                "fresh": sum(1 for b in baselines if b["age_seconds"] < RISK_BASELINE_MAX_AGE_SECONDS),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_risk_baseline_store: Optional[RiskBaselineStore] = None
+_init_lock = threading.Lock()
+
+
+def get_risk_baseline_store() -> Optional[RiskBaselineStore]:
+    """Process-wide store configured by RISK_BASELINES_ENABLED and RISK_BASELINE_PATH."""
+    global _risk_baseline_store
+    if os.getenv("RISK_BASELINES_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _risk_baseline_store is None:
+        with _init_lock:
+            if _risk_baseline_store is None:
+                _risk_baseline_store = RiskBaselineStore(os.getenv("RISK_BASELINE_PATH", "risk_baselines.db"))
+    return _risk_baseline_store
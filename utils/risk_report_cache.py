@@ -0,0 +1,124 @@
+"""
+Persistent cache of per-venue risk reports.
+
+A risk report for a venue is reused while it is fresh, whoever asked for it.
+Entries are keyed on the report kind (single-venue or batch section), the
+canonical venue identity (normalized name and location) and a time bucket.
+The bucket is the absolute date range a phrase such as "next week" means today
+(utils/time_expressions.py), so "next week" asked on Monday and on Tuesday, or
+"19-25 October", share an entry. Reports go stale after
+RISK_REPORT_CACHE_TTL_SECONDS. Async callers use aget/aset, which run the
+SQLite I/O in a worker thread.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import date
+from typing import Optional
+
+from utils.sqlite import enable_wal, sqlite_connection
+from utils.time_expressions import parse_time_expression
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", (text or "").lower()).split())
+
+
+def time_bucket(time_period: str, today: Optional[date] = None) -> str:
+    """Resolve a time phrase to the absolute date range it refers to; unrecognized phrases are kept normalized."""
+    phrase = _normalize(time_period)
+    if not phrase:
+        return "unspecified"
+    period = parse_time_expression(time_period, today)
+    return period.key if period else phrase
+
+
+class RiskReportCache:
+    """SQLite-backed TTL cache of JSON risk report entries."""
+
+    def __init__(self, db_path: str = "risk_reports.db", ttl_seconds: int = 3 * 60 * 60):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        enable_wal(db_path)
+        with sqlite_connection(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS risk_reports ("
+                "key TEXT PRIMARY KEY, kind TEXT NOT NULL, venue TEXT NOT NULL, location TEXT NOT NULL, "
+                "time_bucket TEXT NOT NULL, report TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_risk_reports_created_at ON risk_reports (created_at)")
+
+    @staticmethod
+    def make_key(kind: str, venue_name: str, location: str, time_period: str) -> str:
+        parts = (kind, _normalize(venue_name), _normalize(location), time_bucket(time_period))
+        return hashlib.sha1("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, kind: str, venue_name: str, location: str, time_period: str = "") -> Optional[dict]:
+        key = self.make_key(kind, venue_name, location, time_period)
+        with sqlite_connection(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT report FROM risk_reports WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, kind: str, venue_name: str, location: str, time_period: str, report: dict) -> None:
+        now = time.time()
+        with sqlite_connection(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO risk_reports (key, kind, venue, location, time_bucket, report, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(kind, venue_name, location, time_period), kind, _normalize(venue_name),
+                 _normalize(location), time_bucket(time_period), json.dumps(report), now),
+            )
+            conn.execute("DELETE FROM risk_reports WHERE created_at <= ?", (now - self.ttl_seconds,))
+
+    async def aget(self, kind: str, venue_name: str, location: str, time_period: str = "") -> Optional[dict]:
+        return await asyncio.to_thread(self.get, kind, venue_name, location, time_period)
+
+    async def aset(self, kind: str, venue_name: str, location: str, time_period: str, report: dict) -> None:
+        await asyncio.to_thread(self.set, kind, venue_name, location, time_period, report)
+
+    def stats(self) -> dict:
+        with sqlite_connection(self.db_path) as conn:
+            (entries,) = conn.execute("SELECT COUNT(*) FROM risk_reports").fetchone()
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_risk_report_cache: Optional[RiskReportCache] = None
+_init_lock = threading.Lock()
+
+
+def get_risk_report_cache() -> Optional[RiskReportCache]:
+    """Process-wide cache configured by RISK_REPORT_CACHE_ENABLED, RISK_REPORT_CACHE_PATH and RISK_REPORT_CACHE_TTL_SECONDS."""
+    global _risk_report_cache
+    if os.getenv("RISK_REPORT_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _risk_report_cache is None:
+        with _init_lock:
+            if _risk_report_cache is None:
+                _risk_report_cache = RiskReportCache(
+                    db_path=os.getenv("RISK_REPORT_CACHE_PATH", "risk_reports.db"),
+                    ttl_seconds=int(os.getenv("RISK_REPORT_CACHE_TTL_SECONDS", str(3 * 60 * 60))),
+                )
+    return _risk_report_cache
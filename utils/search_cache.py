@@ -0,0 +1,243 @@
+"""
+Persistent TTL cache for web search (Serper) results.
+
+Results are stored in SQLite keyed on the normalized query, so they survive
+restarts and are shared by all workers. Each search category has its own
+expiry (weather goes stale in an hour, venue listings last a week). The table
+is size-bounded with least-recently-used eviction.
+
+Callers use get_cached_search(), a drop-in for GoogleSerperAPIWrapper whose
+run/arun take an extra category argument. arun does its cache I/O in a worker
+thread so the event loop is never blocked on SQLite. Only real results are
+cached: empty results and Serper's "no result" placeholder are retried next time.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from utils.sqlite import enable_wal, sqlite_connection
+
+# Seconds a cached result stays fresh, per search category
+SEARCH_CACHE_TTLS: Dict[str, int] = {
+    "weather": 60 * 60,
+    "logistics": 3 * 60 * 60,
+    "security": 6 * 60 * 60,
+    "health": 12 * 60 * 60,
+    "events": 12 * 60 * 60,
+    "location": 24 * 60 * 60,
+    "general": 24 * 60 * 60,
+    "venues": 7 * 24 * 60 * 60,
+}
+
+# Eviction runs every this many writes rather than on every insert
+_EVICTION_INTERVAL = 100
+
+# What GoogleSerperAPIWrapper returns when a search finds nothing
+NO_RESULT_MESSAGE = "No good Google Search Result was found"
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and strip surrounding punctuation."""
+    return re.sub(r"\s+", " ", query.lower()).strip(" \t\n.,;:!?\"'")
+
+
+def is_cacheable_result(result) -> bool:
+    """True for a non-empty search result; "no result" answers are not worth keeping for a whole TTL."""
+    return isinstance(result, str) and bool(result.strip()) and not result.startswith(NO_RESULT_MESSAGE)
+
+
+class SearchCache:
+    """SQLite-backed TTL cache for search results with LRU eviction past max_entries."""
+
+    def __init__(self, db_path: str = "search_cache.db", max_entries: int = 50000,
+                 ttls: Optional[Dict[str, int]] = None):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttls = {**SEARCH_CACHE_TTLS, **(ttls or {})}
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        enable_wal(db_path)
+        with sqlite_connection(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, category TEXT NOT NULL, query TEXT NOT NULL, result TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_search_cache_accessed_at ON search_cache (accessed_at)")
+
+    @staticmethod
+    def make_key(category: str, query: str) -> str:
+        return hashlib.sha1(f"{category}\x00{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+    def ttl_for(self, category: str) -> int:
+        return self.ttls.get(category, self.ttls["general"])
+
+    def get(self, category: str, query: str) -> Optional[str]:
+        key = self.make_key(category, query)
+        now = time.time()
+        with sqlite_connection(self.db_path) as conn:
+            row = conn.execute("SELECT result, expires_at FROM search_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] > now:
+                conn.execute("UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row is None or row[1] <= now:
+                self.misses[category] += 1
+                return None
+            self.hits[category] += 1
+        return row[0]
+
+    def set(self, category: str, query: str, result: str) -> None:
+        now = time.time()
+        with sqlite_connection(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, category, query, result, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.make_key(category, query), category, normalize_query(query), result,
+                 now + self.ttl_for(category), now),
+            )
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % _EVICTION_INTERVAL == 0
+        if evict:
+            self.evict()
+
+    async def aget(self, category: str, query: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, category, query)
+
+    async def aset(self, category: str, query: str, result: str) -> None:
+        await asyncio.to_thread(self.set, category, query, result)
+
+    def evict(self) -> int:
+        """Drop expired rows, then least recently used rows beyond max_entries. Returns rows removed."""
+        with sqlite_connection(self.db_path) as conn:
+            removed = conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            (count,) = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+            if count > self.max_entries:
+                removed += conn.execute(
+                    "DELETE FROM search_cache WHERE key IN ("
+                    "SELECT key FROM search_cache ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                ).rowcount
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def stats(self) -> dict:
+        with sqlite_connection(self.db_path) as conn:
+            (entries,) = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+        with self._lock:
+            hits, misses = sum(self.hits.values()), sum(self.misses.values())
+            return {
+                "entries": entries,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "evictions": self.evictions,
+                "by_category": {
+                    category: {"hits": self.hits[category], "misses": self.misses[category]}
+                    for category in sorted(set(self.hits) | set(self.misses))
+                },
+            }
+
+
+class CachedSearch:
+    """Wraps a search client (GoogleSerperAPIWrapper) with a SearchCache.
+
+    Cache misses go through caller (a ResilientCaller) when one is given.
+    """
+
+    def __init__(self, search, cache: Optional[SearchCache] = None, caller=None):
+        self.search = search
+        self.cache = cache
+        self.caller = caller
+
+    def _lookup(self, query, category):
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(category, query)
+        except Exception as e:
+            print(f"Search cache read failed: {e}")
+            return None
+
+    def _store(self, query, category, result):
+        if self.cache is None or not is_cacheable_result(result):
+            return
+        try:
+            self.cache.set(category, query, result)
+        except Exception as e:
+            print(f"Search cache write failed: {e}")
+
+    async def _alookup(self, query, category):
+        if self.cache is None:
+            return None
+        try:
+            return await self.cache.aget(category, query)
+        except Exception as e:
+            print(f"Search cache read failed: {e}")
+            return None
+
+    async def _astore(self, query, category, result):
+        if self.cache is None or not is_cacheable_result(result):
+            return
+        try:
+            await self.cache.aset(category, query, result)
+        except Exception as e:
+            print(f"Search cache write failed: {e}")
+
+    def run(self, query: str, category: str = "general") -> str:
+        cached = self._lookup(query, category)
+        if cached is not None:
+            return cached
+        result = self.caller.call(self.search.run, query) if self.caller else self.search.run(query)
+        self._store(query, category, result)
+        return result
+
+    async def arun(self, query: str, category: str = "general") -> str:
+        cached = await self._alookup(query, category)
+        if cached is not None:
+            return cached
+        result = await self.caller.acall(self.search.arun, query) if self.caller else await self.search.arun(query)
+        await self._astore(query, category, result)
+        return result
+
+
+_search_cache: Optional[SearchCache] = None
+_cached_search: Optional[CachedSearch] = None
+_init_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Process-wide cache configured by SEARCH_CACHE_ENABLED, SEARCH_CACHE_PATH and SEARCH_CACHE_MAX_ENTRIES."""
+    global _search_cache
+    if os.getenv("SEARCH_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _search_cache is None:
+        with _init_lock:
+            if _search_cache is None:
+                _search_cache = SearchCache(
+                    db_path=os.getenv("SEARCH_CACHE_PATH", "search_cache.db"),
+                    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "50000")),
+                )
+    return _search_cache
+
+
+def get_cached_search() -> CachedSearch:
+    """Process-wide Serper client with result caching and resilient upstream calls."""
+    global _cached_search
+    if _cached_search is None:
+        from utils.resilience import get_resilient_caller
+        from utils.serper import SerperSearch
+        cache = get_search_cache()
+        with _init_lock:
+            if _cached_search is None:
+                _cached_search = CachedSearch(SerperSearch(), cache, get_resilient_caller("serper"))
+    return _cached_search
@@ -0,0 +1,41 @@
+"""
+Serper search client with a configurable endpoint and request timeout.
+
+GoogleSerperAPIWrapper posts to a hardcoded https://google.serper.dev with no
+timeout. SERPER_BASE_URL points it elsewhere (a proxy, or the fake upstream in
+scripts/fake_upstream.py for resilience tests) and SERPER_REQUEST_TIMEOUT_SECONDS
+bounds each HTTP request.
+"""
+import os
+from typing import Any
+
+import aiohttp
+import requests
+from langchain_community.utilities import GoogleSerperAPIWrapper
+from pydantic import Field
+
+
+class SerperSearch(GoogleSerperAPIWrapper):
+    base_url: str = Field(default_factory=lambda: os.getenv("SERPER_BASE_URL", "https://google.serper.dev"))
+    request_timeout: float = Field(default_factory=lambda: float(os.getenv("SERPER_REQUEST_TIMEOUT_SECONDS", "15")))
+
+    def _request(self, search_term: str, search_type: str, kwargs: dict):
+        headers = {"X-API-KEY": self.serper_api_key or "", "Content-Type": "application/json"}
+        params = {"q": search_term, **{key: value for key, value in kwargs.items() if value is not None}}
+        return f"{self.base_url.rstrip('/')}/{search_type}", headers, params
+
+    def _google_serper_api_results(self, search_term: str, search_type: str = "search", **kwargs: Any) -> dict:
+        url, headers, params = self._request(search_term, search_type, kwargs)
+        response = requests.post(url, headers=headers, params=params, timeout=self.request_timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def _async_google_serper_search_results(self, search_term: str, search_type: str = "search", **kwargs: Any) -> dict:
+        url, headers, params = self._request(search_term, search_type, kwargs)
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        if self.aiosession:
+            async with self.aiosession.post(url, params=params, headers=headers, timeout=timeout, raise_for_status=True) as response:
+                return await response.json()
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.post(url, params=params, headers=headers, raise_for_status=True) as response:
+                return await response.json()
@@ -0,0 +1,215 @@
+"""
+Chat session storage for the /api/chat endpoints.
+
+Two backends are provided behind the same get/set/delete interface:
+- InMemorySessionStore: per-process, LRU + idle-TTL eviction with a memory cap.
+- SQLiteSessionStore: on-disk, survives restarts and is shared by all uvicorn
+  workers pointing at the same file.
+
+Use create_session_store() to pick a backend from the environment. Async
+callers use aget/aset, which run the SQLite backend's disk I/O in a worker
+thread instead of on the event loop.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List
+
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+
+from utils.sqlite import enable_wal, sqlite_connection
+
+# Rough per-message overhead (object headers, metadata) on top of the content itself
+_MESSAGE_OVERHEAD_BYTES = 256
+
+
+def estimate_history_bytes(messages: List[BaseMessage]) -> int:
+    """Approximate memory held by a list of chat messages."""
+    return sum(len(str(getattr(m, "content", m))) + _MESSAGE_OVERHEAD_BYTES for m in messages)
+
+
+class SessionStore(ABC):
+    """Interface for chat history storage keyed by session id."""
+
+    @abstractmethod
+    def get(self, session_id: str) -> List[BaseMessage]:
+        ...
+
+    @abstractmethod
+    def set(self, session_id: str, messages: List[BaseMessage]) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+    async def aget(self, session_id: str) -> List[BaseMessage]:
+        return await asyncio.to_thread(self.get, session_id)
+
+    async def aset(self, session_id: str, messages: List[BaseMessage]) -> None:
+        await asyncio.to_thread(self.set, session_id, messages)
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store with LRU, idle-TTL and total-size eviction."""
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: float = 3600, max_bytes: int = 64 * 1024 * 1024):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        # session_id -> (messages, last_access, size_bytes); ordered from least to most recently used
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._total_bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> List[BaseMessage]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return []
+            messages, last_access, size = entry
+            if time.monotonic() - last_access > self.ttl_seconds:
+                self._remove(session_id)
+                return []
+            self._sessions[session_id] = (messages, time.monotonic(), size)
+            self._sessions.move_to_end(session_id)
+            return list(messages)
+
+    def set(self, session_id: str, messages: List[BaseMessage]) -> None:
+        size = estimate_history_bytes(messages)
+        with self._lock:
+            if session_id in self._sessions:
+                self._remove(session_id)
+            self._sessions[session_id] = (list(messages), time.monotonic(), size)
+            self._total_bytes += size
+            self._evict()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            if session_id in self._sessions:
+                self._remove(session_id)
+
+    # No I/O: a dict lookup under a short lock is cheaper than a thread hop
+    async def aget(self, session_id: str) -> List[BaseMessage]:
+        return self.get(session_id)
+
+    async def aset(self, session_id: str, messages: List[BaseMessage]) -> None:
+        self.set(session_id, messages)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "sessions": len(self._sessions),
+                "total_bytes": self._total_bytes,
+                "evictions": self._evictions,
+            }
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _remove(self, session_id: str):
+        _, _, size = self._sessions.pop(session_id)
+        self._total_bytes -= size
+
+    def _evict(self):
+        # Idle sessions first, oldest first; stop at the first live one since the dict is in access order
+        now = time.monotonic()
+        while self._sessions:
+            oldest_id, (_, last_access, _) = next(iter(self._sessions.items()))
+            if now - last_access <= self.ttl_seconds:
+                break
+            self._remove(oldest_id)
+            self._evictions += 1
+        # Then least recently used until within the count and memory caps (always keep the newest session)
+        while len(self._sessions) > 1 and (len(self._sessions) > self.max_sessions or self._total_bytes > self.max_bytes):
+            self._remove(next(iter(self._sessions)))
+            self._evictions += 1
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite-backed store shared across workers. Sessions idle longer than ttl_seconds are purged on write."""
+
+    def __init__(self, db_path: str = "sessions.db", ttl_seconds: float = 86400, max_sessions: int = 100000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        enable_wal(db_path)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chat_sessions ("
+                "session_id TEXT PRIMARY KEY, messages TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_chat_sessions_updated_at ON chat_sessions (updated_at)")
+
+    def _connect(self):
+        return sqlite_connection(self.db_path)
+
+    def get(self, session_id: str) -> List[BaseMessage]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT messages, updated_at FROM chat_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return []
+        return messages_from_dict(json.loads(row[0]))
+
+    def set(self, session_id: str, messages: List[BaseMessage]) -> None:
+        now = time.time()
+        payload = json.dumps(messages_to_dict(messages))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO chat_sessions (session_id, messages, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET messages = excluded.messages, updated_at = excluded.updated_at",
+                (session_id, payload, now),
+            )
+            conn.execute("DELETE FROM chat_sessions WHERE updated_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM chat_sessions WHERE session_id IN ("
+                "SELECT session_id FROM chat_sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_sessions,),
+            )
+
+    def delete(self, session_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM chat_sessions WHERE session_id = ?", (session_id,))
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(messages)), 0) FROM chat_sessions").fetchone()
+        return {"backend": "sqlite", "sessions": count, "total_bytes": total}
+
+
+def create_session_store() -> SessionStore:
+    """Build the session store configured by environment variables.
+
+    SESSION_STORE_BACKEND: "memory" (default) or "sqlite"
+    SESSION_TTL_SECONDS: idle time before a session is dropped (default 3600)
+    SESSION_MAX_COUNT: maximum number of sessions kept (default 1000)
+    SESSION_MAX_MB: memory cap for the in-memory backend (default 64)
+    SESSION_DB_PATH: database file for the sqlite backend (default sessions.db)
+    """
+    backend = os.getenv("SESSION_STORE_BACKEND", "memory").lower()
+    ttl_seconds = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+    max_sessions = int(os.getenv("SESSION_MAX_COUNT", "1000"))
+    if backend == "sqlite":
+        return SQLiteSessionStore(
+            db_path=os.getenv("SESSION_DB_PATH", "sessions.db"),
+            ttl_seconds=ttl_seconds,
+            max_sessions=max_sessions,
+        )
+    if backend != "memory":
+        raise ValueError(f"Unknown SESSION_STORE_BACKEND: {backend}")
+    return InMemorySessionStore(
+        max_sessions=max_sessions,
+        ttl_seconds=ttl_seconds,
+        max_bytes=int(float(os.getenv("SESSION_MAX_MB", "64")) * 1024 * 1024),
+    )
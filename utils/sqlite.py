@@ -0,0 +1,22 @@
+"""
+Shared helpers for the small SQLite stores under utils/ (sessions, caches).
+"""
+import sqlite3
+from contextlib import contextmanager
+
+
+@contextmanager
+def sqlite_connection(db_path: str, timeout: float = 10):
+    """Open a short-lived connection, commit on success, roll back on error, always close."""
+    conn = sqlite3.connect(db_path, timeout=timeout)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def enable_wal(db_path: str):
+    """Switch the database to WAL so readers in other workers don't block on writers."""
+    with sqlite_connection(db_path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
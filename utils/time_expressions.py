@@ -0,0 +1,322 @@
+"""
+Time-expression normalizer: free text to an absolute date range.
+
+parse_time_expression() finds the first time expression in a message ("next
+weekend", "in 2 weeks", "20-22 Dec", "15/01/2027", "mid December", "this
+Friday", "Christmas") and resolves it against today's date. Holidays are only
+the fixed-date ones; lunar festivals such as Diwali are not resolved. The
+DateRange it returns gives:
+- key: an ISO interval for cache keys, so phrases meaning the same days share entries
+- label: a readable form for search queries ("19-25 October 2026"), which parses back to the same range
+- overlaps(): for filtering venue availability
+
+It is a handful of precompiled regular expressions (under 0.1 ms per message)
+and needs no LLM call. Ranges for the current week, weekend, month or
+year start today; dates without a year that have already passed this year
+resolve to next year.
+"""
+import calendar
+import re
+from datetime import date, timedelta
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3, "april": 4, "apr": 4,
+    "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7, "august": 8, "aug": 8,
+    "september": 9, "sept": 9, "sep": 9, "october": 10, "oct": 10, "november": 11, "nov": 11,
+    "december": 12, "dec": 12,
+}
+# Month names that are also common English words need a preposition or a year to count
+_AMBIGUOUS_MONTHS = {"may", "march", "mar"}
+
+WEEKDAYS = {
+    "monday": 0, "mon": 0, "tuesday": 1, "tue": 1, "tues": 1, "wednesday": 2, "wed": 2,
+    "thursday": 3, "thu": 3, "thur": 3, "thurs": 3, "friday": 4, "fri": 4, "saturday": 5, "sat": 5, "sunday": 6, "sun": 6,
+}
+
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+
+# Fixed-date holidays (month, day)
+HOLIDAYS = {
+    "new year's eve": (12, 31), "new years eve": (12, 31), "new year eve": (12, 31),
+    "new year's day": (1, 1), "new years day": (1, 1), "new year day": (1, 1),
+    "christmas eve": (12, 24), "christmas": (12, 25), "xmas": (12, 25),
+    "republic day": (1, 26), "independence day": (8, 15), "gandhi jayanti": (10, 2),
+    "valentine's day": (2, 14), "valentines day": (2, 14),
+}
+
+
+class DateRange(NamedTuple):
+    start: date
+    end: date  # inclusive
+    phrase: str = ""  # the text the range was parsed from
+
+    @property
+    def days(self) -> int:
+        return (self.end - self.start).days + 1
+
+    @property
+    def key(self) -> str:
+        return f"{self.start.isoformat()}/{self.end.isoformat()}"
+
+    @property
+    def label(self) -> str:
+        start, end = self.start, self.end
+        if start == end:
+            return _format_day(start)
+        if start.day == 1 and end == _month_end(start):
+            return start.strftime("%B %Y")
+        if (start.year, start.month) == (end.year, end.month):
+            return f"{start.day}-{_format_day(end)}"
+        if start.year == end.year:
+            return f"{start.day} {start:%B} - {_format_day(end)}"
+        return f"{_format_day(start)} - {_format_day(end)}"
+
+    def overlaps(self, start: date, end: Optional[date] = None) -> bool:
+        """True if the range shares at least one day with start..end (inclusive)."""
+        return start <= self.end and (end or start) >= self.start
+
+    def contains(self, day: date) -> bool:
+        return self.start <= day <= self.end
+
+
+def _format_day(day: date) -> str:
+    return f"{day.day} {day:%B %Y}"
+
+
+def _month_end(day: date) -> date:
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(index, 12)
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def _week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _year(text: Optional[str]) -> Optional[int]:
+    if not text:
+        return None
+    year = int(text)
+    return year + 2000 if year < 100 else year
+
+
+def _number(text: str) -> int:
+    return NUMBER_WORDS[text] if text in NUMBER_WORDS else int(text)
+
+
+def _day(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _upcoming(month: int, day: int, today: date) -> Optional[date]:
+    """The next occurrence of month/day on or after today."""
+    candidate = _day(today.year, month, day)
+    if candidate is not None and candidate < today:
+        candidate = _day(today.year + 1, month, day)
+    return candidate
+
+
+def _day_range(today, start_day, start_month, start_year, end_day, end_month, end_year) -> Optional[Tuple[date, date]]:
+    """Resolve a possibly partial "D Month [YYYY] - D Month [YYYY]" range."""
+    start_month = start_month or end_month
+    if end_year is None and start_year is None:
+        start = _upcoming(start_month, start_day, today)
+        if start is None:
+            return None
+        end = _day(start.year, end_month, end_day)
+        if end is not None and end < start:
+            end = _day(start.year + 1, end_month, end_day)
+    else:
+        end_year = end_year or start_year
+        start_year = start_year or (end_year - 1 if (start_month, start_day) > (end_month, end_day) else end_year)
+        start, end = _day(start_year, start_month, start_day), _day(end_year, end_month, end_day)
+    if start is None or end is None or end < start:
+        return None
+    return start, end
+
+
+# --- Patterns ---
+# Each pattern has a handler (match, today) -> (start, end) or None. The earliest match in the text wins,
+# the longest one on ties.
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True))
+_WEEKDAY = "|".join(sorted(WEEKDAYS, key=len, reverse=True))
+_NUMBER = r"\d{1,3}|" + "|".join(NUMBER_WORDS)
+_ORD = r"(?:st|nd|rd|th)?"
+_TO = r"\s*(?:-|–|to|till|until|through|and)\s*"
+_YEAR = r"(?:,?\s*(20\d{2}))?"
+
+
+def _iso_dates(m, today):
+    start = _day(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    end = _day(int(m.group(4)), int(m.group(5)), int(m.group(6))) if m.group(4) else start
+    return (start, end) if start and end and start <= end else None
+
+
+def _numeric_dates(m, today):
+    # Day first, as written in India: 15/01/2027
+    start = _day(_year(m.group(3)), int(m.group(2)), int(m.group(1)))
+    end = _day(_year(m.group(6)), int(m.group(5)), int(m.group(4))) if m.group(4) else start
+    return (start, end) if start and end and start <= end else None
+
+
+def _day_month(m, today):
+    start_month = MONTHS[m.group(2)] if m.group(2) else None
+    if m.group(4) is None:
+        return _day_range(today, int(m.group(1)), start_month, None,
+                          int(m.group(1)), start_month, _year(m.group(3))) if start_month else None
+    return _day_range(today, int(m.group(1)), start_month, _year(m.group(3)),
+                      int(m.group(4)), MONTHS[m.group(5)], _year(m.group(6)))
+
+
+def _month_day(m, today):
+    start_month = MONTHS[m.group(1)]
+    end_month = MONTHS[m.group(3)] if m.group(3) else start_month
+    end_day = int(m.group(4)) if m.group(4) else int(m.group(2))
+    return _day_range(today, int(m.group(2)), start_month, None, end_day, end_month, _year(m.group(5)))
+
+
+def _month(m, today):
+    qualifier, relative, name, year = m.group(1), m.group(2), m.group(3), _year(m.group(4))
+    if name in _AMBIGUOUS_MONTHS and not (qualifier or relative or year or m.group(0).startswith(("in ", "during ", "for ", "by ", "of "))):
+        return None
+    month = MONTHS[name]
+    if year is None:
+        year = today.year if month >= today.month else today.year + 1
+        if relative == "next" and month == today.month:
+            year += 1
+    start = date(year, month, 1)
+    end = _month_end(start)
+    if qualifier in ("early", "beginning of", "start of", "first half of"):
+        end = start.replace(day=10) if qualifier != "first half of" else start.replace(day=15)
+    elif qualifier == "mid":
+        start, end = start.replace(day=11), start.replace(day=20)
+    elif qualifier in ("late", "end of"):
+        start = start.replace(day=21)
+    elif qualifier == "second half of":
+        start = start.replace(day=16)
+    if start <= today <= end:
+        start = today
+    return start, end
+
+
+def _relative_day(m, today):
+    offset = {"today": 0, "tonight": 0, "this evening": 0, "tomorrow": 1, "day after tomorrow": 2}[m.group(1)]
+    day = today + timedelta(days=offset)
+    return day, day
+
+
+def _weekend(m, today):
+    saturday = _week_start(today) + timedelta(days=5 + (7 if m.group(1) == "next" else 0))
+    return max(saturday, today), saturday + timedelta(days=1)
+
+
+def _period(m, today):
+    relative, unit = m.group(1), m.group(2)
+    step = 1 if relative in ("next", "coming") else 0
+    if unit == "week":
+        start = _week_start(today) + timedelta(weeks=step)
+        end = start + timedelta(days=6)
+    elif unit == "month":
+        start = _add_months(today.replace(day=1), step)
+        end = _month_end(start)
+    else:
+        start = date(today.year + step, 1, 1)
+        end = date(today.year + step, 12, 31)
+    return max(start, today), end
+
+
+def _offset(m, today):
+    count, unit = _number(m.group(2)), m.group(3)
+    if m.group(1) == "in":
+        # A point in the future: that day, or the whole week/month it falls in
+        if unit.startswith("day"):
+            day = today + timedelta(days=count)
+            return day, day
+        if unit.startswith("week"):
+            start = _week_start(today + timedelta(weeks=count))
+            return start, start + timedelta(days=6)
+        start = _add_months(today.replace(day=1), count)
+        return start, _month_end(start)
+    # A window starting today: "next 3 days", "within two weeks"
+    if unit.startswith("day"):
+        end = today + timedelta(days=count - 1)
+    elif unit.startswith("week"):
+        end = today + timedelta(weeks=count) - timedelta(days=1)
+    else:
+        end = _add_months(today, count) - timedelta(days=1)
+    return today, max(end, today)
+
+
+def _weekday(m, today):
+    relative, name = m.group(1), m.group(2)
+    if len(name) <= 4 and not relative:
+        return None  # "sun", "sat" and "wed" on their own are usually not dates
+    weekday = WEEKDAYS[name]
+    if relative == "next":
+        day = _week_start(today) + timedelta(weeks=1, days=weekday)
+    else:
+        day = today + timedelta(days=(weekday - today.weekday()) % 7)
+    return day, day
+
+
+def _holiday(m, today):
+    day = _upcoming(*HOLIDAYS[m.group(1).replace("’", "'")], today)
+    return day, day
+
+
+_PATTERNS: List[Tuple["re.Pattern", Callable]] = [(re.compile(pattern), handler) for pattern, handler in [
+    (r"\b(\d{4})-(\d{1,2})-(\d{1,2})(?:" + _TO + r"(\d{4})-(\d{1,2})-(\d{1,2}))?\b", _iso_dates),
+    (r"\b(\d{1,2})[/.](\d{1,2})[/.](\d{4}|\d{2})(?:" + _TO + r"(\d{1,2})[/.](\d{1,2})[/.](\d{4}|\d{2}))?\b", _numeric_dates),
+    (r"\b(\d{1,2})" + _ORD + r"(?:\s+(?:of\s+)?(" + _MONTH + r")\b" + _YEAR + r")?(?:" + _TO + r"(\d{1,2})" + _ORD
+     + r"\s+(?:of\s+)?(" + _MONTH + r")\b" + _YEAR + r")?(?!\d)", _day_month),
+    (r"\b(" + _MONTH + r")\.?\s+(\d{1,2})" + _ORD + r"(?!\d)(?:" + _TO + r"(?:(" + _MONTH + r")\.?\s+)?(\d{1,2})" + _ORD
+     + r"(?!\d))?" + _YEAR, _month_day),
+    (r"\b(?:in\s+|during\s+|for\s+|by\s+|of\s+)?(?:(early|mid|late|end of|beginning of|start of|first half of|second half of)"
+     r"[\s-]+(?:the\s+)?)?(?:(this|next|coming)\s+)?(" + _MONTH + r")\b" + _YEAR, _month),
+    (r"\b(day after tomorrow|today|tonight|this evening|tomorrow)\b", _relative_day),
+    (r"\b(?:(this|next|coming)\s+)?weekend\b", _weekend),
+    (r"\b(this|next|coming|current)\s+(week|month|year)\b", _period),
+    (r"\b(in|next|within|over the next|coming)\s+(" + _NUMBER + r")\s+(days?|weeks?|months?)\b", _offset),
+    (r"\b(?:(this|next|coming|on)\s+)?(" + _WEEKDAY + r")\b", _weekday),
+    (r"\b(" + "|".join(re.escape(name).replace("'", "['’]?") for name in sorted(HOLIDAYS, key=len, reverse=True)) + r")\b",
+     _holiday),
+]]
+
+
+def find_time_expressions(text: str, today: Optional[date] = None) -> List[DateRange]:
+    """All non-overlapping time expressions in text, in order of appearance."""
+    today = today or date.today()
+    lowered = (text or "").lower()
+    candidates = []
+    for pattern, handler in _PATTERNS:
+        for m in pattern.finditer(lowered):
+            candidates.append((m.start(), -len(m.group(0)), m, handler))
+    candidates.sort(key=lambda candidate: candidate[:2])
+
+    ranges, taken_until = [], -1
+    for start, _, m, handler in candidates:
+        if start < taken_until:
+            continue
+        resolved = handler(m, today)
+        if resolved is None:
+            continue
+        ranges.append(DateRange(resolved[0], resolved[1], m.group(0).strip()))
+        taken_until = m.end()
+    return ranges
+
+
+def parse_time_expression(text: str, today: Optional[date] = None) -> Optional[DateRange]:
+    """The first time expression in text as an absolute DateRange, or None."""
+    ranges = find_time_expressions(text, today)
+    return ranges[0] if ranges else None